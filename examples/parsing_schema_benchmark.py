@@ -0,0 +1,90 @@
+#!/usr/bin/env -S rye run python
+
+# Measures the per-request overhead of preparing and parsing structured outputs for a large
+# nested model, i.e. the work done by `.parse()` and `.stream()` besides the HTTP request itself.
+#
+# The strict JSON schema and `TypeAdapter` for a type are generated once and reused, the
+# "first call" timing shows the cost that every request used to pay.
+
+import json
+import timeit
+from enum import Enum
+from typing import Dict, List, Callable, Optional
+
+import pydantic
+from pydantic import BaseModel
+
+import openai
+from openai.lib._parsing._completions import _parse_content, type_to_response_format_param
+
+NUMBER = 1000
+
+
+class Currency(str, Enum):
+    usd = "usd"
+    eur = "eur"
+    gbp = "gbp"
+
+
+class Address(BaseModel):
+    street: str
+    city: str
+    postal_code: Optional[str]
+    country: str
+
+
+class Money(BaseModel):
+    amount: float
+    currency: Currency
+
+
+class LineItem(BaseModel):
+    sku: str
+    description: str
+    quantity: int
+    unit_price: Money
+    tags: List[str]
+
+
+class Shipment(BaseModel):
+    carrier: str
+    tracking_number: Optional[str]
+    destination: Address
+    items: List[LineItem]
+
+
+class Order(BaseModel):
+    id: str
+    billing_address: Address
+    shipments: List[Shipment]
+    totals: Dict[str, Money]
+    notes: Optional[str]
+
+
+@pydantic.dataclasses.dataclass
+class OrderSummary:
+    order_ids: List[str]
+    total: float
+
+
+def first_call(fn: Callable[[], object]) -> float:
+    # simulate a cold cache by clearing the cached schemas and adapters
+    openai.lib._pydantic._strict_json_schema_json.cache_clear()  # type: ignore[attr-defined]
+    openai._models._CachedTypeAdapter.cache_clear()  # type: ignore[attr-defined]
+    start = timeit.default_timer()
+    fn()
+    return timeit.default_timer() - start
+
+
+def report(name: str, fn: Callable[[], object]) -> None:
+    cold = first_call(fn)
+    warm = timeit.timeit(fn, number=NUMBER) / NUMBER
+    print(f"{name:<40} first call {cold * 1e6:>9.1f}us   cached {warm * 1e6:>7.1f}us   ({cold / warm:.0f}x)")
+
+
+summary = json.dumps({"order_ids": ["a", "b"], "total": 12.5})
+
+report("response_format=Order", lambda: type_to_response_format_param(Order))
+report("response_format=OrderSummary", lambda: type_to_response_format_param(OrderSummary))
+report("pydantic_function_tool(Order)", lambda: openai.pydantic_function_tool(Order))
+report("parse OrderSummary content", lambda: _parse_content(OrderSummary, summary))
@@ -28,6 +28,7 @@ from ._exceptions import (
     InternalServerError,
     PermissionDeniedError,
     LengthFinishReasonError,
+    TokenLimitExceededError,
     UnprocessableEntityError,
     APIResponseValidationError,
     ContentFilterFinishReasonError,
@@ -62,6 +63,7 @@ __all__ = [
     "InternalServerError",
     "LengthFinishReasonError",
     "ContentFilterFinishReasonError",
+    "TokenLimitExceededError",
     "Timeout",
     "RequestOptions",
     "Client",
@@ -83,6 +85,7 @@ if not _t.TYPE_CHECKING:
     from ._utils._resources_proxy import resources as resources
 
 from .lib import azure as _azure, pydantic_function_tool as pydantic_function_tool
+from ._files import MappedFile as MappedFile
 from .version import VERSION as VERSION
 from .lib.azure import AzureOpenAI as AzureOpenAI, AsyncAzureOpenAI as AsyncAzureOpenAI
 from .lib._old_api import *
@@ -53,6 +53,7 @@ if TYPE_CHECKING:
         moderations,
         vector_stores,
     )
+    from .lib._poller import Poller, AsyncPoller
     from .resources.files import Files, AsyncFiles
     from .resources.images import Images, AsyncImages
     from .resources.models import Models, AsyncModels
@@ -252,6 +253,13 @@ class OpenAI(SyncAPIClient):
 
         return Containers(self)
 
+    @cached_property
+    def poller(self) -> Poller:
+        """A shared poller for waiting on many long running jobs, see `openai.lib.Poller`."""
+        from .lib._poller import Poller
+
+        return Poller(self)
+
     @cached_property
     def with_raw_response(self) -> OpenAIWithRawResponse:
         return OpenAIWithRawResponse(self)
@@ -553,6 +561,13 @@ class AsyncOpenAI(AsyncAPIClient):
 
         return AsyncContainers(self)
 
+    @cached_property
+    def poller(self) -> AsyncPoller:
+        """A shared poller for waiting on many long running jobs, see `openai.lib.AsyncPoller`."""
+        from .lib._poller import AsyncPoller
+
+        return AsyncPoller(self)
+
     @cached_property
     def with_raw_response(self) -> AsyncOpenAIWithRawResponse:
         return AsyncOpenAIWithRawResponse(self)
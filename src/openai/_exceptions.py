@@ -24,6 +24,7 @@ __all__ = [
     "InternalServerError",
     "LengthFinishReasonError",
     "ContentFilterFinishReasonError",
+    "TokenLimitExceededError",
 ]
 
 
@@ -154,3 +155,18 @@ class ContentFilterFinishReasonError(OpenAIError):
         super().__init__(
             f"Could not parse response content as the request was rejected by the content filter",
         )
+
+
+class TokenLimitExceededError(OpenAIError):
+    tokens: int
+    """The estimated number of input tokens in the request."""
+
+    max_tokens: int
+    """The number of input tokens that fit in the context window."""
+
+    def __init__(self, *, tokens: int, max_tokens: int) -> None:
+        super().__init__(
+            f"The request has an estimated {tokens} input tokens but only {max_tokens} fit in the context window"
+        )
+        self.tokens = tokens
+        self.max_tokens = max_tokens
@@ -1,3 +1,4 @@
 from .numpy_proxy import numpy as numpy, has_numpy as has_numpy
 from .pandas_proxy import pandas as pandas
+from .tiktoken_proxy import tiktoken as tiktoken, has_tiktoken as has_tiktoken
 from .sounddevice_proxy import sounddevice as sounddevice
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+from typing_extensions import override
+
+from .._utils import LazyProxy
+from ._common import MissingDependencyError, format_instructions
+
+if TYPE_CHECKING:
+    import tiktoken as tiktoken
+
+
+TIKTOKEN_INSTRUCTIONS = format_instructions(library="tiktoken", extra="tokens")
+
+
+class TiktokenProxy(LazyProxy[Any]):
+    @override
+    def __load__(self) -> Any:
+        try:
+            import tiktoken
+        except ImportError as err:
+            raise MissingDependencyError(TIKTOKEN_INSTRUCTIONS) from err
+
+        return tiktoken
+
+
+if not TYPE_CHECKING:
+    tiktoken = TiktokenProxy()
+
+
+def has_tiktoken() -> bool:
+    try:
+        import tiktoken  # noqa: F401  # pyright: ignore[reportUnusedImport]
+    except ImportError:
+        return False
+
+    return True
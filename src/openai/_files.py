@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import io
 import os
+import mmap
 import pathlib
-from typing import overload
-from typing_extensions import TypeGuard
+from typing import Any, BinaryIO, overload
+from typing_extensions import Protocol, TypeGuard, override
 
 import anyio
 
@@ -64,7 +65,7 @@ def _transform_file(file: FileTypes) -> HttpxFileTypes:
     if is_file_content(file):
         if isinstance(file, os.PathLike):
             path = pathlib.Path(file)
-            return (path.name, path.read_bytes())
+            return (path.name, FileStream(path))
 
         return file
 
@@ -76,7 +77,7 @@ def _transform_file(file: FileTypes) -> HttpxFileTypes:
 
 def _read_file_content(file: FileContent) -> HttpxFileContent:
     if isinstance(file, os.PathLike):
-        return pathlib.Path(file).read_bytes()
+        return FileStream(file)
     return file
 
 
@@ -117,7 +118,316 @@ async def _async_transform_file(file: FileTypes) -> HttpxFileTypes:
 
 
 async def _async_read_file_content(file: FileContent) -> HttpxFileContent:
+    # httpx reads multipart file objects synchronously, even for async requests, so
+    # a `FileStream` would block the event loop on every chunk. The file is read in
+    # a worker thread instead.
     if isinstance(file, os.PathLike):
         return await anyio.Path(file).read_bytes()
 
     return file
+
+
+class FileStream(io.RawIOBase, BinaryIO):
+    """A read-only file object that streams a file from disk.
+
+    The file is only opened once the request body is being written and is read
+    in the chunk size requested by httpx's multipart encoder, so the contents of
+    `PathLike` file inputs are never loaded into memory all at once.
+
+    The file is closed again once it has been read to the end and re-opened if
+    the request body has to be written again, e.g. when a request is retried.
+
+    This is only used for sync requests, as httpx reads multipart file objects in
+    the event loop when sending async requests.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], *, size: int | None = None) -> None:
+        super().__init__()
+        self._path = pathlib.Path(path)
+        self._size = size
+        self._file: io.FileIO | None = None
+        self._pos = 0
+
+    @property
+    @override
+    def name(self) -> str:
+        return self._path.name
+
+    @property
+    def size(self) -> int:
+        if self._size is None:
+            self._size = self._path.stat().st_size
+        return self._size
+
+    @override
+    def readable(self) -> bool:
+        return True
+
+    @override
+    def seekable(self) -> bool:
+        return True
+
+    @override
+    def tell(self) -> int:
+        self._check_open()
+        return self._pos
+
+    @override
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        self._check_open()
+        if whence == os.SEEK_SET:
+            pos = offset
+        elif whence == os.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == os.SEEK_END:
+            pos = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence value {whence!r}")
+
+        if pos < 0:
+            raise ValueError(f"Negative seek position {pos}")
+
+        if self._file is not None:
+            self._file.seek(pos)
+
+        self._pos = pos
+        return pos
+
+    @override
+    def read(self, size: int | None = -1) -> bytes:
+        self._check_open()
+        if self._file is None:
+            self._file = io.FileIO(self._path, "r")
+            self._file.seek(self._pos)
+
+        data = self._file.readall() if size is None or size < 0 else self._file.read(size)
+        if not data:
+            # EOF, we don't need to hold on to the file descriptor any longer
+            self._close_file()
+            return b""
+
+        self._pos += len(data)
+        return data
+
+    @override
+    def readall(self) -> bytes:
+        return self.read(-1)
+
+    @override
+    def readinto(self, buffer: Any) -> int:
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    @override
+    def write(self, data: Any) -> int:  # noqa: ARG002
+        raise io.UnsupportedOperation("write")
+
+    @override
+    def close(self) -> None:
+        self._close_file()
+        super().close()
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _check_open(self) -> None:
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+
+
+class Digest(Protocol):
+    """The subset of the `hashlib` hash object interface used by `MappedFile`."""
+
+    def update(self, __data: bytes | memoryview) -> None: ...
+
+    def hexdigest(self) -> str: ...
+
+
+class MappedFile(io.RawIOBase, BinaryIO):
+    """A read-only file object backed by a memory-mapped file or an in-memory buffer.
+
+    httpx reads file objects in small chunks while it encodes a multipart body, so
+    passing a `MappedFile` (or a `.slice()` of one) as file content means the data
+    is copied out of the page cache one chunk at a time instead of being loaded
+    into a single `bytes` object up front.
+
+    ```py
+    with MappedFile.open("training.jsonl") as file:
+        client.files.create(file=file, purpose="fine-tune")
+    ```
+    """
+
+    def __init__(
+        self,
+        buffer: memoryview,
+        *,
+        name: str,
+        mapping: mmap.mmap | None = None,
+        offset: int = 0,
+        owner: bool = True,
+        digest: Digest | None = None,
+    ) -> None:
+        super().__init__()
+        self._name = name
+        self._view = buffer
+        self._mapping = mapping
+        self._offset = offset
+        self._owner = owner
+        self._digest = digest
+        self._digested = 0
+        self._pos = 0
+
+    @classmethod
+    def open(cls, path: str | os.PathLike[str]) -> MappedFile:
+        """Memory-map the file at the given path for reading."""
+        path = pathlib.Path(path)
+        with open(path, "rb") as fd:
+            if os.fstat(fd.fileno()).st_size == 0:
+                # empty files cannot be mapped
+                return cls(memoryview(b""), name=path.name)
+
+            mapping = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+
+        return cls(memoryview(mapping), name=path.name, mapping=mapping)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, *, name: str) -> MappedFile:
+        """Wrap an in-memory buffer so that it can be sliced without copying."""
+        return cls(memoryview(data), name=name)
+
+    @property
+    @override
+    def name(self) -> str:
+        return self._name
+
+    def __len__(self) -> int:
+        return self._view.nbytes
+
+    def slice(self, offset: int, length: int, *, digest: Digest | None = None) -> MappedFile:
+        """Return a file object over `length` bytes starting at `offset`.
+
+        The returned object shares this object's buffer. Closing it hints to the OS
+        that the underlying pages are no longer needed, which keeps the resident
+        memory of large sequential uploads bounded.
+
+        If a `digest` is given it is updated with the contents of the slice as they
+        are read, so a checksum can be computed in the same pass that sends the data.
+        Each byte is only hashed once, even if the slice is read again because the
+        request was retried.
+        """
+        self._check_open()
+        if offset < 0 or length < 0:
+            raise ValueError(f"Expected a non-negative offset and length but received offset={offset}, length={length}")
+
+        return MappedFile(
+            self._view[offset : offset + length],
+            name=self._name,
+            mapping=self._mapping,
+            offset=self._offset + offset,
+            owner=False,
+            digest=digest,
+        )
+
+    def update_digest(self) -> None:
+        """Update the digest with any remaining bytes that have not been read yet."""
+        self._check_open()
+        self._update_digest(self._view.nbytes)
+
+    @override
+    def readable(self) -> bool:
+        return True
+
+    @override
+    def seekable(self) -> bool:
+        return True
+
+    @override
+    def tell(self) -> int:
+        self._check_open()
+        return self._pos
+
+    @override
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        self._check_open()
+        if whence == os.SEEK_SET:
+            pos = offset
+        elif whence == os.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == os.SEEK_END:
+            pos = self._view.nbytes + offset
+        else:
+            raise ValueError(f"Invalid whence value {whence!r}")
+
+        if pos < 0:
+            raise ValueError(f"Negative seek position {pos}")
+
+        self._pos = pos
+        return pos
+
+    @override
+    def read(self, size: int | None = -1) -> bytes:
+        self._check_open()
+        start = min(self._pos, self._view.nbytes)
+        end = self._view.nbytes if size is None or size < 0 else min(start + size, self._view.nbytes)
+        self._update_digest(end)
+        self._pos = end
+        return self._view[start:end].tobytes()
+
+    @override
+    def readall(self) -> bytes:
+        return self.read(-1)
+
+    @override
+    def readinto(self, buffer: Any) -> int:
+        self._check_open()
+        start = min(self._pos, self._view.nbytes)
+        end = min(start + len(buffer), self._view.nbytes)
+        self._update_digest(end)
+        buffer[: end - start] = self._view[start:end]
+        self._pos = end
+        return end - start
+
+    @override
+    def write(self, data: Any) -> int:  # noqa: ARG002
+        raise io.UnsupportedOperation("write")
+
+    @override
+    def close(self) -> None:
+        if self.closed:
+            return
+
+        if not self._owner:
+            self._release_pages()
+
+        self._view.release()
+        if self._owner and self._mapping is not None:
+            try:
+                self._mapping.close()
+            except BufferError:
+                # slices are still alive, the mapping will be closed once they are garbage collected
+                pass
+
+        super().close()
+
+    def _update_digest(self, end: int) -> None:
+        if self._digest is not None and end > self._digested:
+            self._digest.update(self._view[self._digested : end])
+            self._digested = end
+
+    def _release_pages(self) -> None:
+        mapping = self._mapping
+        if mapping is None or not hasattr(mmap, "MADV_DONTNEED") or self._view.nbytes == 0:
+            return
+
+        start = self._offset - (self._offset % mmap.PAGESIZE)
+        try:
+            mapping.madvise(mmap.MADV_DONTNEED, start, self._offset + self._view.nbytes - start)
+        except (OSError, ValueError):
+            pass
+
+    def _check_open(self) -> None:
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
@@ -436,6 +436,39 @@ def build(
     return cast(_BaseModelT, construct_type(type_=base_model_cls, value=kwargs))
 
 
+def build_from(base_model_cls: type[_BaseModelT], source: pydantic.BaseModel, **values: object) -> _BaseModelT:
+    """Construct a BaseModel class from the fields of an already constructed model, without validation.
+
+    Unlike `build()` / `construct_type()` the given values and the fields of `source` are
+    used as they are instead of being re-constructed, which makes this much cheaper for
+    values that already have the right type, e.g. when turning an API model into one of
+    its `Parsed*` subclasses.
+
+    ```py
+    build_from(ParsedResponseOutputText, output_text, parsed=parsed)
+    ```
+    """
+    m = base_model_cls.__new__(base_model_cls)
+
+    fields_values: dict[str, object] = {**source.__dict__, **values}
+    for name, field in get_model_fields(base_model_cls).items():
+        if name not in fields_values:
+            fields_values[name] = field_get_default(field)
+
+    _fields_set = {*source.model_fields_set, *values}
+    object.__setattr__(m, "__dict__", fields_values)
+
+    if PYDANTIC_V2:
+        object.__setattr__(m, "__pydantic_private__", None)
+        object.__setattr__(m, "__pydantic_extra__", dict(source.__pydantic_extra__ or {}))
+        object.__setattr__(m, "__pydantic_fields_set__", _fields_set)
+    else:
+        m._init_private_attributes()  # type: ignore
+        object.__setattr__(m, "__fields_set__", _fields_set)
+
+    return m
+
+
 def construct_type_unchecked(*, value: object, type_: type[_T]) -> _T:
     """Loose coercion to the expected type with construction of nested values.
 
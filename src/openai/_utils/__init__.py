@@ -58,3 +58,4 @@ from ._reflection import (
     function_has_argument as function_has_argument,
     assert_signatures_in_sync as assert_signatures_in_sync,
 )
+from ._concurrency import run_concurrently as run_concurrently, async_run_concurrently as async_run_concurrently
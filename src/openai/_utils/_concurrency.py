@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from typing import List, TypeVar, Callable, Iterable, Optional, Awaitable
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor, wait
+
+import anyio
+
+_T = TypeVar("_T")
+
+
+def run_concurrently(functions: Iterable[Callable[[], _T]], *, max_concurrency: int) -> List[_T]:
+    """Runs the given functions in a thread pool, at most `max_concurrency` at a time.
+
+    Results are returned in the same order as the given functions. If any function raises,
+    functions that haven't started yet are cancelled and the first exception is re-raised.
+    """
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        futures: List[Future[_T]] = [executor.submit(fn) for fn in functions]
+
+        done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+        for future in done:
+            exc = future.exception()
+            if exc is not None:
+                for pending in futures:
+                    pending.cancel()
+
+                raise exc
+
+    return [future.result() for future in futures]
+
+
+async def async_run_concurrently(
+    functions: Iterable[Callable[[], Awaitable[_T]]],
+    *,
+    max_concurrency: int,
+) -> List[_T]:
+    """Runs the given async functions concurrently, at most `max_concurrency` at a time.
+
+    Results are returned in the same order as the given functions. If any function raises,
+    the others are cancelled and the first exception is re-raised as is, instead of being
+    wrapped in an `ExceptionGroup` like anyio task groups do.
+
+    Supports any async runtime that anyio supports, e.g. `asyncio` and `trio`.
+    """
+    fns = list(functions)
+    results: List[Optional[_T]] = [None] * len(fns)
+    errors: List[Exception] = []
+    limiter = anyio.CapacityLimiter(max_concurrency)
+
+    async with anyio.create_task_group() as tg:
+
+        async def run(index: int, fn: Callable[[], Awaitable[_T]]) -> None:
+            async with limiter:
+                try:
+                    results[index] = await fn()
+                except Exception as exc:
+                    errors.append(exc)
+                    tg.cancel_scope.cancel()
+
+        for index, fn in enumerate(fns):
+            tg.start_soon(run, index, fn)
+
+    if errors:
+        raise errors[0]
+
+    return results  # type: ignore[return-value]
@@ -1,2 +1,61 @@
 from ._tools import pydantic_function_tool as pydantic_function_tool
+from ._poller import Poller as Poller, AsyncPoller as AsyncPoller, AsyncPollFuture as AsyncPollFuture
+from ._tokens import (
+    TokenCounter as TokenCounter,
+    estimate_tokens as estimate_tokens,
+    get_token_counter as get_token_counter,
+    preflight_response as preflight_response,
+    count_response_tokens as count_response_tokens,
+    preflight_chat_completion as preflight_chat_completion,
+    count_chat_completion_tokens as count_chat_completion_tokens,
+)
+from ._fan_out import (
+    RequestResult as RequestResult,
+    FanOutProgress as FanOutProgress,
+    AsyncRequestResults as AsyncRequestResults,
+)
 from ._parsing import ResponseFormatT as ResponseFormatT
+from ._file_index import FileIndex as FileIndex
+from ._tool_runner import (
+    ToolCall as ToolCall,
+    ToolRunner as ToolRunner,
+    AsyncToolRunner as AsyncToolRunner,
+    ChatToolRunResult as ChatToolRunResult,
+    ResponsesToolRunResult as ResponsesToolRunResult,
+)
+from ._conversation import (
+    Conversation as Conversation,
+    ConversationTurn as ConversationTurn,
+    AsyncConversation as AsyncConversation,
+)
+from ._file_batches import FileAttachFailure as FileAttachFailure, UploadAndAttachResult as UploadAndAttachResult
+from ._prompt_cache import (
+    PromptCacheStats as PromptCacheStats,
+    PromptCacheTracker as PromptCacheTracker,
+    prompt_prefix_hash as prompt_prefix_hash,
+    canonicalize_request as canonicalize_request,
+)
+from ._search_cache import SearchCache as SearchCache
+from ._vector_index import VectorIndex as VectorIndex, VectorIndexMatch as VectorIndexMatch
+from ._embedding_cache import (
+    EmbeddingCache as EmbeddingCache,
+    MmapEmbeddingStore as MmapEmbeddingStore,
+    EmbeddingCacheStore as EmbeddingCacheStore,
+    MemoryEmbeddingStore as MemoryEmbeddingStore,
+    SqliteEmbeddingStore as SqliteEmbeddingStore,
+)
+from ._embedding_arrays import EmbeddingArray as EmbeddingArray, truncate_embeddings as truncate_embeddings
+from ._embedding_dataset import (
+    EmbeddingDataset as EmbeddingDataset,
+    EmbeddingDatasetWriter as EmbeddingDatasetWriter,
+    open_embedding_dataset as open_embedding_dataset,
+)
+from ._vector_store_sync import (
+    VectorStoreManifest as VectorStoreManifest,
+    VectorStoreSyncResult as VectorStoreSyncResult,
+    VectorStoreSyncFailure as VectorStoreSyncFailure,
+)
+from ._completion_batcher import (
+    CompletionBatcher as CompletionBatcher,
+    AsyncCompletionBatcher as AsyncCompletionBatcher,
+)
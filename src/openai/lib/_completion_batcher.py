@@ -0,0 +1,480 @@
+from __future__ import annotations
+
+import math
+import queue
+import threading
+from types import TracebackType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Type,
+    Tuple,
+    Union,
+    Iterator,
+    Optional,
+    AsyncIterator,
+    cast,
+)
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import anyio
+from anyio.abc import TaskGroup
+from anyio.streams.memory import MemoryObjectSendStream, MemoryObjectReceiveStream
+
+from .._models import build_from
+from .._streaming import Stream, AsyncStream
+from ..types.completion import Completion
+from ..types.completion_choice import CompletionChoice
+
+if TYPE_CHECKING:
+    from .._client import OpenAI, AsyncOpenAI
+
+Prompt = Union[str, List[int]]
+
+DEFAULT_MAX_BATCH_SIZE = 20
+DEFAULT_BATCH_WINDOW_SECONDS = 0.05
+DEFAULT_MAX_CONCURRENCY = 4
+
+# prompts are only batched with prompts of the same kind: streamed or not, and text or tokens
+_BatchKey = Tuple[bool, bool]
+
+_DONE = object()
+
+
+class _BaseCompletionBatcher:
+    def __init__(
+        self,
+        *,
+        model: str,
+        max_batch_size: int,
+        batch_window_seconds: float,
+        max_concurrency: int,
+        params: Dict[str, Any],
+    ) -> None:
+        if max_batch_size <= 0:
+            raise ValueError(f"Expected `max_batch_size` to be a positive integer but received {max_batch_size}")
+        if batch_window_seconds < 0:
+            raise ValueError(f"Expected `batch_window_seconds` to not be negative but received {batch_window_seconds}")
+        if max_concurrency <= 0:
+            raise ValueError(f"Expected `max_concurrency` to be a positive integer but received {max_concurrency}")
+        for key in ("prompt", "stream"):
+            if key in params:
+                raise TypeError(f"`{key}` can't be given to a completion batcher, it's set for each prompt")
+
+        self.model = model
+        self._max_batch_size = max_batch_size
+        self._batch_window_seconds = batch_window_seconds
+        self._params = params
+        n = params.get("n")
+        # the number of choices that are generated for every prompt
+        self._n: int = n if isinstance(n, int) else 1
+        self._closed = False
+
+    def _request(self, prompts: List[Prompt], *, stream: bool) -> Dict[str, Any]:
+        request: Dict[str, Any] = {**self._params, "model": self.model, "prompt": prompts}
+        if stream:
+            request["stream"] = True
+        return request
+
+    def _split_completion(self, completion: Completion, count: int) -> List[Completion]:
+        """Splits the choices of a batched completion into a completion for each prompt.
+
+        The choices for the prompt at position `i` are at indices `i * n` to `(i + 1) * n`,
+        their indices are renumbered from zero. The usage covers the whole batch so it
+        isn't included in the completion for each prompt.
+        """
+        choices: List[List[CompletionChoice]] = [[] for _ in range(count)]
+        for choice in completion.choices:
+            position, index = divmod(choice.index, self._n)
+            if position < count:
+                choices[position].append(build_from(CompletionChoice, choice, index=index))
+        return [build_from(Completion, completion, choices=prompt_choices, usage=None) for prompt_choices in choices]
+
+    def _split_chunk(self, chunk: Completion) -> Dict[int, Completion]:
+        """Splits a streamed chunk by the position of the prompt that each of its choices belongs to."""
+        choices: Dict[int, List[CompletionChoice]] = {}
+        for choice in chunk.choices:
+            position, index = divmod(choice.index, self._n)
+            choices.setdefault(position, []).append(build_from(CompletionChoice, choice, index=index))
+        return {
+            position: build_from(Completion, chunk, choices=prompt_choices, usage=None)
+            for position, prompt_choices in choices.items()
+        }
+
+
+class _Entry:
+    prompt: Prompt
+
+    future: Optional[Future[Completion]]
+
+    chunks: Optional[queue.Queue[object]]
+
+    def __init__(self, prompt: Prompt, *, stream: bool) -> None:
+        self.prompt = prompt
+        self.future = None if stream else Future()
+        self.chunks = queue.Queue() if stream else None
+
+
+class _Batch:
+    def __init__(self, key: _BatchKey) -> None:
+        self.key = key
+        self.entries: List[_Entry] = []
+        self.ready = threading.Event()
+
+
+class CompletionBatcher(_BaseCompletionBatcher):
+    """Sends prompts that are submitted around the same time in a single `completions.create()` request.
+
+    Prompts are collected for up to `batch_window_seconds`, or until `max_batch_size`
+    prompts are waiting, and are then sent as the `prompt` list of one request. The
+    choices of the response, or each streamed chunk, are routed back to the caller of
+    the prompt they belong to with their `index` renumbered from zero. Every prompt
+    shares the model and the other params given to the batcher.
+
+    ```py
+    with CompletionBatcher(client, model="gpt-3.5-turbo-instruct", max_tokens=1) as batcher:
+        futures = [batcher.submit(f"Classify the sentiment: {text}\\nSentiment:") for text in texts]
+        labels = [future.result().choices[0].text for future in futures]
+    ```
+
+    Any prompts that are still waiting are sent when the batcher is closed.
+    """
+
+    def __init__(
+        self,
+        client: OpenAI,
+        *,
+        model: str,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        batch_window_seconds: float = DEFAULT_BATCH_WINDOW_SECONDS,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        **params: Any,
+    ) -> None:
+        super().__init__(
+            model=model,
+            max_batch_size=max_batch_size,
+            batch_window_seconds=batch_window_seconds,
+            max_concurrency=max_concurrency,
+            params=params,
+        )
+        self._client = client
+        self._lock = threading.Lock()
+        self._open: Dict[_BatchKey, _Batch] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+
+    def submit(self, prompt: Prompt) -> Future[Completion]:
+        """Adds the prompt to the next batch and returns a future for its completion."""
+        future = self._add(prompt, stream=False).future
+        assert future is not None
+        return future
+
+    def create(self, prompt: Prompt) -> Completion:
+        """Adds the prompt to the next batch and waits for its completion."""
+        return self.submit(prompt).result()
+
+    def stream(self, prompt: Prompt) -> Iterator[Completion]:
+        """Adds the prompt to the next streamed batch and returns an iterator of the chunks for this prompt."""
+        chunks = self._add(prompt, stream=True).chunks
+        assert chunks is not None
+        return _iter_chunks(chunks)
+
+    def flush(self) -> None:
+        """Sends every batch that's waiting without waiting for its window to end."""
+        with self._lock:
+            batches = list(self._open.values())
+            self._open.clear()
+
+        for batch in batches:
+            batch.ready.set()
+
+    def close(self) -> None:
+        """Sends any waiting prompts and waits for every request to finish."""
+        with self._lock:
+            self._closed = True
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> CompletionBatcher:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def _add(self, prompt: Prompt, *, stream: bool) -> _Entry:
+        entry = _Entry(prompt, stream=stream)
+        key: _BatchKey = (stream, isinstance(prompt, str))
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Cannot add a prompt to a completion batcher that has been closed")
+
+            batch = self._open.get(key)
+            if batch is None:
+                batch = self._open[key] = _Batch(key)
+                self._executor.submit(self._run, batch)
+
+            batch.entries.append(entry)
+            if len(batch.entries) >= self._max_batch_size:
+                del self._open[key]
+                batch.ready.set()
+
+        return entry
+
+    def _run(self, batch: _Batch) -> None:
+        batch.ready.wait(self._batch_window_seconds)
+        with self._lock:
+            if self._open.get(batch.key) is batch:
+                del self._open[batch.key]
+
+        stream, _ = batch.key
+        if stream:
+            self._send_stream(batch.entries, [entry.prompt for entry in batch.entries])
+            return
+
+        # prompts whose future was cancelled aren't sent, the others can't be cancelled from now on
+        entries = [
+            entry for entry in batch.entries if cast("Future[Completion]", entry.future).set_running_or_notify_cancel()
+        ]
+        if entries:
+            self._send(entries, [entry.prompt for entry in entries])
+
+    def _send(self, entries: List[_Entry], prompts: List[Prompt]) -> None:
+        try:
+            completion = cast(Completion, self._client.completions.create(**self._request(prompts, stream=False)))
+            completions = self._split_completion(completion, len(entries))
+        except Exception as err:
+            for entry in entries:
+                assert entry.future is not None
+                entry.future.set_exception(err)
+            return
+
+        for entry, prompt_completion in zip(entries, completions):
+            assert entry.future is not None
+            entry.future.set_result(prompt_completion)
+
+    def _send_stream(self, entries: List[_Entry], prompts: List[Prompt]) -> None:
+        try:
+            stream = cast("Stream[Completion]", self._client.completions.create(**self._request(prompts, stream=True)))
+            with stream:
+                for chunk in stream:
+                    for position, prompt_chunk in self._split_chunk(chunk).items():
+                        if position < len(entries):
+                            cast("queue.Queue[object]", entries[position].chunks).put(prompt_chunk)
+        except Exception as err:
+            for entry in entries:
+                cast("queue.Queue[object]", entry.chunks).put(err)
+        finally:
+            for entry in entries:
+                cast("queue.Queue[object]", entry.chunks).put(_DONE)
+
+
+class _AsyncEntry:
+    prompt: Prompt
+
+    result: Optional[Completion]
+
+    error: Optional[BaseException]
+
+    def __init__(self, prompt: Prompt, *, stream: bool) -> None:
+        self.prompt = prompt
+        self.result = None
+        self.error = None
+        self.done = anyio.Event()
+
+        self.send: Optional[MemoryObjectSendStream[object]] = None
+        self.receive: Optional[MemoryObjectReceiveStream[object]] = None
+        if stream:
+            self.send, self.receive = cast(
+                "Tuple[MemoryObjectSendStream[object], MemoryObjectReceiveStream[object]]",
+                anyio.create_memory_object_stream(math.inf),
+            )
+
+    def put(self, item: object) -> None:
+        """Sends a streamed chunk or error to the caller, unless it stopped iterating."""
+        assert self.send is not None
+        try:
+            self.send.send_nowait(item)
+        except (anyio.BrokenResourceError, anyio.ClosedResourceError):
+            pass
+
+
+class _AsyncBatch:
+    def __init__(self, key: _BatchKey) -> None:
+        self.key = key
+        self.entries: List[_AsyncEntry] = []
+        self.ready = anyio.Event()
+
+
+class AsyncCompletionBatcher(_BaseCompletionBatcher):
+    """The async version of `CompletionBatcher`, which must be entered with `async with`.
+
+    ```py
+    async with AsyncCompletionBatcher(client, model="gpt-3.5-turbo-instruct", max_tokens=1) as batcher:
+        completions = await asyncio.gather(*(batcher.create(prompt) for prompt in prompts))
+    ```
+    """
+
+    def __init__(
+        self,
+        client: AsyncOpenAI,
+        *,
+        model: str,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        batch_window_seconds: float = DEFAULT_BATCH_WINDOW_SECONDS,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        **params: Any,
+    ) -> None:
+        super().__init__(
+            model=model,
+            max_batch_size=max_batch_size,
+            batch_window_seconds=batch_window_seconds,
+            max_concurrency=max_concurrency,
+            params=params,
+        )
+        self._client = client
+        self._open: Dict[_BatchKey, _AsyncBatch] = {}
+        self._limiter = anyio.CapacityLimiter(max_concurrency)
+        self._task_group: Optional[TaskGroup] = None
+
+    async def create(self, prompt: Prompt) -> Completion:
+        """Adds the prompt to the next batch and waits for its completion."""
+        entry = self._add(prompt, stream=False)
+        await entry.done.wait()
+        if entry.error is not None:
+            raise entry.error
+        assert entry.result is not None
+        return entry.result
+
+    def stream(self, prompt: Prompt) -> AsyncIterator[Completion]:
+        """Adds the prompt to the next streamed batch and returns an async iterator of the chunks for this prompt."""
+        receive = self._add(prompt, stream=True).receive
+        assert receive is not None
+        return _aiter_chunks(receive)
+
+    def flush(self) -> None:
+        """Sends every batch that's waiting without waiting for its window to end."""
+        batches = list(self._open.values())
+        self._open.clear()
+        for batch in batches:
+            batch.ready.set()
+
+    async def __aenter__(self) -> AsyncCompletionBatcher:
+        self._task_group = anyio.create_task_group()
+        await self._task_group.__aenter__()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> Optional[bool]:
+        assert self._task_group is not None
+        # send any waiting prompts, leaving the task group waits for their requests to finish
+        self._closed = True
+        self.flush()
+        return await self._task_group.__aexit__(exc_type, exc, exc_tb)
+
+    def _add(self, prompt: Prompt, *, stream: bool) -> _AsyncEntry:
+        if self._task_group is None:
+            raise RuntimeError("A completion batcher must be entered with `async with` before prompts are added")
+        if self._closed:
+            raise RuntimeError("Cannot add a prompt to a completion batcher that has been closed")
+
+        entry = _AsyncEntry(prompt, stream=stream)
+        key: _BatchKey = (stream, isinstance(prompt, str))
+
+        batch = self._open.get(key)
+        if batch is None:
+            batch = self._open[key] = _AsyncBatch(key)
+            self._task_group.start_soon(self._run, batch)
+
+        batch.entries.append(entry)
+        if len(batch.entries) >= self._max_batch_size:
+            del self._open[key]
+            batch.ready.set()
+
+        return entry
+
+    async def _run(self, batch: _AsyncBatch) -> None:
+        with anyio.move_on_after(self._batch_window_seconds):
+            await batch.ready.wait()
+        if self._open.get(batch.key) is batch:
+            del self._open[batch.key]
+
+        prompts = [entry.prompt for entry in batch.entries]
+        stream, _ = batch.key
+        try:
+            async with self._limiter:
+                if stream:
+                    await self._send_stream(batch.entries, prompts)
+                else:
+                    await self._send(batch.entries, prompts)
+        except BaseException:
+            # the batcher was cancelled, the callers that are still waiting mustn't hang
+            error = RuntimeError("The completion batcher was closed before the request finished")
+            for entry in batch.entries:
+                if entry.send is not None:
+                    entry.put(error)
+                    entry.send.close()
+                elif not entry.done.is_set():
+                    entry.error = error
+                    entry.done.set()
+            raise
+
+    async def _send(self, entries: List[_AsyncEntry], prompts: List[Prompt]) -> None:
+        try:
+            completion = cast(Completion, await self._client.completions.create(**self._request(prompts, stream=False)))
+        except Exception as err:
+            for entry in entries:
+                entry.error = err
+                entry.done.set()
+            return
+
+        for entry, prompt_completion in zip(entries, self._split_completion(completion, len(entries))):
+            entry.result = prompt_completion
+            entry.done.set()
+
+    async def _send_stream(self, entries: List[_AsyncEntry], prompts: List[Prompt]) -> None:
+        try:
+            stream = cast(
+                "AsyncStream[Completion]",
+                await self._client.completions.create(**self._request(prompts, stream=True)),
+            )
+            async with stream:
+                async for chunk in stream:
+                    for position, prompt_chunk in self._split_chunk(chunk).items():
+                        if position < len(entries):
+                            entries[position].put(prompt_chunk)
+        except Exception as err:
+            for entry in entries:
+                entry.put(err)
+
+        for entry in entries:
+            assert entry.send is not None
+            entry.send.close()
+
+
+def _iter_chunks(chunks: queue.Queue[object]) -> Iterator[Completion]:
+    while True:
+        item = chunks.get()
+        if item is _DONE:
+            return
+        if isinstance(item, BaseException):
+            raise item
+        yield cast(Completion, item)
+
+
+async def _aiter_chunks(chunks: MemoryObjectReceiveStream[object]) -> AsyncIterator[Completion]:
+    async with chunks:
+        async for item in chunks:
+            if isinstance(item, BaseException):
+                raise item
+            yield cast(Completion, item)
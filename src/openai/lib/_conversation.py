@@ -0,0 +1,330 @@
+from __future__ import annotations
+
+import inspect
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple, Union, Callable, Iterable, Optional, Awaitable, cast
+from typing_extensions import Literal
+
+from ._tokens import TokenCounter, get_token_counter
+from ..types.chat import ChatCompletion, ChatCompletionMessageParam
+from ..types.responses import Response, ResponseInputParam
+
+if TYPE_CHECKING:
+    from .._client import OpenAI, AsyncOpenAI
+
+ConversationAPI = Literal["responses", "chat"]
+
+Summarizer = Callable[[List[ChatCompletionMessageParam]], str]
+
+AsyncSummarizer = Callable[[List[ChatCompletionMessageParam]], Union[str, Awaitable[str]]]
+
+# the approximate number of tokens every message adds on top of its content
+_MESSAGE_OVERHEAD = 4
+
+# the history, summary and full history size before a turn, to restore them if the turn fails
+_Snapshot = Tuple[List[ChatCompletionMessageParam], Optional[str], int]
+
+
+class ConversationTurn:
+    """A single exchange of a `Conversation`: the user input and the model's reply."""
+
+    input: str
+
+    output_text: str
+
+    response: Optional[Response]
+    """The response for this turn when the conversation uses the Responses API."""
+
+    completion: Optional[ChatCompletion]
+    """The completion for this turn when the conversation uses the Chat Completions API."""
+
+    tokens_sent: int
+    """The estimated number of input tokens that were sent for this turn."""
+
+    tokens_saved: int
+    """The estimated number of input tokens that weren't sent, compared to resending the full history."""
+
+    def __init__(
+        self,
+        *,
+        input: str,
+        output_text: str,
+        response: Optional[Response] = None,
+        completion: Optional[ChatCompletion] = None,
+        tokens_sent: int,
+        tokens_saved: int,
+    ) -> None:
+        self.input = input
+        self.output_text = output_text
+        self.response = response
+        self.completion = completion
+        self.tokens_sent = tokens_sent
+        self.tokens_saved = tokens_saved
+
+
+class _BaseConversation:
+    def __init__(
+        self,
+        *,
+        model: str,
+        instructions: Optional[str],
+        api: ConversationAPI,
+        max_history_tokens: Optional[int],
+        count_tokens: Optional[TokenCounter],
+        params: Dict[str, Any],
+    ) -> None:
+        if api != "responses" and api != "chat":
+            raise ValueError(f"Expected `api` to be 'responses' or 'chat' but received {api!r}")
+        if max_history_tokens is not None and max_history_tokens <= 0:
+            raise ValueError(f"Expected `max_history_tokens` to be positive but received {max_history_tokens}")
+
+        self.model = model
+        self.instructions = instructions
+        self.api: ConversationAPI = api
+        self.turns: List[ConversationTurn] = []
+        self.previous_response_id: Optional[str] = None
+        self.summary: Optional[str] = None
+
+        self._max_history_tokens = max_history_tokens
+        self._count_tokens = count_tokens or get_token_counter(model)
+        self._params = params
+        self._history: List[ChatCompletionMessageParam] = []
+        # the size of every message in the conversation, as if nothing had been compacted
+        self._full_history_tokens = 0
+
+    @property
+    def messages(self) -> List[ChatCompletionMessageParam]:
+        """The messages that are resent with the next turn if `previous_response_id` can't be used.
+
+        The instructions and the summary of any compacted messages always come first so
+        that consecutive requests share the same prefix, which allows prompt caching.
+        """
+        messages: List[ChatCompletionMessageParam] = []
+        if self.instructions is not None:
+            messages.append({"role": "system", "content": self.instructions})
+        return messages + self._prefix() + self._history
+
+    @property
+    def tokens_saved(self) -> int:
+        """The estimated number of input tokens saved over all turns."""
+        return sum(turn.tokens_saved for turn in self.turns)
+
+    def _chains_responses(self) -> bool:
+        # responses that aren't stored can't be referenced by `previous_response_id`
+        return self.api == "responses" and self._params.get("store") is not False
+
+    def _prefix(self) -> List[ChatCompletionMessageParam]:
+        if self.summary is None:
+            return []
+        return [{"role": "system", "content": f"Summary of the earlier conversation:\n{self.summary}"}]
+
+    def _message_tokens(self, message: ChatCompletionMessageParam) -> int:
+        return self._count_tokens(_message_text(message)) + _MESSAGE_OVERHEAD
+
+    def _add_input(self, content: str) -> _Snapshot:
+        snapshot: _Snapshot = (list(self._history), self.summary, self._full_history_tokens)
+        message: ChatCompletionMessageParam = {"role": "user", "content": content}
+        self._history.append(message)
+        self._full_history_tokens += self._message_tokens(message)
+        return snapshot
+
+    def _restore(self, snapshot: _Snapshot) -> None:
+        """Undoes a turn that failed, including any messages that were compacted for it."""
+        history, self.summary, self._full_history_tokens = snapshot
+        self._history = list(history)
+
+    def _compact(self) -> List[ChatCompletionMessageParam]:
+        """Removes the oldest messages once the history no longer fits in `max_history_tokens`.
+
+        The history is cut down to half of the budget at once, instead of dropping a
+        message on every turn, so the prefix of the request stays the same for the
+        following turns.
+        """
+        if self._max_history_tokens is None or self._chains_responses():
+            return []
+
+        total = sum(self._message_tokens(message) for message in self._history)
+        if total <= self._max_history_tokens:
+            return []
+
+        target = self._max_history_tokens // 2
+        dropped: List[ChatCompletionMessageParam] = []
+        # never drop the new input and always start the history with a user message
+        while len(self._history) > 1 and (total > target or self._history[0]["role"] != "user"):
+            message = self._history.pop(0)
+            total -= self._message_tokens(message)
+            dropped.append(message)
+
+        return dropped
+
+    def _summarizer_input(self, dropped: List[ChatCompletionMessageParam]) -> List[ChatCompletionMessageParam]:
+        return self._prefix() + dropped
+
+    def _request(self) -> Dict[str, Any]:
+        if self.api == "chat":
+            return {**self._params, "model": self.model, "messages": self.messages}
+
+        if self._chains_responses() and self.previous_response_id is not None:
+            input: List[ChatCompletionMessageParam] = self._history[-1:]
+        else:
+            input = self._prefix() + self._history
+
+        request: Dict[str, Any] = {**self._params, "model": self.model, "input": cast(ResponseInputParam, input)}
+        if self.instructions is not None:
+            # instructions aren't carried over by `previous_response_id` so they're always sent
+            request["instructions"] = self.instructions
+        if self._chains_responses() and self.previous_response_id is not None:
+            request["previous_response_id"] = self.previous_response_id
+        return request
+
+    def _sent_tokens(self, request: Dict[str, Any]) -> int:
+        messages: Iterable[ChatCompletionMessageParam] = request.get("messages") or request["input"]
+        tokens = sum(self._message_tokens(message) for message in messages)
+        if "instructions" in request:
+            tokens += self._count_tokens(request["instructions"]) + _MESSAGE_OVERHEAD
+        return tokens
+
+    def _finish(
+        self,
+        request: Dict[str, Any],
+        *,
+        response: Optional[Response] = None,
+        completion: Optional[ChatCompletion] = None,
+    ) -> ConversationTurn:
+        if response is not None:
+            output_text = response.output_text
+            self.previous_response_id = response.id
+        else:
+            assert completion is not None
+            output_text = (completion.choices[0].message.content or "") if completion.choices else ""
+
+        tokens_sent = self._sent_tokens(request)
+        full_tokens = self._full_history_tokens
+        if self.instructions is not None:
+            full_tokens += self._count_tokens(self.instructions) + _MESSAGE_OVERHEAD
+
+        user_message = self._history[-1]
+        assistant_message: ChatCompletionMessageParam = {"role": "assistant", "content": output_text}
+        self._history.append(assistant_message)
+        self._full_history_tokens += self._message_tokens(assistant_message)
+
+        turn = ConversationTurn(
+            input=_message_text(user_message),
+            output_text=output_text,
+            response=response,
+            completion=completion,
+            tokens_sent=tokens_sent,
+            tokens_saved=max(full_tokens - tokens_sent, 0),
+        )
+        self.turns.append(turn)
+        return turn
+
+
+class Conversation(_BaseConversation):
+    """Keeps track of a multi-turn conversation so that the full history doesn't have to be resent on every turn.
+
+    With the Responses API each turn only sends the new input and references the
+    previous turn with `previous_response_id`. Otherwise, i.e. with `api="chat"` or
+    `store=False`, the history is resent and compacted once it exceeds
+    `max_history_tokens`: the oldest messages are dropped and, if given, passed to
+    `summarize` which returns a summary that replaces them.
+
+    ```py
+    conversation = Conversation(client, model="gpt-4o", instructions="You are a helpful assistant.")
+    turn = conversation.send("What's the capital of France?")
+    print(turn.output_text, turn.tokens_saved)
+    ```
+    """
+
+    def __init__(
+        self,
+        client: OpenAI,
+        *,
+        model: str,
+        instructions: Optional[str] = None,
+        api: ConversationAPI = "responses",
+        max_history_tokens: Optional[int] = None,
+        summarize: Optional[Summarizer] = None,
+        count_tokens: Optional[TokenCounter] = None,
+        **params: Any,
+    ) -> None:
+        super().__init__(
+            model=model,
+            instructions=instructions,
+            api=api,
+            max_history_tokens=max_history_tokens,
+            count_tokens=count_tokens,
+            params=params,
+        )
+        self._client = client
+        self._summarize = summarize
+
+    def send(self, content: str) -> ConversationTurn:
+        """Sends the next user message and returns the model's reply."""
+        snapshot = self._add_input(content)
+        try:
+            dropped = self._compact()
+            if dropped and self._summarize is not None:
+                self.summary = self._summarize(self._summarizer_input(dropped))
+
+            request = self._request()
+            if self.api == "chat":
+                completion = cast(ChatCompletion, self._client.chat.completions.create(**request))
+                return self._finish(request, completion=completion)
+            return self._finish(request, response=cast(Response, self._client.responses.create(**request)))
+        except BaseException:
+            self._restore(snapshot)
+            raise
+
+
+class AsyncConversation(_BaseConversation):
+    """The async version of `Conversation`, `summarize` may be a regular or an async function."""
+
+    def __init__(
+        self,
+        client: AsyncOpenAI,
+        *,
+        model: str,
+        instructions: Optional[str] = None,
+        api: ConversationAPI = "responses",
+        max_history_tokens: Optional[int] = None,
+        summarize: Optional[AsyncSummarizer] = None,
+        count_tokens: Optional[TokenCounter] = None,
+        **params: Any,
+    ) -> None:
+        super().__init__(
+            model=model,
+            instructions=instructions,
+            api=api,
+            max_history_tokens=max_history_tokens,
+            count_tokens=count_tokens,
+            params=params,
+        )
+        self._client = client
+        self._summarize = summarize
+
+    async def send(self, content: str) -> ConversationTurn:
+        """Sends the next user message and returns the model's reply."""
+        snapshot = self._add_input(content)
+        try:
+            dropped = self._compact()
+            if dropped and self._summarize is not None:
+                summary = self._summarize(self._summarizer_input(dropped))
+                self.summary = await summary if inspect.isawaitable(summary) else summary
+
+            request = self._request()
+            if self.api == "chat":
+                completion = cast(ChatCompletion, await self._client.chat.completions.create(**request))
+                return self._finish(request, completion=completion)
+            return self._finish(request, response=cast(Response, await self._client.responses.create(**request)))
+        except BaseException:
+            self._restore(snapshot)
+            raise
+
+
+def _message_text(message: ChatCompletionMessageParam) -> str:
+    content = message.get("content")
+    if isinstance(content, str):
+        return content
+    if content is None:
+        return ""
+    return "".join(cast(str, part.get("text", "")) for part in cast(Iterable[Dict[str, Any]], content))
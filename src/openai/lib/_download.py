@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import os
+import re
+import logging
+import functools
+from typing import Any, Dict, List, Tuple, Callable, Optional, ContextManager, AsyncContextManager
+
+import anyio
+import httpx
+
+from .._utils import run_concurrently, async_run_concurrently
+from .._response import StreamedBinaryAPIResponse, AsyncStreamedBinaryAPIResponse
+from .._exceptions import OpenAIError, APIStatusError
+
+log: logging.Logger = logging.getLogger(__name__)
+
+# 32MB
+DEFAULT_SEGMENT_SIZE = 32 * 1024 * 1024
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+# 1MB
+_WRITE_CHUNK_SIZE = 1024 * 1024
+
+_CONTENT_RANGE_RE = re.compile(r"^bytes (\d+)-(\d+)/(\d+|\*)$")
+
+OpenStream = Callable[[Dict[str, str]], ContextManager[StreamedBinaryAPIResponse]]
+AsyncOpenStream = Callable[[Dict[str, str]], AsyncContextManager[AsyncStreamedBinaryAPIResponse]]
+
+
+def download_to_file(
+    open_stream: OpenStream,
+    file: str | os.PathLike[str],
+    *,
+    segment_size: int = DEFAULT_SEGMENT_SIZE,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> int:
+    """Downloads a response body to the given file using concurrent HTTP range requests.
+
+    The first segment is requested on its own, if the server responds with the full
+    body instead of a partial one then it is streamed to the file as is. Otherwise the
+    file is preallocated to the total size and the remaining segments are fetched
+    concurrently, each one being written directly to its offset in the file.
+
+    Returns the number of bytes written.
+    """
+    _validate_options(segment_size=segment_size, max_concurrency=max_concurrency)
+
+    try:
+        with open_stream(_range_headers(0, segment_size - 1)) as first:
+            return _download_segments(
+                first, open_stream, file, segment_size=segment_size, max_concurrency=max_concurrency
+            )
+    except APIStatusError as err:
+        if err.status_code != 416:
+            raise
+
+    # the requested range isn't satisfiable which means the content is empty,
+    # fallback to a normal request so that we don't have to special case it
+    log.debug("Range request was not satisfiable, falling back to a single request")
+    with open_stream({}) as response:
+        return _stream_to_file(response, file)
+
+
+def _download_segments(
+    first: StreamedBinaryAPIResponse,
+    open_stream: OpenStream,
+    file: str | os.PathLike[str],
+    *,
+    segment_size: int,
+    max_concurrency: int,
+) -> int:
+    total = _get_total_size(first)
+    if total is None:
+        log.debug("Server did not respond with a partial response, falling back to a single stream")
+        return _stream_to_file(first, file)
+
+    with open(file, "wb") as f:
+        f.truncate(total)
+
+    def fetch(start: int, end: int) -> int:
+        with open_stream(_range_headers(start, end)) as response:
+            return _write_segment(response, file, start=start, end=end)
+
+    segments = _segments(total, segment_size=segment_size)
+    written = run_concurrently(
+        [
+            functools.partial(_write_segment, first, file, start=0, end=segments[0][1]),
+            *(functools.partial(fetch, start, end) for start, end in segments[1:]),
+        ],
+        max_concurrency=max_concurrency,
+    )
+    return sum(written)
+
+
+async def async_download_to_file(
+    open_stream: AsyncOpenStream,
+    file: str | os.PathLike[str],
+    *,
+    segment_size: int = DEFAULT_SEGMENT_SIZE,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> int:
+    """Downloads a response body to the given file using concurrent HTTP range requests.
+
+    The first segment is requested on its own, if the server responds with the full
+    body instead of a partial one then it is streamed to the file as is. Otherwise the
+    file is preallocated to the total size and the remaining segments are fetched
+    concurrently, each one being written directly to its offset in the file.
+
+    Returns the number of bytes written.
+    """
+    _validate_options(segment_size=segment_size, max_concurrency=max_concurrency)
+
+    try:
+        async with open_stream(_range_headers(0, segment_size - 1)) as first:
+            return await _async_download_segments(
+                first, open_stream, file, segment_size=segment_size, max_concurrency=max_concurrency
+            )
+    except APIStatusError as err:
+        if err.status_code != 416:
+            raise
+
+    # the requested range isn't satisfiable which means the content is empty,
+    # fallback to a normal request so that we don't have to special case it
+    log.debug("Range request was not satisfiable, falling back to a single request")
+    async with open_stream({}) as response:
+        return await _async_stream_to_file(response, file)
+
+
+async def _async_download_segments(
+    first: AsyncStreamedBinaryAPIResponse,
+    open_stream: AsyncOpenStream,
+    file: str | os.PathLike[str],
+    *,
+    segment_size: int,
+    max_concurrency: int,
+) -> int:
+    total = _get_total_size(first)
+    if total is None:
+        log.debug("Server did not respond with a partial response, falling back to a single stream")
+        return await _async_stream_to_file(first, file)
+
+    async with await anyio.open_file(file, "wb") as f:
+        await f.truncate(total)
+
+    async def fetch(start: int, end: int) -> int:
+        async with open_stream(_range_headers(start, end)) as response:
+            return await _async_write_segment(response, file, start=start, end=end)
+
+    segments = _segments(total, segment_size=segment_size)
+    written = await async_run_concurrently(
+        [
+            functools.partial(_async_write_segment, first, file, start=0, end=segments[0][1]),
+            *(functools.partial(fetch, start, end) for start, end in segments[1:]),
+        ],
+        max_concurrency=max_concurrency,
+    )
+    return sum(written)
+
+
+def _validate_options(*, segment_size: int, max_concurrency: int) -> None:
+    if segment_size <= 0:
+        raise ValueError(f"Expected `segment_size` to be a positive integer but received {segment_size}")
+    if max_concurrency <= 0:
+        raise ValueError(f"Expected `max_concurrency` to be a positive integer but received {max_concurrency}")
+
+
+def _range_headers(start: int, end: int) -> Dict[str, str]:
+    # byte ranges apply to the encoded content, so make sure it isn't compressed
+    return {"Range": f"bytes={start}-{end}", "Accept-Encoding": "identity"}
+
+
+def _segments(total: int, *, segment_size: int) -> List[Tuple[int, int]]:
+    """Returns the inclusive `(start, end)` byte ranges covering `total` bytes."""
+    if total == 0:
+        return [(0, -1)]
+    return [(start, min(start + segment_size, total) - 1) for start in range(0, total, segment_size)]
+
+
+def _get_total_size(response: StreamedBinaryAPIResponse | AsyncStreamedBinaryAPIResponse) -> Optional[int]:
+    if response.status_code != 206:
+        return None
+
+    match = _CONTENT_RANGE_RE.match(response.headers.get("content-range", ""))
+    if match is None or match.group(3) == "*" or int(match.group(1)) != 0:
+        return None
+
+    return int(match.group(3))
+
+
+def _check_segment(response: Any, *, start: int, end: int) -> None:
+    content_range = response.headers.get("content-range", "")
+    match = _CONTENT_RANGE_RE.match(content_range)
+    if response.status_code != 206 or match is None or int(match.group(1)) != start:
+        raise OpenAIError(
+            f"Expected a partial response for bytes {start}-{end} but received status {response.status_code} with Content-Range {content_range!r}"
+        )
+
+
+def _write_segment(response: StreamedBinaryAPIResponse, file: str | os.PathLike[str], *, start: int, end: int) -> int:
+    _check_segment(response, start=start, end=end)
+
+    written = 0
+    with open(file, "r+b") as f:
+        f.seek(start)
+        for data in response.iter_bytes(_WRITE_CHUNK_SIZE):
+            f.write(data)
+            written += len(data)
+
+    _check_written(written, start=start, end=end, response=response.http_response)
+    return written
+
+
+async def _async_write_segment(
+    response: AsyncStreamedBinaryAPIResponse, file: str | os.PathLike[str], *, start: int, end: int
+) -> int:
+    _check_segment(response, start=start, end=end)
+
+    written = 0
+    async with await anyio.open_file(file, "r+b") as f:
+        await f.seek(start)
+        async for data in response.iter_bytes(_WRITE_CHUNK_SIZE):
+            await f.write(data)
+            written += len(data)
+
+    _check_written(written, start=start, end=end, response=response.http_response)
+    return written
+
+
+def _check_written(written: int, *, start: int, end: int, response: httpx.Response) -> None:
+    if written != end - start + 1:
+        raise OpenAIError(
+            f"Expected {end - start + 1} bytes for range {start}-{end} of {response.request.url} but received {written}"
+        )
+
+
+def _stream_to_file(response: StreamedBinaryAPIResponse, file: str | os.PathLike[str]) -> int:
+    written = 0
+    with open(file, "wb") as f:
+        for data in response.iter_bytes(_WRITE_CHUNK_SIZE):
+            f.write(data)
+            written += len(data)
+    return written
+
+
+async def _async_stream_to_file(response: AsyncStreamedBinaryAPIResponse, file: str | os.PathLike[str]) -> int:
+    written = 0
+    async with await anyio.open_file(file, "wb") as f:
+        async for data in response.iter_bytes(_WRITE_CHUNK_SIZE):
+            await f.write(data)
+            written += len(data)
+    return written
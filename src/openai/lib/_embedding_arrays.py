@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import sys
+import math
+import array
+import base64
+from typing import TYPE_CHECKING, Any, List, Tuple, Union, Mapping, Optional, Sequence, cast, overload
+from typing_extensions import override
+
+from .._extras import numpy as np, has_numpy
+from .._exceptions import OpenAIError
+from ..types.embedding import Embedding
+from ..types.create_embedding_response import Usage, CreateEmbeddingResponse
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+    EmbeddingMatrix = Union["npt.NDArray[np.float32]", "array.array[float]"]
+
+# float32
+_ITEM_SIZE = 4
+
+
+class EmbeddingArray:
+    """The embeddings returned by `embeddings.create_array()`, decoded into a single contiguous float32 buffer.
+
+    If NumPy is installed then `embeddings` is a `(len(input), dimensions)` array,
+    otherwise it is a flat `array.array("f")` where the embedding for input `i` is
+    `embeddings[i * dimensions : (i + 1) * dimensions]`.
+    """
+
+    embeddings: EmbeddingMatrix
+
+    dimensions: int
+    """The number of dimensions of each embedding."""
+
+    model: str
+    """The name of the model used to generate the embeddings."""
+
+    usage: Usage
+
+    def __init__(self, *, embeddings: EmbeddingMatrix, dimensions: int, model: str, usage: Usage) -> None:
+        self.embeddings = embeddings
+        self.dimensions = dimensions
+        self.model = model
+        self.usage = usage
+
+    def __len__(self) -> int:
+        if self.dimensions == 0:
+            return 0
+        if isinstance(self.embeddings, array.array):
+            return len(self.embeddings) // self.dimensions
+        return len(self.embeddings)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return (len(self), self.dimensions)
+
+    @override
+    def __repr__(self) -> str:
+        return f"EmbeddingArray(shape={self.shape}, model={self.model!r})"
+
+    def truncate(self, dimensions: int) -> EmbeddingArray:
+        """Returns the embeddings shortened to `dimensions`, see `truncate_embeddings()`."""
+        _check_dimensions(dimensions, available=self.dimensions)
+
+        if isinstance(self.embeddings, array.array):
+            rows = [
+                self.embeddings[start : start + dimensions] for start in range(0, len(self.embeddings), self.dimensions)
+            ]
+            embeddings: EmbeddingMatrix = array.array("f", [value for row in _normalize_rows(rows) for value in row])
+        else:
+            embeddings = _truncate_matrix(self.embeddings, dimensions)
+
+        return EmbeddingArray(embeddings=embeddings, dimensions=dimensions, model=self.model, usage=self.usage)
+
+
+@overload
+def truncate_embeddings(embeddings: EmbeddingArray, dimensions: int) -> EmbeddingArray: ...
+
+
+@overload
+def truncate_embeddings(embeddings: CreateEmbeddingResponse, dimensions: int) -> CreateEmbeddingResponse: ...
+
+
+@overload
+def truncate_embeddings(embeddings: npt.NDArray[Any], dimensions: int) -> npt.NDArray[np.float32]: ...
+
+
+@overload
+def truncate_embeddings(embeddings: Sequence[Sequence[float]], dimensions: int) -> List[List[float]]: ...
+
+
+def truncate_embeddings(embeddings: Any, dimensions: int) -> Any:
+    """Shortens embeddings to their first `dimensions` values and re-normalizes them to unit length.
+
+    This is the same as requesting `dimensions` from a `text-embedding-3` or later
+    model, so a single request for full size embeddings can produce any number of
+    shorter variants without embedding the inputs again.
+
+    Accepts the result of `embeddings.create()` or `embeddings.create_array()`, a 2D
+    NumPy array or a sequence of float sequences, and returns the same type.
+    """
+    if isinstance(embeddings, EmbeddingArray):
+        return embeddings.truncate(dimensions)
+
+    if isinstance(embeddings, CreateEmbeddingResponse):
+        data = embeddings.data
+        for embedding in data:
+            _check_dimensions(dimensions, available=len(embedding.embedding))
+
+        rows = _normalize_rows([embedding.embedding[:dimensions] for embedding in data])
+        return CreateEmbeddingResponse.construct(
+            data=[
+                Embedding.construct(embedding=row, index=embedding.index, object="embedding")
+                for embedding, row in zip(data, rows)
+            ],
+            model=embeddings.model,
+            object="list",
+            usage=embeddings.usage,
+        )
+
+    if has_numpy() and isinstance(embeddings, np.ndarray):
+        matrix = cast("npt.NDArray[Any]", embeddings)
+        if matrix.ndim != 2:
+            raise ValueError(f"Expected a 2D array of embeddings but received an array of shape {matrix.shape}")
+        _check_dimensions(dimensions, available=matrix.shape[1])
+        return _truncate_matrix(matrix, dimensions)
+
+    vectors: Sequence[Sequence[float]] = embeddings
+    for vector in vectors:
+        _check_dimensions(dimensions, available=len(vector))
+    return _normalize_rows([vector[:dimensions] for vector in vectors])
+
+
+def _check_dimensions(dimensions: int, *, available: int) -> None:
+    if not 0 < dimensions <= available:
+        raise ValueError(f"Expected `dimensions` to be between 1 and {available} but received {dimensions}")
+
+
+def _truncate_matrix(matrix: npt.NDArray[Any], dimensions: int) -> npt.NDArray[np.float32]:
+    truncated: npt.NDArray[np.float32] = np.array(matrix[:, :dimensions], dtype=np.float32)
+    norms: npt.NDArray[np.float32] = np.linalg.norm(truncated, axis=1, keepdims=True)
+    # leave zero vectors as they are instead of dividing by zero
+    norms[norms == 0] = 1
+    truncated /= norms
+    return truncated
+
+
+def _normalize_rows(rows: Sequence[Sequence[float]]) -> List[List[float]]:
+    normalized: List[List[float]] = []
+    for row in rows:
+        norm = math.sqrt(math.fsum(value * value for value in row)) or 1.0
+        normalized.append([value / norm for value in row])
+    return normalized
+
+
+def parse_embedding_array(body: Mapping[str, Any], *, model: str) -> EmbeddingArray:
+    """Decodes a `base64` encoded embeddings response body into an `EmbeddingArray`.
+
+    Each embedding is decoded straight into its row of a preallocated buffer so that
+    no intermediate Python `float` objects are created.
+    """
+    data: Sequence[Mapping[str, Any]] = body.get("data") or []
+    embeddings, dimensions = _decode_matrix(data)
+    usage: Mapping[str, Any] = body.get("usage") or {}
+
+    return EmbeddingArray(
+        embeddings=embeddings,
+        dimensions=dimensions,
+        model=body.get("model") or model,
+        usage=Usage.construct(prompt_tokens=usage.get("prompt_tokens", 0), total_tokens=usage.get("total_tokens", 0)),
+    )
+
+
+def _decode_matrix(data: Sequence[Mapping[str, Any]]) -> Tuple[EmbeddingMatrix, int]:
+    count = len(data)
+    dimensions: Optional[int] = None
+    seen: List[bool] = [False] * count
+
+    if has_numpy():
+        matrix: Optional[npt.NDArray[np.float32]] = None
+        for item in data:
+            raw = _decode_item(item)
+            if matrix is None:
+                dimensions = len(raw) // _ITEM_SIZE
+                matrix = np.empty((count, dimensions), dtype=np.float32)
+
+            index = _check_item(item, raw, dimensions=dimensions, seen=seen)
+            matrix[index] = np.frombuffer(raw, dtype="<f4")  # type: ignore[no-untyped-call]
+
+        if matrix is None:
+            return np.empty((0, 0), dtype=np.float32), 0
+        return matrix, dimensions or 0
+
+    flat: Optional[array.array[float]] = None
+    view: Optional[memoryview] = None
+    for item in data:
+        raw = _decode_item(item)
+        if flat is None:
+            dimensions = len(raw) // _ITEM_SIZE
+            flat = array.array("f", bytes(count * len(raw)))
+            view = memoryview(flat).cast("B")
+
+        index = _check_item(item, raw, dimensions=dimensions, seen=seen)
+        assert view is not None
+        view[index * len(raw) : (index + 1) * len(raw)] = raw
+
+    if flat is None:
+        return array.array("f"), 0
+
+    if sys.byteorder == "big":
+        # the API encodes embeddings as little-endian
+        flat.byteswap()
+
+    return flat, dimensions or 0
+
+
+def _decode_item(item: Mapping[str, Any]) -> bytes:
+    encoded = item.get("embedding")
+    if not isinstance(encoded, str):
+        raise OpenAIError(f"Expected a base64 encoded embedding but received {type(encoded)}")
+    return base64.b64decode(encoded)
+
+
+def _check_item(item: Mapping[str, Any], raw: bytes, *, dimensions: Optional[int], seen: List[bool]) -> int:
+    index = item.get("index")
+    if not isinstance(index, int) or not 0 <= index < len(seen) or seen[index]:
+        raise OpenAIError(f"Received an unexpected embedding index {index!r} for {len(seen)} inputs")
+    if dimensions is None or len(raw) != dimensions * _ITEM_SIZE:
+        raise OpenAIError(
+            f"Expected every embedding to have {dimensions} dimensions but received {len(raw) // _ITEM_SIZE}"
+        )
+
+    seen[index] = True
+    return index
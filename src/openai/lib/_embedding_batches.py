@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import time
+import random
+import threading
+from typing import List, Union, Optional, Sequence
+
+from ._tokens import TokenCounter as TokenCounter, estimate_tokens as estimate_tokens
+from .._exceptions import APIStatusError, RateLimitError, APIConnectionError
+from ..types.embedding import Embedding
+from ..types.create_embedding_response import Usage, CreateEmbeddingResponse
+
+EmbeddingInput = Union[str, List[int]]
+
+# the limits documented for `embeddings.create()`
+DEFAULT_MAX_INPUTS_PER_REQUEST = 2048
+DEFAULT_MAX_TOKENS_PER_REQUEST = 300_000
+
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_MAX_SHARD_RETRIES = 2
+
+_INITIAL_SHARD_RETRY_DELAY = 1.0
+_MAX_SHARD_RETRY_DELAY = 30.0
+
+
+def pack_inputs(
+    inputs: Sequence[EmbeddingInput],
+    *,
+    max_inputs: int = DEFAULT_MAX_INPUTS_PER_REQUEST,
+    max_tokens: int = DEFAULT_MAX_TOKENS_PER_REQUEST,
+    count_tokens: Optional[TokenCounter] = None,
+) -> List[List[int]]:
+    """Groups the indices of the given inputs into as few requests as the input and token limits allow.
+
+    Inputs keep their relative order within and across requests. Strings and token
+    arrays can't be mixed in a single request so they are always packed separately,
+    an input that exceeds `max_tokens` on its own is sent in a request by itself.
+    """
+    if max_inputs <= 0:
+        raise ValueError(f"Expected `max_inputs_per_request` to be a positive integer but received {max_inputs}")
+    if max_tokens <= 0:
+        raise ValueError(f"Expected `max_tokens_per_request` to be a positive integer but received {max_tokens}")
+
+    counter = count_tokens or estimate_tokens
+
+    shards: List[List[int]] = []
+    for is_text in (True, False):
+        shard: List[int] = []
+        shard_tokens = 0
+
+        for index, item in enumerate(inputs):
+            if isinstance(item, str) != is_text:
+                continue
+
+            tokens = counter(item) if isinstance(item, str) else len(item)
+            if shard and (len(shard) >= max_inputs or shard_tokens + tokens > max_tokens):
+                shards.append(shard)
+                shard = []
+                shard_tokens = 0
+
+            shard.append(index)
+            shard_tokens += tokens
+
+        if shard:
+            shards.append(shard)
+
+    shards.sort(key=lambda indices: indices[0])
+    return shards
+
+
+def merge_embedding_responses(
+    responses: Sequence[CreateEmbeddingResponse],
+    shards: Sequence[Sequence[int]],
+    *,
+    total: int,
+    model: str,
+) -> CreateEmbeddingResponse:
+    """Combines the responses for each shard into a single response with the embeddings in input order."""
+    data: List[Optional[Embedding]] = [None] * total
+    prompt_tokens = 0
+    total_tokens = 0
+    response_model: Optional[str] = None
+
+    for response, indices in zip(responses, shards):
+        response_model = response_model or response.model
+        prompt_tokens += response.usage.prompt_tokens
+        total_tokens += response.usage.total_tokens
+
+        for embedding in response.data:
+            index = indices[embedding.index]
+            embedding.index = index
+            data[index] = embedding
+
+    return CreateEmbeddingResponse.construct(
+        data=data,
+        model=response_model or model,
+        object="list",
+        usage=Usage.construct(prompt_tokens=prompt_tokens, total_tokens=total_tokens),
+    )
+
+
+def is_retryable_shard_error(err: Exception) -> bool:
+    """Whether a request for a shard that failed with this error, after any client retries, is worth retrying."""
+    if isinstance(err, (RateLimitError, APIConnectionError)):
+        return True
+    return isinstance(err, APIStatusError) and err.status_code >= 500
+
+
+def shard_retry_delay(attempt: int, retry_after: Optional[float]) -> float:
+    if retry_after is not None and 0 < retry_after <= 60:
+        return retry_after
+
+    delay = min(_INITIAL_SHARD_RETRY_DELAY * pow(2.0, attempt), _MAX_SHARD_RETRY_DELAY)
+    return delay * (1 - 0.25 * random.random())
+
+
+class RateLimitGate:
+    """Coordinates the requests for every shard so that they all back off when one is rate limited.
+
+    Without this each in-flight request would keep hitting the rate limit on its own
+    schedule, using up its retries while the others are still being sent.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        """The number of seconds that requests should wait before being sent."""
+        with self._lock:
+            return max(0.0, self._resume_at - time.monotonic())
@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+import os
+import sys
+import json
+import mmap
+import array
+import base64
+import struct
+import hashlib
+import sqlite3
+import threading
+from typing import IO, Any, Dict, List, Tuple, Union, Optional, Sequence, cast
+from collections import OrderedDict
+from typing_extensions import Literal, Protocol
+
+from .._types import NotGiven
+from .._utils import is_given
+from ..types.embedding import Embedding
+from ..types.create_embedding_response import Usage, CreateEmbeddingResponse
+
+EmbeddingInput = Union[str, List[int]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    key TEXT PRIMARY KEY,
+    vector BLOB NOT NULL
+)
+"""
+
+# sha256 digest of the key, offset and length of the vector in the data file
+_INDEX_RECORD = struct.Struct("<32sQI")
+
+
+class EmbeddingCacheStore(Protocol):
+    """Storage for an `EmbeddingCache`, vectors are stored as little-endian float32 bytes."""
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]: ...
+
+    def set_many(self, items: Sequence[Tuple[str, bytes]]) -> None: ...
+
+
+class MemoryEmbeddingStore:
+    """Keeps up to `max_entries` vectors in memory, evicting the least recently used ones."""
+
+    def __init__(self, *, max_entries: int = 100_000) -> None:
+        if max_entries <= 0:
+            raise ValueError(f"Expected `max_entries` to be a positive integer but received {max_entries}")
+
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        results: List[Optional[bytes]] = []
+        with self._lock:
+            for key in keys:
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                results.append(vector)
+        return results
+
+    def set_many(self, items: Sequence[Tuple[str, bytes]]) -> None:
+        with self._lock:
+            for key, vector in items:
+                self._entries[key] = vector
+                self._entries.move_to_end(key)
+
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+class SqliteEmbeddingStore:
+    """Stores vectors in a SQLite database so they can be shared between runs and processes."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.expanduser(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute(_SCHEMA)
+
+    def __enter__(self) -> SqliteEmbeddingStore:
+        return self
+
+    def __exit__(self, *_args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        found: Dict[str, bytes] = {}
+        unique = list(dict.fromkeys(keys))
+        with self._lock:
+            # stay well under SQLite's limit on the number of query parameters
+            for start in range(0, len(unique), 500):
+                chunk = unique[start : start + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                found.update((key, bytes(vector)) for key, vector in rows)
+
+        return [found.get(key) for key in keys]
+
+    def set_many(self, items: Sequence[Tuple[str, bytes]]) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany("INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", items)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+
+class MmapEmbeddingStore:
+    """Appends vectors to a flat float32 file that is memory-mapped for reads.
+
+    An index of key hashes to offsets is kept in a separate `<path>.idx` file and
+    loaded into memory when the store is opened. Both files are only ever appended
+    to, a vector is written before its index record so that an interrupted write
+    never leaves an index record pointing at incomplete data.
+
+    Only a single process should write to the store at a time.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self._path = os.path.expanduser(path)
+        self._lock = threading.Lock()
+        self._index: Dict[bytes, Tuple[int, int]] = {}
+        self._map: Optional[mmap.mmap] = None
+
+        self._data: IO[bytes] = open(self._path, "ab+")
+        self._index_file: IO[bytes] = open(self._path + ".idx", "ab+")
+        self._size = os.fstat(self._data.fileno()).st_size
+        self._load_index()
+
+    def __enter__(self) -> MmapEmbeddingStore:
+        return self
+
+    def __exit__(self, *_args: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._index)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            self._data.close()
+            self._index_file.close()
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        results: List[Optional[bytes]] = []
+        with self._lock:
+            for key in keys:
+                location = self._index.get(_digest(key))
+                if location is None:
+                    results.append(None)
+                    continue
+
+                offset, length = location
+                view = self._mapping(offset + length)
+                results.append(view[offset : offset + length])
+        return results
+
+    def set_many(self, items: Sequence[Tuple[str, bytes]]) -> None:
+        with self._lock:
+            records: List[bytes] = []
+            for key, vector in items:
+                self._data.write(vector)
+                digest = _digest(key)
+                self._index[digest] = (self._size, len(vector))
+                records.append(_INDEX_RECORD.pack(digest, self._size, len(vector)))
+                self._size += len(vector)
+
+            self._data.flush()
+            self._index_file.write(b"".join(records))
+            self._index_file.flush()
+
+    def _load_index(self) -> None:
+        self._index_file.seek(0)
+        contents = self._index_file.read()
+
+        # ignore a trailing partial record, or records for data that was never fully written
+        usable = len(contents) - len(contents) % _INDEX_RECORD.size
+        for digest, offset, length in _INDEX_RECORD.iter_unpack(contents[:usable]):
+            if offset + length <= self._size:
+                self._index[digest] = (offset, length)
+
+    def _mapping(self, end: int) -> mmap.mmap:
+        if self._map is None or len(self._map) < end:
+            if self._map is not None:
+                self._map.close()
+            self._map = mmap.mmap(self._data.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+
+class EmbeddingCache:
+    """Caches embeddings by model, dimensions and input so that they are only requested once.
+
+    When a cache is passed to `embeddings.create_many()` the embeddings for inputs
+    that were embedded before are served from it and only the others are sent to the
+    API. Vectors are stored as float32 bytes in the given store, which keeps
+    them in memory by default.
+
+    ```py
+    cache = EmbeddingCache(SqliteEmbeddingStore("embeddings.sqlite"))
+
+    response = client.embeddings.create_many(input=chunks, model="text-embedding-3-small", cache=cache)
+    ```
+    """
+
+    store: EmbeddingCacheStore
+
+    def __init__(self, store: Optional[EmbeddingCacheStore] = None) -> None:
+        self.store = store if store is not None else MemoryEmbeddingStore()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(
+        self,
+        input: Sequence[EmbeddingInput],
+        *,
+        model: str,
+        dimensions: Union[int, NotGiven],
+    ) -> CachedEmbeddings:
+        keys = [embedding_cache_key(item, model=model, dimensions=dimensions) for item in input]
+        vectors = self.store.get_many(keys)
+
+        found = sum(vector is not None for vector in vectors)
+        self.hits += found
+        self.misses += len(keys) - found
+
+        return CachedEmbeddings(self, input, keys=keys, vectors=vectors)
+
+
+class CachedEmbeddings:
+    """The result of looking up inputs in an `EmbeddingCache`, `missing` are the unique inputs to request."""
+
+    missing: List[EmbeddingInput]
+
+    def __init__(
+        self,
+        cache: EmbeddingCache,
+        input: Sequence[EmbeddingInput],
+        *,
+        keys: List[str],
+        vectors: List[Optional[bytes]],
+    ) -> None:
+        self._cache = cache
+        self._keys = keys
+        self._vectors = vectors
+
+        missing: Dict[str, EmbeddingInput] = {}
+        for key, item, vector in zip(keys, input, vectors):
+            if vector is None and key not in missing:
+                missing[key] = item
+
+        self._missing_keys = list(missing)
+        self.missing = list(missing.values())
+
+    def merge(
+        self,
+        response: CreateEmbeddingResponse,
+        *,
+        encoding_format: Union[Literal["float", "base64"], NotGiven],
+    ) -> CreateEmbeddingResponse:
+        """Stores the embeddings for the `missing` inputs and returns the embeddings for every input in order."""
+        fetched: Dict[str, bytes] = {}
+        for embedding in response.data:
+            fetched[self._missing_keys[embedding.index]] = _to_bytes(embedding.embedding)
+
+        if fetched:
+            self._cache.store.set_many(list(fetched.items()))
+
+        data: List[Embedding] = []
+        for index, (key, vector) in enumerate(zip(self._keys, self._vectors)):
+            raw = vector if vector is not None else fetched[key]
+            data.append(
+                Embedding.construct(
+                    embedding=_from_bytes(raw, base64_encoded=encoding_format == "base64"),
+                    index=index,
+                    object="embedding",
+                )
+            )
+
+        return CreateEmbeddingResponse.construct(
+            data=data,
+            model=response.model,
+            object="list",
+            usage=Usage.construct(
+                prompt_tokens=response.usage.prompt_tokens,
+                total_tokens=response.usage.total_tokens,
+            ),
+        )
+
+
+def embedding_cache_key(item: EmbeddingInput, *, model: str, dimensions: Union[int, NotGiven]) -> str:
+    payload = json.dumps([model, dimensions if is_given(dimensions) else None, item], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _digest(key: str) -> bytes:
+    return hashlib.sha256(key.encode("utf-8")).digest()
+
+
+def _to_bytes(embedding: object) -> bytes:
+    if isinstance(embedding, str):
+        return base64.b64decode(embedding)
+
+    vector = array.array("f", cast(Any, embedding))
+    if sys.byteorder == "big":
+        vector.byteswap()
+    return vector.tobytes()
+
+
+def _from_bytes(raw: bytes, *, base64_encoded: bool) -> Any:
+    if base64_encoded:
+        return base64.b64encode(raw).decode("ascii")
+
+    vector = array.array("f", raw)
+    if sys.byteorder == "big":
+        vector.byteswap()
+    return vector.tolist()
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import os
+import sys
+import json
+import array
+import struct
+import itertools
+from typing import IO, TYPE_CHECKING, Any, List, Tuple, Union, Iterable, Iterator, Optional, Sequence, cast
+from typing_extensions import override
+
+from .._extras import numpy as np, has_numpy
+from ._embedding_arrays import EmbeddingArray
+from ..types.create_embedding_response import CreateEmbeddingResponse
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+# the `.npy` header is written with enough padding that the final shape always fits,
+# so that it can be rewritten in place as rows are appended
+_NPY_MAGIC = b"\x93NUMPY\x01\x00"
+_NPY_HEADER_SIZE = 128
+
+# float32
+_ITEM_SIZE = 4
+
+DEFAULT_WINDOW_SIZE = 8192
+
+_MISSING = object()
+
+
+class EmbeddingDatasetWriter:
+    """Streams embeddings to disk as a float32 `.npy` file, with their IDs in a `<path>.ids` file.
+
+    Rows are appended to the file as they are written and the header is updated
+    every time the writer is flushed, so memory use doesn't grow with the number of
+    embeddings and the file can be read at any point, e.g. with
+    `numpy.load(path, mmap_mode="r")` or `open_embedding_dataset()`.
+
+    The IDs file contains one JSON encoded ID per line, the ID on line `i` belongs
+    to row `i` of the array.
+
+    ```py
+    with EmbeddingDatasetWriter("corpus.npy") as writer:
+        for ids, texts in batches:
+            response = client.embeddings.create(input=texts, model="text-embedding-3-small")
+            writer.write_response(response, ids=ids)
+    ```
+    """
+
+    path: str
+
+    dimensions: Optional[int]
+    """The number of dimensions of each embedding, set by the first row written if not given."""
+
+    def __init__(self, path: str | os.PathLike[str], *, dimensions: Optional[int] = None) -> None:
+        if dimensions is not None and dimensions <= 0:
+            raise ValueError(f"Expected `dimensions` to be a positive integer but received {dimensions}")
+
+        self.path = os.fspath(os.path.expanduser(path))
+        self.dimensions = dimensions
+        self._rows = 0
+
+        self._data: IO[bytes] = open(self.path, "wb")
+        self._ids: IO[bytes] = open(self.path + ".ids", "wb")
+        self._write_header()
+        self._data.flush()
+
+    def __enter__(self) -> EmbeddingDatasetWriter:
+        return self
+
+    def __exit__(self, *_args: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def close(self) -> None:
+        if self._data.closed:
+            return
+
+        self.flush()
+        self._data.close()
+        self._ids.close()
+
+    def flush(self) -> None:
+        """Writes any buffered rows and updates the header with the current number of rows."""
+        # the IDs and rows are flushed before the header so that the header never
+        # counts rows that haven't been written
+        self._ids.flush()
+        self._data.flush()
+        self._write_header()
+        self._data.flush()
+
+    def write(
+        self,
+        embeddings: Union[Sequence[Sequence[float]], npt.NDArray[Any]],
+        *,
+        ids: Iterable[str],
+    ) -> None:
+        """Appends the given embeddings, either a 2D array or a sequence of float sequences."""
+        if has_numpy() and isinstance(embeddings, np.ndarray):
+            matrix = np.ascontiguousarray(embeddings, dtype="<f4")
+            if matrix.ndim != 2:
+                raise ValueError(f"Expected a 2D array of embeddings but received an array of shape {matrix.shape}")
+            self._append([matrix.tobytes()], rows=matrix.shape[0], dimensions=matrix.shape[1], ids=ids)
+            return
+
+        sizes = {len(vector) for vector in embeddings}
+        if len(sizes) > 1:
+            raise ValueError(
+                f"Expected every embedding to have the same number of dimensions but received {sorted(sizes)}"
+            )
+
+        rows = [_pack_row(vector) for vector in embeddings]
+        self._append(rows, rows=len(rows), dimensions=sizes.pop() if sizes else None, ids=ids)
+
+    def write_response(self, response: CreateEmbeddingResponse, *, ids: Iterable[str]) -> None:
+        """Appends the embeddings in an `embeddings.create()` response, in input order."""
+        data = sorted(response.data, key=lambda embedding: embedding.index)
+        self.write([embedding.embedding for embedding in data], ids=ids)
+
+    def write_array(self, result: EmbeddingArray, *, ids: Iterable[str]) -> None:
+        """Appends the embeddings returned by `embeddings.create_array()`."""
+        embeddings: Any = result.embeddings
+        self._append(
+            [embeddings.tobytes() if sys.byteorder == "little" else _little_endian(embeddings)],
+            rows=len(result),
+            dimensions=result.dimensions,
+            ids=ids,
+        )
+
+    def _append(self, chunks: List[bytes], *, rows: int, dimensions: Optional[int], ids: Iterable[str]) -> None:
+        id_list = list(ids)
+        if len(id_list) != rows:
+            raise ValueError(f"Expected {rows} IDs but received {len(id_list)}")
+        if rows == 0:
+            return
+
+        expected = self.dimensions if self.dimensions is not None else dimensions
+        if (
+            dimensions is None
+            or dimensions != expected
+            or sum(len(chunk) for chunk in chunks) != rows * dimensions * _ITEM_SIZE
+        ):
+            raise ValueError(f"Expected every embedding to have {expected} dimensions")
+
+        self.dimensions = dimensions
+
+        for chunk in chunks:
+            self._data.write(chunk)
+        self._ids.write(b"".join(json.dumps(id).encode("utf-8") + b"\n" for id in id_list))
+        self._rows += rows
+        self.flush()
+
+    def _write_header(self) -> None:
+        header = f"{{'descr': '<f4', 'fortran_order': False, 'shape': ({self._rows}, {self.dimensions or 0}), }}"
+        header = header.ljust(_NPY_HEADER_SIZE - len(_NPY_MAGIC) - 2 - 1) + "\n"
+
+        position = self._data.tell()
+        self._data.seek(0)
+        self._data.write(_NPY_MAGIC + struct.pack("<H", len(header)) + header.encode("latin1"))
+        if position > _NPY_HEADER_SIZE:
+            self._data.seek(position)
+
+
+class EmbeddingDataset:
+    """An embedding dataset written by an `EmbeddingDatasetWriter`, see `open_embedding_dataset()`."""
+
+    embeddings: npt.NDArray[np.float32]
+    """A read-only, memory-mapped `(len(ids), dimensions)` array."""
+
+    ids: List[str]
+
+    def __init__(self, *, embeddings: npt.NDArray[np.float32], ids: List[str]) -> None:
+        self.embeddings = embeddings
+        self.ids = ids
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @override
+    def __repr__(self) -> str:
+        return f"EmbeddingDataset(shape={self.embeddings.shape})"
+
+
+def open_embedding_dataset(path: str | os.PathLike[str]) -> EmbeddingDataset:
+    """Opens a dataset written by an `EmbeddingDatasetWriter`, memory-mapping the embeddings.
+
+    Requires NumPy.
+    """
+    path = os.fspath(os.path.expanduser(path))
+    embeddings = np.load(path, mmap_mode="r")
+
+    ids: List[str] = []
+    with open(path + ".ids", "rb") as f:
+        for line in f:
+            # the IDs file may be ahead of the header if a write was interrupted
+            if len(ids) == embeddings.shape[0]:
+                break
+            ids.append(json.loads(line))
+
+    return EmbeddingDataset(embeddings=embeddings, ids=ids)
+
+
+def iter_windows(
+    input: Iterable[str],
+    ids: Optional[Iterable[str]],
+    *,
+    size: int,
+) -> Iterator[Tuple[List[str], List[str]]]:
+    """Yields `(ids, texts)` windows of at most `size` inputs, IDs default to the position of each input."""
+    if size <= 0:
+        raise ValueError(f"Expected `window_size` to be a positive integer but received {size}")
+
+    pairs: Iterator[Tuple[object, object]] = itertools.zip_longest(
+        ids if ids is not None else (str(index) for index in itertools.count()),
+        input,
+        fillvalue=_MISSING,
+    )
+    while True:
+        window_ids: List[str] = []
+        texts: List[str] = []
+        for id, text in pairs:
+            if text is _MISSING:
+                if ids is None:
+                    break
+                raise ValueError("Received more IDs than inputs")
+            if id is _MISSING:
+                raise ValueError("Received more inputs than IDs")
+
+            window_ids.append(str(id))
+            texts.append(str(text))
+            if len(texts) >= size:
+                break
+
+        if not texts:
+            return
+
+        yield window_ids, texts
+
+
+def _pack_row(vector: Sequence[float]) -> bytes:
+    row = array.array("f", vector)
+    if sys.byteorder == "big":
+        row.byteswap()
+    return row.tobytes()
+
+
+def _little_endian(embeddings: Any) -> bytes:
+    if not isinstance(embeddings, array.array):
+        return np.ascontiguousarray(embeddings, dtype="<f4").tobytes()
+
+    row = array.array("f", cast("array.array[float]", embeddings))
+    row.byteswap()
+    return row.tobytes()
@@ -0,0 +1,394 @@
+from __future__ import annotations
+
+import math
+from types import TracebackType
+from typing import (
+    Any,
+    Set,
+    Dict,
+    Type,
+    Tuple,
+    Union,
+    Generic,
+    Mapping,
+    TypeVar,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    Awaitable,
+    AsyncIterable,
+    cast,
+)
+from typing_extensions import override
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+import anyio
+import httpx
+from anyio.abc import TaskGroup
+from anyio.streams.memory import MemoryObjectSendStream, MemoryObjectReceiveStream
+
+from .._exceptions import APIStatusError, RateLimitError
+from ._embedding_batches import RateLimitGate, shard_retry_delay, is_retryable_shard_error
+
+_T = TypeVar("_T")
+
+DEFAULT_FAN_OUT_CONCURRENCY = 16
+DEFAULT_MAX_REQUEST_RETRIES = 2
+
+RetryAfterParser = Callable[[httpx.Headers], Optional[float]]
+
+
+class RequestResult(Generic[_T]):
+    """The outcome of one of the requests sent by a `create_many()` call."""
+
+    index: int
+    """The position of the request in the given requests."""
+
+    request: Mapping[str, Any]
+
+    result: Optional[_T]
+    """The created object, `None` if the request failed."""
+
+    error: Optional[Exception]
+    """The error the request failed with after any retries, `None` if it succeeded."""
+
+    def __init__(
+        self,
+        *,
+        index: int,
+        request: Mapping[str, Any],
+        result: Optional[_T] = None,
+        error: Optional[Exception] = None,
+    ) -> None:
+        self.index = index
+        self.request = request
+        self.result = result
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @override
+    def __repr__(self) -> str:
+        return f"RequestResult(index={self.index}, ok={self.ok}, error={self.error!r})"
+
+
+class FanOutProgress:
+    """Counts of the requests of a `create_many()` call, passed to its `on_progress` callback.
+
+    The same object is updated and passed again whenever a request finishes.
+    """
+
+    started: int
+
+    succeeded: int
+
+    failed: int
+
+    def __init__(self) -> None:
+        self.started = 0
+        self.succeeded = 0
+        self.failed = 0
+
+    @property
+    def finished(self) -> int:
+        return self.succeeded + self.failed
+
+    @property
+    def in_flight(self) -> int:
+        return self.started - self.finished
+
+    @override
+    def __repr__(self) -> str:
+        return f"FanOutProgress(started={self.started}, succeeded={self.succeeded}, failed={self.failed})"
+
+
+ProgressCallback = Callable[[FanOutProgress], None]
+
+
+def iter_many(
+    create: Callable[..., _T],
+    requests: Iterable[Mapping[str, Any]],
+    *,
+    concurrency: int,
+    ordered: bool,
+    max_request_retries: int,
+    on_progress: Optional[ProgressCallback],
+    sleep: Callable[[float], None],
+    parse_retry_after: RetryAfterParser,
+) -> Iterator[RequestResult[_T]]:
+    """Calls `create(**request)` for every request in a thread pool and yields the results as they finish.
+
+    Requests are read from the iterable as slots free up, so that at most `concurrency`
+    requests are in flight and at most twice as many results are held at once, however
+    many requests there are. With `ordered=True` results are yielded in input order.
+
+    A request that fails with a rate limit, connection or server error after the
+    client's own retries is retried up to `max_request_retries` times, while a request
+    is rate limited the others wait before being sent. Errors are never raised, they're
+    set on the request's `RequestResult` instead.
+    """
+    _validate(concurrency=concurrency, max_request_retries=max_request_retries)
+    return _iter_many(
+        create,
+        requests,
+        concurrency=concurrency,
+        ordered=ordered,
+        max_request_retries=max_request_retries,
+        on_progress=on_progress,
+        sleep=sleep,
+        parse_retry_after=parse_retry_after,
+    )
+
+
+def _iter_many(
+    create: Callable[..., _T],
+    requests: Iterable[Mapping[str, Any]],
+    *,
+    concurrency: int,
+    ordered: bool,
+    max_request_retries: int,
+    on_progress: Optional[ProgressCallback],
+    sleep: Callable[[float], None],
+    parse_retry_after: RetryAfterParser,
+) -> Iterator[RequestResult[_T]]:
+    gate = RateLimitGate()
+    progress = FanOutProgress()
+
+    def run(index: int, request: Mapping[str, Any]) -> RequestResult[_T]:
+        attempt = 0
+        while True:
+            paused = gate.remaining()
+            if paused > 0:
+                sleep(paused)
+
+            try:
+                return RequestResult(index=index, request=request, result=create(**request))
+            except Exception as err:
+                delay = _retry_delay(err, attempt, max_request_retries, parse_retry_after)
+                if delay is None:
+                    return RequestResult(index=index, request=request, error=err)
+
+                attempt += 1
+                if isinstance(err, RateLimitError):
+                    gate.pause(delay)
+                else:
+                    sleep(delay)
+
+    iterator = iter(requests)
+    exhausted = False
+    next_index = 0
+    yielded = 0
+    pending: Set[Future[RequestResult[_T]]] = set()
+    finished: Dict[int, RequestResult[_T]] = {}
+
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    try:
+        while True:
+            # results that are held back to keep the input order count towards the window as well
+            while not exhausted and len(pending) < concurrency and next_index - yielded < 2 * concurrency:
+                try:
+                    request = next(iterator)
+                except StopIteration:
+                    exhausted = True
+                    break
+
+                pending.add(executor.submit(run, next_index, request))
+                next_index += 1
+                progress.started += 1
+
+            if not pending:
+                return
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.remove(future)
+                result = future.result()
+                _record(progress, result, on_progress)
+                finished[result.index] = result
+
+            if ordered:
+                while yielded in finished:
+                    yield finished.pop(yielded)
+                    yielded += 1
+            else:
+                for index in sorted(finished):
+                    yield finished.pop(index)
+                    yielded += 1
+    finally:
+        # stop sending requests if the caller stopped iterating early
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+class AsyncRequestResults(Generic[_T]):
+    """The results of an async `create_many()` call, which must be entered with `async with`.
+
+    ```py
+    async with client.chat.completions.create_many(requests, concurrency=32) as results:
+        async for result in results:
+            ...
+    ```
+
+    Leaving the `async with` block cancels any requests that are still in flight.
+    """
+
+    def __init__(
+        self,
+        create: Callable[..., Awaitable[_T]],
+        requests: Union[Iterable[Mapping[str, Any]], AsyncIterable[Mapping[str, Any]]],
+        *,
+        concurrency: int,
+        ordered: bool,
+        max_request_retries: int,
+        on_progress: Optional[ProgressCallback],
+        sleep: Callable[[float], Awaitable[None]],
+        parse_retry_after: RetryAfterParser,
+    ) -> None:
+        _validate(concurrency=concurrency, max_request_retries=max_request_retries)
+
+        self.progress = FanOutProgress()
+
+        self._create = create
+        self._requests = requests
+        self._concurrency = concurrency
+        self._ordered = ordered
+        self._max_request_retries = max_request_retries
+        self._on_progress = on_progress
+        self._sleep = sleep
+        self._parse_retry_after = parse_retry_after
+
+        self._gate = RateLimitGate()
+        self._limiter = anyio.CapacityLimiter(concurrency)
+        # results that haven't been returned yet, including those held back to keep the input order
+        self._window = anyio.Semaphore(2 * concurrency)
+        self._finished: Dict[int, RequestResult[_T]] = {}
+        self._next_index = 0
+        self._task_group: Optional[TaskGroup] = None
+
+        # the window bounds how many results can be buffered
+        self._send, self._receive = cast(
+            "Tuple[MemoryObjectSendStream[RequestResult[_T]], MemoryObjectReceiveStream[RequestResult[_T]]]",
+            anyio.create_memory_object_stream(math.inf),
+        )
+
+    async def __aenter__(self) -> AsyncRequestResults[_T]:
+        self._task_group = anyio.create_task_group()
+        await self._task_group.__aenter__()
+        self._task_group.start_soon(self._produce)
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> Optional[bool]:
+        assert self._task_group is not None
+        self._task_group.cancel_scope.cancel()
+        try:
+            return await self._task_group.__aexit__(exc_type, exc, exc_tb)
+        finally:
+            self._receive.close()
+
+    def __aiter__(self) -> AsyncRequestResults[_T]:
+        return self
+
+    async def __anext__(self) -> RequestResult[_T]:
+        if self._task_group is None:
+            raise RuntimeError("`create_many()` results must be iterated inside an `async with` block")
+
+        if self._ordered:
+            while self._next_index not in self._finished:
+                result = await self._receive_next()
+                self._finished[result.index] = result
+            result = self._finished.pop(self._next_index)
+            self._next_index += 1
+        else:
+            result = await self._receive_next()
+
+        self._window.release()
+        return result
+
+    async def _receive_next(self) -> RequestResult[_T]:
+        try:
+            return await self._receive.receive()
+        except anyio.EndOfStream:
+            raise StopAsyncIteration() from None
+
+    async def _produce(self) -> None:
+        async with self._send:
+            async with anyio.create_task_group() as tg:
+                index = 0
+                if isinstance(self._requests, AsyncIterable):
+                    async for request in self._requests:
+                        await self._window.acquire()
+                        tg.start_soon(self._run, index, request)
+                        index += 1
+                else:
+                    for request in self._requests:
+                        await self._window.acquire()
+                        tg.start_soon(self._run, index, request)
+                        index += 1
+
+    async def _run(self, index: int, request: Mapping[str, Any]) -> None:
+        async with self._limiter:
+            self.progress.started += 1
+            result = await self._send_request(index, request)
+
+        _record(self.progress, result, self._on_progress)
+        await self._send.send(result)
+
+    async def _send_request(self, index: int, request: Mapping[str, Any]) -> RequestResult[_T]:
+        attempt = 0
+        while True:
+            paused = self._gate.remaining()
+            if paused > 0:
+                await self._sleep(paused)
+
+            try:
+                return RequestResult(index=index, request=request, result=await self._create(**request))
+            except Exception as err:
+                delay = _retry_delay(err, attempt, self._max_request_retries, self._parse_retry_after)
+                if delay is None:
+                    return RequestResult(index=index, request=request, error=err)
+
+                attempt += 1
+                if isinstance(err, RateLimitError):
+                    self._gate.pause(delay)
+                else:
+                    await self._sleep(delay)
+
+
+def _validate(*, concurrency: int, max_request_retries: int) -> None:
+    if concurrency <= 0:
+        raise ValueError(f"Expected `concurrency` to be a positive integer but received {concurrency}")
+    if max_request_retries < 0:
+        raise ValueError(f"Expected `max_request_retries` to not be negative but received {max_request_retries}")
+
+
+def _retry_delay(
+    err: Exception,
+    attempt: int,
+    max_request_retries: int,
+    parse_retry_after: RetryAfterParser,
+) -> Optional[float]:
+    """Returns how long to wait before retrying a failed request, or `None` if it shouldn't be retried."""
+    if attempt >= max_request_retries or not is_retryable_shard_error(err):
+        return None
+
+    retry_after = parse_retry_after(err.response.headers) if isinstance(err, APIStatusError) else None
+    return shard_retry_delay(attempt, retry_after)
+
+
+def _record(progress: FanOutProgress, result: RequestResult[Any], on_progress: Optional[ProgressCallback]) -> None:
+    if result.ok:
+        progress.succeeded += 1
+    else:
+        progress.failed += 1
+
+    if on_progress is not None:
+        on_progress(progress)
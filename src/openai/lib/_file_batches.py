@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import time
+from typing import List, Optional
+from typing_extensions import override
+
+from .._types import FileTypes
+from ..types.vector_stores.vector_store_file import VectorStoreFile
+from ..types.vector_stores.vector_store_file_batch import VectorStoreFileBatch
+
+
+class FileAttachFailure:
+    """A file that could not be uploaded or attached to the vector store."""
+
+    file: Optional[FileTypes]
+    """The given file, `None` for entries passed through `file_ids`."""
+
+    file_id: Optional[str]
+    """The ID of the uploaded file, `None` if the upload itself failed."""
+
+    error: Exception
+
+    def __init__(self, *, file: Optional[FileTypes], file_id: Optional[str], error: Exception) -> None:
+        self.file = file
+        self.file_id = file_id
+        self.error = error
+
+    @override
+    def __repr__(self) -> str:
+        return f"FileAttachFailure(file_id={self.file_id!r}, error={self.error!r})"
+
+
+class UploadAndAttachResult:
+    """The outcome of `vector_stores.file_batches.upload_and_attach()`."""
+
+    batches: List[VectorStoreFileBatch]
+    """Every file batch that was created, in their final polled state."""
+
+    failures: List[FileAttachFailure]
+    """Files that failed to upload or could not be added to a batch."""
+
+    failed_files: List[VectorStoreFile]
+    """Vector store files that were attached but failed to be processed, see `last_error`."""
+
+    def __init__(
+        self,
+        *,
+        batches: List[VectorStoreFileBatch],
+        failures: List[FileAttachFailure],
+        failed_files: List[VectorStoreFile],
+    ) -> None:
+        self.batches = batches
+        self.failures = failures
+        self.failed_files = failed_files
+
+    @property
+    def completed_count(self) -> int:
+        return sum(batch.file_counts.completed for batch in self.batches)
+
+    @override
+    def __repr__(self) -> str:
+        return (
+            f"UploadAndAttachResult(batches={len(self.batches)}, completed={self.completed_count}, "
+            f"failures={len(self.failures)}, failed_files={len(self.failed_files)})"
+        )
+
+
+class FileIdBatcher:
+    """Groups file IDs into batches of `batch_size`.
+
+    A partial batch becomes ready once `window_seconds` have passed since the
+    oldest ID in it was added, so that files don't wait indefinitely for the
+    batch to fill up.
+    """
+
+    def __init__(self, *, batch_size: int, window_seconds: float) -> None:
+        if batch_size <= 0:
+            raise ValueError(f"Expected `batch_size` to be a positive integer but received {batch_size}")
+        if window_seconds < 0:
+            raise ValueError(f"Expected `batch_window_seconds` to not be negative but received {window_seconds}")
+
+        self._batch_size = batch_size
+        self._window_seconds = window_seconds
+        self._ids: List[str] = []
+        self._since: Optional[float] = None
+
+    def add(self, file_id: str) -> None:
+        if not self._ids:
+            self._since = time.monotonic()
+        self._ids.append(file_id)
+
+    def timeout(self) -> Optional[float]:
+        """Returns the number of seconds until the pending partial batch is ready, if there is one."""
+        if self._since is None:
+            return None
+        return max(0.0, self._since + self._window_seconds - time.monotonic())
+
+    def take_ready(self, *, flush: bool = False) -> List[List[str]]:
+        """Removes and returns the batches that are ready, `flush` also includes the pending partial batch."""
+        ready: List[List[str]] = []
+        while len(self._ids) >= self._batch_size:
+            ready.append(self._ids[: self._batch_size])
+            del self._ids[: self._batch_size]
+            self._since = time.monotonic()
+
+        if self._ids and (flush or self.timeout() == 0.0):
+            ready.append(self._ids)
+            self._ids = []
+
+        if not self._ids:
+            self._since = None
+
+        return ready
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from typing import Any, Callable, Optional, Awaitable
+
+from .._types import FileTypes, FileContent
+from .._utils import asyncify, is_tuple_t
+from .._models import construct_type_unchecked
+from .._constants import RAW_RESPONSE_HEADER
+from .._exceptions import NotFoundError
+from ..types.upload import Upload
+from ..types.file_object import FileObject
+
+# 1MB
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    content_hash TEXT NOT NULL,
+    purpose TEXT NOT NULL,
+    file_id TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    upload TEXT,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (content_hash, purpose)
+)
+"""
+
+
+class FileIndexEntry:
+    file_id: str
+    bytes: int
+    upload: Optional[Upload]
+
+    def __init__(self, *, file_id: str, bytes: int, upload: Optional[Upload]) -> None:
+        self.file_id = file_id
+        self.bytes = bytes
+        self.upload = upload
+
+
+class FileIndex:
+    """A local, content-addressed index of uploaded files.
+
+    Entries map the SHA-256 hash of a file's contents and the purpose it was
+    uploaded for to the resulting file ID. When an index is passed to
+    `files.create()`, `uploads.upload_file_chunked()` or
+    `vector_stores.file_batches.upload_and_poll()`, content that has already been
+    uploaded is not sent again. Before an entry is reused the file is retrieved
+    from the API to make sure that it still exists.
+
+    The index is stored in a SQLite database so it can be shared between runs
+    and processes, by default it only lives in memory.
+
+    ```py
+    index = FileIndex("file-index.sqlite")
+
+    file = client.files.create(file=Path("input.jsonl"), purpose="batch", file_index=index)
+    ```
+    """
+
+    def __init__(self, path: str | os.PathLike[str] = ":memory:") -> None:
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            os.path.expanduser(path),
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._conn.execute(_SCHEMA)
+
+    def __enter__(self) -> FileIndex:
+        return self
+
+    def __exit__(self, *_args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def get(self, content_hash: str, purpose: str) -> FileIndexEntry | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT file_id, bytes, upload FROM files WHERE content_hash = ? AND purpose = ?",
+                (content_hash, purpose),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        file_id, size, upload = row
+        return FileIndexEntry(
+            file_id=file_id,
+            bytes=size,
+            upload=construct_type_unchecked(type_=Upload, value=json.loads(upload)) if upload else None,
+        )
+
+    def add(self, content_hash: str, purpose: str, file: FileObject, *, upload: Upload | None = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files (content_hash, purpose, file_id, bytes, upload, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    content_hash,
+                    purpose,
+                    file.id,
+                    file.bytes,
+                    upload.to_json(indent=None) if upload is not None else None,
+                    time.time(),
+                ),
+            )
+
+    def remove(self, content_hash: str, purpose: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM files WHERE content_hash = ? AND purpose = ?",
+                (content_hash, purpose),
+            )
+
+    def find(
+        self,
+        content_hash: str,
+        purpose: str,
+        *,
+        retrieve: Callable[[str], FileObject],
+    ) -> FileObject | None:
+        """Returns the previously uploaded file for the given content, if it still exists."""
+        entry = self.get(content_hash, purpose)
+        if entry is None:
+            return None
+
+        try:
+            file = retrieve(entry.file_id)
+        except NotFoundError:
+            file = None
+
+        return self._validate(content_hash, purpose, entry, file)
+
+    async def async_find(
+        self,
+        content_hash: str,
+        purpose: str,
+        *,
+        retrieve: Callable[[str], Awaitable[FileObject]],
+    ) -> FileObject | None:
+        """Returns the previously uploaded file for the given content, if it still exists."""
+        entry = self.get(content_hash, purpose)
+        if entry is None:
+            return None
+
+        try:
+            file = await retrieve(entry.file_id)
+        except NotFoundError:
+            file = None
+
+        return self._validate(content_hash, purpose, entry, file)
+
+    def find_upload(
+        self,
+        content_hash: str,
+        purpose: str,
+        *,
+        retrieve: Callable[[str], FileObject],
+    ) -> Upload | None:
+        """Returns the completed Upload that previously created a file for the given content."""
+        entry = self.get(content_hash, purpose)
+        if entry is None or entry.upload is None:
+            return None
+
+        file = self.find(content_hash, purpose, retrieve=retrieve)
+        if file is None:
+            return None
+
+        entry.upload.file = file
+        return entry.upload
+
+    async def async_find_upload(
+        self,
+        content_hash: str,
+        purpose: str,
+        *,
+        retrieve: Callable[[str], Awaitable[FileObject]],
+    ) -> Upload | None:
+        """Returns the completed Upload that previously created a file for the given content."""
+        entry = self.get(content_hash, purpose)
+        if entry is None or entry.upload is None:
+            return None
+
+        file = await self.async_find(content_hash, purpose, retrieve=retrieve)
+        if file is None:
+            return None
+
+        entry.upload.file = file
+        return entry.upload
+
+    def _validate(
+        self,
+        content_hash: str,
+        purpose: str,
+        entry: FileIndexEntry,
+        file: FileObject | None,
+    ) -> FileObject | None:
+        if (
+            file is None
+            or file.status == "error"
+            or file.bytes != entry.bytes
+            or (file.expires_at is not None and file.expires_at <= time.time())
+        ):
+            # the file has been deleted, has expired or is otherwise unusable
+            self.remove(content_hash, purpose)
+            return None
+
+        return file
+
+
+def hash_file_content(file: FileTypes) -> str | None:
+    """Returns the SHA-256 hex digest of the given file's contents.
+
+    `None` is returned for file objects that cannot be read without consuming them.
+    """
+    content: FileContent = file[1] if is_tuple_t(file) else file  # type: ignore[assignment]
+    digest = hashlib.sha256()
+
+    if isinstance(content, bytes):
+        digest.update(content)
+        return digest.hexdigest()
+
+    if isinstance(content, os.PathLike):
+        with open(content, "rb") as fd:
+            for chunk in iter(lambda: fd.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    if not content.seekable():
+        return None
+
+    position = content.tell()
+    try:
+        for chunk in iter(lambda: content.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    finally:
+        content.seek(position)
+
+    return digest.hexdigest()
+
+
+async def async_hash_file_content(file: FileTypes) -> str | None:
+    """Returns the SHA-256 hex digest of the given file's contents without blocking the event loop."""
+    return await asyncify(hash_file_content)(file)
+
+
+def check_not_raw_response(extra_headers: Any) -> None:
+    if extra_headers and RAW_RESPONSE_HEADER in extra_headers:
+        raise TypeError(
+            "The `file_index` argument is not supported with `.with_raw_response` or `.with_streaming_response`"
+        )
@@ -11,7 +11,7 @@ from ..._types import NOT_GIVEN, NotGiven
 from ..._utils import is_dict, is_given
 from ..._compat import PYDANTIC_V2, model_parse_json
 from ..._models import construct_type_unchecked
-from .._pydantic import is_basemodel_type, to_strict_json_schema, is_dataclass_like_type
+from .._pydantic import get_type_adapter, is_basemodel_type, to_strict_json_schema, is_dataclass_like_type
 from ...types.chat import (
     ParsedChoice,
     ChatCompletion,
@@ -224,7 +224,7 @@ def _parse_content(response_format: type[ResponseFormatT], content: str) -> Resp
         if not PYDANTIC_V2:
             raise TypeError(f"Non BaseModel types are only supported with Pydantic v2 - {response_format}")
 
-        return pydantic.TypeAdapter(response_format).validate_json(content)
+        return get_type_adapter(response_format).validate_json(content)
 
     raise TypeError(f"Unable to automatically parse response format type {response_format}")
 
@@ -250,7 +250,7 @@ def type_to_response_format_param(
         json_schema_type = response_format
     elif is_dataclass_like_type(response_format):
         name = response_format.__name__
-        json_schema_type = pydantic.TypeAdapter(response_format)
+        json_schema_type = get_type_adapter(response_format)
     else:
         raise TypeError(f"Unsupported response_format type - {response_format}")
 
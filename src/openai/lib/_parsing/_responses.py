@@ -4,14 +4,12 @@ import json
 from typing import TYPE_CHECKING, Any, List, Iterable, cast
 from typing_extensions import TypeVar, assert_never
 
-import pydantic
-
 from .._tools import ResponsesPydanticFunctionTool
 from ..._types import NotGiven
 from ..._utils import is_given
 from ..._compat import PYDANTIC_V2, model_parse_json
-from ..._models import construct_type_unchecked
-from .._pydantic import is_basemodel_type, is_dataclass_like_type
+from ..._models import build_from
+from .._pydantic import get_type_adapter, is_basemodel_type, is_dataclass_like_type
 from ._completions import solve_response_format_t, type_to_response_format_param
 from ...types.responses import (
     Response,
@@ -68,34 +66,22 @@ def parse_response(
                     continue
 
                 content_list.append(
-                    construct_type_unchecked(
-                        type_=cast(Any, ParsedResponseOutputText)[solved_t],
-                        value={
-                            **item.to_dict(),
-                            "parsed": parse_text(item.text, text_format=text_format),
-                        },
+                    build_from(
+                        cast(Any, ParsedResponseOutputText)[solved_t],
+                        item,
+                        parsed=parse_text(item.text, text_format=text_format),
                     )
                 )
 
             output_list.append(
-                construct_type_unchecked(
-                    type_=cast(Any, ParsedResponseOutputMessage)[solved_t],
-                    value={
-                        **output.to_dict(),
-                        "content": content_list,
-                    },
-                )
+                build_from(cast(Any, ParsedResponseOutputMessage)[solved_t], output, content=content_list)
             )
         elif output.type == "function_call":
             output_list.append(
-                construct_type_unchecked(
-                    type_=ParsedResponseFunctionToolCall,
-                    value={
-                        **output.to_dict(),
-                        "parsed_arguments": parse_function_tool_arguments(
-                            input_tools=input_tools, function_call=output
-                        ),
-                    },
+                build_from(
+                    ParsedResponseFunctionToolCall,
+                    output,
+                    parsed_arguments=parse_function_tool_arguments(input_tools=input_tools, function_call=output),
                 )
             )
         elif (
@@ -117,15 +103,10 @@ def parse_response(
         else:
             output_list.append(output)
 
+    # the already constructed fields of the response and its output items are reused as they are,
+    # instead of round-tripping them through `.to_dict()` and constructing them all over again
     return cast(
-        ParsedResponse[TextFormatT],
-        construct_type_unchecked(
-            type_=cast(Any, ParsedResponse)[solved_t],
-            value={
-                **response.to_dict(),
-                "output": output_list,
-            },
-        ),
+        ParsedResponse[TextFormatT], build_from(cast(Any, ParsedResponse)[solved_t], response, output=output_list)
     )
 
 
@@ -140,7 +121,7 @@ def parse_text(text: str, text_format: type[TextFormatT] | NotGiven) -> TextForm
         if not PYDANTIC_V2:
             raise TypeError(f"Non BaseModel types are only supported with Pydantic v2 - {text_format}")
 
-        return pydantic.TypeAdapter(text_format).validate_json(text)
+        return get_type_adapter(text_format).validate_json(text)
 
     raise TypeError(f"Unable to automatically parse response format type {text_format}")
 
@@ -0,0 +1,601 @@
+from __future__ import annotations
+
+import time
+import random
+import logging
+import threading
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Tuple,
+    Generic,
+    TypeVar,
+    Iterable,
+    Optional,
+    Generator,
+)
+from typing_extensions import Literal
+from concurrent.futures import Future
+
+import anyio
+import httpx
+
+from .._models import BaseModel
+from ..types.batch import Batch
+from ..types.beta.threads.run import Run
+from ..types.fine_tuning.fine_tuning_job import FineTuningJob
+from ..types.vector_stores.vector_store_file import VectorStoreFile
+from ..types.vector_stores.vector_store_file_batch import VectorStoreFileBatch
+
+if TYPE_CHECKING:
+    from .._client import OpenAI, AsyncOpenAI
+    from .._legacy_response import LegacyAPIResponse
+
+_T = TypeVar("_T")
+
+log: logging.Logger = logging.getLogger(__name__)
+
+JobKind = Literal["batch", "fine_tuning.job", "vector_store.file", "vector_store.file_batch", "thread.run"]
+
+# kinds that can be refreshed in bulk through a list endpoint
+_LISTABLE_KINDS = {"batch", "fine_tuning.job", "vector_store.file", "thread.run"}
+
+_LIST_PAGE_SIZE = 100
+
+_POLL_HEADERS = {"X-Stainless-Poll-Helper": "true"}
+
+_RUN_TERMINAL_STATES = {"requires_action", "cancelled", "completed", "failed", "expired", "incomplete"}
+
+
+def _is_terminal(kind: JobKind, obj: Any) -> bool:
+    if kind == "batch":
+        return obj.status in {"completed", "failed", "expired", "cancelled"}
+    if kind == "fine_tuning.job":
+        return obj.status in {"succeeded", "failed", "cancelled"}
+    if kind == "vector_store.file":
+        return bool(obj.status != "in_progress")
+    if kind == "vector_store.file_batch":
+        return bool(obj.file_counts.in_progress == 0)
+    return obj.status in _RUN_TERMINAL_STATES
+
+
+def _progress(kind: JobKind, obj: Any) -> object:
+    """Returns a value that changes whenever the job makes observable progress."""
+    if kind == "batch":
+        return (obj.status, obj.request_counts)
+    if kind == "vector_store.file_batch":
+        return obj.file_counts
+    return obj.status
+
+
+class _Job:
+    kind: JobKind
+    id: str
+    parent_id: Optional[str]
+    interval: float
+    next_at: float
+    progress: object
+
+    def __init__(self, kind: JobKind, id: str, parent_id: Optional[str], *, interval: float) -> None:
+        self.kind = kind
+        self.id = id
+        self.parent_id = parent_id
+        self.interval = interval
+        self.next_at = time.monotonic()
+        self.progress = None
+
+    @property
+    def key(self) -> Tuple[JobKind, Optional[str], str]:
+        return (self.kind, self.parent_id, self.id)
+
+
+class _BasePoller:
+    def __init__(
+        self,
+        *,
+        min_interval: float,
+        max_interval: float,
+        backoff: float,
+        jitter: float,
+        max_list_pages: int,
+    ) -> None:
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError(
+                f"Expected `0 < min_interval <= max_interval` but received min_interval={min_interval} and max_interval={max_interval}"
+            )
+        if backoff < 1:
+            raise ValueError(f"Expected `backoff` to be at least 1 but received {backoff}")
+        if not 0 <= jitter < 1:
+            raise ValueError(f"Expected `jitter` to be between 0 and 1 but received {jitter}")
+        if max_list_pages < 0:
+            raise ValueError(f"Expected `max_list_pages` to not be negative but received {max_list_pages}")
+
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._backoff = backoff
+        self._jitter = jitter
+        self._max_list_pages = max_list_pages
+
+    def _reschedule(self, job: _Job, obj: BaseModel, *, headers: Optional[httpx.Headers]) -> None:
+        progress = _progress(job.kind, obj)
+        if progress == job.progress:
+            job.interval = min(job.interval * self._backoff, self._max_interval)
+        else:
+            job.interval = self._min_interval
+        job.progress = progress
+
+        delay = job.interval
+        from_header = headers.get("openai-poll-after-ms") if headers is not None else None
+        if from_header is not None:
+            delay = max(delay, int(from_header) / 1000)
+
+        delay *= random.uniform(1 - self._jitter, 1 + self._jitter)
+        job.next_at = time.monotonic() + delay
+
+    def _group_due(self, jobs: Iterable[_Job]) -> Dict[Tuple[JobKind, Optional[str]], List[_Job]]:
+        groups: Dict[Tuple[JobKind, Optional[str]], List[_Job]] = {}
+        for job in jobs:
+            groups.setdefault((job.kind, job.parent_id), []).append(job)
+        return groups
+
+
+class Poller(_BasePoller):
+    """Waits for many long running jobs at once using a single background thread.
+
+    Instead of running a separate polling loop for every object, jobs are tracked
+    by a shared poller which refreshes all of the jobs of the same kind through
+    their list endpoint where one exists, and falls back to retrieving them one by
+    one otherwise. Each job is checked again after an interval that grows while it
+    isn't making progress, honouring the `openai-poll-after-ms` response header,
+    with some random jitter so that requests for many jobs aren't synchronised.
+
+    The `track_*()` methods return a `concurrent.futures.Future` that resolves with
+    the object once it has reached a terminal state.
+
+    ```py
+    futures = [client.poller.track_batch(batch.id) for batch in batches]
+
+    for future in concurrent.futures.as_completed(futures):
+        batch = future.result()
+    ```
+    """
+
+    def __init__(
+        self,
+        client: OpenAI,
+        *,
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+        backoff: float = 1.5,
+        jitter: float = 0.1,
+        max_list_pages: int = 3,
+    ) -> None:
+        super().__init__(
+            min_interval=min_interval,
+            max_interval=max_interval,
+            backoff=backoff,
+            jitter=jitter,
+            max_list_pages=max_list_pages,
+        )
+        self._client = client
+        self._jobs: Dict[Tuple[JobKind, Optional[str], str], Tuple[_Job, Future[Any]]] = {}
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def track_batch(self, batch_id: str) -> Future[Batch]:
+        return self._track("batch", batch_id, None)
+
+    def track_fine_tuning_job(self, fine_tuning_job_id: str) -> Future[FineTuningJob]:
+        return self._track("fine_tuning.job", fine_tuning_job_id, None)
+
+    def track_vector_store_file(self, file_id: str, *, vector_store_id: str) -> Future[VectorStoreFile]:
+        return self._track("vector_store.file", file_id, vector_store_id)
+
+    def track_vector_store_file_batch(self, batch_id: str, *, vector_store_id: str) -> Future[VectorStoreFileBatch]:
+        return self._track("vector_store.file_batch", batch_id, vector_store_id)
+
+    def track_run(self, run_id: str, *, thread_id: str) -> Future[Run]:
+        return self._track("thread.run", run_id, thread_id)
+
+    def close(self) -> None:
+        """Stops polling and cancels the futures for any jobs that haven't finished yet."""
+        with self._condition:
+            self._closed = True
+            for _, future in self._jobs.values():
+                future.cancel()
+            self._jobs.clear()
+            self._condition.notify_all()
+
+    def __enter__(self) -> Poller:
+        return self
+
+    def __exit__(self, *_args: object) -> None:
+        self.close()
+
+    def _track(self, kind: JobKind, id: str, parent_id: Optional[str]) -> Future[Any]:
+        if not id:
+            raise ValueError(f"Expected a non-empty value for the {kind} ID but received {id!r}")
+
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Cannot track new jobs after the poller has been closed")
+
+            job = _Job(kind, id, parent_id, interval=self._min_interval)
+            existing = self._jobs.get(job.key)
+            if existing is not None and not existing[1].cancelled():
+                return existing[1]
+
+            future: Future[Any] = Future()
+            self._jobs[job.key] = (job, future)
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="openai-poller", daemon=True)
+                self._thread.start()
+
+            self._condition.notify_all()
+            return future
+
+    def _run(self) -> None:
+        try:
+            self._poll()
+        except Exception as exc:
+            # fail the tracked jobs instead of leaving their futures pending forever
+            with self._condition:
+                entries = list(self._jobs.values())
+                self._jobs.clear()
+
+            for _, future in entries:
+                if future.set_running_or_notify_cancel():
+                    future.set_exception(exc)
+        finally:
+            with self._condition:
+                if self._thread is threading.current_thread():
+                    self._thread = None
+
+    def _poll(self) -> None:
+        while True:
+            with self._condition:
+                for key in [key for key, (_, future) in self._jobs.items() if future.cancelled()]:
+                    del self._jobs[key]
+
+                if not self._jobs or self._closed:
+                    self._thread = None
+                    return
+
+                now = time.monotonic()
+                due = [job for job, _ in self._jobs.values() if job.next_at <= now]
+                if not due:
+                    self._condition.wait(timeout=min(job.next_at for job, _ in self._jobs.values()) - now)
+                    continue
+
+            for (kind, parent_id), jobs in self._group_due(due).items():
+                self._refresh(kind, parent_id, jobs)
+
+    def _refresh(self, kind: JobKind, parent_id: Optional[str], jobs: List[_Job]) -> None:
+        remaining = {job.id: job for job in jobs}
+
+        if kind in _LISTABLE_KINDS and len(jobs) > 1 and self._max_list_pages > 0:
+            try:
+                headers, found = self._list(kind, parent_id, set(remaining))
+            except Exception as exc:
+                log.debug("Failed to list %s objects, falling back to retrieving them individually: %s", kind, exc)
+            else:
+                for obj in found:
+                    job = remaining.pop(obj.id, None)
+                    if job is not None:
+                        self._update(job, obj, headers=headers)
+
+        for job in remaining.values():
+            try:
+                response = self._retrieve(job)
+                obj = response.parse()
+            except Exception as exc:
+                self._resolve(job, exception=exc)
+            else:
+                self._update(job, obj, headers=response.headers)
+
+    def _update(self, job: _Job, obj: BaseModel, *, headers: Optional[httpx.Headers]) -> None:
+        if _is_terminal(job.kind, obj):
+            self._resolve(job, result=obj)
+            return
+
+        with self._condition:
+            self._reschedule(job, obj, headers=headers)
+
+    def _resolve(self, job: _Job, *, result: Any = None, exception: Optional[BaseException] = None) -> None:
+        with self._condition:
+            entry = self._jobs.pop(job.key, None)
+
+        # the future can be cancelled concurrently, this only fails if it already was
+        if entry is None or not entry[1].set_running_or_notify_cancel():
+            return
+
+        if exception is not None:
+            entry[1].set_exception(exception)
+        else:
+            entry[1].set_result(result)
+
+    def _retrieve(self, job: _Job) -> LegacyAPIResponse[Any]:
+        client = self._client
+        if job.kind == "batch":
+            return client.batches.with_raw_response.retrieve(job.id, extra_headers=_POLL_HEADERS)
+        if job.kind == "fine_tuning.job":
+            return client.fine_tuning.jobs.with_raw_response.retrieve(job.id, extra_headers=_POLL_HEADERS)
+
+        assert job.parent_id is not None
+        if job.kind == "vector_store.file":
+            return client.vector_stores.files.with_raw_response.retrieve(
+                job.id, vector_store_id=job.parent_id, extra_headers=_POLL_HEADERS
+            )
+        if job.kind == "vector_store.file_batch":
+            return client.vector_stores.file_batches.with_raw_response.retrieve(
+                job.id, vector_store_id=job.parent_id, extra_headers=_POLL_HEADERS
+            )
+        return client.beta.threads.runs.with_raw_response.retrieve(  # pyright: ignore[reportDeprecated]
+            job.id, thread_id=job.parent_id, extra_headers=_POLL_HEADERS
+        )
+
+    def _list(self, kind: JobKind, parent_id: Optional[str], ids: set[str]) -> Tuple[httpx.Headers, List[Any]]:
+        """Lists the objects of the given kind until all of `ids` have been seen or the page limit is hit."""
+        client = self._client
+        response: LegacyAPIResponse[Any]
+        if kind == "batch":
+            response = client.batches.with_raw_response.list(limit=_LIST_PAGE_SIZE, extra_headers=_POLL_HEADERS)
+        elif kind == "fine_tuning.job":
+            response = client.fine_tuning.jobs.with_raw_response.list(
+                limit=_LIST_PAGE_SIZE, extra_headers=_POLL_HEADERS
+            )
+        elif kind == "vector_store.file":
+            assert parent_id is not None
+            response = client.vector_stores.files.with_raw_response.list(
+                parent_id, limit=_LIST_PAGE_SIZE, extra_headers=_POLL_HEADERS
+            )
+        else:
+            assert parent_id is not None
+            response = client.beta.threads.runs.with_raw_response.list(  # pyright: ignore[reportDeprecated]
+                parent_id, limit=_LIST_PAGE_SIZE, extra_headers=_POLL_HEADERS
+            )
+
+        found: List[Any] = []
+        page = response.parse()
+        for page_number in range(self._max_list_pages):
+            found.extend(obj for obj in page.data if obj.id in ids)
+            if len(found) >= len(ids) or page_number + 1 >= self._max_list_pages or not page.has_next_page():
+                break
+            page = page.get_next_page()
+
+        return response.headers, found
+
+
+class AsyncPollFuture(Generic[_T]):
+    """An awaitable that resolves with the tracked object once it has reached a terminal state."""
+
+    def __init__(self, poller: AsyncPoller) -> None:
+        self._poller = poller
+        self._done = False
+        self._result: Optional[_T] = None
+        self._exception: Optional[BaseException] = None
+
+    def done(self) -> bool:
+        return self._done
+
+    def result(self) -> _T:
+        """Returns the resolved object, this raises if the future hasn't been resolved yet."""
+        if not self._done:
+            raise RuntimeError("The job has not reached a terminal state yet")
+        if self._exception is not None:
+            raise self._exception
+        return self._result  # type: ignore[return-value]
+
+    def __await__(self) -> Generator[Any, None, _T]:
+        return self._wait().__await__()
+
+    async def _wait(self) -> _T:
+        await self._poller._wait(self)
+        return self.result()
+
+    def _set(self, *, result: Any = None, exception: Optional[BaseException] = None) -> None:
+        self._result = result
+        self._exception = exception
+        self._done = True
+
+
+class AsyncPoller(_BasePoller):
+    """Waits for many long running jobs at once using a single polling loop.
+
+    Instead of running a separate polling loop for every object, jobs are tracked
+    by a shared poller which refreshes all of the jobs of the same kind through
+    their list endpoint where one exists, and falls back to retrieving them one by
+    one otherwise. Each job is checked again after an interval that grows while it
+    isn't making progress, honouring the `openai-poll-after-ms` response header,
+    with some random jitter so that requests for many jobs aren't synchronised.
+
+    The `track_*()` methods return an awaitable future that resolves with the
+    object once it has reached a terminal state. There is no background task, one
+    of the tasks awaiting a future drives the polling loop for every tracked job
+    and another one takes over when its own job is done.
+
+    ```py
+    batches = await asyncio.gather(*(client.poller.track_batch(batch.id) for batch in batches))
+    ```
+    """
+
+    def __init__(
+        self,
+        client: AsyncOpenAI,
+        *,
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+        backoff: float = 1.5,
+        jitter: float = 0.1,
+        max_list_pages: int = 3,
+    ) -> None:
+        super().__init__(
+            min_interval=min_interval,
+            max_interval=max_interval,
+            backoff=backoff,
+            jitter=jitter,
+            max_list_pages=max_list_pages,
+        )
+        self._client = client
+        self._jobs: Dict[Tuple[JobKind, Optional[str], str], Tuple[_Job, AsyncPollFuture[Any]]] = {}
+        self._driving = False
+        self._changed: Optional[anyio.Event] = None
+
+    def track_batch(self, batch_id: str) -> AsyncPollFuture[Batch]:
+        return self._track("batch", batch_id, None)
+
+    def track_fine_tuning_job(self, fine_tuning_job_id: str) -> AsyncPollFuture[FineTuningJob]:
+        return self._track("fine_tuning.job", fine_tuning_job_id, None)
+
+    def track_vector_store_file(self, file_id: str, *, vector_store_id: str) -> AsyncPollFuture[VectorStoreFile]:
+        return self._track("vector_store.file", file_id, vector_store_id)
+
+    def track_vector_store_file_batch(
+        self, batch_id: str, *, vector_store_id: str
+    ) -> AsyncPollFuture[VectorStoreFileBatch]:
+        return self._track("vector_store.file_batch", batch_id, vector_store_id)
+
+    def track_run(self, run_id: str, *, thread_id: str) -> AsyncPollFuture[Run]:
+        return self._track("thread.run", run_id, thread_id)
+
+    def _track(self, kind: JobKind, id: str, parent_id: Optional[str]) -> AsyncPollFuture[Any]:
+        if not id:
+            raise ValueError(f"Expected a non-empty value for the {kind} ID but received {id!r}")
+
+        job = _Job(kind, id, parent_id, interval=self._min_interval)
+        existing = self._jobs.get(job.key)
+        if existing is not None:
+            return existing[1]
+
+        future: AsyncPollFuture[Any] = AsyncPollFuture(self)
+        self._jobs[job.key] = (job, future)
+        self._notify()
+        return future
+
+    def _notify(self) -> None:
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = None
+
+    def _changed_event(self) -> anyio.Event:
+        if self._changed is None:
+            self._changed = anyio.Event()
+        return self._changed
+
+    async def _wait(self, future: AsyncPollFuture[Any]) -> None:
+        while not future.done():
+            if self._driving:
+                # another task is already polling, wait until it resolves a job or stops driving
+                await self._changed_event().wait()
+                continue
+
+            self._driving = True
+            try:
+                await self._drive(until=future)
+            finally:
+                self._driving = False
+                self._notify()
+
+    async def _drive(self, *, until: AsyncPollFuture[Any]) -> None:
+        while not until.done():
+            now = time.monotonic()
+            due = [job for job, _ in self._jobs.values() if job.next_at <= now]
+            if not due:
+                delay = min(job.next_at for job, _ in self._jobs.values()) - now
+                with anyio.move_on_after(delay):
+                    # wake up early if a new job is tracked
+                    await self._changed_event().wait()
+                continue
+
+            for (kind, parent_id), jobs in self._group_due(due).items():
+                await self._refresh(kind, parent_id, jobs)
+
+    async def _refresh(self, kind: JobKind, parent_id: Optional[str], jobs: List[_Job]) -> None:
+        remaining = {job.id: job for job in jobs}
+
+        if kind in _LISTABLE_KINDS and len(jobs) > 1 and self._max_list_pages > 0:
+            try:
+                headers, found = await self._list(kind, parent_id, set(remaining))
+            except Exception as exc:
+                log.debug("Failed to list %s objects, falling back to retrieving them individually: %s", kind, exc)
+            else:
+                for obj in found:
+                    job = remaining.pop(obj.id, None)
+                    if job is not None:
+                        self._update(job, obj, headers=headers)
+
+        for job in remaining.values():
+            try:
+                response = await self._retrieve(job)
+                obj = response.parse()
+            except Exception as exc:
+                self._resolve(job, exception=exc)
+            else:
+                self._update(job, obj, headers=response.headers)
+
+    def _update(self, job: _Job, obj: BaseModel, *, headers: Optional[httpx.Headers]) -> None:
+        if _is_terminal(job.kind, obj):
+            self._resolve(job, result=obj)
+        else:
+            self._reschedule(job, obj, headers=headers)
+
+    def _resolve(self, job: _Job, *, result: Any = None, exception: Optional[BaseException] = None) -> None:
+        entry = self._jobs.pop(job.key, None)
+        if entry is not None:
+            entry[1]._set(result=result, exception=exception)
+            self._notify()
+
+    async def _retrieve(self, job: _Job) -> LegacyAPIResponse[Any]:
+        client = self._client
+        if job.kind == "batch":
+            return await client.batches.with_raw_response.retrieve(job.id, extra_headers=_POLL_HEADERS)
+        if job.kind == "fine_tuning.job":
+            return await client.fine_tuning.jobs.with_raw_response.retrieve(job.id, extra_headers=_POLL_HEADERS)
+
+        assert job.parent_id is not None
+        if job.kind == "vector_store.file":
+            return await client.vector_stores.files.with_raw_response.retrieve(
+                job.id, vector_store_id=job.parent_id, extra_headers=_POLL_HEADERS
+            )
+        if job.kind == "vector_store.file_batch":
+            return await client.vector_stores.file_batches.with_raw_response.retrieve(
+                job.id, vector_store_id=job.parent_id, extra_headers=_POLL_HEADERS
+            )
+        return await client.beta.threads.runs.with_raw_response.retrieve(  # pyright: ignore[reportDeprecated]
+            job.id, thread_id=job.parent_id, extra_headers=_POLL_HEADERS
+        )
+
+    async def _list(self, kind: JobKind, parent_id: Optional[str], ids: set[str]) -> Tuple[httpx.Headers, List[Any]]:
+        """Lists the objects of the given kind until all of `ids` have been seen or the page limit is hit."""
+        client = self._client
+        response: LegacyAPIResponse[Any]
+        if kind == "batch":
+            response = await client.batches.with_raw_response.list(limit=_LIST_PAGE_SIZE, extra_headers=_POLL_HEADERS)
+        elif kind == "fine_tuning.job":
+            response = await client.fine_tuning.jobs.with_raw_response.list(
+                limit=_LIST_PAGE_SIZE, extra_headers=_POLL_HEADERS
+            )
+        elif kind == "vector_store.file":
+            assert parent_id is not None
+            response = await client.vector_stores.files.with_raw_response.list(
+                parent_id, limit=_LIST_PAGE_SIZE, extra_headers=_POLL_HEADERS
+            )
+        else:
+            assert parent_id is not None
+            response = await client.beta.threads.runs.with_raw_response.list(  # pyright: ignore[reportDeprecated]
+                parent_id, limit=_LIST_PAGE_SIZE, extra_headers=_POLL_HEADERS
+            )
+
+        found: List[Any] = []
+        page = response.parse()
+        for page_number in range(self._max_list_pages):
+            found.extend(obj for obj in page.data if obj.id in ids)
+            if len(found) >= len(ids) or page_number + 1 >= self._max_list_pages or not page.has_next_page():
+                break
+            page = await page.get_next_page()
+
+        return response.headers, found
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import json
+import time
+import hashlib
+import threading
+from typing import Any, Dict, List, Tuple, Union, Mapping, TypeVar, Callable, Iterable, Optional, Awaitable, cast
+from typing_extensions import override
+
+from .._types import NotGiven
+from .._utils import is_given
+from ..types.responses import Response, ResponseUsage
+from ..types.completion_usage import CompletionUsage
+from ..types.chat.chat_completion import ChatCompletion
+
+_T = TypeVar("_T")
+
+# the request params that make up the static prefix of a prompt, in addition to the leading system messages
+_PREFIX_PARAMS = ("model", "instructions", "tools", "response_format", "text", "prompt_cache_key")
+
+_INSTRUCTION_ROLES = ("system", "developer")
+
+UsageSource = Union[ChatCompletion, Response, CompletionUsage, ResponseUsage]
+
+
+class PromptCacheStats:
+    """Prompt caching metrics for the requests that share one static prefix."""
+
+    prefix_hash: str
+
+    requests: int
+
+    cached_requests: int
+    """The number of requests that read at least one prompt token from the cache."""
+
+    prompt_tokens: int
+
+    cached_tokens: int
+
+    cached_latency: float
+    """The total number of seconds taken by timed requests that hit the cache."""
+
+    uncached_latency: float
+    """The total number of seconds taken by timed requests that missed the cache."""
+
+    def __init__(self, prefix_hash: str) -> None:
+        self.prefix_hash = prefix_hash
+        self.requests = 0
+        self.cached_requests = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.cached_latency = 0.0
+        self.uncached_latency = 0.0
+        self._timed_cached = 0
+        self._timed_uncached = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of prompt tokens that were read from the cache."""
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+    @property
+    def mean_cached_latency(self) -> Optional[float]:
+        return self.cached_latency / self._timed_cached if self._timed_cached else None
+
+    @property
+    def mean_uncached_latency(self) -> Optional[float]:
+        return self.uncached_latency / self._timed_uncached if self._timed_uncached else None
+
+    def _add(self, *, prompt_tokens: int, cached_tokens: int, latency: Optional[float]) -> None:
+        self.requests += 1
+        self.prompt_tokens += prompt_tokens
+        self.cached_tokens += cached_tokens
+        if cached_tokens > 0:
+            self.cached_requests += 1
+
+        if latency is None:
+            return
+        if cached_tokens > 0:
+            self.cached_latency += latency
+            self._timed_cached += 1
+        else:
+            self.uncached_latency += latency
+            self._timed_uncached += 1
+
+    @override
+    def __repr__(self) -> str:
+        return (
+            f"PromptCacheStats(prefix_hash={self.prefix_hash!r}, requests={self.requests}, "
+            f"hit_rate={self.hit_rate:.2f})"
+        )
+
+
+class PromptCacheTracker:
+    """Makes requests cache friendly and measures how often they hit the server side prompt cache.
+
+    Prompts are only cached for an exact prefix match, so `prepare()` puts the tools and
+    the JSON schemas of a Chat Completions or Responses request into a deterministic
+    order. The usage of each result is then aggregated per hash of the request's static
+    prefix: the model, instructions and leading system messages, tools and response format.
+
+    ```py
+    tracker = PromptCacheTracker()
+
+    completion = tracker.track(client.chat.completions.create, model="gpt-4o", messages=messages, tools=tools)
+
+    for stats in tracker.stats.values():
+        print(stats.prefix_hash, stats.hit_rate, stats.mean_cached_latency, stats.mean_uncached_latency)
+    ```
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: Dict[str, PromptCacheStats] = {}
+
+    @property
+    def stats(self) -> Dict[str, PromptCacheStats]:
+        """The metrics for every prefix seen so far, keyed by `prompt_prefix_hash()`."""
+        with self._lock:
+            return dict(self._stats)
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of prompt tokens that were read from the cache over all requests."""
+        with self._lock:
+            prompt_tokens = sum(stats.prompt_tokens for stats in self._stats.values())
+            cached_tokens = sum(stats.cached_tokens for stats in self._stats.values())
+        return cached_tokens / prompt_tokens if prompt_tokens else 0.0
+
+    def prepare(self, **params: Any) -> Dict[str, Any]:
+        """Returns the given request params with a deterministic static prefix, see `canonicalize_request()`."""
+        return canonicalize_request(params)
+
+    def record(
+        self,
+        params: Mapping[str, Any],
+        result: UsageSource,
+        *,
+        latency: Optional[float] = None,
+    ) -> PromptCacheStats:
+        """Adds the usage of a completed request to the metrics for its prefix.
+
+        `result` can be a `ChatCompletion`, a `Response` or their `usage`. Results without
+        usage, e.g. streams that didn't include it, still count towards `requests`.
+        """
+        prompt_tokens, cached_tokens = _cached_usage(result)
+        prefix_hash = prompt_prefix_hash(params)
+
+        with self._lock:
+            stats = self._stats.get(prefix_hash)
+            if stats is None:
+                stats = self._stats[prefix_hash] = PromptCacheStats(prefix_hash)
+            stats._add(prompt_tokens=prompt_tokens, cached_tokens=cached_tokens, latency=latency)
+            return stats
+
+    def track(self, create: Callable[..., _T], **params: Any) -> _T:
+        """Calls `create()` with the prepared params and records its usage and latency."""
+        request = self.prepare(**params)
+        start = time.monotonic()
+        result = create(**request)
+        # streams don't have a usage to record
+        if isinstance(result, (ChatCompletion, Response)):
+            self.record(request, result, latency=time.monotonic() - start)
+        return result
+
+    async def async_track(self, create: Callable[..., Awaitable[_T]], **params: Any) -> _T:
+        """The async version of `track()`."""
+        request = self.prepare(**params)
+        start = time.monotonic()
+        result = await create(**request)
+        # streams don't have a usage to record
+        if isinstance(result, (ChatCompletion, Response)):
+            self.record(request, result, latency=time.monotonic() - start)
+        return result
+
+
+def canonicalize_request(params: Mapping[str, Any]) -> Dict[str, Any]:
+    """Puts the static prefix of a Chat Completions or Responses request into a deterministic order.
+
+    Tools are sorted by type and name and the keys of tool definitions and JSON schemas
+    are sorted, so that requests built in different ways send the same prefix. The
+    order of schema `properties` is kept as it determines the order of the output.
+    Messages are never reordered.
+    """
+    request = dict(params)
+
+    tools: Union[Iterable[object], NotGiven, None] = request.get("tools")
+    if is_given(tools) and tools is not None:
+        request["tools"] = sorted((_canonical(tool) for tool in tools), key=_tool_sort_key)
+
+    for key in ("response_format", "text"):
+        value = request.get(key)
+        if is_given(value) and value is not None:
+            request[key] = _canonical(value)
+
+    return request
+
+
+def prompt_prefix_hash(params: Mapping[str, Any]) -> str:
+    """Returns a hash of the static prefix of a Chat Completions or Responses request."""
+    prefix: Dict[str, object] = {key: params[key] for key in _PREFIX_PARAMS if key in params and is_given(params[key])}
+    prefix["messages"] = _leading_instructions(params.get("messages") or params.get("input"))
+
+    prefix = canonicalize_request(prefix)
+    encoded = json.dumps(prefix, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+def _canonical(value: object, *, keep_order: bool = False) -> Any:
+    if isinstance(value, Mapping):
+        mapping = cast(Mapping[str, object], value)
+        keys = list(mapping.keys()) if keep_order else sorted(mapping.keys())
+        # the entries of `properties` are property names, not schema keywords
+        return {key: _canonical(mapping[key], keep_order=key == "properties" and not keep_order) for key in keys}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in cast(Iterable[object], value)]
+    return value
+
+
+def _tool_sort_key(tool: Dict[str, Any]) -> Tuple[str, str]:
+    function: object = tool.get("function")
+    name: object = (
+        cast(Mapping[str, object], function).get("name") if isinstance(function, Mapping) else tool.get("name")
+    )
+    return (str(tool.get("type", "")), str(name or ""))
+
+
+def _leading_instructions(messages: object) -> List[object]:
+    if isinstance(messages, (str, NotGiven)) or not isinstance(messages, Iterable):
+        return []
+
+    leading: List[object] = []
+    for message in cast(Iterable[object], messages):
+        if not isinstance(message, Mapping):
+            break
+        message = cast(Mapping[str, object], message)
+        if message.get("role") not in _INSTRUCTION_ROLES:
+            break
+        leading.append(message)
+    return leading
+
+
+def _cached_usage(result: UsageSource) -> Tuple[int, int]:
+    usage: Union[CompletionUsage, ResponseUsage, None] = (
+        result.usage if isinstance(result, (ChatCompletion, Response)) else result
+    )
+
+    if isinstance(usage, CompletionUsage):
+        details = usage.prompt_tokens_details
+        return usage.prompt_tokens, (details.cached_tokens or 0) if details is not None else 0
+    if isinstance(usage, ResponseUsage):
+        return usage.input_tokens, usage.input_tokens_details.cached_tokens
+    return 0, 0
@@ -1,19 +1,27 @@
 from __future__ import annotations
 
+import json
 import inspect
-from typing import Any, TypeVar
+from typing import Any, TypeVar, cast
 from typing_extensions import TypeGuard
 
 import pydantic
 
 from .._types import NOT_GIVEN
-from .._utils import is_dict as _is_dict, is_list
+from .._utils import is_dict as _is_dict, is_list, lru_cache
 from .._compat import PYDANTIC_V2, model_json_schema
 
 _T = TypeVar("_T")
 
 
 def to_strict_json_schema(model: type[pydantic.BaseModel] | pydantic.TypeAdapter[Any]) -> dict[str, Any]:
+    # generating the schema is expensive so it's only done once per model, a new
+    # copy is returned every time so that callers are free to modify it
+    return cast("dict[str, Any]", json.loads(_strict_json_schema_json(model)))
+
+
+@lru_cache(maxsize=512)
+def _strict_json_schema_json(model: type[pydantic.BaseModel] | pydantic.TypeAdapter[Any]) -> str:
     if inspect.isclass(model) and is_basemodel_type(model):
         schema = model_json_schema(model)
     elif PYDANTIC_V2 and isinstance(model, pydantic.TypeAdapter):
@@ -21,7 +29,17 @@ def to_strict_json_schema(model: type[pydantic.BaseModel] | pydantic.TypeAdapter
     else:
         raise TypeError(f"Non BaseModel types are only supported with Pydantic v2 - {model}")
 
-    return _ensure_strict_json_schema(schema, path=(), root=schema)
+    return json.dumps(_ensure_strict_json_schema(schema, path=(), root=schema))
+
+
+def get_type_adapter(type_: type[_T]) -> pydantic.TypeAdapter[_T]:
+    """Returns a cached `TypeAdapter` for the given type, as building one is expensive.
+
+    Only supported with Pydantic v2.
+    """
+    from .._models import _CachedTypeAdapter
+
+    return cast("pydantic.TypeAdapter[_T]", cast(Any, _CachedTypeAdapter)(type_))
 
 
 def _ensure_strict_json_schema(
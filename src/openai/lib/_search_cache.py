@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import json
+import time
+import weakref
+import threading
+from typing import Dict, List, Tuple, Union, Optional
+from collections import OrderedDict
+
+from .._types import NotGiven
+from .._utils import is_given
+
+# caches are registered per client so that mutating a vector store through that
+# client can invalidate any results that were cached for it
+_registry: weakref.WeakKeyDictionary[object, weakref.WeakSet[SearchCache]] = weakref.WeakKeyDictionary()
+_registry_lock = threading.Lock()
+
+
+class SearchCache:
+    """An in-memory cache of `vector_stores.search()` results.
+
+    Results are keyed by the vector store ID and every search parameter, and expire
+    after `ttl` seconds. Once more than `max_size` results are cached the least
+    recently used ones are evicted.
+
+    Cached results for a vector store are invalidated when its files or file
+    batches are changed through the same client that the search was made with,
+    changes made in any other way are only picked up once the results expire.
+
+    ```py
+    cache = SearchCache(ttl=300)
+
+    pages = client.vector_stores.search_many(vector_store.id, queries=["refunds", "shipping"], cache=cache)
+    ```
+    """
+
+    def __init__(self, *, ttl: float = 60.0, max_size: int = 1024) -> None:
+        if ttl <= 0:
+            raise ValueError(f"Expected `ttl` to be positive but received {ttl}")
+        if max_size <= 0:
+            raise ValueError(f"Expected `max_size` to be a positive integer but received {max_size}")
+
+        self._ttl = ttl
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, Tuple[str, float, object]] = OrderedDict()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    @property
+    def generation(self) -> int:
+        """A counter that changes every time results are invalidated."""
+        return self._generation
+
+    def get(self, key: str) -> Optional[object]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def set(self, key: str, vector_store_id: str, value: object, *, generation: Optional[int] = None) -> None:
+        """Caches a result, unless `generation` is given and results have been invalidated since it was read.
+
+        This avoids caching results that were fetched before a change to the vector
+        store but only received after it.
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+
+            self._entries[key] = (vector_store_id, time.monotonic() + self._ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, vector_store_id: Optional[str] = None) -> None:
+        """Removes the cached results for the given vector store, or every result if no ID is given."""
+        with self._lock:
+            self._generation += 1
+            if vector_store_id is None:
+                self._entries.clear()
+                return
+
+            for key in [key for key, entry in self._entries.items() if entry[0] == vector_store_id]:
+                del self._entries[key]
+
+    def register(self, client: object) -> None:
+        """Invalidate results when vector stores are changed through the given client."""
+        with _registry_lock:
+            caches = _registry.get(client)
+            if caches is None:
+                caches = _registry[client] = weakref.WeakSet()
+            caches.add(self)
+
+
+def invalidate_search_caches(client: object, vector_store_id: str) -> None:
+    """Invalidates the cached search results for a vector store that has been changed through the given client."""
+    with _registry_lock:
+        caches = list(_registry.get(client, ()))
+
+    for cache in caches:
+        cache.invalidate(vector_store_id)
+
+
+def search_cache_key(
+    vector_store_id: str,
+    *,
+    query: Union[str, List[str]],
+    filters: object,
+    max_num_results: Union[int, NotGiven],
+    ranking_options: object,
+    rewrite_query: Union[bool, NotGiven],
+) -> str:
+    params: Dict[str, object] = {
+        "vector_store_id": vector_store_id,
+        "query": query,
+        "filters": filters,
+        "max_num_results": max_num_results,
+        "ranking_options": ranking_options,
+        "rewrite_query": rewrite_query,
+    }
+    return json.dumps({key: value for key, value in params.items() if is_given(value)}, sort_keys=True, default=str)
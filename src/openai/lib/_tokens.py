@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import json
+import math
+from typing import Any, Dict, List, Tuple, Union, Mapping, Callable, Iterable, Optional, cast
+
+import pydantic
+
+from .._types import NotGiven
+from .._utils import is_given, lru_cache
+from .._compat import model_dump
+from .._extras import tiktoken, has_tiktoken
+from .._exceptions import TokenLimitExceededError
+
+TokenCounter = Callable[[str], int]
+
+# the number of tokens that the chat format adds around every message and before the reply, see
+# https://cookbook.openai.com/examples/how_to_count_tokens_with_tiktoken
+_TOKENS_PER_MESSAGE = 3
+_TOKENS_PER_NAME = 1
+_REPLY_TOKENS = 3
+
+# the cost of an image whose size isn't known: a single tile with `detail: "low"`, otherwise
+# the four tiles of a 1024x1024 image with `detail: "high"`
+_LOW_DETAIL_IMAGE_TOKENS = 85
+_HIGH_DETAIL_IMAGE_TOKENS = 765
+
+_FALLBACK_ENCODING = "o200k_base"
+
+_INSTRUCTION_ROLES = ("system", "developer")
+
+# the request params that reserve room in the context window for the output
+_OUTPUT_TOKEN_PARAMS = ("max_completion_tokens", "max_tokens", "max_output_tokens")
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimates the number of tokens in the given text without a tokenizer.
+
+    This assumes three bytes of UTF-8 per token which overestimates the count for
+    typical English text, so that requests packed with it stay under the token limit.
+    """
+    return max(1, math.ceil(len(text.encode("utf-8")) / 3))
+
+
+def get_token_counter(model: Optional[str] = None) -> TokenCounter:
+    """Returns a function that counts the tokens in a text for the given model.
+
+    The count is exact when `tiktoken` is installed, i.e. with `pip install openai[tokens]`,
+    otherwise the text is measured with `estimate_tokens()`.
+    """
+    if not has_tiktoken():
+        return estimate_tokens
+
+    encoding = _encoding_for_model(model)
+    # special tokens are counted as regular text as that's how the API treats them in inputs
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+
+@lru_cache(maxsize=32)
+def _encoding_for_model(model: Optional[str]) -> Any:
+    if model is not None:
+        try:
+            return cast(Any, tiktoken).encoding_for_model(model)
+        except KeyError:
+            pass
+    return cast(Any, tiktoken).get_encoding(_FALLBACK_ENCODING)
+
+
+def count_chat_completion_tokens(
+    *,
+    messages: Iterable[object],
+    model: Optional[str] = None,
+    tools: Union[Iterable[object], NotGiven, None] = None,
+    response_format: Union[object, NotGiven, None] = None,
+    count_tokens: Optional[TokenCounter] = None,
+    **_params: object,
+) -> int:
+    """Counts the input tokens of a `chat.completions.create()` request.
+
+    The other request params are accepted and ignored so that the params of a request
+    can be passed as they are, e.g. `count_chat_completion_tokens(**params)`.
+
+    The count is close to, but not always exactly, what the API reports as
+    `prompt_tokens`: tool definitions and JSON schemas are counted as their JSON
+    encoding, images are counted as a 1024x1024 image, or a single tile with
+    `detail: "low"`, and audio and file content isn't counted.
+    """
+    counter = count_tokens or get_token_counter(model)
+    return _count_messages(messages, counter) + _REPLY_TOKENS + _count_static(tools, response_format, counter)
+
+
+def count_response_tokens(
+    *,
+    input: Union[str, Iterable[object]],
+    model: Optional[str] = None,
+    instructions: Union[str, NotGiven, None] = None,
+    tools: Union[Iterable[object], NotGiven, None] = None,
+    text: Union[object, NotGiven, None] = None,
+    count_tokens: Optional[TokenCounter] = None,
+    **_params: object,
+) -> int:
+    """Counts the input tokens of a `responses.create()` request.
+
+    Tokens of the items referenced by `previous_response_id` or a `conversation` aren't
+    included as they're never sent, otherwise this has the same caveats as
+    `count_chat_completion_tokens()`.
+    """
+    counter = count_tokens or get_token_counter(model)
+
+    tokens = _count_input(input, counter) + _REPLY_TOKENS
+    if isinstance(instructions, str):
+        tokens += _count_messages([{"role": "system", "content": instructions}], counter)
+    return tokens + _count_static(tools, text, counter)
+
+
+def preflight_chat_completion(
+    *,
+    context_window: int,
+    truncate: bool = False,
+    count_tokens: Optional[TokenCounter] = None,
+    **params: Any,
+) -> Dict[str, Any]:
+    """Checks that a `chat.completions.create()` request fits in the model's context window before it's sent.
+
+    The room reserved for the output with `max_completion_tokens` or `max_tokens` is
+    subtracted from `context_window`. A request that doesn't fit raises a
+    `TokenLimitExceededError` unless `truncate=True` is given, in which case the oldest
+    messages after the leading system and developer messages are dropped until it does.
+
+    Returns the request params, with the remaining messages, to pass to `create()`:
+
+    ```py
+    completion = client.chat.completions.create(
+        **preflight_chat_completion(context_window=128_000, truncate=True, model="gpt-4o", messages=messages)
+    )
+    ```
+    """
+    counter = count_tokens or get_token_counter(params.get("model"))
+    max_tokens = _max_input_tokens(context_window, params)
+
+    # the tokens of everything but the messages, which don't change when messages are dropped
+    request: Dict[str, Any] = {**params, "messages": []}
+    base_tokens = count_chat_completion_tokens(**request, count_tokens=counter)
+
+    messages = list(cast(Iterable[object], params["messages"]))
+    fitted = _fit(messages, counter, base_tokens=base_tokens, max_tokens=max_tokens, truncate=truncate)
+    return {**params, "messages": fitted}
+
+
+def preflight_response(
+    *,
+    context_window: int,
+    truncate: bool = False,
+    count_tokens: Optional[TokenCounter] = None,
+    **params: Any,
+) -> Dict[str, Any]:
+    """Checks that a `responses.create()` request fits in the model's context window before it's sent.
+
+    This works like `preflight_chat_completion()`, with `max_output_tokens` reserving room
+    for the output. Only a list of input items can be truncated, a string input that
+    doesn't fit always raises.
+    """
+    counter = count_tokens or get_token_counter(params.get("model"))
+    max_tokens = _max_input_tokens(context_window, params)
+
+    input: Union[str, Iterable[object]] = params["input"]
+    if isinstance(input, str):
+        tokens = count_response_tokens(**params, count_tokens=counter)
+        if tokens > max_tokens:
+            raise TokenLimitExceededError(tokens=tokens, max_tokens=max_tokens)
+        return params
+
+    # the tokens of everything but the input items, which don't change when items are dropped
+    request: Dict[str, Any] = {**params, "input": []}
+    base_tokens = count_response_tokens(**request, count_tokens=counter)
+
+    fitted = _fit(list(input), counter, base_tokens=base_tokens, max_tokens=max_tokens, truncate=truncate)
+    return {**params, "input": fitted}
+
+
+def _max_input_tokens(context_window: int, params: Mapping[str, Any]) -> int:
+    if context_window <= 0:
+        raise ValueError(f"Expected `context_window` to be a positive integer but received {context_window}")
+
+    for key in _OUTPUT_TOKEN_PARAMS:
+        output_tokens = params.get(key)
+        if isinstance(output_tokens, int):
+            return context_window - output_tokens
+    return context_window
+
+
+def _fit(
+    items: List[object],
+    counter: TokenCounter,
+    *,
+    base_tokens: int,
+    max_tokens: int,
+    truncate: bool,
+) -> List[object]:
+    """Drops the oldest items until the request fits in `max_tokens`, each item is only counted once."""
+    item_tokens = [_count_messages([item], counter) for item in items]
+    tokens = base_tokens + sum(item_tokens)
+    if tokens <= max_tokens:
+        return items
+    if not truncate:
+        raise TokenLimitExceededError(tokens=tokens, max_tokens=max_tokens)
+
+    leading = 0
+    while leading < len(items) and _role(items[leading]) in _INSTRUCTION_ROLES:
+        leading += 1
+
+    # never drop the last item and always start the history with a user message so
+    # that no tool output or reply is left without the item it belongs to
+    start = leading
+    while len(items) - start > 1 and (tokens > max_tokens or _role(items[start]) != "user"):
+        tokens -= item_tokens[start]
+        start += 1
+
+    if tokens > max_tokens:
+        raise TokenLimitExceededError(tokens=tokens, max_tokens=max_tokens)
+    return items[:leading] + items[start:]
+
+
+def _count_static(
+    tools: Union[Iterable[object], NotGiven, None],
+    format: Union[object, NotGiven, None],
+    counter: TokenCounter,
+) -> int:
+    tokens = 0
+    if is_given(tools) and tools is not None:
+        tokens += sum(counter(_json(tool)) for tool in tools)
+    if is_given(format) and format is not None:
+        tokens += counter(_json(format))
+    return tokens
+
+
+def _count_input(input: Union[str, Iterable[object]], counter: TokenCounter) -> int:
+    if isinstance(input, str):
+        return _count_messages([{"role": "user", "content": input}], counter)
+    return _count_messages(input, counter)
+
+
+def _count_messages(messages: Iterable[object], counter: TokenCounter) -> int:
+    tokens = 0
+    for message in messages:
+        item = _as_dict(message)
+        item_type = item.get("type")
+        if item_type is not None and item_type != "message":
+            # Responses API items such as function calls and their outputs
+            tokens += _TOKENS_PER_MESSAGE + counter(_json(item))
+            continue
+
+        tokens += _TOKENS_PER_MESSAGE + counter(str(item.get("role", "")))
+        if item.get("name"):
+            tokens += _TOKENS_PER_NAME + counter(str(item["name"]))
+        tokens += _count_content(item.get("content"), counter)
+        for tool_call in cast(Iterable[object], item.get("tool_calls") or []):
+            tokens += counter(_json(tool_call))
+    return tokens
+
+
+def _count_content(content: object, counter: TokenCounter) -> int:
+    if content is None:
+        return 0
+    if isinstance(content, str):
+        return counter(content)
+
+    tokens = 0
+    for part in cast(Iterable[object], content):
+        part = _as_dict(part)
+        text, image_detail = _part_text(part)
+        if text:
+            tokens += counter(text)
+        if image_detail is not None:
+            tokens += _LOW_DETAIL_IMAGE_TOKENS if image_detail == "low" else _HIGH_DETAIL_IMAGE_TOKENS
+    return tokens
+
+
+def _part_text(part: Mapping[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+    """Returns the text of a content part and the detail of its image, if it has one."""
+    part_type = part.get("type")
+    if part_type == "image_url":
+        image_url: Mapping[str, Any] = part.get("image_url") or {}
+        return None, str(image_url.get("detail") or "auto")
+    if part_type == "input_image":
+        return None, str(part.get("detail") or "auto")
+
+    text = part.get("text") or part.get("refusal")
+    return (text if isinstance(text, str) else None), None
+
+
+def _role(item: object) -> object:
+    return _as_dict(item).get("role")
+
+
+def _as_dict(item: object) -> Mapping[str, Any]:
+    if isinstance(item, pydantic.BaseModel):
+        return model_dump(item, exclude_unset=True)
+    if isinstance(item, Mapping):
+        return cast(Mapping[str, Any], item)
+    return {}
+
+
+def _json(value: object) -> str:
+    if isinstance(value, pydantic.BaseModel):
+        value = model_dump(value, exclude_unset=True, mode="json")
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
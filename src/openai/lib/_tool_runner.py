@@ -0,0 +1,850 @@
+from __future__ import annotations
+
+import json
+import time
+import inspect
+import threading
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Set,
+    Dict,
+    List,
+    Tuple,
+    Union,
+    TypeVar,
+    Callable,
+    Iterable,
+    Optional,
+    Awaitable,
+    cast,
+)
+from functools import partial
+from concurrent.futures import Future, wait as wait_futures
+
+import anyio
+import pydantic
+import anyio.abc
+
+from ._tools import pydantic_function_tool
+from .._types import NOT_GIVEN, NotGiven
+from .._utils import asyncify, is_given, async_run_concurrently
+from .._compat import model_dump, model_parse_json
+from ..types.chat import (
+    ParsedChatCompletion,
+    ParsedFunctionToolCall,
+    ChatCompletionToolParam,
+    ChatCompletionMessageParam,
+    ParsedChatCompletionMessage,
+    ChatCompletionToolMessageParam,
+    ChatCompletionAssistantMessageParam,
+)
+from .._exceptions import OpenAIError
+from ..types.responses import (
+    ParsedResponse,
+    ResponseInputParam,
+    ResponseInputItemParam,
+    ParsedResponseOutputItem,
+    ParsedResponseFunctionToolCall,
+)
+
+if TYPE_CHECKING:
+    from .._client import OpenAI, AsyncOpenAI
+
+DEFAULT_MAX_ITERATIONS = 10
+DEFAULT_MAX_CONCURRENCY = 8
+
+ToolFunction = Callable[[Any], Any]
+
+_CallT = TypeVar("_CallT")
+_FinalT = TypeVar("_FinalT")
+
+
+class RegisteredTool:
+    """A Python function that the model can call, see `ToolRunner.register()`."""
+
+    name: str
+
+    model: type[pydantic.BaseModel]
+    """The model the tool call arguments are parsed into before calling `function`."""
+
+    function: ToolFunction
+
+    timeout: Optional[float]
+    """The number of seconds to wait for `function` to return, `None` to wait forever."""
+
+    param: ChatCompletionToolParam
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        model: type[pydantic.BaseModel],
+        function: ToolFunction,
+        timeout: Optional[float],
+        param: ChatCompletionToolParam,
+    ) -> None:
+        self.name = name
+        self.model = model
+        self.function = function
+        self.timeout = timeout
+        self.param = param
+
+    def parse_arguments(self, arguments: str, parsed: object = None) -> pydantic.BaseModel:
+        if isinstance(parsed, self.model):
+            return parsed
+        return model_parse_json(self.model, arguments)
+
+
+class ToolCall:
+    """A tool call requested by the model and the output of running it."""
+
+    id: str
+    """The `tool_call.id` for Chat Completions or the `call_id` for Responses."""
+
+    name: str
+
+    arguments: str
+
+    output: str
+
+    def __init__(self, *, id: str, name: str, arguments: str, output: str) -> None:
+        self.id = id
+        self.name = name
+        self.arguments = arguments
+        self.output = output
+
+
+class ChatToolRunResult:
+    completion: ParsedChatCompletion[None]
+    """The final completion, which didn't request any tool calls."""
+
+    completions: List[ParsedChatCompletion[None]]
+    """Every completion in the run, in order."""
+
+    messages: List[ChatCompletionMessageParam]
+    """The full conversation, including the assistant and tool messages added by the run."""
+
+    tool_calls: List[ToolCall]
+
+    def __init__(
+        self,
+        *,
+        completions: List[ParsedChatCompletion[None]],
+        messages: List[ChatCompletionMessageParam],
+        tool_calls: List[ToolCall],
+    ) -> None:
+        self.completion = completions[-1]
+        self.completions = completions
+        self.messages = messages
+        self.tool_calls = tool_calls
+
+
+class ResponsesToolRunResult:
+    response: ParsedResponse[None]
+    """The final response, which didn't request any function calls."""
+
+    responses: List[ParsedResponse[None]]
+    """Every response in the run, in order."""
+
+    tool_calls: List[ToolCall]
+
+    def __init__(self, *, responses: List[ParsedResponse[None]], tool_calls: List[ToolCall]) -> None:
+        self.response = responses[-1]
+        self.responses = responses
+        self.tool_calls = tool_calls
+
+
+class _BaseToolRunner:
+    _tools: Dict[str, RegisteredTool]
+
+    def __init__(
+        self,
+        *,
+        timeout: Optional[float],
+        max_concurrency: int,
+        max_iterations: int,
+        return_errors: bool,
+    ) -> None:
+        if max_concurrency <= 0:
+            raise ValueError(f"Expected `max_concurrency` to be a positive integer but received {max_concurrency}")
+        if max_iterations <= 0:
+            raise ValueError(f"Expected `max_iterations` to be a positive integer but received {max_iterations}")
+
+        self._tools = {}
+        self._timeout = timeout
+        self._max_concurrency = max_concurrency
+        self._max_iterations = max_iterations
+        self._return_errors = return_errors
+
+    @property
+    def tools(self) -> List[ChatCompletionToolParam]:
+        """The definitions of the registered tools, in the Chat Completions shape that `.parse()` accepts."""
+        return [tool.param for tool in self._tools.values()]
+
+    def register(
+        self,
+        model: type[pydantic.BaseModel],
+        function: ToolFunction,
+        *,
+        name: str | None = None,
+        description: str | None = None,
+        timeout: Optional[float] | NotGiven = NOT_GIVEN,
+    ) -> RegisteredTool:
+        """Registers a function that the model can call.
+
+        The tool definition is created with `openai.pydantic_function_tool(model)` and
+        the function is called with the tool call arguments parsed into an instance of
+        `model`. Its return value is sent back to the model as is if it is a string,
+        otherwise it is serialized to JSON.
+
+        `timeout` overrides the runner's default timeout for this tool.
+        """
+        param = pydantic_function_tool(model, name=name, description=description)
+        tool_name = param["function"]["name"]
+        if tool_name in self._tools:
+            raise ValueError(f"A tool named `{tool_name}` is already registered")
+
+        tool = RegisteredTool(
+            name=tool_name,
+            model=model,
+            function=function,
+            timeout=timeout if is_given(timeout) else self._timeout,
+            param=param,
+        )
+        self._tools[tool_name] = tool
+        return tool
+
+    def _get_tool(self, name: str) -> RegisteredTool:
+        tool = self._tools.get(name)
+        if tool is None:
+            raise OpenAIError(f"The model called an unknown tool `{name}`")
+        return tool
+
+    def _timeout_for(self, name: str) -> Optional[float]:
+        tool = self._tools.get(name)
+        return tool.timeout if tool is not None else None
+
+    def _error_output(self, exc: Exception) -> str:
+        if not self._return_errors:
+            raise exc
+        return json.dumps({"error": f"{type(exc).__name__}: {exc}" if str(exc) else type(exc).__name__})
+
+    def _check_params(self, params: Dict[str, Any]) -> None:
+        if "tools" in params:
+            raise TypeError("The `tools` are set by the runner, register them with `.register()` instead")
+        if not self._tools:
+            raise ValueError("No tools have been registered")
+
+    def _too_many_iterations(self) -> OpenAIError:
+        return OpenAIError(f"The model was still calling tools after {self._max_iterations} requests")
+
+
+class ToolRunner(_BaseToolRunner):
+    """Runs the tool calls requested by the model and sends their outputs back until it stops calling tools.
+
+    When the model requests several tool calls at once they are run concurrently in
+    threads, at most `max_concurrency` at a time.
+
+    ```py
+    runner = ToolRunner(client, timeout=30)
+    runner.register(GetWeather, get_weather)
+
+    result = runner.run_responses(model="gpt-4o", input="What's the weather in Paris and Tokyo?")
+    print(result.response.output_text)
+    ```
+
+    If a tool raises, or doesn't return within its timeout, the exception is
+    re-raised unless `return_errors=True` is given, in which case the error is sent
+    to the model as the output of the tool call. Note that a timed out function
+    can't be interrupted and keeps running in its thread.
+    """
+
+    def __init__(
+        self,
+        client: OpenAI,
+        *,
+        timeout: Optional[float] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_iterations: int = DEFAULT_MAX_ITERATIONS,
+        return_errors: bool = False,
+    ) -> None:
+        super().__init__(
+            timeout=timeout,
+            max_concurrency=max_concurrency,
+            max_iterations=max_iterations,
+            return_errors=return_errors,
+        )
+        self._client = client
+
+    def run_chat(
+        self,
+        *,
+        messages: Iterable[ChatCompletionMessageParam],
+        model: str,
+        stream: bool = False,
+        **params: Any,
+    ) -> ChatToolRunResult:
+        """Calls `client.beta.chat.completions.parse()` with the registered tools until no tools are called.
+
+        Every request resends the full conversation, `params` are passed to each request as is.
+
+        If `stream=True` each completion is requested with `.stream()` instead and every tool
+        call starts running as soon as its arguments have been received, while the model is
+        still generating the rest of the completion.
+        """
+        self._check_params(params)
+
+        conversation = list(messages)
+        completions: List[ParsedChatCompletion[None]] = []
+        tool_calls: List[ToolCall] = []
+
+        for _ in range(self._max_iterations):
+            with _ThreadDispatcher(self) as dispatcher:
+                if stream:
+                    with self._client.beta.chat.completions.stream(
+                        messages=conversation,
+                        model=model,
+                        tools=self.tools,
+                        on_tool_call=lambda call: dispatcher.submit(*_chat_tool_call(call)),
+                        **params,
+                    ) as completion_stream:
+                        completion = completion_stream.get_final_completion()
+                else:
+                    completion = self._client.beta.chat.completions.parse(
+                        messages=conversation,
+                        model=model,
+                        tools=self.tools,
+                        **params,
+                    )
+
+                message = completion.choices[0].message
+                calls = dispatcher.results(_chat_tool_calls(message))
+
+            completions.append(completion)
+            if not calls:
+                return ChatToolRunResult(completions=completions, messages=conversation, tool_calls=tool_calls)
+
+            conversation.append(_assistant_message(message))
+            conversation.extend(_tool_messages(calls))
+            tool_calls.extend(calls)
+
+        raise self._too_many_iterations()
+
+    def run_responses(
+        self,
+        *,
+        input: Union[str, ResponseInputParam],
+        model: str,
+        stream: bool = False,
+        **params: Any,
+    ) -> ResponsesToolRunResult:
+        """Calls `client.responses.parse()` with the registered tools until no functions are called.
+
+        Follow up requests only send the function call outputs and continue from the
+        previous response with `previous_response_id`, unless `store=False` is given in
+        which case the output of each response is sent back as well.
+
+        If `stream=True` each response is requested with `.stream()` instead and every
+        function call starts running as soon as its arguments have been received, while the
+        model is still generating the rest of the response.
+        """
+        self._check_params(params)
+
+        responses: List[ParsedResponse[None]] = []
+        tool_calls: List[ToolCall] = []
+
+        for _ in range(self._max_iterations):
+            with _ThreadDispatcher(self) as dispatcher:
+                if stream:
+                    with self._client.responses.stream(
+                        input=input,
+                        model=model,
+                        tools=self.tools,
+                        on_tool_call=lambda call: dispatcher.submit(*_response_tool_call(call)),
+                        **params,
+                    ) as response_stream:
+                        response = response_stream.get_final_response()
+                else:
+                    response = self._client.responses.parse(input=input, model=model, tools=self.tools, **params)
+
+                calls = dispatcher.results(_response_tool_calls(response))
+
+            responses.append(response)
+            if not calls:
+                return ResponsesToolRunResult(responses=responses, tool_calls=tool_calls)
+
+            tool_calls.extend(calls)
+            input, params = _next_responses_input(input, params, response=response, calls=calls)
+
+        raise self._too_many_iterations()
+
+    def call_tools(self, requested: Iterable[Tuple[str, str, str, object]]) -> List[ToolCall]:
+        """Runs `(call_id, name, arguments, parsed_arguments)` tool calls concurrently, returning them in order."""
+        with _ThreadDispatcher(self) as dispatcher:
+            return dispatcher.results(requested)
+
+    def _invoke(self, name: str, arguments: str, parsed: object) -> object:
+        tool = self._get_tool(name)
+        return tool.function(tool.parse_arguments(arguments, parsed))
+
+
+class _ThreadDispatcher:
+    """Runs tool calls in threads as they are submitted, at most `max_concurrency` at a time.
+
+    A call's timeout starts when its function starts running, not while it waits for
+    one of the other calls to finish. A call that times out gives up its slot to the
+    waiting calls, as it can't be interrupted.
+
+    Calls that haven't started yet are cancelled when the dispatcher is closed, e.g.
+    because the stream they were submitted from failed. Calls that are already running
+    can't be interrupted, the dispatcher doesn't wait for them.
+    """
+
+    def __init__(self, runner: ToolRunner) -> None:
+        self._runner = runner
+        self._slots = threading.Semaphore(runner._max_concurrency)
+        self._calls: Dict[str, _ThreadCall] = {}
+
+    def __enter__(self) -> _ThreadDispatcher:
+        return self
+
+    def __exit__(self, *_args: object) -> None:
+        for call in self._calls.values():
+            call.future.cancel()
+
+    def submit(self, call_id: str, name: str, arguments: str, parsed: object) -> None:
+        if call_id in self._calls:
+            return
+
+        self._calls[call_id] = _ThreadCall(
+            partial(self._runner._invoke, name, arguments, parsed),
+            slots=self._slots,
+            timeout=self._runner._timeout_for(name),
+        )
+
+    def results(self, requested: Iterable[Tuple[str, str, str, object]]) -> List[ToolCall]:
+        """Submits any of the given calls that haven't been yet and waits for all of them to complete."""
+        requested = list(requested)
+        for call in requested:
+            self.submit(*call)
+
+        calls: List[ToolCall] = []
+        for call_id, name, arguments, _parsed in requested:
+            thread_call = self._calls[call_id]
+            try:
+                output = _serialize_output(thread_call.future.result()) if thread_call.wait() else None
+            except Exception as exc:
+                output = self._runner._error_output(exc)
+
+            if output is None:
+                # the call's own deadline passed, as opposed to the tool raising a `TimeoutError`
+                output = self._runner._error_output(_timeout_error(name, self._runner._timeout_for(name)))
+
+            calls.append(ToolCall(id=call_id, name=name, arguments=arguments, output=output))
+
+        return calls
+
+
+class _ThreadCall:
+    """A tool call that runs in its own daemon thread once it gets one of the dispatcher's slots."""
+
+    def __init__(self, function: Callable[[], object], *, slots: threading.Semaphore, timeout: Optional[float]) -> None:
+        self.future: Future[object] = Future()
+        self._function = function
+        self._slots = slots
+        self._timeout = timeout
+        self._started = threading.Event()
+        self._deadline: Optional[float] = None
+        self._lock = threading.Lock()
+        self._holds_slot = False
+
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def wait(self) -> bool:
+        """Waits for the call to start and then to finish, returns `False` if its timeout passed first."""
+        if self._timeout is None:
+            wait_futures([self.future])
+            return True
+
+        # a call waiting for a slot always gets one, either when a running call
+        # returns or when it times out
+        self._started.wait()
+        assert self._deadline is not None
+        wait_futures([self.future], timeout=max(self._deadline - time.monotonic(), 0))
+        return self.future.done()
+
+    def _run(self) -> None:
+        self._slots.acquire()
+        self._holds_slot = True
+        if not self.future.set_running_or_notify_cancel():
+            self._release_slot()
+            return
+
+        timer: Optional[threading.Timer] = None
+        if self._timeout is not None:
+            self._deadline = time.monotonic() + self._timeout
+            timer = threading.Timer(self._timeout, self._release_slot)
+            timer.daemon = True
+            timer.start()
+        self._started.set()
+
+        try:
+            self.future.set_result(self._function())
+        except Exception as exc:
+            self.future.set_exception(exc)
+        finally:
+            if timer is not None:
+                timer.cancel()
+            self._release_slot()
+
+    def _release_slot(self) -> None:
+        with self._lock:
+            if self._holds_slot:
+                self._holds_slot = False
+                self._slots.release()
+
+
+class AsyncToolRunner(_BaseToolRunner):
+    """Runs the tool calls requested by the model and sends their outputs back until it stops calling tools.
+
+    When the model requests several tool calls at once they are run concurrently in a
+    task group, at most `max_concurrency` at a time. Registered functions can be
+    async functions or regular functions, which are run in a worker thread.
+
+    ```py
+    runner = AsyncToolRunner(client, timeout=30)
+    runner.register(GetWeather, get_weather)
+
+    result = await runner.run_responses(model="gpt-4o", input="What's the weather in Paris and Tokyo?")
+    print(result.response.output_text)
+    ```
+
+    If a tool raises, or doesn't return within its timeout, the exception is
+    re-raised and the other calls are cancelled, unless `return_errors=True` is
+    given in which case the error is sent to the model as the output of the tool call.
+    """
+
+    def __init__(
+        self,
+        client: AsyncOpenAI,
+        *,
+        timeout: Optional[float] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_iterations: int = DEFAULT_MAX_ITERATIONS,
+        return_errors: bool = False,
+    ) -> None:
+        super().__init__(
+            timeout=timeout,
+            max_concurrency=max_concurrency,
+            max_iterations=max_iterations,
+            return_errors=return_errors,
+        )
+        self._client = client
+
+    async def run_chat(
+        self,
+        *,
+        messages: Iterable[ChatCompletionMessageParam],
+        model: str,
+        stream: bool = False,
+        **params: Any,
+    ) -> ChatToolRunResult:
+        """Calls `client.beta.chat.completions.parse()` with the registered tools until no tools are called.
+
+        Every request resends the full conversation, `params` are passed to each request as is.
+
+        If `stream=True` each completion is requested with `.stream()` instead and every tool
+        call starts running as soon as its arguments have been received, while the model is
+        still generating the rest of the completion.
+        """
+        self._check_params(params)
+
+        conversation = list(messages)
+        completions: List[ParsedChatCompletion[None]] = []
+        tool_calls: List[ToolCall] = []
+
+        for _ in range(self._max_iterations):
+            if stream:
+                completion, calls = await _TaskDispatcher(self).run(
+                    partial(self._stream_completion, messages=conversation, model=model, params=params),
+                    to_call=_chat_tool_call,
+                    requested=lambda completion: _chat_tool_calls(completion.choices[0].message),
+                )
+            else:
+                completion = await self._client.beta.chat.completions.parse(
+                    messages=conversation,
+                    model=model,
+                    tools=self.tools,
+                    **params,
+                )
+                calls = await self.call_tools(_chat_tool_calls(completion.choices[0].message))
+
+            completions.append(completion)
+            if not calls:
+                return ChatToolRunResult(completions=completions, messages=conversation, tool_calls=tool_calls)
+
+            conversation.append(_assistant_message(completion.choices[0].message))
+            conversation.extend(_tool_messages(calls))
+            tool_calls.extend(calls)
+
+        raise self._too_many_iterations()
+
+    async def run_responses(
+        self,
+        *,
+        input: Union[str, ResponseInputParam],
+        model: str,
+        stream: bool = False,
+        **params: Any,
+    ) -> ResponsesToolRunResult:
+        """Calls `client.responses.parse()` with the registered tools until no functions are called.
+
+        Follow up requests only send the function call outputs and continue from the
+        previous response with `previous_response_id`, unless `store=False` is given in
+        which case the output of each response is sent back as well.
+
+        If `stream=True` each response is requested with `.stream()` instead and every
+        function call starts running as soon as its arguments have been received, while the
+        model is still generating the rest of the response.
+        """
+        self._check_params(params)
+
+        responses: List[ParsedResponse[None]] = []
+        tool_calls: List[ToolCall] = []
+
+        for _ in range(self._max_iterations):
+            if stream:
+                response, calls = await _TaskDispatcher(self).run(
+                    partial(self._stream_response, input=input, model=model, params=params),
+                    to_call=_response_tool_call,
+                    requested=_response_tool_calls,
+                )
+            else:
+                response = await self._client.responses.parse(input=input, model=model, tools=self.tools, **params)
+                calls = await self.call_tools(_response_tool_calls(response))
+
+            responses.append(response)
+            if not calls:
+                return ResponsesToolRunResult(responses=responses, tool_calls=tool_calls)
+
+            tool_calls.extend(calls)
+            input, params = _next_responses_input(input, params, response=response, calls=calls)
+
+        raise self._too_many_iterations()
+
+    async def _stream_completion(
+        self,
+        on_tool_call: Callable[[ParsedFunctionToolCall], None],
+        *,
+        messages: List[ChatCompletionMessageParam],
+        model: str,
+        params: Dict[str, Any],
+    ) -> ParsedChatCompletion[None]:
+        async with self._client.beta.chat.completions.stream(
+            messages=messages,
+            model=model,
+            tools=self.tools,
+            on_tool_call=on_tool_call,
+            **params,
+        ) as stream:
+            return await stream.get_final_completion()
+
+    async def _stream_response(
+        self,
+        on_tool_call: Callable[[ParsedResponseFunctionToolCall], None],
+        *,
+        input: Union[str, ResponseInputParam],
+        model: str,
+        params: Dict[str, Any],
+    ) -> ParsedResponse[None]:
+        async with self._client.responses.stream(
+            input=input,
+            model=model,
+            tools=self.tools,
+            on_tool_call=on_tool_call,
+            **params,
+        ) as stream:
+            return await stream.get_final_response()
+
+    async def call_tools(self, requested: Iterable[Tuple[str, str, str, object]]) -> List[ToolCall]:
+        """Runs `(call_id, name, arguments, parsed_arguments)` tool calls concurrently, returning them in order."""
+        calls = [
+            self._make_call(call_id=call_id, name=name, arguments=arguments, parsed=parsed)
+            for call_id, name, arguments, parsed in requested
+        ]
+        if not calls:
+            return []
+
+        return await async_run_concurrently(calls, max_concurrency=self._max_concurrency)
+
+    def _make_call(
+        self,
+        *,
+        call_id: str,
+        name: str,
+        arguments: str,
+        parsed: object,
+    ) -> Callable[[], Awaitable[ToolCall]]:
+        async def call() -> ToolCall:
+            timeout = self._timeout_for(name)
+            result: object = None
+            try:
+                tool = self._get_tool(name)
+                with anyio.move_on_after(timeout) as scope:
+                    result = await _call_function(tool.function, tool.parse_arguments(arguments, parsed))
+                output = None if scope.cancelled_caught else _serialize_output(result)
+            except Exception as exc:
+                output = self._error_output(exc)
+
+            if output is None:
+                # the call's own deadline passed, as opposed to the tool raising a `TimeoutError`
+                output = self._error_output(_timeout_error(name, timeout))
+
+            return ToolCall(id=call_id, name=name, arguments=arguments, output=output)
+
+        return call
+
+
+class _TaskDispatcher:
+    """Runs tool calls in a task group as they are streamed.
+
+    If the stream fails, or a tool call raises, everything else is cancelled and the
+    first error is re-raised as is instead of in an `ExceptionGroup`.
+    """
+
+    def __init__(self, runner: AsyncToolRunner) -> None:
+        self._runner = runner
+        self._limiter = anyio.CapacityLimiter(runner._max_concurrency)
+        self._results: Dict[str, ToolCall] = {}
+        self._started: Set[str] = set()
+        self._errors: List[Exception] = []
+
+    async def run(
+        self,
+        request: Callable[[Callable[[_CallT], None]], Awaitable[_FinalT]],
+        *,
+        to_call: Callable[[_CallT], Tuple[str, str, str, object]],
+        requested: Callable[[_FinalT], List[Tuple[str, str, str, object]]],
+    ) -> Tuple[_FinalT, List[ToolCall]]:
+        """Makes the streaming `request`, starting each tool call it reports, and waits for all of them."""
+        final: List[_FinalT] = []
+
+        async with anyio.create_task_group() as tg:
+            try:
+                final.append(await request(lambda call: self._start(tg, *to_call(call))))
+            except Exception as exc:
+                self._errors.insert(0, exc)
+                tg.cancel_scope.cancel()
+            else:
+                # in case the arguments of any call weren't reported while streaming
+                for call in requested(final[0]):
+                    self._start(tg, *call)
+
+        if self._errors:
+            raise self._errors[0]
+
+        return final[0], [self._results[call_id] for call_id, *_rest in requested(final[0])]
+
+    def _start(self, tg: anyio.abc.TaskGroup, call_id: str, name: str, arguments: str, parsed: object) -> None:
+        if call_id in self._started:
+            return
+
+        self._started.add(call_id)
+        call = self._runner._make_call(call_id=call_id, name=name, arguments=arguments, parsed=parsed)
+
+        async def run() -> None:
+            async with self._limiter:
+                try:
+                    self._results[call_id] = await call()
+                except Exception as exc:
+                    self._errors.append(exc)
+                    tg.cancel_scope.cancel()
+
+        tg.start_soon(run)
+
+
+async def _call_function(function: ToolFunction, arguments: pydantic.BaseModel) -> object:
+    if inspect.iscoroutinefunction(function):
+        return await function(arguments)
+    return await asyncify(function)(arguments)
+
+
+def _timeout_error(name: str, timeout: Optional[float]) -> TimeoutError:
+    return TimeoutError(f"The `{name}` tool did not return within {timeout} seconds")
+
+
+def _serialize_output(result: object) -> str:
+    if isinstance(result, str):
+        return result
+    if isinstance(result, pydantic.BaseModel):
+        return json.dumps(model_dump(result, mode="json"))
+    return json.dumps(result)
+
+
+def _chat_tool_call(call: ParsedFunctionToolCall) -> Tuple[str, str, str, object]:
+    return (call.id, call.function.name, call.function.arguments, call.function.parsed_arguments)
+
+
+def _chat_tool_calls(message: ParsedChatCompletionMessage[None]) -> List[Tuple[str, str, str, object]]:
+    return [_chat_tool_call(call) for call in message.tool_calls or []]
+
+
+def _response_tool_call(item: ParsedResponseFunctionToolCall) -> Tuple[str, str, str, object]:
+    return (item.call_id, item.name, item.arguments, item.parsed_arguments)
+
+
+def _response_tool_calls(response: ParsedResponse[None]) -> List[Tuple[str, str, str, object]]:
+    return [_response_tool_call(item) for item in response.output if item.type == "function_call"]
+
+
+def _assistant_message(message: ParsedChatCompletionMessage[None]) -> ChatCompletionAssistantMessageParam:
+    return {
+        "role": "assistant",
+        "content": message.content,
+        "tool_calls": [
+            {
+                "id": call.id,
+                "type": "function",
+                "function": {"name": call.function.name, "arguments": call.function.arguments},
+            }
+            for call in message.tool_calls or []
+        ],
+    }
+
+
+def _tool_messages(calls: List[ToolCall]) -> List[ChatCompletionToolMessageParam]:
+    return [{"role": "tool", "tool_call_id": call.id, "content": call.output} for call in calls]
+
+
+def _next_responses_input(
+    input: Union[str, ResponseInputParam],
+    params: Dict[str, Any],
+    *,
+    response: ParsedResponse[None],
+    calls: List[ToolCall],
+) -> Tuple[ResponseInputParam, Dict[str, Any]]:
+    outputs: List[ResponseInputItemParam] = [
+        {"type": "function_call_output", "call_id": call.id, "output": call.output} for call in calls
+    ]
+
+    if params.get("store") is False:
+        # the response isn't stored so it can't be continued from, send the whole conversation instead
+        history: List[ResponseInputItemParam] = (
+            [{"role": "user", "content": input}] if isinstance(input, str) else list(input)
+        )
+        history.extend(_output_item_to_input(item) for item in response.output)
+        return history + outputs, params
+
+    return outputs, {**params, "previous_response_id": response.id}
+
+
+def _output_item_to_input(item: ParsedResponseOutputItem[None]) -> ResponseInputItemParam:
+    data: Dict[str, Any] = item.to_dict()
+    # drop the fields that `.parse()` adds as they aren't valid input
+    data.pop("parsed_arguments", None)
+    if item.type == "message":
+        contents: List[Dict[str, Any]] = data.get("content") or []
+        for content in contents:
+            content.pop("parsed", None)
+    return cast(ResponseInputItemParam, data)
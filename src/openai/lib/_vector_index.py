@@ -0,0 +1,363 @@
+# numpy's stubs leave many array operations partially unknown
+# pyright: reportUnknownMemberType=false, reportUnknownVariableType=false, reportUnknownArgumentType=false
+
+from __future__ import annotations
+
+import os
+import json
+import array
+from typing import TYPE_CHECKING, Any, List, Tuple, Union, Iterable, Optional, Sequence, cast
+from typing_extensions import override
+
+from .._extras import numpy as np
+from ._embedding_arrays import EmbeddingArray
+from ..types.create_embedding_response import CreateEmbeddingResponse
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+    EmbeddingsLike = Union[
+        "npt.NDArray[Any]",
+        Sequence[Sequence[float]],
+        Sequence[float],
+        CreateEmbeddingResponse,
+        EmbeddingArray,
+    ]
+
+# the number of indexed vectors that are scored at once, bounds the size of the
+# intermediate `(queries, rows)` score matrix
+_SEARCH_BLOCK_ROWS = 65536
+
+# k-means is trained on a sample of at most this many vectors per list
+_TRAINING_SAMPLE_PER_LIST = 256
+
+
+class VectorIndexMatch:
+    id: str
+
+    score: float
+    """The cosine similarity between the query and the indexed embedding."""
+
+    index: int
+    """The position of the embedding in the index."""
+
+    def __init__(self, *, id: str, score: float, index: int) -> None:
+        self.id = id
+        self.score = score
+        self.index = index
+
+    @override
+    def __repr__(self) -> str:
+        return f"VectorIndexMatch(id={self.id!r}, score={self.score:.4f})"
+
+
+class VectorIndex:
+    """An in-process nearest neighbour index over embeddings, requires NumPy.
+
+    Embeddings are normalized and stored in a contiguous float32 matrix so that
+    queries are answered with a single matrix multiplication over the index, which
+    returns exact results. For larger indexes `train()` partitions the embeddings
+    into clusters so that only the clusters closest to a query are searched.
+
+    Indexes can be saved to a directory and loaded back memory-mapped, so they
+    don't need to be read into memory up front.
+
+    ```py
+    index = VectorIndex()
+    index.add(client.embeddings.create_array(input=chunks, model="text-embedding-3-small"), ids=chunk_ids)
+
+    query = client.embeddings.create_array(input="how do refunds work?", model="text-embedding-3-small")
+    matches = index.search(query, k=5)
+    ```
+    """
+
+    def __init__(self) -> None:
+        self._vectors: Optional[npt.NDArray[np.float32]] = None
+        self._size = 0
+        self._ids: List[str] = []
+
+        self._centroids: Optional[npt.NDArray[np.float32]] = None
+        self._lists: Optional[npt.NDArray[np.int32]] = None
+        # the rows of each list, grouped by list, built lazily when searching
+        self._list_order: Optional[npt.NDArray[np.intp]] = None
+        self._list_offsets: Optional[npt.NDArray[np.intp]] = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    @override
+    def __repr__(self) -> str:
+        lists = len(self._centroids) if self._centroids is not None else None
+        return f"VectorIndex(size={self._size}, dimensions={self.dimensions}, lists={lists})"
+
+    @property
+    def dimensions(self) -> Optional[int]:
+        return self._vectors.shape[1] if self._vectors is not None else None
+
+    @property
+    def ids(self) -> List[str]:
+        return self._ids
+
+    @property
+    def vectors(self) -> npt.NDArray[np.float32]:
+        """The normalized embeddings, in the order they were added."""
+        if self._vectors is None:
+            return np.empty((0, 0), dtype=np.float32)
+        return self._vectors[: self._size]
+
+    def add(self, embeddings: EmbeddingsLike, *, ids: Optional[Iterable[str]] = None) -> None:
+        """Adds embeddings to the index, their IDs default to their position in the index.
+
+        Embeddings can be a 2D array, a sequence of float sequences or the result of
+        `embeddings.create()` or `embeddings.create_array()`.
+        """
+        matrix = _normalize(_as_matrix(embeddings))
+        id_list = list(ids) if ids is not None else [str(self._size + i) for i in range(len(matrix))]
+        if len(id_list) != len(matrix):
+            raise ValueError(f"Expected {len(matrix)} IDs but received {len(id_list)}")
+        if len(matrix) == 0:
+            return
+
+        if self._vectors is not None and matrix.shape[1] != self._vectors.shape[1]:
+            raise ValueError(
+                f"Expected embeddings with {self._vectors.shape[1]} dimensions but received {matrix.shape[1]}"
+            )
+
+        start = self._size
+        self._reserve(start + len(matrix), dimensions=matrix.shape[1])
+        assert self._vectors is not None
+        self._vectors[start : start + len(matrix)] = matrix
+        self._ids.extend(id_list)
+        self._size += len(matrix)
+
+        if self._centroids is not None:
+            assert self._lists is not None
+            self._lists = np.concatenate([self._lists[:start], _assign(matrix, self._centroids)])
+            self._list_order = None
+            self._list_offsets = None
+
+    def search(
+        self,
+        query: EmbeddingsLike,
+        *,
+        k: int = 10,
+        n_probe: Optional[int] = None,
+    ) -> List[VectorIndexMatch]:
+        """Returns the `k` embeddings most similar to the query embedding, most similar first."""
+        queries = _as_matrix(query)
+        if len(queries) != 1:
+            raise ValueError(f"Expected a single query embedding but received {len(queries)}, use `search_many()`")
+        return self.search_many(queries, k=k, n_probe=n_probe)[0]
+
+    def search_many(
+        self,
+        queries: EmbeddingsLike,
+        *,
+        k: int = 10,
+        n_probe: Optional[int] = None,
+    ) -> List[List[VectorIndexMatch]]:
+        """Returns the `k` most similar embeddings for each query, most similar first.
+
+        If the index has been partitioned with `train()` then only the `n_probe`
+        clusters closest to each query are searched, by default `n_probe` is 1/8th
+        of the clusters. Otherwise every embedding is scored.
+        """
+        if k <= 0:
+            raise ValueError(f"Expected `k` to be a positive integer but received {k}")
+
+        matrix = _normalize(_as_matrix(queries))
+        if self._size == 0:
+            return [[] for _ in range(len(matrix))]
+        if matrix.shape[1] != self.dimensions:
+            raise ValueError(
+                f"Expected query embeddings with {self.dimensions} dimensions but received {matrix.shape[1]}"
+            )
+
+        if self._centroids is None:
+            rows, scores = _top_k_blocks(matrix, self.vectors, k=k)
+            return [self._matches(row, score) for row, score in zip(rows, scores)]
+
+        return [self._search_lists(query, k=k, n_probe=n_probe) for query in matrix]
+
+    def train(self, n_lists: int, *, iterations: int = 10, seed: int = 0) -> None:
+        """Partitions the index into `n_lists` clusters with k-means, for approximate search.
+
+        Embeddings added afterwards are assigned to the closest existing cluster,
+        call `train()` again to re-partition after adding many embeddings.
+        """
+        if not 0 < n_lists <= self._size:
+            raise ValueError(f"Expected `n_lists` to be between 1 and the size of the index but received {n_lists}")
+
+        vectors = self.vectors
+        rng = np.random.default_rng(seed)
+        sample_size = min(self._size, n_lists * _TRAINING_SAMPLE_PER_LIST)
+        sample = vectors[np.sort(rng.choice(self._size, size=sample_size, replace=False))]
+
+        centroids = sample[rng.choice(sample_size, size=n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = _assign(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            counts = np.bincount(assignments, minlength=n_lists)
+
+            empty = counts == 0
+            if empty.any():
+                # restart empty clusters from random points
+                sums[empty] = sample[rng.choice(sample_size, size=int(empty.sum()))]
+            centroids = _normalize(sums)
+
+        self._centroids = centroids
+        self._lists = _assign(vectors, centroids)
+        self._list_order = None
+        self._list_offsets = None
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """Saves the index to the given directory, see `VectorIndex.load()`."""
+        directory = os.fspath(os.path.expanduser(path))
+        os.makedirs(directory, exist_ok=True)
+
+        np.save(os.path.join(directory, "vectors.npy"), self.vectors)
+        with open(os.path.join(directory, "ids.json"), "w", encoding="utf-8") as f:
+            json.dump(self._ids, f)
+
+        for name in ("centroids.npy", "lists.npy"):
+            if os.path.exists(os.path.join(directory, name)):
+                os.remove(os.path.join(directory, name))
+        if self._centroids is not None and self._lists is not None:
+            np.save(os.path.join(directory, "centroids.npy"), self._centroids)
+            np.save(os.path.join(directory, "lists.npy"), self._lists)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str], *, mmap: bool = True) -> VectorIndex:
+        """Loads an index saved with `save()`, by default the embeddings are memory-mapped instead of read into memory."""
+        directory = os.fspath(os.path.expanduser(path))
+        index = cls()
+
+        vectors = np.load(os.path.join(directory, "vectors.npy"), mmap_mode="r" if mmap else None)
+        with open(os.path.join(directory, "ids.json"), encoding="utf-8") as f:
+            ids = cast(List[str], json.load(f))
+        if len(ids) != len(vectors):
+            raise ValueError(f"Expected {len(vectors)} IDs in the saved index but found {len(ids)}")
+
+        if len(vectors):
+            index._vectors = vectors
+            index._size = len(vectors)
+            index._ids = ids
+
+        if os.path.exists(os.path.join(directory, "centroids.npy")):
+            index._centroids = np.load(os.path.join(directory, "centroids.npy"))
+            index._lists = np.load(os.path.join(directory, "lists.npy"))
+
+        return index
+
+    def _reserve(self, size: int, *, dimensions: int) -> None:
+        if self._vectors is not None and len(self._vectors) >= size and self._vectors.flags.writeable:
+            return
+
+        # grow geometrically so that adding embeddings one batch at a time doesn't copy the whole index every time
+        capacity = max(size, 2 * (len(self._vectors) if self._vectors is not None else 0), 1024)
+        vectors = np.empty((capacity, dimensions), dtype=np.float32)
+        if self._vectors is not None:
+            vectors[: self._size] = self._vectors[: self._size]
+        self._vectors = vectors
+
+    def _search_lists(
+        self, query: npt.NDArray[np.float32], *, k: int, n_probe: Optional[int]
+    ) -> List[VectorIndexMatch]:
+        assert self._centroids is not None and self._lists is not None
+
+        if self._list_order is None or self._list_offsets is None:
+            self._list_order = np.argsort(self._lists, kind="stable")
+            self._list_offsets = np.searchsorted(self._lists[self._list_order], np.arange(len(self._centroids) + 1))
+
+        probes = n_probe if n_probe is not None else max(1, len(self._centroids) // 8)
+        probes = min(max(probes, 1), len(self._centroids))
+        closest = _top_k_rows(self._centroids @ query, probes)
+
+        order, offsets = self._list_order, self._list_offsets
+        candidates = np.concatenate([order[offsets[i] : offsets[i + 1]] for i in closest])
+        if len(candidates) == 0:
+            return []
+
+        scores = self.vectors[candidates] @ query
+        best = _top_k_rows(scores, k)
+        return self._matches(candidates[best], scores[best])
+
+    def _matches(self, rows: Any, scores: Any) -> List[VectorIndexMatch]:
+        return [
+            VectorIndexMatch(id=self._ids[row], score=float(score), index=int(row))
+            for row, score in zip(rows.tolist(), scores.tolist())
+        ]
+
+
+def _as_matrix(embeddings: EmbeddingsLike) -> npt.NDArray[np.float32]:
+    if isinstance(embeddings, CreateEmbeddingResponse):
+        data = sorted(embeddings.data, key=lambda embedding: embedding.index)
+        matrix = np.asarray([embedding.embedding for embedding in data], dtype=np.float32)
+    elif isinstance(embeddings, EmbeddingArray):
+        values = embeddings.embeddings
+        if isinstance(values, array.array):
+            matrix = np.frombuffer(values, dtype=np.float32).reshape(embeddings.shape)
+        else:
+            matrix = np.asarray(values, dtype=np.float32)
+    else:
+        matrix = np.asarray(embeddings, dtype=np.float32)
+
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    if matrix.ndim != 2:
+        raise ValueError(f"Expected a 2D array of embeddings but received an array of shape {matrix.shape}")
+    return matrix
+
+
+def _normalize(matrix: npt.NDArray[np.float32]) -> npt.NDArray[np.float32]:
+    norms: npt.NDArray[np.float32] = np.linalg.norm(matrix, axis=1, keepdims=True)
+    # leave zero vectors as they are instead of dividing by zero
+    norms[norms == 0] = 1
+    return (matrix / norms).astype(np.float32, copy=False)
+
+
+def _assign(vectors: npt.NDArray[np.float32], centroids: npt.NDArray[np.float32]) -> npt.NDArray[np.int32]:
+    """Returns the index of the closest centroid to each vector."""
+    assignments = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), _SEARCH_BLOCK_ROWS):
+        block = vectors[start : start + _SEARCH_BLOCK_ROWS]
+        assignments[start : start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return assignments
+
+
+def _top_k_rows(scores: npt.NDArray[np.float32], k: int) -> npt.NDArray[np.intp]:
+    """Returns the positions of the `k` highest scores in a 1D array, highest first."""
+    if k < len(scores):
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(len(scores))
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+def _top_k_blocks(
+    queries: npt.NDArray[np.float32],
+    vectors: npt.NDArray[np.float32],
+    *,
+    k: int,
+) -> Tuple[npt.NDArray[np.intp], npt.NDArray[np.float32]]:
+    """Scores every vector against every query, one block of vectors at a time, and keeps the top `k` of each query."""
+    best_rows = np.empty((len(queries), 0), dtype=np.intp)
+    best_scores = np.empty((len(queries), 0), dtype=np.float32)
+
+    for start in range(0, len(vectors), _SEARCH_BLOCK_ROWS):
+        scores = queries @ vectors[start : start + _SEARCH_BLOCK_ROWS].T
+        rows = np.broadcast_to(np.arange(start, start + scores.shape[1]), scores.shape)
+
+        candidates = np.concatenate([best_scores, scores], axis=1)
+        candidate_rows = np.concatenate([best_rows, rows], axis=1)
+
+        if candidates.shape[1] > k:
+            top = np.argpartition(-candidates, k - 1, axis=1)[:, :k]
+            candidates = np.take_along_axis(candidates, top, axis=1)
+            candidate_rows = np.take_along_axis(candidate_rows, top, axis=1)
+
+        best_scores, best_rows = candidates, candidate_rows
+
+    order = np.argsort(-best_scores, axis=1, kind="stable")
+    return np.take_along_axis(best_rows, order, axis=1), np.take_along_axis(best_scores, order, axis=1)
@@ -0,0 +1,461 @@
+from __future__ import annotations
+
+import os
+import json
+import time
+import logging
+import sqlite3
+import threading
+from typing import TYPE_CHECKING, Dict, List, Tuple, Union, Mapping, Callable, Iterator, Optional
+from pathlib import Path
+from typing_extensions import Literal, TypeAlias, override
+
+from .._types import NOT_GIVEN, NotGiven, FileTypes
+from ._file_index import hash_file_content
+from .._exceptions import NotFoundError
+from ..types.file_chunking_strategy_param import FileChunkingStrategyParam
+
+if TYPE_CHECKING:
+    from .._client import OpenAI, AsyncOpenAI
+
+log: logging.Logger = logging.getLogger(__name__)
+
+Attributes: TypeAlias = Dict[str, Union[str, float, bool]]
+
+SyncSource: TypeAlias = Union[str, "os.PathLike[str]", Mapping[str, FileTypes]]
+
+SyncOperationKind = Literal["add", "update", "update_attributes", "delete"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    vector_store_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    attributes TEXT,
+    file_id TEXT NOT NULL,
+    attached INTEGER NOT NULL,
+    previous_file_id TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (vector_store_id, key)
+)
+"""
+
+
+class ManifestEntry:
+    key: str
+    content_hash: str
+    attributes: Optional[Attributes]
+    file_id: str
+
+    attached: bool
+    """Whether the file has been added to the vector store, `False` if the sync was interrupted after the upload."""
+
+    previous_file_id: Optional[str]
+    """The file that this entry replaces, which still has to be removed once this one is attached."""
+
+    def __init__(
+        self,
+        *,
+        key: str,
+        content_hash: str,
+        attributes: Optional[Attributes],
+        file_id: str,
+        attached: bool,
+        previous_file_id: Optional[str] = None,
+    ) -> None:
+        self.key = key
+        self.content_hash = content_hash
+        self.attributes = attributes
+        self.file_id = file_id
+        self.attached = attached
+        self.previous_file_id = previous_file_id
+
+
+class VectorStoreManifest:
+    """A local record of the files that have been synced to vector stores.
+
+    Each entry maps a source key, e.g. a path relative to the synced directory, to
+    the hash of its contents, its attributes and the resulting file ID. Entries are
+    written as soon as each file has been uploaded and attached, so an interrupted
+    sync can be resumed by running it again with the same manifest.
+
+    The manifest is stored in a SQLite database and can hold entries for any number
+    of vector stores.
+    """
+
+    def __init__(self, path: str | os.PathLike[str] = ":memory:") -> None:
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            os.path.expanduser(path),
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._conn.execute(_SCHEMA)
+
+    def __enter__(self) -> VectorStoreManifest:
+        return self
+
+    def __exit__(self, *_args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def entries(self, vector_store_id: str) -> Dict[str, ManifestEntry]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, content_hash, attributes, file_id, attached, previous_file_id FROM entries WHERE vector_store_id = ?",
+                (vector_store_id,),
+            ).fetchall()
+
+        return {
+            key: ManifestEntry(
+                key=key,
+                content_hash=content_hash,
+                attributes=json.loads(attributes) if attributes is not None else None,
+                file_id=file_id,
+                attached=bool(attached),
+                previous_file_id=previous_file_id,
+            )
+            for key, content_hash, attributes, file_id, attached, previous_file_id in rows
+        }
+
+    def put(self, vector_store_id: str, entry: ManifestEntry) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (vector_store_id, key, content_hash, attributes, file_id, attached, previous_file_id, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    vector_store_id,
+                    entry.key,
+                    entry.content_hash,
+                    json.dumps(entry.attributes, sort_keys=True) if entry.attributes is not None else None,
+                    entry.file_id,
+                    int(entry.attached),
+                    entry.previous_file_id,
+                    time.time(),
+                ),
+            )
+
+    def remove(self, vector_store_id: str, key: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM entries WHERE vector_store_id = ? AND key = ?",
+                (vector_store_id, key),
+            )
+
+
+class SyncOperation:
+    kind: SyncOperationKind
+    key: str
+    file: Optional[FileTypes]
+    content_hash: Optional[str]
+    attributes: Optional[Attributes]
+
+    entry: Optional[ManifestEntry]
+    """The existing manifest entry for this key, if there is one."""
+
+    def __init__(
+        self,
+        kind: SyncOperationKind,
+        key: str,
+        *,
+        file: Optional[FileTypes] = None,
+        content_hash: Optional[str] = None,
+        attributes: Optional[Attributes] = None,
+        entry: Optional[ManifestEntry] = None,
+    ) -> None:
+        self.kind = kind
+        self.key = key
+        self.file = file
+        self.content_hash = content_hash
+        self.attributes = attributes
+        self.entry = entry
+
+    @override
+    def __repr__(self) -> str:
+        return f"SyncOperation(kind={self.kind!r}, key={self.key!r})"
+
+
+class VectorStoreSyncFailure:
+    key: str
+    operation: SyncOperationKind
+    error: Exception
+
+    def __init__(self, *, key: str, operation: SyncOperationKind, error: Exception) -> None:
+        self.key = key
+        self.operation = operation
+        self.error = error
+
+    @override
+    def __repr__(self) -> str:
+        return f"VectorStoreSyncFailure(key={self.key!r}, operation={self.operation!r}, error={self.error!r})"
+
+
+class VectorStoreSyncResult:
+    """The outcome of `vector_stores.sync()`, keys are listed per operation."""
+
+    added: List[str]
+    updated: List[str]
+    attributes_updated: List[str]
+    deleted: List[str]
+    unchanged: int
+    failures: List[VectorStoreSyncFailure]
+
+    dry_run: bool
+    """If `True` then the listed operations were only planned, not executed."""
+
+    def __init__(
+        self,
+        *,
+        operations: List[SyncOperation],
+        unchanged: int,
+        failures: List[VectorStoreSyncFailure],
+        dry_run: bool,
+    ) -> None:
+        failed = {(failure.operation, failure.key) for failure in failures}
+        succeeded = [op for op in operations if (op.kind, op.key) not in failed]
+
+        self.added = [op.key for op in succeeded if op.kind == "add"]
+        self.updated = [op.key for op in succeeded if op.kind == "update"]
+        self.attributes_updated = [op.key for op in succeeded if op.kind == "update_attributes"]
+        self.deleted = [op.key for op in succeeded if op.kind == "delete"]
+        self.unchanged = unchanged
+        self.failures = failures
+        self.dry_run = dry_run
+
+    @override
+    def __repr__(self) -> str:
+        return (
+            f"VectorStoreSyncResult(added={len(self.added)}, updated={len(self.updated)}, "
+            f"attributes_updated={len(self.attributes_updated)}, deleted={len(self.deleted)}, "
+            f"unchanged={self.unchanged}, failures={len(self.failures)}, dry_run={self.dry_run})"
+        )
+
+
+def iter_source(source: SyncSource) -> Iterator[Tuple[str, FileTypes]]:
+    """Yields `(key, file)` pairs, directories are walked recursively and keyed by their relative POSIX path."""
+    if isinstance(source, Mapping):
+        yield from source.items()
+        return
+
+    root = Path(source)
+    if not root.is_dir():
+        raise ValueError(f"Expected `source` to be a directory or a mapping of keys to files but received {source!r}")
+
+    for path in sorted(root.rglob("*")):
+        if path.is_file():
+            yield path.relative_to(root).as_posix(), path
+
+
+def plan_sync(
+    source: SyncSource,
+    entries: Dict[str, ManifestEntry],
+    *,
+    attributes: Optional[Callable[[str], Optional[Attributes]]],
+    delete: bool,
+) -> Tuple[List[SyncOperation], int]:
+    """Diffs the source against the manifest entries, returns the operations to run and the unchanged count."""
+    remaining = dict(entries)
+    operations: List[SyncOperation] = []
+    unchanged = 0
+
+    for key, file in iter_source(source):
+        content_hash = hash_file_content(file)
+        if content_hash is None:
+            raise TypeError(f"Cannot sync {key!r} as its contents cannot be read without consuming them")
+
+        attrs = attributes(key) if attributes is not None else None
+        entry = remaining.pop(key, None)
+
+        kind: Optional[SyncOperationKind]
+        if entry is None:
+            kind = "add"
+        elif entry.content_hash != content_hash or not entry.attached:
+            kind = "update" if entry.attached or entry.previous_file_id is not None else "add"
+        elif entry.attributes != attrs:
+            kind = "update_attributes"
+        else:
+            kind = None
+
+        if kind is None:
+            unchanged += 1
+        else:
+            operations.append(
+                SyncOperation(kind, key, file=file, content_hash=content_hash, attributes=attrs, entry=entry)
+            )
+
+    if delete:
+        operations.extend(SyncOperation("delete", key, entry=entry) for key, entry in remaining.items())
+    else:
+        unchanged += len(remaining)
+
+    return operations, unchanged
+
+
+def apply_sync_operation(
+    client: OpenAI,
+    vector_store_id: str,
+    operation: SyncOperation,
+    *,
+    manifest: VectorStoreManifest,
+    chunking_strategy: FileChunkingStrategyParam | NotGiven = NOT_GIVEN,
+) -> Optional[VectorStoreSyncFailure]:
+    """Runs a single sync operation, recording the result in the manifest as it progresses."""
+    entry = operation.entry
+    try:
+        if operation.kind == "delete":
+            assert entry is not None
+            _remove_file(client, vector_store_id, entry.file_id)
+            if entry.previous_file_id is not None:
+                _remove_file(client, vector_store_id, entry.previous_file_id)
+            manifest.remove(vector_store_id, operation.key)
+        elif operation.kind == "update_attributes":
+            assert entry is not None
+            client.vector_stores.files.update(
+                entry.file_id, vector_store_id=vector_store_id, attributes=operation.attributes
+            )
+            entry.attributes = operation.attributes
+            manifest.put(vector_store_id, entry)
+        else:
+            assert operation.file is not None and operation.content_hash is not None
+            if _is_resumable(operation):
+                assert entry is not None
+                log.debug("Resuming the sync of %r with the already uploaded file %s", operation.key, entry.file_id)
+            else:
+                if entry is not None and not entry.attached:
+                    # the file uploaded by an interrupted sync is out of date
+                    _remove_file(client, vector_store_id, entry.file_id)
+
+                file = client.files.create(file=operation.file, purpose="assistants")
+                entry = _uploaded_entry(operation, file.id)
+                manifest.put(vector_store_id, entry)
+
+            client.vector_stores.files.create(
+                vector_store_id,
+                file_id=entry.file_id,
+                attributes=operation.attributes if operation.attributes is not None else NOT_GIVEN,
+                chunking_strategy=chunking_strategy,
+            )
+            entry.attached = True
+            entry.attributes = operation.attributes
+            manifest.put(vector_store_id, entry)
+
+            if entry.previous_file_id is not None:
+                _remove_file(client, vector_store_id, entry.previous_file_id)
+                entry.previous_file_id = None
+                manifest.put(vector_store_id, entry)
+    except Exception as exc:
+        log.debug("Failed to %s %r: %s", operation.kind, operation.key, exc)
+        return VectorStoreSyncFailure(key=operation.key, operation=operation.kind, error=exc)
+
+    return None
+
+
+async def async_apply_sync_operation(
+    client: AsyncOpenAI,
+    vector_store_id: str,
+    operation: SyncOperation,
+    *,
+    manifest: VectorStoreManifest,
+    chunking_strategy: FileChunkingStrategyParam | NotGiven = NOT_GIVEN,
+) -> Optional[VectorStoreSyncFailure]:
+    """Runs a single sync operation, recording the result in the manifest as it progresses."""
+    entry = operation.entry
+    try:
+        if operation.kind == "delete":
+            assert entry is not None
+            await _async_remove_file(client, vector_store_id, entry.file_id)
+            if entry.previous_file_id is not None:
+                await _async_remove_file(client, vector_store_id, entry.previous_file_id)
+            manifest.remove(vector_store_id, operation.key)
+        elif operation.kind == "update_attributes":
+            assert entry is not None
+            await client.vector_stores.files.update(
+                entry.file_id, vector_store_id=vector_store_id, attributes=operation.attributes
+            )
+            entry.attributes = operation.attributes
+            manifest.put(vector_store_id, entry)
+        else:
+            assert operation.file is not None and operation.content_hash is not None
+            if _is_resumable(operation):
+                assert entry is not None
+                log.debug("Resuming the sync of %r with the already uploaded file %s", operation.key, entry.file_id)
+            else:
+                if entry is not None and not entry.attached:
+                    # the file uploaded by an interrupted sync is out of date
+                    await _async_remove_file(client, vector_store_id, entry.file_id)
+
+                file = await client.files.create(file=operation.file, purpose="assistants")
+                entry = _uploaded_entry(operation, file.id)
+                manifest.put(vector_store_id, entry)
+
+            await client.vector_stores.files.create(
+                vector_store_id,
+                file_id=entry.file_id,
+                attributes=operation.attributes if operation.attributes is not None else NOT_GIVEN,
+                chunking_strategy=chunking_strategy,
+            )
+            entry.attached = True
+            entry.attributes = operation.attributes
+            manifest.put(vector_store_id, entry)
+
+            if entry.previous_file_id is not None:
+                await _async_remove_file(client, vector_store_id, entry.previous_file_id)
+                entry.previous_file_id = None
+                manifest.put(vector_store_id, entry)
+    except Exception as exc:
+        log.debug("Failed to %s %r: %s", operation.kind, operation.key, exc)
+        return VectorStoreSyncFailure(key=operation.key, operation=operation.kind, error=exc)
+
+    return None
+
+
+def _is_resumable(operation: SyncOperation) -> bool:
+    entry = operation.entry
+    return entry is not None and not entry.attached and entry.content_hash == operation.content_hash
+
+
+def _uploaded_entry(operation: SyncOperation, file_id: str) -> ManifestEntry:
+    assert operation.content_hash is not None
+
+    entry = operation.entry
+    if entry is None:
+        previous_file_id = None
+    elif entry.attached:
+        previous_file_id = entry.file_id
+    else:
+        previous_file_id = entry.previous_file_id
+
+    return ManifestEntry(
+        key=operation.key,
+        content_hash=operation.content_hash,
+        attributes=operation.attributes,
+        file_id=file_id,
+        attached=False,
+        previous_file_id=previous_file_id,
+    )
+
+
+def _remove_file(client: OpenAI, vector_store_id: str, file_id: str) -> None:
+    try:
+        client.vector_stores.files.delete(file_id, vector_store_id=vector_store_id)
+    except NotFoundError:
+        pass
+
+    try:
+        client.files.delete(file_id)
+    except NotFoundError:
+        pass
+
+
+async def _async_remove_file(client: AsyncOpenAI, vector_store_id: str, file_id: str) -> None:
+    try:
+        await client.vector_stores.files.delete(file_id, vector_store_id=vector_store_id)
+    except NotFoundError:
+        pass
+
+    try:
+        await client.files.delete(file_id)
+    except NotFoundError:
+        pass
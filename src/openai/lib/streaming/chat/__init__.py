@@ -19,6 +19,7 @@ from ._events import (
     FunctionToolCallArgumentsDeltaEvent as FunctionToolCallArgumentsDeltaEvent,
 )
 from ._completions import (
+    ToolCallHook as ToolCallHook,
     ChatCompletionStream as ChatCompletionStream,
     AsyncChatCompletionStream as AsyncChatCompletionStream,
     ChatCompletionStreamState as ChatCompletionStreamState,
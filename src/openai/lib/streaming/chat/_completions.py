@@ -37,12 +37,15 @@ from ..._parsing import (
     parse_function_tool_arguments,
 )
 from ...._streaming import Stream, AsyncStream
-from ....types.chat import ChatCompletionChunk, ParsedChatCompletion, ChatCompletionToolParam
+from ....types.chat import ChatCompletionChunk, ParsedChatCompletion, ParsedFunctionToolCall, ChatCompletionToolParam
 from ...._exceptions import LengthFinishReasonError, ContentFilterFinishReasonError
 from ....types.chat.chat_completion import ChoiceLogprobs
 from ....types.chat.chat_completion_chunk import Choice as ChoiceChunk
 from ....types.chat.completion_create_params import ResponseFormat as ResponseFormatParam
 
+ToolCallHook = Callable[[ParsedFunctionToolCall], object]
+"""Called with a function tool call as soon as its arguments have been streamed."""
+
 
 class ChatCompletionStream(Generic[ResponseFormatT]):
     """Wrapper over the Chat Completions streaming API that adds helpful
@@ -59,11 +62,14 @@ class ChatCompletionStream(Generic[ResponseFormatT]):
         raw_stream: Stream[ChatCompletionChunk],
         response_format: type[ResponseFormatT] | ResponseFormatParam | NotGiven,
         input_tools: Iterable[ChatCompletionToolParam] | NotGiven,
+        on_tool_call: ToolCallHook | None = None,
     ) -> None:
         self._raw_stream = raw_stream
         self._response = raw_stream.response
         self._iterator = self.__stream__()
-        self._state = ChatCompletionStreamState(response_format=response_format, input_tools=input_tools)
+        self._state = ChatCompletionStreamState(
+            response_format=response_format, input_tools=input_tools, on_tool_call=on_tool_call
+        )
 
     def __next__(self) -> ChatCompletionStreamEvent[ResponseFormatT]:
         return self._iterator.__next__()
@@ -140,11 +146,13 @@ class ChatCompletionStreamManager(Generic[ResponseFormatT]):
         *,
         response_format: type[ResponseFormatT] | ResponseFormatParam | NotGiven,
         input_tools: Iterable[ChatCompletionToolParam] | NotGiven,
+        on_tool_call: ToolCallHook | None = None,
     ) -> None:
         self.__stream: ChatCompletionStream[ResponseFormatT] | None = None
         self.__api_request = api_request
         self.__response_format = response_format
         self.__input_tools = input_tools
+        self.__on_tool_call = on_tool_call
 
     def __enter__(self) -> ChatCompletionStream[ResponseFormatT]:
         raw_stream = self.__api_request()
@@ -153,6 +161,7 @@ class ChatCompletionStreamManager(Generic[ResponseFormatT]):
             raw_stream=raw_stream,
             response_format=self.__response_format,
             input_tools=self.__input_tools,
+            on_tool_call=self.__on_tool_call,
         )
 
         return self.__stream
@@ -182,11 +191,14 @@ class AsyncChatCompletionStream(Generic[ResponseFormatT]):
         raw_stream: AsyncStream[ChatCompletionChunk],
         response_format: type[ResponseFormatT] | ResponseFormatParam | NotGiven,
         input_tools: Iterable[ChatCompletionToolParam] | NotGiven,
+        on_tool_call: ToolCallHook | None = None,
     ) -> None:
         self._raw_stream = raw_stream
         self._response = raw_stream.response
         self._iterator = self.__stream__()
-        self._state = ChatCompletionStreamState(response_format=response_format, input_tools=input_tools)
+        self._state = ChatCompletionStreamState(
+            response_format=response_format, input_tools=input_tools, on_tool_call=on_tool_call
+        )
 
     async def __anext__(self) -> ChatCompletionStreamEvent[ResponseFormatT]:
         return await self._iterator.__anext__()
@@ -263,11 +275,13 @@ class AsyncChatCompletionStreamManager(Generic[ResponseFormatT]):
         *,
         response_format: type[ResponseFormatT] | ResponseFormatParam | NotGiven,
         input_tools: Iterable[ChatCompletionToolParam] | NotGiven,
+        on_tool_call: ToolCallHook | None = None,
     ) -> None:
         self.__stream: AsyncChatCompletionStream[ResponseFormatT] | None = None
         self.__api_request = api_request
         self.__response_format = response_format
         self.__input_tools = input_tools
+        self.__on_tool_call = on_tool_call
 
     async def __aenter__(self) -> AsyncChatCompletionStream[ResponseFormatT]:
         raw_stream = await self.__api_request
@@ -276,6 +290,7 @@ class AsyncChatCompletionStreamManager(Generic[ResponseFormatT]):
             raw_stream=raw_stream,
             response_format=self.__response_format,
             input_tools=self.__input_tools,
+            on_tool_call=self.__on_tool_call,
         )
 
         return self.__stream
@@ -309,6 +324,10 @@ class ChatCompletionStreamState(Generic[ResponseFormatT]):
 
     print(state.get_final_completion())
     ```
+
+    If `on_tool_call` is given it is called with each function tool call as soon as its
+    arguments are complete, before the rest of the completion has been received, so that
+    the tool can start running while the model is still generating.
     """
 
     def __init__(
@@ -316,9 +335,11 @@ class ChatCompletionStreamState(Generic[ResponseFormatT]):
         *,
         input_tools: Iterable[ChatCompletionToolParam] | NotGiven = NOT_GIVEN,
         response_format: type[ResponseFormatT] | ResponseFormatParam | NotGiven = NOT_GIVEN,
+        on_tool_call: ToolCallHook | None = None,
     ) -> None:
         self.__current_completion_snapshot: ParsedChatCompletionSnapshot | None = None
         self.__choice_event_states: list[ChoiceEventState] = []
+        self._on_tool_call = on_tool_call
 
         self._input_tools = [tool for tool in input_tools] if is_given(input_tools) else []
         self._response_format = response_format
@@ -572,13 +593,18 @@ class ChatCompletionStreamState(Generic[ResponseFormatT]):
                         ),
                     )
 
-            events_to_fire.extend(
-                choice_state.get_done_events(
-                    choice_chunk=choice,
-                    choice_snapshot=choice_snapshot,
-                    response_format=self._response_format,
-                )
+            done_events = choice_state.get_done_events(
+                choice_chunk=choice,
+                choice_snapshot=choice_snapshot,
+                response_format=self._response_format,
             )
+            events_to_fire.extend(done_events)
+
+            if self._on_tool_call is not None:
+                for event in done_events:
+                    if event.type == "tool_calls.function.arguments.done":
+                        assert choice_snapshot.message.tool_calls is not None
+                        self._on_tool_call(choice_snapshot.message.tool_calls[event.index])
 
         return events_to_fire
 
@@ -4,6 +4,7 @@ from ._events import (
     ResponseFunctionCallArgumentsDeltaEvent as ResponseFunctionCallArgumentsDeltaEvent,
 )
 from ._responses import (
+    ToolCallHook as ToolCallHook,
     ResponseStream as ResponseStream,
     AsyncResponseStream as AsyncResponseStream,
     ResponseStreamEvent as ResponseStreamEvent,
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import time
 import inspect
 from types import TracebackType
-from typing import Any, List, Generic, Iterable, Awaitable, cast
+from random import random
+from typing import Any, List, Tuple, Generic, Iterable, Optional, Awaitable, cast
 from typing_extensions import Self, Callable, Iterator, AsyncIterator
 
+import anyio
+import httpx
+
 from ._types import ParsedResponseSnapshot
 from ._events import (
     ResponseStreamEvent,
@@ -15,16 +20,27 @@ from ._events import (
 )
 from ...._types import NOT_GIVEN, NotGiven
 from ...._utils import is_given, consume_sync_iterator, consume_async_iterator
-from ...._models import build, construct_type_unchecked
+from ...._models import build_from
+from ...._constants import MAX_RETRY_DELAY, INITIAL_RETRY_DELAY
 from ...._streaming import Stream, AsyncStream
 from ....types.responses import ParsedResponse, ResponseStreamEvent as RawResponseStreamEvent
-from ..._parsing._responses import TextFormatT, parse_text, parse_response
+from ..._parsing._responses import TextFormatT, parse_text, parse_response, parse_function_tool_arguments
 from ....types.responses.tool_param import ToolParam
 from ....types.responses.parsed_response import (
-    ParsedContent,
+    ParsedResponseOutputText,
     ParsedResponseOutputMessage,
     ParsedResponseFunctionToolCall,
 )
+from ....types.responses.response_output_item import ResponseOutputItem
+from ....types.responses.response_output_text import ResponseOutputText
+
+ToolCallHook = Callable[[ParsedResponseFunctionToolCall], object]
+"""Called with a function call as soon as its arguments have been streamed."""
+
+Reconnect = Callable[[str, int], Stream[RawResponseStreamEvent]]
+"""Re-opens the stream of the given response, starting after the given sequence number."""
+
+AsyncReconnect = Callable[[str, int], Awaitable[AsyncStream[RawResponseStreamEvent]]]
 
 
 class ResponseStream(Generic[TextFormatT]):
@@ -35,12 +51,18 @@ class ResponseStream(Generic[TextFormatT]):
         text_format: type[TextFormatT] | NotGiven,
         input_tools: Iterable[ToolParam] | NotGiven,
         starting_after: int | None,
+        on_tool_call: ToolCallHook | None = None,
+        reconnect: Reconnect | None = None,
+        max_reconnects: int = 0,
+        response_id: str | None = None,
     ) -> None:
         self._raw_stream = raw_stream
         self._response = raw_stream.response
         self._iterator = self.__stream__()
-        self._state = ResponseStreamState(text_format=text_format, input_tools=input_tools)
+        self._state = ResponseStreamState(text_format=text_format, input_tools=input_tools, on_tool_call=on_tool_call)
         self._starting_after = starting_after
+        self._reconnect = reconnect
+        self._progress = _StreamProgress(response_id=response_id, max_reconnects=max_reconnects if reconnect else 0)
 
     def __next__(self) -> ResponseStreamEvent[TextFormatT]:
         return self._iterator.__next__()
@@ -53,11 +75,34 @@ class ResponseStream(Generic[TextFormatT]):
         return self
 
     def __stream__(self) -> Iterator[ResponseStreamEvent[TextFormatT]]:
-        for sse_event in self._raw_stream:
-            events_to_fire = self._state.handle_event(sse_event)
-            for event in events_to_fire:
-                if self._starting_after is None or event.sequence_number > self._starting_after:
-                    yield event
+        while True:
+            try:
+                for sse_event in self._raw_stream:
+                    if not self._progress.track(sse_event):
+                        continue
+
+                    events_to_fire = self._state.handle_event(sse_event)
+                    for event in events_to_fire:
+                        if self._starting_after is None or event.sequence_number > self._starting_after:
+                            yield event
+            except httpx.TransportError:
+                if not self._progress.can_resume():
+                    raise
+            else:
+                if not self._progress.can_resume():
+                    return
+
+            self._resume()
+
+    def _resume(self) -> None:
+        assert self._reconnect is not None
+        response_id, starting_after = self._progress.resume_from()
+
+        self._response.close()
+        time.sleep(self._progress.next_delay())
+
+        self._raw_stream = self._reconnect(response_id, starting_after)
+        self._response = self._raw_stream.response
 
     def __exit__(
         self,
@@ -100,12 +145,20 @@ class ResponseStreamManager(Generic[TextFormatT]):
         text_format: type[TextFormatT] | NotGiven,
         input_tools: Iterable[ToolParam] | NotGiven,
         starting_after: int | None,
+        on_tool_call: ToolCallHook | None = None,
+        reconnect: Reconnect | None = None,
+        max_reconnects: int = 0,
+        response_id: str | None = None,
     ) -> None:
         self.__stream: ResponseStream[TextFormatT] | None = None
         self.__api_request = api_request
         self.__text_format = text_format
         self.__input_tools = input_tools
         self.__starting_after = starting_after
+        self.__on_tool_call = on_tool_call
+        self.__reconnect = reconnect
+        self.__max_reconnects = max_reconnects
+        self.__response_id = response_id
 
     def __enter__(self) -> ResponseStream[TextFormatT]:
         raw_stream = self.__api_request()
@@ -115,6 +168,10 @@ class ResponseStreamManager(Generic[TextFormatT]):
             text_format=self.__text_format,
             input_tools=self.__input_tools,
             starting_after=self.__starting_after,
+            on_tool_call=self.__on_tool_call,
+            reconnect=self.__reconnect,
+            max_reconnects=self.__max_reconnects,
+            response_id=self.__response_id,
         )
 
         return self.__stream
@@ -137,12 +194,18 @@ class AsyncResponseStream(Generic[TextFormatT]):
         text_format: type[TextFormatT] | NotGiven,
         input_tools: Iterable[ToolParam] | NotGiven,
         starting_after: int | None,
+        on_tool_call: ToolCallHook | None = None,
+        reconnect: AsyncReconnect | None = None,
+        max_reconnects: int = 0,
+        response_id: str | None = None,
     ) -> None:
         self._raw_stream = raw_stream
         self._response = raw_stream.response
         self._iterator = self.__stream__()
-        self._state = ResponseStreamState(text_format=text_format, input_tools=input_tools)
+        self._state = ResponseStreamState(text_format=text_format, input_tools=input_tools, on_tool_call=on_tool_call)
         self._starting_after = starting_after
+        self._reconnect = reconnect
+        self._progress = _StreamProgress(response_id=response_id, max_reconnects=max_reconnects if reconnect else 0)
 
     async def __anext__(self) -> ResponseStreamEvent[TextFormatT]:
         return await self._iterator.__anext__()
@@ -152,11 +215,34 @@ class AsyncResponseStream(Generic[TextFormatT]):
             yield item
 
     async def __stream__(self) -> AsyncIterator[ResponseStreamEvent[TextFormatT]]:
-        async for sse_event in self._raw_stream:
-            events_to_fire = self._state.handle_event(sse_event)
-            for event in events_to_fire:
-                if self._starting_after is None or event.sequence_number > self._starting_after:
-                    yield event
+        while True:
+            try:
+                async for sse_event in self._raw_stream:
+                    if not self._progress.track(sse_event):
+                        continue
+
+                    events_to_fire = self._state.handle_event(sse_event)
+                    for event in events_to_fire:
+                        if self._starting_after is None or event.sequence_number > self._starting_after:
+                            yield event
+            except httpx.TransportError:
+                if not self._progress.can_resume():
+                    raise
+            else:
+                if not self._progress.can_resume():
+                    return
+
+            await self._resume()
+
+    async def _resume(self) -> None:
+        assert self._reconnect is not None
+        response_id, starting_after = self._progress.resume_from()
+
+        await self._response.aclose()
+        await anyio.sleep(self._progress.next_delay())
+
+        self._raw_stream = await self._reconnect(response_id, starting_after)
+        self._response = self._raw_stream.response
 
     async def __aenter__(self) -> Self:
         return self
@@ -202,12 +288,20 @@ class AsyncResponseStreamManager(Generic[TextFormatT]):
         text_format: type[TextFormatT] | NotGiven,
         input_tools: Iterable[ToolParam] | NotGiven,
         starting_after: int | None,
+        on_tool_call: ToolCallHook | None = None,
+        reconnect: AsyncReconnect | None = None,
+        max_reconnects: int = 0,
+        response_id: str | None = None,
     ) -> None:
         self.__stream: AsyncResponseStream[TextFormatT] | None = None
         self.__api_request = api_request
         self.__text_format = text_format
         self.__input_tools = input_tools
         self.__starting_after = starting_after
+        self.__on_tool_call = on_tool_call
+        self.__reconnect = reconnect
+        self.__max_reconnects = max_reconnects
+        self.__response_id = response_id
 
     async def __aenter__(self) -> AsyncResponseStream[TextFormatT]:
         raw_stream = await self.__api_request
@@ -217,6 +311,10 @@ class AsyncResponseStreamManager(Generic[TextFormatT]):
             text_format=self.__text_format,
             input_tools=self.__input_tools,
             starting_after=self.__starting_after,
+            on_tool_call=self.__on_tool_call,
+            reconnect=self.__reconnect,
+            max_reconnects=self.__max_reconnects,
+            response_id=self.__response_id,
         )
 
         return self.__stream
@@ -231,14 +329,76 @@ class AsyncResponseStreamManager(Generic[TextFormatT]):
             await self.__stream.close()
 
 
+class _StreamProgress:
+    """Tracks how far a stream has got so that it can be resumed after the connection drops.
+
+    Events are deduplicated by their `sequence_number`, so the events that are sent
+    again after resuming are never handled twice.
+    """
+
+    def __init__(self, *, response_id: str | None, max_reconnects: int) -> None:
+        self.response_id = response_id
+        self.last_sequence_number: Optional[int] = None
+        self.finished = False
+        self._max_reconnects = max_reconnects
+        self._failed_reconnects = 0
+
+    def track(self, event: RawResponseStreamEvent) -> bool:
+        """Records the event and returns whether or not it should be handled."""
+        if self.last_sequence_number is not None and event.sequence_number <= self.last_sequence_number:
+            return False
+
+        self.last_sequence_number = event.sequence_number
+        self._failed_reconnects = 0
+
+        if event.type == "response.created" or event.type == "response.queued":
+            self.response_id = event.response.id
+        elif (
+            event.type == "response.completed"
+            or event.type == "response.failed"
+            or event.type == "response.incomplete"
+            or event.type == "error"
+        ):
+            self.finished = True
+
+        return True
+
+    def can_resume(self) -> bool:
+        return (
+            not self.finished
+            and self.response_id is not None
+            and self.last_sequence_number is not None
+            and self._failed_reconnects < self._max_reconnects
+        )
+
+    def resume_from(self) -> Tuple[str, int]:
+        assert self.response_id is not None and self.last_sequence_number is not None
+        return self.response_id, self.last_sequence_number
+
+    def next_delay(self) -> float:
+        # the same exponential backoff with jitter that is used for retrying requests
+        delay = min(INITIAL_RETRY_DELAY * pow(2.0, self._failed_reconnects), MAX_RETRY_DELAY)
+        self._failed_reconnects += 1
+        return delay * (1 - 0.25 * random())
+
+
 class ResponseStreamState(Generic[TextFormatT]):
+    """Accumulates `ResponseStreamEvent`s into a `ParsedResponse`.
+
+    If `on_tool_call` is given it is called with each function call as soon as its
+    arguments are complete, before the rest of the response has been received, so that
+    the tool can start running while the model is still generating.
+    """
+
     def __init__(
         self,
         *,
         input_tools: Iterable[ToolParam] | NotGiven,
         text_format: type[TextFormatT] | NotGiven,
+        on_tool_call: ToolCallHook | None = None,
     ) -> None:
         self.__current_snapshot: ParsedResponseSnapshot | None = None
+        self._on_tool_call = on_tool_call
         self._completed_response: ParsedResponse[TextFormatT] | None = None
         self._input_tools = [tool for tool in input_tools] if is_given(input_tools) else []
         self._text_format = text_format
@@ -256,18 +416,7 @@ class ResponseStreamState(Generic[TextFormatT]):
             content = output.content[event.content_index]
             assert content.type == "output_text"
 
-            events.append(
-                build(
-                    ResponseTextDeltaEvent,
-                    content_index=event.content_index,
-                    delta=event.delta,
-                    item_id=event.item_id,
-                    output_index=event.output_index,
-                    sequence_number=event.sequence_number,
-                    type="response.output_text.delta",
-                    snapshot=content.text,
-                )
-            )
+            events.append(build_from(ResponseTextDeltaEvent, event, snapshot=content.text))
         elif event.type == "response.output_text.done":
             output = snapshot.output[event.output_index]
             assert output.type == "message"
@@ -276,14 +425,9 @@ class ResponseStreamState(Generic[TextFormatT]):
             assert content.type == "output_text"
 
             events.append(
-                build(
+                build_from(
                     ResponseTextDoneEvent[TextFormatT],
-                    content_index=event.content_index,
-                    item_id=event.item_id,
-                    output_index=event.output_index,
-                    sequence_number=event.sequence_number,
-                    type="response.output_text.done",
-                    text=event.text,
+                    event,
                     parsed=parse_text(event.text, text_format=self._text_format),
                 )
             )
@@ -291,30 +435,23 @@ class ResponseStreamState(Generic[TextFormatT]):
             output = snapshot.output[event.output_index]
             assert output.type == "function_call"
 
-            events.append(
-                build(
-                    ResponseFunctionCallArgumentsDeltaEvent,
-                    delta=event.delta,
-                    item_id=event.item_id,
-                    output_index=event.output_index,
-                    sequence_number=event.sequence_number,
-                    type="response.function_call_arguments.delta",
-                    snapshot=output.arguments,
-                )
-            )
+            events.append(build_from(ResponseFunctionCallArgumentsDeltaEvent, event, snapshot=output.arguments))
+        elif event.type == "response.function_call_arguments.done":
+            output = snapshot.output[event.output_index]
+            assert output.type == "function_call"
 
+            events.append(event)
+
+            if self._on_tool_call is not None:
+                output.parsed_arguments = parse_function_tool_arguments(
+                    input_tools=self._input_tools, function_call=output
+                )
+                self._on_tool_call(output)
         elif event.type == "response.completed":
             response = self._completed_response
             assert response is not None
 
-            events.append(
-                build(
-                    ResponseCompletedEvent,
-                    sequence_number=event.sequence_number,
-                    type="response.completed",
-                    response=response,
-                )
-            )
+            events.append(build_from(ResponseCompletedEvent[TextFormatT], event, response=response))
         else:
             events.append(event)
 
@@ -327,23 +464,21 @@ class ResponseStreamState(Generic[TextFormatT]):
 
         if event.type == "response.output_item.added":
             if event.item.type == "function_call":
-                snapshot.output.append(
-                    construct_type_unchecked(
-                        type_=cast(Any, ParsedResponseFunctionToolCall), value=event.item.to_dict()
-                    )
-                )
+                snapshot.output.append(build_from(ParsedResponseFunctionToolCall, event.item))
             elif event.item.type == "message":
                 snapshot.output.append(
-                    construct_type_unchecked(type_=cast(Any, ParsedResponseOutputMessage), value=event.item.to_dict())
+                    build_from(
+                        cast(Any, ParsedResponseOutputMessage),
+                        event.item,
+                        content=[_parsed_content(part) for part in event.item.content],
+                    )
                 )
             else:
                 snapshot.output.append(event.item)
         elif event.type == "response.content_part.added":
             output = snapshot.output[event.output_index]
             if output.type == "message":
-                output.content.append(
-                    construct_type_unchecked(type_=cast(Any, ParsedContent), value=event.part.to_dict())
-                )
+                output.content.append(_parsed_content(event.part))
         elif event.type == "response.output_text.delta":
             output = snapshot.output[event.output_index]
             if output.type == "message":
@@ -354,6 +489,10 @@ class ResponseStreamState(Generic[TextFormatT]):
             output = snapshot.output[event.output_index]
             if output.type == "function_call":
                 output.arguments += event.delta
+        elif event.type == "response.function_call_arguments.done":
+            output = snapshot.output[event.output_index]
+            if output.type == "function_call":
+                output.arguments = event.arguments
         elif event.type == "response.completed":
             self._completed_response = parse_response(
                 text_format=self._text_format,
@@ -367,4 +506,25 @@ class ResponseStreamState(Generic[TextFormatT]):
         if event.type != "response.created":
             raise RuntimeError(f"Expected to have received `response.created` before `{event.type}`")
 
-        return construct_type_unchecked(type_=ParsedResponseSnapshot, value=event.response.to_dict())
+        # the output list is appended to as items are received so it can't be shared with the event
+        return build_from(
+            ParsedResponseSnapshot,
+            event.response,
+            output=[_parsed_output_item(item) for item in event.response.output],
+        )
+
+
+def _parsed_content(part: object) -> Any:
+    if isinstance(part, ResponseOutputText):
+        return build_from(cast(Any, ParsedResponseOutputText), part)
+    return part
+
+
+def _parsed_output_item(item: ResponseOutputItem) -> Any:
+    if item.type == "function_call":
+        return build_from(ParsedResponseFunctionToolCall, item)
+    if item.type == "message":
+        return build_from(
+            cast(Any, ParsedResponseOutputMessage), item, content=[_parsed_content(part) for part in item.content]
+        )
+    return item
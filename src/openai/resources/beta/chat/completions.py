@@ -24,7 +24,7 @@ from ....lib._parsing import (
     type_to_response_format_param as _type_to_response_format,
 )
 from ....types.chat_model import ChatModel
-from ....lib.streaming.chat import ChatCompletionStreamManager, AsyncChatCompletionStreamManager
+from ....lib.streaming.chat import ToolCallHook, ChatCompletionStreamManager, AsyncChatCompletionStreamManager
 from ....types.shared_params import Metadata, ReasoningEffort
 from ....types.chat.chat_completion import ChatCompletion
 from ....types.chat.chat_completion_chunk import ChatCompletionChunk
@@ -239,6 +239,7 @@ class Completions(SyncAPIResource):
         top_p: Optional[float] | NotGiven = NOT_GIVEN,
         user: str | NotGiven = NOT_GIVEN,
         web_search_options: completion_create_params.WebSearchOptions | NotGiven = NOT_GIVEN,
+        on_tool_call: ToolCallHook | None = None,
         # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
         # The extra values given here take precedence over values defined on the client or passed to this method.
         extra_headers: Headers | None = None,
@@ -267,6 +268,9 @@ class Completions(SyncAPIResource):
 
         When the context manager exits, the response will be closed, however the `stream` instance is still available outside
         the context manager.
+
+        If `on_tool_call` is given it is called with each function tool call as soon as its arguments have been received,
+        while the rest of the completion is still streaming, so that the tool can start running early.
         """
         extra_headers = {
             "X-Stainless-Helper-Method": "beta.chat.completions.stream",
@@ -315,6 +319,7 @@ class Completions(SyncAPIResource):
             api_request,
             response_format=response_format,
             input_tools=tools,
+            on_tool_call=on_tool_call,
         )
 
 
@@ -518,6 +523,7 @@ class AsyncCompletions(AsyncAPIResource):
         top_p: Optional[float] | NotGiven = NOT_GIVEN,
         user: str | NotGiven = NOT_GIVEN,
         web_search_options: completion_create_params.WebSearchOptions | NotGiven = NOT_GIVEN,
+        on_tool_call: ToolCallHook | None = None,
         # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
         # The extra values given here take precedence over values defined on the client or passed to this method.
         extra_headers: Headers | None = None,
@@ -546,6 +552,9 @@ class AsyncCompletions(AsyncAPIResource):
 
         When the context manager exits, the response will be closed, however the `stream` instance is still available outside
         the context manager.
+
+        If `on_tool_call` is given it is called with each function tool call as soon as its arguments have been received,
+        while the rest of the completion is still streaming, so that the tool can start running early.
         """
         _validate_input_tools(tools)
 
@@ -595,6 +604,7 @@ class AsyncCompletions(AsyncAPIResource):
             api_request,
             response_format=response_format,
             input_tools=tools,
+            on_tool_call=on_tool_call,
         )
 
 
@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 import inspect
-from typing import Dict, List, Union, Iterable, Optional
+from typing import Dict, List, Union, Callable, Iterable, Iterator, Optional, Awaitable, AsyncIterable, cast
+from functools import partial
 from typing_extensions import Literal, overload
 
 import httpx
@@ -32,6 +33,14 @@ from ....types.chat import (
     completion_update_params,
 )
 from ...._base_client import AsyncPaginator, make_request_options
+from ....lib._fan_out import (
+    DEFAULT_FAN_OUT_CONCURRENCY,
+    DEFAULT_MAX_REQUEST_RETRIES,
+    RequestResult,
+    ProgressCallback,
+    AsyncRequestResults,
+    iter_many,
+)
 from ....types.shared.chat_model import ChatModel
 from ....types.chat.chat_completion import ChatCompletion
 from ....types.shared_params.metadata import Metadata
@@ -970,6 +979,64 @@ class Completions(SyncAPIResource):
             stream_cls=Stream[ChatCompletionChunk],
         )
 
+    def create_many(
+        self,
+        requests: Iterable[completion_create_params.CompletionCreateParamsNonStreaming],
+        *,
+        concurrency: int = DEFAULT_FAN_OUT_CONCURRENCY,
+        ordered: bool = False,
+        max_request_retries: int = DEFAULT_MAX_REQUEST_RETRIES,
+        on_progress: Optional[ProgressCallback] = None,
+        # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
+        # The extra values given here take precedence over values defined on the client or passed to this method.
+        extra_headers: Headers | None = None,
+        extra_query: Query | None = None,
+        extra_body: Body | None = None,
+        timeout: float | httpx.Timeout | None | NotGiven = NOT_GIVEN,
+    ) -> Iterator[RequestResult[ChatCompletion]]:
+        """Creates a chat completion for each of the given requests, sending at most `concurrency` at a time.
+
+        Results are yielded as the requests finish, or in the order of the requests with
+        `ordered=True`. Requests are read from `requests` as they're sent, so a lazy
+        iterable of any size can be given and memory use stays flat.
+
+        A request that fails with a rate limit, connection or server error after the
+        client's own retries is retried on its own up to `max_request_retries` times.
+        When a request is rate limited every other request waits before being sent. Errors
+        aren't raised, a failed request's `RequestResult` has its `error` set instead.
+
+        ```py
+        for result in client.chat.completions.create_many(requests, concurrency=32):
+            print(result.index, result.result if result.ok else result.error)
+        ```
+
+        Args:
+          requests: The params of each `create()` call, without `stream`.
+
+          concurrency: The maximum number of requests to send at once.
+
+          ordered: Whether to return the results in the order of the requests instead of as
+              they finish.
+
+          max_request_retries: How many times to retry a request that failed with a retryable error.
+
+          on_progress: A function that's called with the number of started, succeeded and failed
+              requests whenever a request finishes.
+        """
+        create = partial(
+            self.create, extra_headers=extra_headers, extra_query=extra_query, extra_body=extra_body, timeout=timeout
+        )
+        return iter_many(
+            cast("Callable[..., ChatCompletion]", create),
+            requests,
+            concurrency=concurrency,
+            ordered=ordered,
+            max_request_retries=max_request_retries,
+            on_progress=on_progress,
+            sleep=self._sleep,
+            parse_retry_after=self._client._parse_retry_after_header,
+        )
+
     def retrieve(
         self,
         completion_id: str,
@@ -2073,6 +2140,63 @@ class AsyncCompletions(AsyncAPIResource):
             stream_cls=AsyncStream[ChatCompletionChunk],
         )
 
+    def create_many(
+        self,
+        requests: Union[
+            Iterable[completion_create_params.CompletionCreateParamsNonStreaming],
+            AsyncIterable[completion_create_params.CompletionCreateParamsNonStreaming],
+        ],
+        *,
+        concurrency: int = DEFAULT_FAN_OUT_CONCURRENCY,
+        ordered: bool = False,
+        max_request_retries: int = DEFAULT_MAX_REQUEST_RETRIES,
+        on_progress: Optional[ProgressCallback] = None,
+        # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
+        # The extra values given here take precedence over values defined on the client or passed to this method.
+        extra_headers: Headers | None = None,
+        extra_query: Query | None = None,
+        extra_body: Body | None = None,
+        timeout: float | httpx.Timeout | None | NotGiven = NOT_GIVEN,
+    ) -> AsyncRequestResults[ChatCompletion]:
+        """Creates a chat completion for each of the given requests, sending at most `concurrency` at a time.
+
+        This works like the sync `create_many()`, except that the results must be iterated
+        inside an `async with` block, leaving it cancels any requests that are still in
+        flight. `requests` may also be an async iterable.
+
+        ```py
+        async with client.chat.completions.create_many(requests, concurrency=32) as results:
+            async for result in results:
+                print(result.index, result.result if result.ok else result.error)
+        ```
+
+        Args:
+          requests: The params of each `create()` call, without `stream`.
+
+          concurrency: The maximum number of requests to send at once.
+
+          ordered: Whether to return the results in the order of the requests instead of as
+              they finish.
+
+          max_request_retries: How many times to retry a request that failed with a retryable error.
+
+          on_progress: A function that's called with the number of started, succeeded and failed
+              requests whenever a request finishes.
+        """
+        create = partial(
+            self.create, extra_headers=extra_headers, extra_query=extra_query, extra_body=extra_body, timeout=timeout
+        )
+        return AsyncRequestResults(
+            cast("Callable[..., Awaitable[ChatCompletion]]", create),
+            requests,
+            concurrency=concurrency,
+            ordered=ordered,
+            max_request_retries=max_request_retries,
+            on_progress=on_progress,
+            sleep=self._sleep,
+            parse_retry_after=self._client._parse_retry_after_header,
+        )
+
     async def retrieve(
         self,
         completion_id: str,
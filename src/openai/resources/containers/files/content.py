@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import os
+
 import httpx
 
 from .... import _legacy_response
@@ -15,6 +17,12 @@ from ...._response import (
     async_to_custom_streamed_response_wrapper,
 )
 from ...._base_client import make_request_options
+from ....lib._download import (
+    DEFAULT_SEGMENT_SIZE,
+    DEFAULT_MAX_CONCURRENCY,
+    download_to_file,
+    async_download_to_file,
+)
 
 __all__ = ["Content", "AsyncContent"]
 
@@ -76,6 +84,47 @@ class Content(SyncAPIResource):
             cast_to=_legacy_response.HttpxBinaryResponseContent,
         )
 
+    def download_to_file(
+        self,
+        file_id: str,
+        file: str | os.PathLike[str],
+        *,
+        container_id: str,
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
+        # The extra values given here take precedence over values defined on the client or passed to this method.
+        extra_headers: Headers | None = None,
+        extra_query: Query | None = None,
+        timeout: float | httpx.Timeout | None | NotGiven = NOT_GIVEN,
+    ) -> int:
+        """Downloads the contents of the given container file to disk.
+
+        The content is fetched as `segment_size` byte ranges, with up to
+        `max_concurrency` requests in flight at once, and each range is written
+        directly to its offset in the destination file. If the server doesn't support
+        range requests then the content is streamed in a single request instead.
+
+        Returns the number of bytes written.
+        """
+        if not container_id:
+            raise ValueError(f"Expected a non-empty value for `container_id` but received {container_id!r}")
+        if not file_id:
+            raise ValueError(f"Expected a non-empty value for `file_id` but received {file_id!r}")
+
+        return download_to_file(
+            lambda headers: self.with_streaming_response.retrieve(
+                file_id,
+                container_id=container_id,
+                extra_headers={**(extra_headers or {}), **headers},
+                extra_query=extra_query,
+                timeout=timeout,
+            ),
+            file,
+            segment_size=segment_size,
+            max_concurrency=max_concurrency,
+        )
+
 
 class AsyncContent(AsyncAPIResource):
     @cached_property
@@ -134,6 +183,47 @@ class AsyncContent(AsyncAPIResource):
             cast_to=_legacy_response.HttpxBinaryResponseContent,
         )
 
+    async def download_to_file(
+        self,
+        file_id: str,
+        file: str | os.PathLike[str],
+        *,
+        container_id: str,
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
+        # The extra values given here take precedence over values defined on the client or passed to this method.
+        extra_headers: Headers | None = None,
+        extra_query: Query | None = None,
+        timeout: float | httpx.Timeout | None | NotGiven = NOT_GIVEN,
+    ) -> int:
+        """Downloads the contents of the given container file to disk.
+
+        The content is fetched as `segment_size` byte ranges, with up to
+        `max_concurrency` requests in flight at once, and each range is written
+        directly to its offset in the destination file. If the server doesn't support
+        range requests then the content is streamed in a single request instead.
+
+        Returns the number of bytes written.
+        """
+        if not container_id:
+            raise ValueError(f"Expected a non-empty value for `container_id` but received {container_id!r}")
+        if not file_id:
+            raise ValueError(f"Expected a non-empty value for `file_id` but received {file_id!r}")
+
+        return await async_download_to_file(
+            lambda headers: self.with_streaming_response.retrieve(
+                file_id,
+                container_id=container_id,
+                extra_headers={**(extra_headers or {}), **headers},
+                extra_query=extra_query,
+                timeout=timeout,
+            ),
+            file,
+            segment_size=segment_size,
+            max_concurrency=max_concurrency,
+        )
+
 
 class ContentWithRawResponse:
     def __init__(self, content: Content) -> None:
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import os
 import array
 import base64
-from typing import List, Union, Iterable, cast
+import functools
+from typing import List, Union, Callable, Iterable, Optional, Sequence, cast
 from typing_extensions import Literal
 
 import httpx
@@ -12,13 +14,28 @@ import httpx
 from .. import _legacy_response
 from ..types import embedding_create_params
 from .._types import NOT_GIVEN, Body, Query, Headers, NotGiven
-from .._utils import is_given, maybe_transform
+from .._utils import is_given, maybe_transform, run_concurrently, async_run_concurrently
 from .._compat import cached_property
 from .._extras import numpy as np, has_numpy
 from .._resource import SyncAPIResource, AsyncAPIResource
 from .._response import to_streamed_response_wrapper, async_to_streamed_response_wrapper
+from .._exceptions import APIStatusError, RateLimitError
 from .._base_client import make_request_options
+from ..lib._embedding_cache import EmbeddingCache
+from ..lib._embedding_arrays import EmbeddingArray, parse_embedding_array
 from ..types.embedding_model import EmbeddingModel
+from ..lib._embedding_batches import (
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_MAX_SHARD_RETRIES,
+    DEFAULT_MAX_INPUTS_PER_REQUEST,
+    DEFAULT_MAX_TOKENS_PER_REQUEST,
+    RateLimitGate,
+    pack_inputs,
+    shard_retry_delay,
+    is_retryable_shard_error,
+    merge_embedding_responses,
+)
+from ..lib._embedding_dataset import DEFAULT_WINDOW_SIZE, EmbeddingDatasetWriter, iter_windows
 from ..types.create_embedding_response import CreateEmbeddingResponse
 
 __all__ = ["Embeddings", "AsyncEmbeddings"]
@@ -139,6 +156,229 @@ class Embeddings(SyncAPIResource):
             cast_to=CreateEmbeddingResponse,
         )
 
+    def create_array(
+        self,
+        *,
+        input: Union[str, List[str], Iterable[int], Iterable[Iterable[int]]],
+        model: Union[str, EmbeddingModel],
+        dimensions: int | NotGiven = NOT_GIVEN,
+        user: str | NotGiven = NOT_GIVEN,
+        # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
+        # The extra values given here take precedence over values defined on the client or passed to this method.
+        extra_headers: Headers | None = None,
+        extra_query: Query | None = None,
+        extra_body: Body | None = None,
+        timeout: float | httpx.Timeout | None | NotGiven = NOT_GIVEN,
+    ) -> EmbeddingArray:
+        """Creates embeddings and returns them as a single contiguous float32 matrix.
+
+        The embeddings are requested in the compact `base64` encoding and each one is
+        decoded straight into its row of a preallocated `(len(input), dimensions)`
+        NumPy array, or a flat `array.array("f")` if NumPy isn't installed, instead
+        of into lists of Python floats.
+
+        Takes the same arguments as `create()`, except for `encoding_format`.
+        """
+        response = self._post(
+            "/embeddings",
+            body=maybe_transform(
+                {
+                    "input": input,
+                    "model": model,
+                    "user": user,
+                    "dimensions": dimensions,
+                    "encoding_format": "base64",
+                },
+                embedding_create_params.EmbeddingCreateParams,
+            ),
+            options=make_request_options(
+                extra_headers=extra_headers,
+                extra_query=extra_query,
+                extra_body=extra_body,
+                timeout=timeout,
+            ),
+            cast_to=httpx.Response,
+        )
+        return parse_embedding_array(response.json(), model=model)
+
+    def create_many(
+        self,
+        *,
+        input: Sequence[Union[str, List[int]]],
+        model: Union[str, EmbeddingModel],
+        dimensions: int | NotGiven = NOT_GIVEN,
+        encoding_format: Literal["float", "base64"] | NotGiven = NOT_GIVEN,
+        user: str | NotGiven = NOT_GIVEN,
+        max_inputs_per_request: int = DEFAULT_MAX_INPUTS_PER_REQUEST,
+        max_tokens_per_request: int = DEFAULT_MAX_TOKENS_PER_REQUEST,
+        count_tokens: Optional[Callable[[str], int]] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_shard_retries: int = DEFAULT_MAX_SHARD_RETRIES,
+        cache: EmbeddingCache | None = None,
+        # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
+        # The extra values given here take precedence over values defined on the client or passed to this method.
+        extra_headers: Headers | None = None,
+        extra_query: Query | None = None,
+        extra_body: Body | None = None,
+        timeout: float | httpx.Timeout | None | NotGiven = NOT_GIVEN,
+    ) -> CreateEmbeddingResponse:
+        """Creates embeddings for any number of inputs, returned in the same order as the inputs.
+
+        The inputs are packed into as few requests as the per request limits on the
+        number of inputs and tokens allow, which are sent concurrently. Tokens are
+        estimated from the length of each text unless a `count_tokens` function is
+        given, e.g. one based on `tiktoken`.
+
+        A request that fails with a rate limit, connection or server error after the
+        client's own retries is retried on its own up to `max_shard_retries` times.
+        When a request is rate limited every other request waits before being sent.
+        If a request still fails then the error is raised.
+
+        Args:
+          input: The texts or token arrays to embed.
+
+          model: ID of the model to use.
+
+          dimensions: The number of dimensions the resulting output embeddings should have. Only
+              supported in `text-embedding-3` and later models.
+
+          encoding_format: The format to return the embeddings in. Can be either `float` or
+              [`base64`](https://pypi.org/project/pybase64/).
+
+          user: A unique identifier representing your end-user.
+
+          max_inputs_per_request: The maximum number of inputs to send in a single request.
+
+          max_tokens_per_request: The maximum number of tokens, summed across inputs, to send in a
+              single request.
+
+          count_tokens: A function that returns the number of tokens in a text.
+
+          max_concurrency: The maximum number of requests to send at once.
+
+          max_shard_retries: How many times to retry a request that failed with a retryable error.
+
+          cache: An `EmbeddingCache` to serve previously created embeddings from, only inputs
+              that aren't cached are sent and the usage only counts those inputs.
+        """
+        if max_concurrency <= 0:
+            raise ValueError(f"Expected `max_concurrency` to be a positive integer but received {max_concurrency}")
+
+        cached = cache.lookup(input, model=model, dimensions=dimensions) if cache is not None else None
+        if cached is not None:
+            input = cached.missing
+
+        shards = pack_inputs(
+            input,
+            max_inputs=max_inputs_per_request,
+            max_tokens=max_tokens_per_request,
+            count_tokens=count_tokens,
+        )
+        gate = RateLimitGate()
+
+        def send(indices: List[int]) -> CreateEmbeddingResponse:
+            shard_input = cast("Union[List[str], List[List[int]]]", [input[index] for index in indices])
+
+            attempt = 0
+            while True:
+                wait = gate.remaining()
+                if wait > 0:
+                    self._sleep(wait)
+
+                try:
+                    return self.create(
+                        input=shard_input,
+                        model=model,
+                        dimensions=dimensions,
+                        encoding_format=encoding_format,
+                        user=user,
+                        extra_headers=extra_headers,
+                        extra_query=extra_query,
+                        extra_body=extra_body,
+                        timeout=timeout,
+                    )
+                except Exception as err:
+                    if attempt >= max_shard_retries or not is_retryable_shard_error(err):
+                        raise
+
+                    retry_after = (
+                        self._client._parse_retry_after_header(err.response.headers)
+                        if isinstance(err, APIStatusError)
+                        else None
+                    )
+                    delay = shard_retry_delay(attempt, retry_after)
+                    attempt += 1
+
+                    if isinstance(err, RateLimitError):
+                        gate.pause(delay)
+                    else:
+                        self._sleep(delay)
+
+        responses = run_concurrently(
+            [functools.partial(send, indices) for indices in shards],
+            max_concurrency=max_concurrency,
+        )
+        response = merge_embedding_responses(responses, shards, total=len(input), model=model)
+        if cached is not None:
+            return cached.merge(response, encoding_format=encoding_format)
+        return response
+
+    def create_to_dataset(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        input: Iterable[str],
+        ids: Optional[Iterable[str]] = None,
+        model: Union[str, EmbeddingModel],
+        dimensions: int | NotGiven = NOT_GIVEN,
+        user: str | NotGiven = NOT_GIVEN,
+        window_size: int = DEFAULT_WINDOW_SIZE,
+        max_inputs_per_request: int = DEFAULT_MAX_INPUTS_PER_REQUEST,
+        max_tokens_per_request: int = DEFAULT_MAX_TOKENS_PER_REQUEST,
+        count_tokens: Optional[Callable[[str], int]] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_shard_retries: int = DEFAULT_MAX_SHARD_RETRIES,
+        cache: EmbeddingCache | None = None,
+        # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
+        # The extra values given here take precedence over values defined on the client or passed to this method.
+        extra_headers: Headers | None = None,
+        extra_query: Query | None = None,
+        extra_body: Body | None = None,
+        timeout: float | httpx.Timeout | None | NotGiven = NOT_GIVEN,
+    ) -> int:
+        """Embeds a corpus of any size and streams the embeddings to a float32 `.npy` file.
+
+        The inputs are consumed `window_size` at a time, each window is embedded with
+        `create_many()` and appended to the file before the next one is read, so
+        memory use stays constant when `input` is a lazy iterable. The ID of each
+        input, its position by default, is written to `<path>.ids`, see
+        `EmbeddingDatasetWriter` for the format and `open_embedding_dataset()` to
+        read it back.
+
+        Returns the number of embeddings written.
+        """
+        with EmbeddingDatasetWriter(path, dimensions=dimensions if is_given(dimensions) else None) as writer:
+            for window_ids, texts in iter_windows(input, ids, size=window_size):
+                response = self.create_many(
+                    input=texts,
+                    model=model,
+                    dimensions=dimensions,
+                    user=user,
+                    max_inputs_per_request=max_inputs_per_request,
+                    max_tokens_per_request=max_tokens_per_request,
+                    count_tokens=count_tokens,
+                    max_concurrency=max_concurrency,
+                    max_shard_retries=max_shard_retries,
+                    cache=cache,
+                    extra_headers=extra_headers,
+                    extra_query=extra_query,
+                    extra_body=extra_body,
+                    timeout=timeout,
+                )
+                writer.write_response(response, ids=window_ids)
+
+            return len(writer)
+
 
 class AsyncEmbeddings(AsyncAPIResource):
     @cached_property
@@ -255,6 +495,229 @@ class AsyncEmbeddings(AsyncAPIResource):
             cast_to=CreateEmbeddingResponse,
         )
 
+    async def create_array(
+        self,
+        *,
+        input: Union[str, List[str], Iterable[int], Iterable[Iterable[int]]],
+        model: Union[str, EmbeddingModel],
+        dimensions: int | NotGiven = NOT_GIVEN,
+        user: str | NotGiven = NOT_GIVEN,
+        # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
+        # The extra values given here take precedence over values defined on the client or passed to this method.
+        extra_headers: Headers | None = None,
+        extra_query: Query | None = None,
+        extra_body: Body | None = None,
+        timeout: float | httpx.Timeout | None | NotGiven = NOT_GIVEN,
+    ) -> EmbeddingArray:
+        """Creates embeddings and returns them as a single contiguous float32 matrix.
+
+        The embeddings are requested in the compact `base64` encoding and each one is
+        decoded straight into its row of a preallocated `(len(input), dimensions)`
+        NumPy array, or a flat `array.array("f")` if NumPy isn't installed, instead
+        of into lists of Python floats.
+
+        Takes the same arguments as `create()`, except for `encoding_format`.
+        """
+        response = await self._post(
+            "/embeddings",
+            body=maybe_transform(
+                {
+                    "input": input,
+                    "model": model,
+                    "user": user,
+                    "dimensions": dimensions,
+                    "encoding_format": "base64",
+                },
+                embedding_create_params.EmbeddingCreateParams,
+            ),
+            options=make_request_options(
+                extra_headers=extra_headers,
+                extra_query=extra_query,
+                extra_body=extra_body,
+                timeout=timeout,
+            ),
+            cast_to=httpx.Response,
+        )
+        return parse_embedding_array(response.json(), model=model)
+
+    async def create_many(
+        self,
+        *,
+        input: Sequence[Union[str, List[int]]],
+        model: Union[str, EmbeddingModel],
+        dimensions: int | NotGiven = NOT_GIVEN,
+        encoding_format: Literal["float", "base64"] | NotGiven = NOT_GIVEN,
+        user: str | NotGiven = NOT_GIVEN,
+        max_inputs_per_request: int = DEFAULT_MAX_INPUTS_PER_REQUEST,
+        max_tokens_per_request: int = DEFAULT_MAX_TOKENS_PER_REQUEST,
+        count_tokens: Optional[Callable[[str], int]] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_shard_retries: int = DEFAULT_MAX_SHARD_RETRIES,
+        cache: EmbeddingCache | None = None,
+        # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
+        # The extra values given here take precedence over values defined on the client or passed to this method.
+        extra_headers: Headers | None = None,
+        extra_query: Query | None = None,
+        extra_body: Body | None = None,
+        timeout: float | httpx.Timeout | None | NotGiven = NOT_GIVEN,
+    ) -> CreateEmbeddingResponse:
+        """Creates embeddings for any number of inputs, returned in the same order as the inputs.
+
+        The inputs are packed into as few requests as the per request limits on the
+        number of inputs and tokens allow, which are sent concurrently. Tokens are
+        estimated from the length of each text unless a `count_tokens` function is
+        given, e.g. one based on `tiktoken`.
+
+        A request that fails with a rate limit, connection or server error after the
+        client's own retries is retried on its own up to `max_shard_retries` times.
+        When a request is rate limited every other request waits before being sent.
+        If a request still fails then the error is raised.
+
+        Args:
+          input: The texts or token arrays to embed.
+
+          model: ID of the model to use.
+
+          dimensions: The number of dimensions the resulting output embeddings should have. Only
+              supported in `text-embedding-3` and later models.
+
+          encoding_format: The format to return the embeddings in. Can be either `float` or
+              [`base64`](https://pypi.org/project/pybase64/).
+
+          user: A unique identifier representing your end-user.
+
+          max_inputs_per_request: The maximum number of inputs to send in a single request.
+
+          max_tokens_per_request: The maximum number of tokens, summed across inputs, to send in a
+              single request.
+
+          count_tokens: A function that returns the number of tokens in a text.
+
+          max_concurrency: The maximum number of requests to send at once.
+
+          max_shard_retries: How many times to retry a request that failed with a retryable error.
+
+          cache: An `EmbeddingCache` to serve previously created embeddings from, only inputs
+              that aren't cached are sent and the usage only counts those inputs.
+        """
+        if max_concurrency <= 0:
+            raise ValueError(f"Expected `max_concurrency` to be a positive integer but received {max_concurrency}")
+
+        cached = cache.lookup(input, model=model, dimensions=dimensions) if cache is not None else None
+        if cached is not None:
+            input = cached.missing
+
+        shards = pack_inputs(
+            input,
+            max_inputs=max_inputs_per_request,
+            max_tokens=max_tokens_per_request,
+            count_tokens=count_tokens,
+        )
+        gate = RateLimitGate()
+
+        async def send(indices: List[int]) -> CreateEmbeddingResponse:
+            shard_input = cast("Union[List[str], List[List[int]]]", [input[index] for index in indices])
+
+            attempt = 0
+            while True:
+                wait = gate.remaining()
+                if wait > 0:
+                    await self._sleep(wait)
+
+                try:
+                    return await self.create(
+                        input=shard_input,
+                        model=model,
+                        dimensions=dimensions,
+                        encoding_format=encoding_format,
+                        user=user,
+                        extra_headers=extra_headers,
+                        extra_query=extra_query,
+                        extra_body=extra_body,
+                        timeout=timeout,
+                    )
+                except Exception as err:
+                    if attempt >= max_shard_retries or not is_retryable_shard_error(err):
+                        raise
+
+                    retry_after = (
+                        self._client._parse_retry_after_header(err.response.headers)
+                        if isinstance(err, APIStatusError)
+                        else None
+                    )
+                    delay = shard_retry_delay(attempt, retry_after)
+                    attempt += 1
+
+                    if isinstance(err, RateLimitError):
+                        gate.pause(delay)
+                    else:
+                        await self._sleep(delay)
+
+        responses = await async_run_concurrently(
+            [functools.partial(send, indices) for indices in shards],
+            max_concurrency=max_concurrency,
+        )
+        response = merge_embedding_responses(responses, shards, total=len(input), model=model)
+        if cached is not None:
+            return cached.merge(response, encoding_format=encoding_format)
+        return response
+
+    async def create_to_dataset(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        input: Iterable[str],
+        ids: Optional[Iterable[str]] = None,
+        model: Union[str, EmbeddingModel],
+        dimensions: int | NotGiven = NOT_GIVEN,
+        user: str | NotGiven = NOT_GIVEN,
+        window_size: int = DEFAULT_WINDOW_SIZE,
+        max_inputs_per_request: int = DEFAULT_MAX_INPUTS_PER_REQUEST,
+        max_tokens_per_request: int = DEFAULT_MAX_TOKENS_PER_REQUEST,
+        count_tokens: Optional[Callable[[str], int]] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_shard_retries: int = DEFAULT_MAX_SHARD_RETRIES,
+        cache: EmbeddingCache | None = None,
+        # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
+        # The extra values given here take precedence over values defined on the client or passed to this method.
+        extra_headers: Headers | None = None,
+        extra_query: Query | None = None,
+        extra_body: Body | None = None,
+        timeout: float | httpx.Timeout | None | NotGiven = NOT_GIVEN,
+    ) -> int:
+        """Embeds a corpus of any size and streams the embeddings to a float32 `.npy` file.
+
+        The inputs are consumed `window_size` at a time, each window is embedded with
+        `create_many()` and appended to the file before the next one is read, so
+        memory use stays constant when `input` is a lazy iterable. The ID of each
+        input, its position by default, is written to `<path>.ids`, see
+        `EmbeddingDatasetWriter` for the format and `open_embedding_dataset()` to
+        read it back.
+
+        Returns the number of embeddings written.
+        """
+        with EmbeddingDatasetWriter(path, dimensions=dimensions if is_given(dimensions) else None) as writer:
+            for window_ids, texts in iter_windows(input, ids, size=window_size):
+                response = await self.create_many(
+                    input=texts,
+                    model=model,
+                    dimensions=dimensions,
+                    user=user,
+                    max_inputs_per_request=max_inputs_per_request,
+                    max_tokens_per_request=max_tokens_per_request,
+                    count_tokens=count_tokens,
+                    max_concurrency=max_concurrency,
+                    max_shard_retries=max_shard_retries,
+                    cache=cache,
+                    extra_headers=extra_headers,
+                    extra_query=extra_query,
+                    extra_body=extra_body,
+                    timeout=timeout,
+                )
+                writer.write_response(response, ids=window_ids)
+
+            return len(writer)
+
 
 class EmbeddingsWithRawResponse:
     def __init__(self, embeddings: Embeddings) -> None:
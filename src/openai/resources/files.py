@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import os
 import time
+import logging
 import typing_extensions
 from typing import Mapping, cast
 from typing_extensions import Literal
@@ -25,12 +27,21 @@ from .._response import (
 )
 from ..pagination import SyncCursorPage, AsyncCursorPage
 from .._base_client import AsyncPaginator, make_request_options
+from ..lib._download import (
+    DEFAULT_SEGMENT_SIZE,
+    DEFAULT_MAX_CONCURRENCY,
+    download_to_file,
+    async_download_to_file,
+)
+from ..lib._file_index import FileIndex, hash_file_content, check_not_raw_response, async_hash_file_content
 from ..types.file_object import FileObject
 from ..types.file_deleted import FileDeleted
 from ..types.file_purpose import FilePurpose
 
 __all__ = ["Files", "AsyncFiles"]
 
+log: logging.Logger = logging.getLogger(__name__)
+
 
 class Files(SyncAPIResource):
     @cached_property
@@ -57,6 +68,7 @@ class Files(SyncAPIResource):
         *,
         file: FileTypes,
         purpose: FilePurpose,
+        file_index: FileIndex | None = None,
         # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
         # The extra values given here take precedence over values defined on the client or passed to this method.
         extra_headers: Headers | None = None,
@@ -96,6 +108,10 @@ class Files(SyncAPIResource):
               fine-tuning - `vision`: Images used for vision fine-tuning - `user_data`:
               Flexible file type for any purpose - `evals`: Used for eval data sets
 
+          file_index: A local index of previously uploaded file contents. If the same content
+              has already been uploaded for this `purpose`, the existing file is returned
+              instead of uploading it again.
+
           extra_headers: Send extra headers
 
           extra_query: Add additional query parameters to the request
@@ -104,6 +120,17 @@ class Files(SyncAPIResource):
 
           timeout: Override the client-level default timeout for this request, in seconds
         """
+        if file_index is not None:
+            return self._create_with_index(
+                file=file,
+                purpose=purpose,
+                file_index=file_index,
+                extra_headers=extra_headers,
+                extra_query=extra_query,
+                extra_body=extra_body,
+                timeout=timeout,
+            )
+
         body = deepcopy_minimal(
             {
                 "file": file,
@@ -343,6 +370,78 @@ class Files(SyncAPIResource):
 
         return file
 
+    def download_to_file(
+        self,
+        file_id: str,
+        file: str | os.PathLike[str],
+        *,
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
+        # The extra values given here take precedence over values defined on the client or passed to this method.
+        extra_headers: Headers | None = None,
+        extra_query: Query | None = None,
+        timeout: float | httpx.Timeout | None | NotGiven = NOT_GIVEN,
+    ) -> int:
+        """Downloads the contents of the given file to disk.
+
+        The content is fetched as `segment_size` byte ranges, with up to
+        `max_concurrency` requests in flight at once, and each range is written
+        directly to its offset in the destination file. If the server doesn't support
+        range requests then the content is streamed in a single request instead.
+
+        Returns the number of bytes written.
+        """
+        if not file_id:
+            raise ValueError(f"Expected a non-empty value for `file_id` but received {file_id!r}")
+
+        return download_to_file(
+            lambda headers: self.with_streaming_response.content(
+                file_id,
+                extra_headers={**(extra_headers or {}), **headers},
+                extra_query=extra_query,
+                timeout=timeout,
+            ),
+            file,
+            segment_size=segment_size,
+            max_concurrency=max_concurrency,
+        )
+
+    def _create_with_index(
+        self,
+        *,
+        file: FileTypes,
+        purpose: FilePurpose,
+        file_index: FileIndex,
+        extra_headers: Headers | None,
+        extra_query: Query | None,
+        extra_body: Body | None,
+        timeout: float | httpx.Timeout | None | NotGiven,
+    ) -> FileObject:
+        check_not_raw_response(extra_headers)
+
+        content_hash = hash_file_content(file)
+        if content_hash is None:
+            log.debug("Not using the file index as the contents of %r cannot be hashed without consuming it", file)
+        else:
+            existing = file_index.find(content_hash, purpose, retrieve=self.retrieve)
+            if existing is not None:
+                log.debug("Reusing file %s from the file index", existing.id)
+                return existing
+
+        file_object = self.create(
+            file=file,
+            purpose=purpose,
+            extra_headers=extra_headers,
+            extra_query=extra_query,
+            extra_body=extra_body,
+            timeout=timeout,
+        )
+        if content_hash is not None:
+            file_index.add(content_hash, purpose, file_object)
+
+        return file_object
+
 
 class AsyncFiles(AsyncAPIResource):
     @cached_property
@@ -369,6 +468,7 @@ class AsyncFiles(AsyncAPIResource):
         *,
         file: FileTypes,
         purpose: FilePurpose,
+        file_index: FileIndex | None = None,
         # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
         # The extra values given here take precedence over values defined on the client or passed to this method.
         extra_headers: Headers | None = None,
@@ -408,6 +508,10 @@ class AsyncFiles(AsyncAPIResource):
               fine-tuning - `vision`: Images used for vision fine-tuning - `user_data`:
               Flexible file type for any purpose - `evals`: Used for eval data sets
 
+          file_index: A local index of previously uploaded file contents. If the same content
+              has already been uploaded for this `purpose`, the existing file is returned
+              instead of uploading it again.
+
           extra_headers: Send extra headers
 
           extra_query: Add additional query parameters to the request
@@ -416,6 +520,17 @@ class AsyncFiles(AsyncAPIResource):
 
           timeout: Override the client-level default timeout for this request, in seconds
         """
+        if file_index is not None:
+            return await self._create_with_index(
+                file=file,
+                purpose=purpose,
+                file_index=file_index,
+                extra_headers=extra_headers,
+                extra_query=extra_query,
+                extra_body=extra_body,
+                timeout=timeout,
+            )
+
         body = deepcopy_minimal(
             {
                 "file": file,
@@ -655,6 +770,78 @@ class AsyncFiles(AsyncAPIResource):
 
         return file
 
+    async def download_to_file(
+        self,
+        file_id: str,
+        file: str | os.PathLike[str],
+        *,
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
+        # The extra values given here take precedence over values defined on the client or passed to this method.
+        extra_headers: Headers | None = None,
+        extra_query: Query | None = None,
+        timeout: float | httpx.Timeout | None | NotGiven = NOT_GIVEN,
+    ) -> int:
+        """Downloads the contents of the given file to disk.
+
+        The content is fetched as `segment_size` byte ranges, with up to
+        `max_concurrency` requests in flight at once, and each range is written
+        directly to its offset in the destination file. If the server doesn't support
+        range requests then the content is streamed in a single request instead.
+
+        Returns the number of bytes written.
+        """
+        if not file_id:
+            raise ValueError(f"Expected a non-empty value for `file_id` but received {file_id!r}")
+
+        return await async_download_to_file(
+            lambda headers: self.with_streaming_response.content(
+                file_id,
+                extra_headers={**(extra_headers or {}), **headers},
+                extra_query=extra_query,
+                timeout=timeout,
+            ),
+            file,
+            segment_size=segment_size,
+            max_concurrency=max_concurrency,
+        )
+
+    async def _create_with_index(
+        self,
+        *,
+        file: FileTypes,
+        purpose: FilePurpose,
+        file_index: FileIndex,
+        extra_headers: Headers | None,
+        extra_query: Query | None,
+        extra_body: Body | None,
+        timeout: float | httpx.Timeout | None | NotGiven,
+    ) -> FileObject:
+        check_not_raw_response(extra_headers)
+
+        content_hash = await async_hash_file_content(file)
+        if content_hash is None:
+            log.debug("Not using the file index as the contents of %r cannot be hashed without consuming it", file)
+        else:
+            existing = await file_index.async_find(content_hash, purpose, retrieve=self.retrieve)
+            if existing is not None:
+                log.debug("Reusing file %s from the file index", existing.id)
+                return existing
+
+        file_object = await self.create(
+            file=file,
+            purpose=purpose,
+            extra_headers=extra_headers,
+            extra_query=extra_query,
+            extra_body=extra_body,
+            timeout=timeout,
+        )
+        if content_hash is not None:
+            file_index.add(content_hash, purpose, file_object)
+
+        return file_object
+
 
 class FilesWithRawResponse:
     def __init__(self, files: Files) -> None:
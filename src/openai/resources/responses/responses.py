@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, List, Type, Union, Iterable, Optional, cast
+from typing import Any, List, Type, Union, Callable, Iterable, Iterator, Optional, Awaitable, AsyncIterable, cast
 from functools import partial
 from typing_extensions import Literal, overload
 
@@ -25,6 +25,14 @@ from .input_items import (
 from ..._streaming import Stream, AsyncStream
 from ...lib._tools import PydanticFunctionTool, ResponsesPydanticFunctionTool
 from ..._base_client import make_request_options
+from ...lib._fan_out import (
+    DEFAULT_FAN_OUT_CONCURRENCY,
+    DEFAULT_MAX_REQUEST_RETRIES,
+    RequestResult,
+    ProgressCallback,
+    AsyncRequestResults,
+    iter_many,
+)
 from ...types.responses import response_create_params, response_retrieve_params
 from ...lib._parsing._responses import (
     TextFormatT,
@@ -37,7 +45,7 @@ from ...types.responses.tool_param import ToolParam, ParseableToolParam
 from ...types.shared_params.metadata import Metadata
 from ...types.shared_params.reasoning import Reasoning
 from ...types.responses.parsed_response import ParsedResponse
-from ...lib.streaming.responses._responses import ResponseStreamManager, AsyncResponseStreamManager
+from ...lib.streaming.responses._responses import ToolCallHook, ResponseStreamManager, AsyncResponseStreamManager
 from ...types.responses.response_includable import ResponseIncludable
 from ...types.shared_params.responses_model import ResponsesModel
 from ...types.responses.response_input_param import ResponseInputParam
@@ -732,6 +740,7 @@ class Responses(SyncAPIResource):
         text_format: type[TextFormatT] | NotGiven = NOT_GIVEN,
         starting_after: int | NotGiven = NOT_GIVEN,
         tools: Iterable[ParseableToolParam] | NotGiven = NOT_GIVEN,
+        on_tool_call: ToolCallHook | None = None,
         # The extra values given here take precedence over values defined on the client or passed to this method.
         extra_headers: Headers | None = None,
         extra_query: Query | None = None,
@@ -762,6 +771,7 @@ class Responses(SyncAPIResource):
         top_p: Optional[float] | NotGiven = NOT_GIVEN,
         truncation: Optional[Literal["auto", "disabled"]] | NotGiven = NOT_GIVEN,
         user: str | NotGiven = NOT_GIVEN,
+        on_tool_call: ToolCallHook | None = None,
         # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
         # The extra values given here take precedence over values defined on the client or passed to this method.
         extra_headers: Headers | None = None,
@@ -794,6 +804,7 @@ class Responses(SyncAPIResource):
         truncation: Optional[Literal["auto", "disabled"]] | NotGiven = NOT_GIVEN,
         user: str | NotGiven = NOT_GIVEN,
         starting_after: int | NotGiven = NOT_GIVEN,
+        on_tool_call: ToolCallHook | None = None,
         # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
         # The extra values given here take precedence over values defined on the client or passed to this method.
         extra_headers: Headers | None = None,
@@ -828,6 +839,19 @@ class Responses(SyncAPIResource):
                 + ", ".join(new_response_args_names)
             )
         tools = _make_tools(tools)
+
+        def reconnect(response_id: str, starting_after: int) -> Stream[ResponseStreamEvent]:
+            return self.retrieve(
+                response_id,
+                stream=True,
+                starting_after=starting_after,
+                include=include or [],
+                extra_headers=extra_headers,
+                extra_query=extra_query,
+                extra_body=extra_body,
+                timeout=timeout,
+            )
+
         if len(new_response_args_names) > 0:
             if not is_given(input):
                 raise ValueError("input must be provided when creating a new response")
@@ -871,7 +895,16 @@ class Responses(SyncAPIResource):
                 timeout=timeout,
             )
 
-            return ResponseStreamManager(api_request, text_format=text_format, input_tools=tools, starting_after=None)
+            return ResponseStreamManager(
+                api_request,
+                text_format=text_format,
+                input_tools=tools,
+                starting_after=None,
+                on_tool_call=on_tool_call,
+                # only background responses can be streamed again once the connection has dropped
+                reconnect=reconnect if background else None,
+                max_reconnects=self._client.max_retries,
+            )
         else:
             if not is_given(response_id):
                 raise ValueError("id must be provided when streaming an existing response")
@@ -890,6 +923,10 @@ class Responses(SyncAPIResource):
                 text_format=text_format,
                 input_tools=tools,
                 starting_after=starting_after if is_given(starting_after) else None,
+                on_tool_call=on_tool_call,
+                reconnect=reconnect,
+                max_reconnects=self._client.max_retries,
+                response_id=response_id,
             )
 
     def parse(
@@ -976,6 +1013,64 @@ class Responses(SyncAPIResource):
             cast_to=cast(Type[ParsedResponse[TextFormatT]], Response),
         )
 
+    def create_many(
+        self,
+        requests: Iterable[response_create_params.ResponseCreateParamsNonStreaming],
+        *,
+        concurrency: int = DEFAULT_FAN_OUT_CONCURRENCY,
+        ordered: bool = False,
+        max_request_retries: int = DEFAULT_MAX_REQUEST_RETRIES,
+        on_progress: Optional[ProgressCallback] = None,
+        # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
+        # The extra values given here take precedence over values defined on the client or passed to this method.
+        extra_headers: Headers | None = None,
+        extra_query: Query | None = None,
+        extra_body: Body | None = None,
+        timeout: float | httpx.Timeout | None | NotGiven = NOT_GIVEN,
+    ) -> Iterator[RequestResult[Response]]:
+        """Creates a response for each of the given requests, sending at most `concurrency` at a time.
+
+        Results are yielded as the requests finish, or in the order of the requests with
+        `ordered=True`. Requests are read from `requests` as they're sent, so a lazy
+        iterable of any size can be given and memory use stays flat.
+
+        A request that fails with a rate limit, connection or server error after the
+        client's own retries is retried on its own up to `max_request_retries` times.
+        When a request is rate limited every other request waits before being sent. Errors
+        aren't raised, a failed request's `RequestResult` has its `error` set instead.
+
+        ```py
+        for result in client.responses.create_many(requests, concurrency=32):
+            print(result.index, result.result if result.ok else result.error)
+        ```
+
+        Args:
+          requests: The params of each `create()` call, without `stream`.
+
+          concurrency: The maximum number of requests to send at once.
+
+          ordered: Whether to return the results in the order of the requests instead of as
+              they finish.
+
+          max_request_retries: How many times to retry a request that failed with a retryable error.
+
+          on_progress: A function that's called with the number of started, succeeded and failed
+              requests whenever a request finishes.
+        """
+        create = partial(
+            self.create, extra_headers=extra_headers, extra_query=extra_query, extra_body=extra_body, timeout=timeout
+        )
+        return iter_many(
+            cast("Callable[..., Response]", create),
+            requests,
+            concurrency=concurrency,
+            ordered=ordered,
+            max_request_retries=max_request_retries,
+            on_progress=on_progress,
+            sleep=self._sleep,
+            parse_retry_after=self._client._parse_retry_after_header,
+        )
+
     @overload
     def retrieve(
         self,
@@ -1940,6 +2035,7 @@ class AsyncResponses(AsyncAPIResource):
         text_format: type[TextFormatT] | NotGiven = NOT_GIVEN,
         starting_after: int | NotGiven = NOT_GIVEN,
         tools: Iterable[ParseableToolParam] | NotGiven = NOT_GIVEN,
+        on_tool_call: ToolCallHook | None = None,
         # The extra values given here take precedence over values defined on the client or passed to this method.
         extra_headers: Headers | None = None,
         extra_query: Query | None = None,
@@ -1970,6 +2066,7 @@ class AsyncResponses(AsyncAPIResource):
         top_p: Optional[float] | NotGiven = NOT_GIVEN,
         truncation: Optional[Literal["auto", "disabled"]] | NotGiven = NOT_GIVEN,
         user: str | NotGiven = NOT_GIVEN,
+        on_tool_call: ToolCallHook | None = None,
         # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
         # The extra values given here take precedence over values defined on the client or passed to this method.
         extra_headers: Headers | None = None,
@@ -2002,6 +2099,7 @@ class AsyncResponses(AsyncAPIResource):
         truncation: Optional[Literal["auto", "disabled"]] | NotGiven = NOT_GIVEN,
         user: str | NotGiven = NOT_GIVEN,
         starting_after: int | NotGiven = NOT_GIVEN,
+        on_tool_call: ToolCallHook | None = None,
         # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
         # The extra values given here take precedence over values defined on the client or passed to this method.
         extra_headers: Headers | None = None,
@@ -2037,6 +2135,19 @@ class AsyncResponses(AsyncAPIResource):
             )
 
         tools = _make_tools(tools)
+
+        async def reconnect(response_id: str, starting_after: int) -> AsyncStream[ResponseStreamEvent]:
+            return await self.retrieve(
+                response_id,
+                stream=True,
+                starting_after=starting_after,
+                include=include or [],
+                extra_headers=extra_headers,
+                extra_query=extra_query,
+                extra_body=extra_body,
+                timeout=timeout,
+            )
+
         if len(new_response_args_names) > 0:
             if isinstance(input, NotGiven):
                 raise ValueError("input must be provided when creating a new response")
@@ -2072,6 +2183,7 @@ class AsyncResponses(AsyncAPIResource):
                 top_p=top_p,
                 truncation=truncation,
                 user=user,
+                background=background,
                 extra_headers=extra_headers,
                 extra_query=extra_query,
                 extra_body=extra_body,
@@ -2083,6 +2195,10 @@ class AsyncResponses(AsyncAPIResource):
                 text_format=text_format,
                 input_tools=tools,
                 starting_after=None,
+                on_tool_call=on_tool_call,
+                # only background responses can be streamed again once the connection has dropped
+                reconnect=reconnect if background else None,
+                max_reconnects=self._client.max_retries,
             )
         else:
             if isinstance(response_id, NotGiven):
@@ -2102,6 +2218,10 @@ class AsyncResponses(AsyncAPIResource):
                 text_format=text_format,
                 input_tools=tools,
                 starting_after=starting_after if is_given(starting_after) else None,
+                on_tool_call=on_tool_call,
+                reconnect=reconnect,
+                max_reconnects=self._client.max_retries,
+                response_id=response_id,
             )
 
     async def parse(
@@ -2188,6 +2308,63 @@ class AsyncResponses(AsyncAPIResource):
             cast_to=cast(Type[ParsedResponse[TextFormatT]], Response),
         )
 
+    def create_many(
+        self,
+        requests: Union[
+            Iterable[response_create_params.ResponseCreateParamsNonStreaming],
+            AsyncIterable[response_create_params.ResponseCreateParamsNonStreaming],
+        ],
+        *,
+        concurrency: int = DEFAULT_FAN_OUT_CONCURRENCY,
+        ordered: bool = False,
+        max_request_retries: int = DEFAULT_MAX_REQUEST_RETRIES,
+        on_progress: Optional[ProgressCallback] = None,
+        # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
+        # The extra values given here take precedence over values defined on the client or passed to this method.
+        extra_headers: Headers | None = None,
+        extra_query: Query | None = None,
+        extra_body: Body | None = None,
+        timeout: float | httpx.Timeout | None | NotGiven = NOT_GIVEN,
+    ) -> AsyncRequestResults[Response]:
+        """Creates a response for each of the given requests, sending at most `concurrency` at a time.
+
+        This works like the sync `create_many()`, except that the results must be iterated
+        inside an `async with` block, leaving it cancels any requests that are still in
+        flight. `requests` may also be an async iterable.
+
+        ```py
+        async with client.responses.create_many(requests, concurrency=32) as results:
+            async for result in results:
+                print(result.index, result.result if result.ok else result.error)
+        ```
+
+        Args:
+          requests: The params of each `create()` call, without `stream`.
+
+          concurrency: The maximum number of requests to send at once.
+
+          ordered: Whether to return the results in the order of the requests instead of as
+              they finish.
+
+          max_request_retries: How many times to retry a request that failed with a retryable error.
+
+          on_progress: A function that's called with the number of started, succeeded and failed
+              requests whenever a request finishes.
+        """
+        create = partial(
+            self.create, extra_headers=extra_headers, extra_query=extra_query, extra_body=extra_body, timeout=timeout
+        )
+        return AsyncRequestResults(
+            cast("Callable[..., Awaitable[Response]]", create),
+            requests,
+            concurrency=concurrency,
+            ordered=ordered,
+            max_request_retries=max_request_retries,
+            on_progress=on_progress,
+            sleep=self._sleep,
+            parse_retry_after=self._client._parse_retry_after_header,
+        )
+
     @overload
     async def retrieve(
         self,
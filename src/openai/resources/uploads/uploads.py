@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
-import io
 import os
+import sys
+import hashlib
 import logging
 import builtins
 from typing import List, overload
@@ -22,13 +23,15 @@ from .parts import (
     AsyncPartsWithStreamingResponse,
 )
 from ...types import FilePurpose, upload_create_params, upload_complete_params
+from ..._files import Digest, MappedFile
 from ..._types import NOT_GIVEN, Body, Query, Headers, NotGiven
-from ..._utils import maybe_transform, async_maybe_transform
+from ..._utils import asyncify, is_given, maybe_transform, async_maybe_transform
 from ..._compat import cached_property
 from ..._resource import SyncAPIResource, AsyncAPIResource
 from ..._response import to_streamed_response_wrapper, async_to_streamed_response_wrapper
 from ..._base_client import make_request_options
 from ...types.upload import Upload
+from ...lib._file_index import FileIndex, hash_file_content, async_hash_file_content
 from ...types.file_purpose import FilePurpose
 
 __all__ = ["Uploads", "AsyncUploads"]
@@ -40,6 +43,18 @@ DEFAULT_PART_SIZE = 64 * 1024 * 1024
 log: logging.Logger = logging.getLogger(__name__)
 
 
+if sys.version_info >= (3, 9):
+
+    def _md5() -> Digest:
+        # the checksum is only used to verify the upload
+        return hashlib.md5(usedforsecurity=False)
+
+else:
+
+    def _md5() -> Digest:
+        return hashlib.md5()
+
+
 class Uploads(SyncAPIResource):
     @cached_property
     def parts(self) -> Parts:
@@ -74,6 +89,7 @@ class Uploads(SyncAPIResource):
         bytes: int | None = None,
         part_size: int | None = None,
         md5: str | NotGiven = NOT_GIVEN,
+        file_index: FileIndex | None = None,
     ) -> Upload:
         """Splits a file into multiple 64MB parts and uploads them sequentially."""
 
@@ -88,6 +104,7 @@ class Uploads(SyncAPIResource):
         purpose: FilePurpose,
         part_size: int | None = None,
         md5: str | NotGiven = NOT_GIVEN,
+        file_index: FileIndex | None = None,
     ) -> Upload:
         """Splits an in-memory file into multiple 64MB parts and uploads them sequentially."""
 
@@ -101,9 +118,16 @@ class Uploads(SyncAPIResource):
         bytes: int | None = None,
         part_size: int | None = None,
         md5: str | NotGiven = NOT_GIVEN,
+        file_index: FileIndex | None = None,
     ) -> Upload:
         """Splits the given file into multiple parts and uploads them sequentially.
 
+        If `md5` is not given, the checksum of the file is computed while the parts
+        are uploaded and passed to `.complete()` so the server can verify the upload.
+
+        If a `file_index` is given and the same content has already been uploaded for
+        this `purpose`, the previous Upload is returned instead of uploading it again.
+
         ```py
         from pathlib import Path
 
@@ -130,6 +154,15 @@ class Uploads(SyncAPIResource):
             if bytes is None:
                 bytes = file.stat().st_size
 
+        content_hash: str | None = None
+        if file_index is not None:
+            content_hash = hash_file_content(file)
+            if content_hash is not None:
+                existing = file_index.find_upload(content_hash, purpose, retrieve=self._client.files.retrieve)
+                if existing is not None:
+                    log.info("Reusing upload %s from the file index", existing.id)
+                    return existing
+
         upload = self.create(
             bytes=bytes,
             filename=filename,
@@ -142,26 +175,34 @@ class Uploads(SyncAPIResource):
         if part_size is None:
             part_size = DEFAULT_PART_SIZE
 
+        # parts are sent as views over a memory-mapped file so that no part is ever
+        # fully materialised in memory, httpx streams each one in small chunks
         if isinstance(file, builtins.bytes):
-            buf: io.FileIO | io.BytesIO = io.BytesIO(file)
+            source = MappedFile.from_bytes(file, name=filename)
         else:
-            buf = io.FileIO(file)
+            source = MappedFile.open(file)
+
+        # unless it was given, the checksum is computed from the parts as they are
+        # sent so that the file doesn't have to be read an additional time
+        digest = _md5() if not is_given(md5) else None
 
-        try:
-            while True:
-                data = buf.read(part_size)
-                if not data:
-                    # EOF
-                    break
+        with source:
+            for offset in range(0, len(source), part_size):
+                with source.slice(offset, part_size, digest=digest) as data:
+                    part = self.parts.create(upload_id=upload.id, data=data)
+                    data.update_digest()
 
-                part = self.parts.create(upload_id=upload.id, data=data)
                 log.info("Uploaded part %s for upload %s", part.id, upload.id)
                 part_ids.append(part.id)
-        except Exception:
-            buf.close()
-            raise
 
-        return self.complete(upload_id=upload.id, part_ids=part_ids, md5=md5)
+        if digest is not None:
+            md5 = digest.hexdigest()
+
+        upload = self.complete(upload_id=upload.id, part_ids=part_ids, md5=md5)
+        if file_index is not None and content_hash is not None and upload.file is not None:
+            file_index.add(content_hash, purpose, upload.file, upload=upload)
+
+        return upload
 
     def create(
         self,
@@ -366,6 +407,7 @@ class AsyncUploads(AsyncAPIResource):
         bytes: int | None = None,
         part_size: int | None = None,
         md5: str | NotGiven = NOT_GIVEN,
+        file_index: FileIndex | None = None,
     ) -> Upload:
         """Splits a file into multiple 64MB parts and uploads them sequentially."""
 
@@ -380,6 +422,7 @@ class AsyncUploads(AsyncAPIResource):
         purpose: FilePurpose,
         part_size: int | None = None,
         md5: str | NotGiven = NOT_GIVEN,
+        file_index: FileIndex | None = None,
     ) -> Upload:
         """Splits an in-memory file into multiple 64MB parts and uploads them sequentially."""
 
@@ -393,9 +436,16 @@ class AsyncUploads(AsyncAPIResource):
         bytes: int | None = None,
         part_size: int | None = None,
         md5: str | NotGiven = NOT_GIVEN,
+        file_index: FileIndex | None = None,
     ) -> Upload:
         """Splits the given file into multiple parts and uploads them sequentially.
 
+        If `md5` is not given, the checksum of the file is computed while the parts
+        are uploaded and passed to `.complete()` so the server can verify the upload.
+
+        If a `file_index` is given and the same content has already been uploaded for
+        this `purpose`, the previous Upload is returned instead of uploading it again.
+
         ```py
         from pathlib import Path
 
@@ -423,6 +473,17 @@ class AsyncUploads(AsyncAPIResource):
                 stat = await file.stat()
                 bytes = stat.st_size
 
+        content_hash: str | None = None
+        if file_index is not None:
+            content_hash = await async_hash_file_content(file)
+            if content_hash is not None:
+                existing = await file_index.async_find_upload(
+                    content_hash, purpose, retrieve=self._client.files.retrieve
+                )
+                if existing is not None:
+                    log.info("Reusing upload %s from the file index", existing.id)
+                    return existing
+
         upload = await self.create(
             bytes=bytes,
             filename=filename,
@@ -435,36 +496,34 @@ class AsyncUploads(AsyncAPIResource):
         if part_size is None:
             part_size = DEFAULT_PART_SIZE
 
+        # parts are sent as views over a memory-mapped file so that no part is ever
+        # fully materialised in memory, httpx streams each one in small chunks
         if isinstance(file, anyio.Path):
-            fd = await file.open("rb")
-            async with fd:
-                while True:
-                    data = await fd.read(part_size)
-                    if not data:
-                        # EOF
-                        break
-
-                    part = await self.parts.create(upload_id=upload.id, data=data)
-                    log.info("Uploaded part %s for upload %s", part.id, upload.id)
-                    part_ids.append(part.id)
+            source = await asyncify(MappedFile.open)(file)
         else:
-            buf = io.BytesIO(file)
+            source = MappedFile.from_bytes(file, name=filename)
 
-            try:
-                while True:
-                    data = buf.read(part_size)
-                    if not data:
-                        # EOF
-                        break
+        # unless it was given, the checksum is computed from the parts as they are
+        # sent so that the file doesn't have to be read an additional time
+        digest = _md5() if not is_given(md5) else None
 
+        with source:
+            for offset in range(0, len(source), part_size):
+                with source.slice(offset, part_size, digest=digest) as data:
                     part = await self.parts.create(upload_id=upload.id, data=data)
-                    log.info("Uploaded part %s for upload %s", part.id, upload.id)
-                    part_ids.append(part.id)
-            except Exception:
-                buf.close()
-                raise
+                    data.update_digest()
+
+                log.info("Uploaded part %s for upload %s", part.id, upload.id)
+                part_ids.append(part.id)
+
+        if digest is not None:
+            md5 = digest.hexdigest()
+
+        upload = await self.complete(upload_id=upload.id, part_ids=part_ids, md5=md5)
+        if file_index is not None and content_hash is not None and upload.file is not None:
+            file_index.add(content_hash, purpose, upload.file, upload=upload)
 
-        return await self.complete(upload_id=upload.id, part_ids=part_ids, md5=md5)
+        return upload
 
     async def create(
         self,
@@ -5,8 +5,9 @@ from __future__ import annotations
 import asyncio
 from typing import Dict, List, Iterable, Optional
 from typing_extensions import Union, Literal
-from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait, as_completed
 
+import anyio
 import httpx
 import sniffio
 
@@ -19,6 +20,9 @@ from ..._resource import SyncAPIResource, AsyncAPIResource
 from ..._response import to_streamed_response_wrapper, async_to_streamed_response_wrapper
 from ...pagination import SyncCursorPage, AsyncCursorPage
 from ..._base_client import AsyncPaginator, make_request_options
+from ...lib._file_index import FileIndex
+from ...lib._file_batches import FileIdBatcher, FileAttachFailure, UploadAndAttachResult
+from ...lib._search_cache import invalidate_search_caches
 from ...types.file_object import FileObject
 from ...types.vector_stores import file_batch_create_params, file_batch_list_files_params
 from ...types.file_chunking_strategy_param import FileChunkingStrategyParam
@@ -90,7 +94,7 @@ class FileBatches(SyncAPIResource):
         if not vector_store_id:
             raise ValueError(f"Expected a non-empty value for `vector_store_id` but received {vector_store_id!r}")
         extra_headers = {"OpenAI-Beta": "assistants=v2", **(extra_headers or {})}
-        return self._post(
+        batch = self._post(
             f"/vector_stores/{vector_store_id}/file_batches",
             body=maybe_transform(
                 {
@@ -105,6 +109,8 @@ class FileBatches(SyncAPIResource):
             ),
             cast_to=VectorStoreFileBatch,
         )
+        invalidate_search_caches(self._client, vector_store_id)
+        return batch
 
     def retrieve(
         self,
@@ -174,13 +180,15 @@ class FileBatches(SyncAPIResource):
         if not batch_id:
             raise ValueError(f"Expected a non-empty value for `batch_id` but received {batch_id!r}")
         extra_headers = {"OpenAI-Beta": "assistants=v2", **(extra_headers or {})}
-        return self._post(
+        batch = self._post(
             f"/vector_stores/{vector_store_id}/file_batches/{batch_id}/cancel",
             options=make_request_options(
                 extra_headers=extra_headers, extra_query=extra_query, extra_body=extra_body, timeout=timeout
             ),
             cast_to=VectorStoreFileBatch,
         )
+        invalidate_search_caches(self._client, vector_store_id)
+        return batch
 
     def create_and_poll(
         self,
@@ -312,6 +320,8 @@ class FileBatches(SyncAPIResource):
                 self._sleep(poll_interval_ms / 1000)
                 continue
 
+            # the batch's files are now searchable, or have stopped being processed
+            invalidate_search_caches(self._client, vector_store_id)
             return batch
 
     def upload_and_poll(
@@ -323,12 +333,16 @@ class FileBatches(SyncAPIResource):
         file_ids: List[str] = [],
         poll_interval_ms: int | NotGiven = NOT_GIVEN,
         chunking_strategy: FileChunkingStrategyParam | NotGiven = NOT_GIVEN,
+        file_index: FileIndex | None = None,
     ) -> VectorStoreFileBatch:
         """Uploads the given files concurrently and then creates a vector store file batch.
 
         If you've already uploaded certain files that you want to include in this batch
         then you can pass their IDs through the `file_ids` argument.
 
+        If a `file_index` is given, files whose contents have already been uploaded are
+        not uploaded again and their existing file IDs are used instead.
+
         By default, if any file upload fails then an exception will be eagerly raised.
 
         The number of concurrency uploads is configurable using the `max_concurrency`
@@ -345,6 +359,7 @@ class FileBatches(SyncAPIResource):
                     self._client.files.create,
                     file=file,
                     purpose="assistants",
+                    file_index=file_index,
                 )
                 for file in files
             ]
@@ -364,6 +379,125 @@ class FileBatches(SyncAPIResource):
         )
         return batch
 
+    def upload_and_attach(
+        self,
+        vector_store_id: str,
+        *,
+        files: Iterable[FileTypes],
+        max_concurrency: int = 5,
+        batch_size: int = 100,
+        batch_window_seconds: float = 5.0,
+        file_ids: List[str] = [],
+        poll_interval_ms: int | NotGiven = NOT_GIVEN,
+        chunking_strategy: FileChunkingStrategyParam | NotGiven = NOT_GIVEN,
+        file_index: FileIndex | None = None,
+    ) -> UploadAndAttachResult:
+        """Uploads the given files and attaches them to the vector store while the remaining files are uploading.
+
+        Unlike `upload_and_poll()`, which waits for every upload to finish before creating
+        a single file batch, a file batch is created as soon as `batch_size` files have been
+        uploaded, or once `batch_window_seconds` have passed since the oldest file waiting
+        to be attached was uploaded. This lets the files be processed while the rest are
+        still being uploaded. Once every file has been attached, all of the created batches
+        are polled together.
+
+        Failures are not raised, instead files that could not be uploaded or attached are
+        reported in `result.failures` and files that failed to be processed are reported
+        in `result.failed_files`.
+        """
+        batcher = FileIdBatcher(batch_size=batch_size, window_seconds=batch_window_seconds)
+        for file_id in file_ids:
+            batcher.add(file_id)
+
+        uploaded: Dict[str, FileTypes] = {}
+        batches: List[VectorStoreFileBatch] = []
+        failures: List[FileAttachFailure] = []
+
+        def attach(ids: List[str]) -> None:
+            try:
+                batch = self.create(vector_store_id=vector_store_id, file_ids=ids, chunking_strategy=chunking_strategy)
+            except Exception as exc:
+                failures.extend(FileAttachFailure(file=uploaded.get(id), file_id=id, error=exc) for id in ids)
+            else:
+                batches.append(batch)
+
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            futures: Dict[Future[FileObject], FileTypes] = {
+                executor.submit(
+                    self._client.files.create,
+                    file=file,
+                    purpose="assistants",
+                    file_index=file_index,
+                ): file
+                for file in files
+            }
+
+            not_done = set(futures)
+            while not_done:
+                done, not_done = wait(not_done, timeout=batcher.timeout(), return_when=FIRST_COMPLETED)
+                for future in done:
+                    exc = future.exception()
+                    if isinstance(exc, Exception):
+                        failures.append(FileAttachFailure(file=futures[future], file_id=None, error=exc))
+                    elif exc is not None:
+                        raise exc
+                    else:
+                        file_obj = future.result()
+                        uploaded[file_obj.id] = futures[future]
+                        batcher.add(file_obj.id)
+
+                for ids in batcher.take_ready():
+                    attach(ids)
+
+        for ids in batcher.take_ready(flush=True):
+            attach(ids)
+
+        batches = self._poll_many(batches, vector_store_id=vector_store_id, poll_interval_ms=poll_interval_ms)
+
+        failed_files: List[VectorStoreFile] = []
+        for batch in batches:
+            if batch.file_counts.failed > 0:
+                failed_files.extend(
+                    self.list_files(batch.id, vector_store_id=vector_store_id, filter="failed", limit=100)
+                )
+
+        return UploadAndAttachResult(batches=batches, failures=failures, failed_files=failed_files)
+
+    def _poll_many(
+        self,
+        batches: List[VectorStoreFileBatch],
+        *,
+        vector_store_id: str,
+        poll_interval_ms: int | NotGiven,
+    ) -> List[VectorStoreFileBatch]:
+        """Waits for all of the given file batches to be processed, retrieving each one once per interval."""
+        headers: dict[str, str] = {"X-Stainless-Poll-Helper": "true"}
+        if is_given(poll_interval_ms):
+            headers["X-Stainless-Custom-Poll-Interval"] = str(poll_interval_ms)
+
+        results = list(batches)
+        pending = list(range(len(results)))
+        while True:
+            interval_ms = 0
+            in_progress: List[int] = []
+            for index in pending:
+                response = self.with_raw_response.retrieve(
+                    results[index].id,
+                    vector_store_id=vector_store_id,
+                    extra_headers=headers,
+                )
+                results[index] = response.parse()
+                if results[index].file_counts.in_progress > 0:
+                    in_progress.append(index)
+                    interval_ms = max(interval_ms, _poll_interval_ms(response.headers, poll_interval_ms))
+
+            if not in_progress:
+                invalidate_search_caches(self._client, vector_store_id)
+                return results
+
+            pending = in_progress
+            self._sleep(interval_ms / 1000)
+
 
 class AsyncFileBatches(AsyncAPIResource):
     @cached_property
@@ -427,7 +561,7 @@ class AsyncFileBatches(AsyncAPIResource):
         if not vector_store_id:
             raise ValueError(f"Expected a non-empty value for `vector_store_id` but received {vector_store_id!r}")
         extra_headers = {"OpenAI-Beta": "assistants=v2", **(extra_headers or {})}
-        return await self._post(
+        batch = await self._post(
             f"/vector_stores/{vector_store_id}/file_batches",
             body=await async_maybe_transform(
                 {
@@ -442,6 +576,8 @@ class AsyncFileBatches(AsyncAPIResource):
             ),
             cast_to=VectorStoreFileBatch,
         )
+        invalidate_search_caches(self._client, vector_store_id)
+        return batch
 
     async def retrieve(
         self,
@@ -511,13 +647,15 @@ class AsyncFileBatches(AsyncAPIResource):
         if not batch_id:
             raise ValueError(f"Expected a non-empty value for `batch_id` but received {batch_id!r}")
         extra_headers = {"OpenAI-Beta": "assistants=v2", **(extra_headers or {})}
-        return await self._post(
+        batch = await self._post(
             f"/vector_stores/{vector_store_id}/file_batches/{batch_id}/cancel",
             options=make_request_options(
                 extra_headers=extra_headers, extra_query=extra_query, extra_body=extra_body, timeout=timeout
             ),
             cast_to=VectorStoreFileBatch,
         )
+        invalidate_search_caches(self._client, vector_store_id)
+        return batch
 
     async def create_and_poll(
         self,
@@ -649,6 +787,8 @@ class AsyncFileBatches(AsyncAPIResource):
                 await self._sleep(poll_interval_ms / 1000)
                 continue
 
+            # the batch's files are now searchable, or have stopped being processed
+            invalidate_search_caches(self._client, vector_store_id)
             return batch
 
     async def upload_and_poll(
@@ -660,12 +800,16 @@ class AsyncFileBatches(AsyncAPIResource):
         file_ids: List[str] = [],
         poll_interval_ms: int | NotGiven = NOT_GIVEN,
         chunking_strategy: FileChunkingStrategyParam | NotGiven = NOT_GIVEN,
+        file_index: FileIndex | None = None,
     ) -> VectorStoreFileBatch:
         """Uploads the given files concurrently and then creates a vector store file batch.
 
         If you've already uploaded certain files that you want to include in this batch
         then you can pass their IDs through the `file_ids` argument.
 
+        If a `file_index` is given, files whose contents have already been uploaded are
+        not uploaded again and their existing file IDs are used instead.
+
         By default, if any file upload fails then an exception will be eagerly raised.
 
         The number of concurrency uploads is configurable using the `max_concurrency`
@@ -685,6 +829,7 @@ class AsyncFileBatches(AsyncAPIResource):
                     file_obj = await self._client.files.create(
                         file=file,
                         purpose="assistants",
+                        file_index=file_index,
                     )
                     uploaded_files.append(file_obj)
 
@@ -703,6 +848,7 @@ class AsyncFileBatches(AsyncAPIResource):
                     file_obj = await self._client.files.create(
                         file=file,
                         purpose="assistants",
+                        file_index=file_index,
                     )
                     uploaded_files.append(file_obj)
 
@@ -724,6 +870,154 @@ class AsyncFileBatches(AsyncAPIResource):
         )
         return batch
 
+    async def upload_and_attach(
+        self,
+        vector_store_id: str,
+        *,
+        files: Iterable[FileTypes],
+        max_concurrency: int = 5,
+        batch_size: int = 100,
+        batch_window_seconds: float = 5.0,
+        file_ids: List[str] = [],
+        poll_interval_ms: int | NotGiven = NOT_GIVEN,
+        chunking_strategy: FileChunkingStrategyParam | NotGiven = NOT_GIVEN,
+        file_index: FileIndex | None = None,
+    ) -> UploadAndAttachResult:
+        """Uploads the given files and attaches them to the vector store while the remaining files are uploading.
+
+        Unlike `upload_and_poll()`, which waits for every upload to finish before creating
+        a single file batch, a file batch is created as soon as `batch_size` files have been
+        uploaded, or once `batch_window_seconds` have passed since the oldest file waiting
+        to be attached was uploaded. This lets the files be processed while the rest are
+        still being uploaded. Once every file has been attached, all of the created batches
+        are polled together.
+
+        Failures are not raised, instead files that could not be uploaded or attached are
+        reported in `result.failures` and files that failed to be processed are reported
+        in `result.failed_files`.
+        """
+        batcher = FileIdBatcher(batch_size=batch_size, window_seconds=batch_window_seconds)
+        for file_id in file_ids:
+            batcher.add(file_id)
+
+        uploaded: Dict[str, FileTypes] = {}
+        batches: List[VectorStoreFileBatch] = []
+        failures: List[FileAttachFailure] = []
+        limiter = anyio.CapacityLimiter(max_concurrency)
+        uploads_done = anyio.Event()
+        # set when an upload adds an ID to the batcher or when all of them are done
+        id_added = anyio.Event()
+
+        async def attach(ids: List[str]) -> None:
+            try:
+                batch = await self.create(
+                    vector_store_id=vector_store_id, file_ids=ids, chunking_strategy=chunking_strategy
+                )
+            except Exception as exc:
+                failures.extend(FileAttachFailure(file=uploaded.get(id), file_id=id, error=exc) for id in ids)
+            else:
+                batches.append(batch)
+
+        async def upload(file: FileTypes) -> None:
+            async with limiter:
+                try:
+                    file_obj = await self._client.files.create(file=file, purpose="assistants", file_index=file_index)
+                except Exception as exc:
+                    failures.append(FileAttachFailure(file=file, file_id=None, error=exc))
+                    return
+
+            uploaded[file_obj.id] = file
+            batcher.add(file_obj.id)
+            id_added.set()
+            for ids in batcher.take_ready():
+                await attach(ids)
+
+        async def attach_on_window() -> None:
+            nonlocal id_added
+            while not uploads_done.is_set():
+                timeout = batcher.timeout()
+                if timeout is None:
+                    # no partial batch is pending, so there's no window to wait for
+                    await id_added.wait()
+                    id_added = anyio.Event()
+                    continue
+
+                with anyio.move_on_after(timeout):
+                    await uploads_done.wait()
+
+                for ids in batcher.take_ready():
+                    await attach(ids)
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(attach_on_window)
+
+            async with anyio.create_task_group() as uploads:
+                for file in files:
+                    uploads.start_soon(upload, file)
+
+            uploads_done.set()
+            id_added.set()
+
+        for ids in batcher.take_ready(flush=True):
+            await attach(ids)
+
+        batches = await self._poll_many(batches, vector_store_id=vector_store_id, poll_interval_ms=poll_interval_ms)
+
+        failed_files: List[VectorStoreFile] = []
+        for batch in batches:
+            if batch.file_counts.failed > 0:
+                async for failed_file in self.list_files(
+                    batch.id, vector_store_id=vector_store_id, filter="failed", limit=100
+                ):
+                    failed_files.append(failed_file)
+
+        return UploadAndAttachResult(batches=batches, failures=failures, failed_files=failed_files)
+
+    async def _poll_many(
+        self,
+        batches: List[VectorStoreFileBatch],
+        *,
+        vector_store_id: str,
+        poll_interval_ms: int | NotGiven,
+    ) -> List[VectorStoreFileBatch]:
+        """Waits for all of the given file batches to be processed, retrieving each one once per interval."""
+        headers: dict[str, str] = {"X-Stainless-Poll-Helper": "true"}
+        if is_given(poll_interval_ms):
+            headers["X-Stainless-Custom-Poll-Interval"] = str(poll_interval_ms)
+
+        results = list(batches)
+        pending = list(range(len(results)))
+        while True:
+            interval_ms = 0
+            in_progress: List[int] = []
+            for index in pending:
+                response = await self.with_raw_response.retrieve(
+                    results[index].id,
+                    vector_store_id=vector_store_id,
+                    extra_headers=headers,
+                )
+                results[index] = response.parse()
+                if results[index].file_counts.in_progress > 0:
+                    in_progress.append(index)
+                    interval_ms = max(interval_ms, _poll_interval_ms(response.headers, poll_interval_ms))
+
+            if not in_progress:
+                invalidate_search_caches(self._client, vector_store_id)
+                return results
+
+            pending = in_progress
+            await self._sleep(interval_ms / 1000)
+
+
+def _poll_interval_ms(headers: httpx.Headers, poll_interval_ms: int | NotGiven) -> int:
+    if is_given(poll_interval_ms):
+        return poll_interval_ms
+
+    from_header = headers.get("openai-poll-after-ms")
+    if from_header is not None:
+        return int(from_header)
+    return 1000
+
 
 class FileBatchesWithRawResponse:
     def __init__(self, file_batches: FileBatches) -> None:
@@ -16,6 +16,7 @@ from ..._resource import SyncAPIResource, AsyncAPIResource
 from ..._response import to_streamed_response_wrapper, async_to_streamed_response_wrapper
 from ...pagination import SyncPage, AsyncPage, SyncCursorPage, AsyncCursorPage
 from ..._base_client import AsyncPaginator, make_request_options
+from ...lib._search_cache import invalidate_search_caches
 from ...types.vector_stores import file_list_params, file_create_params, file_update_params
 from ...types.file_chunking_strategy_param import FileChunkingStrategyParam
 from ...types.vector_stores.vector_store_file import VectorStoreFile
@@ -89,7 +90,7 @@ class Files(SyncAPIResource):
         if not vector_store_id:
             raise ValueError(f"Expected a non-empty value for `vector_store_id` but received {vector_store_id!r}")
         extra_headers = {"OpenAI-Beta": "assistants=v2", **(extra_headers or {})}
-        return self._post(
+        file = self._post(
             f"/vector_stores/{vector_store_id}/files",
             body=maybe_transform(
                 {
@@ -104,6 +105,8 @@ class Files(SyncAPIResource):
             ),
             cast_to=VectorStoreFile,
         )
+        invalidate_search_caches(self._client, vector_store_id)
+        return file
 
     def retrieve(
         self,
@@ -178,7 +181,7 @@ class Files(SyncAPIResource):
         if not file_id:
             raise ValueError(f"Expected a non-empty value for `file_id` but received {file_id!r}")
         extra_headers = {"OpenAI-Beta": "assistants=v2", **(extra_headers or {})}
-        return self._post(
+        file = self._post(
             f"/vector_stores/{vector_store_id}/files/{file_id}",
             body=maybe_transform({"attributes": attributes}, file_update_params.FileUpdateParams),
             options=make_request_options(
@@ -186,6 +189,8 @@ class Files(SyncAPIResource):
             ),
             cast_to=VectorStoreFile,
         )
+        invalidate_search_caches(self._client, vector_store_id)
+        return file
 
     def list(
         self,
@@ -291,13 +296,15 @@ class Files(SyncAPIResource):
         if not file_id:
             raise ValueError(f"Expected a non-empty value for `file_id` but received {file_id!r}")
         extra_headers = {"OpenAI-Beta": "assistants=v2", **(extra_headers or {})}
-        return self._delete(
+        deleted = self._delete(
             f"/vector_stores/{vector_store_id}/files/{file_id}",
             options=make_request_options(
                 extra_headers=extra_headers, extra_query=extra_query, extra_body=extra_body, timeout=timeout
             ),
             cast_to=VectorStoreFileDeleted,
         )
+        invalidate_search_caches(self._client, vector_store_id)
+        return deleted
 
     def create_and_poll(
         self,
@@ -350,6 +357,8 @@ class Files(SyncAPIResource):
 
                 self._sleep(poll_interval_ms / 1000)
             elif file.status == "cancelled" or file.status == "completed" or file.status == "failed":
+                # the file's chunks are now searchable, or have stopped being processed
+                invalidate_search_caches(self._client, vector_store_id)
                 return file
             else:
                 if TYPE_CHECKING:  # type: ignore[unreachable]
@@ -492,7 +501,7 @@ class AsyncFiles(AsyncAPIResource):
         if not vector_store_id:
             raise ValueError(f"Expected a non-empty value for `vector_store_id` but received {vector_store_id!r}")
         extra_headers = {"OpenAI-Beta": "assistants=v2", **(extra_headers or {})}
-        return await self._post(
+        file = await self._post(
             f"/vector_stores/{vector_store_id}/files",
             body=await async_maybe_transform(
                 {
@@ -507,6 +516,8 @@ class AsyncFiles(AsyncAPIResource):
             ),
             cast_to=VectorStoreFile,
         )
+        invalidate_search_caches(self._client, vector_store_id)
+        return file
 
     async def retrieve(
         self,
@@ -581,7 +592,7 @@ class AsyncFiles(AsyncAPIResource):
         if not file_id:
             raise ValueError(f"Expected a non-empty value for `file_id` but received {file_id!r}")
         extra_headers = {"OpenAI-Beta": "assistants=v2", **(extra_headers or {})}
-        return await self._post(
+        file = await self._post(
             f"/vector_stores/{vector_store_id}/files/{file_id}",
             body=await async_maybe_transform({"attributes": attributes}, file_update_params.FileUpdateParams),
             options=make_request_options(
@@ -589,6 +600,8 @@ class AsyncFiles(AsyncAPIResource):
             ),
             cast_to=VectorStoreFile,
         )
+        invalidate_search_caches(self._client, vector_store_id)
+        return file
 
     def list(
         self,
@@ -694,13 +707,15 @@ class AsyncFiles(AsyncAPIResource):
         if not file_id:
             raise ValueError(f"Expected a non-empty value for `file_id` but received {file_id!r}")
         extra_headers = {"OpenAI-Beta": "assistants=v2", **(extra_headers or {})}
-        return await self._delete(
+        deleted = await self._delete(
             f"/vector_stores/{vector_store_id}/files/{file_id}",
             options=make_request_options(
                 extra_headers=extra_headers, extra_query=extra_query, extra_body=extra_body, timeout=timeout
             ),
             cast_to=VectorStoreFileDeleted,
         )
+        invalidate_search_caches(self._client, vector_store_id)
+        return deleted
 
     async def create_and_poll(
         self,
@@ -753,6 +768,8 @@ class AsyncFiles(AsyncAPIResource):
 
                 await self._sleep(poll_interval_ms / 1000)
             elif file.status == "cancelled" or file.status == "completed" or file.status == "failed":
+                # the file's chunks are now searchable, or have stopped being processed
+                invalidate_search_caches(self._client, vector_store_id)
                 return file
             else:
                 if TYPE_CHECKING:  # type: ignore[unreachable]
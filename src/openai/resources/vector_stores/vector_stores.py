@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
-from typing import List, Union, Optional
+import os
+import functools
+from typing import Dict, List, Union, Callable, Optional, Sequence, cast
 from typing_extensions import Literal
 
 import httpx
@@ -24,7 +26,7 @@ from ...types import (
     vector_store_update_params,
 )
 from ..._types import NOT_GIVEN, Body, Query, Headers, NotGiven
-from ..._utils import maybe_transform, async_maybe_transform
+from ..._utils import asyncify, maybe_transform, run_concurrently, async_maybe_transform, async_run_concurrently
 from ..._compat import cached_property
 from ..._resource import SyncAPIResource, AsyncAPIResource
 from ..._response import to_streamed_response_wrapper, async_to_streamed_response_wrapper
@@ -38,7 +40,16 @@ from .file_batches import (
     AsyncFileBatchesWithStreamingResponse,
 )
 from ..._base_client import AsyncPaginator, make_request_options
+from ...lib._search_cache import SearchCache, search_cache_key, invalidate_search_caches
 from ...types.vector_store import VectorStore
+from ...lib._vector_store_sync import (
+    SyncSource,
+    VectorStoreManifest,
+    VectorStoreSyncResult,
+    plan_sync,
+    apply_sync_operation,
+    async_apply_sync_operation,
+)
 from ...types.vector_store_deleted import VectorStoreDeleted
 from ...types.shared_params.metadata import Metadata
 from ...types.file_chunking_strategy_param import FileChunkingStrategyParam
@@ -320,13 +331,15 @@ class VectorStores(SyncAPIResource):
         if not vector_store_id:
             raise ValueError(f"Expected a non-empty value for `vector_store_id` but received {vector_store_id!r}")
         extra_headers = {"OpenAI-Beta": "assistants=v2", **(extra_headers or {})}
-        return self._delete(
+        deleted = self._delete(
             f"/vector_stores/{vector_store_id}",
             options=make_request_options(
                 extra_headers=extra_headers, extra_query=extra_query, extra_body=extra_body, timeout=timeout
             ),
             cast_to=VectorStoreDeleted,
         )
+        invalidate_search_caches(self._client, vector_store_id)
+        return deleted
 
     def search(
         self,
@@ -391,6 +404,145 @@ class VectorStores(SyncAPIResource):
             method="post",
         )
 
+    def search_many(
+        self,
+        vector_store_id: str,
+        *,
+        queries: Sequence[Union[str, List[str]]],
+        filters: vector_store_search_params.Filters | NotGiven = NOT_GIVEN,
+        max_num_results: int | NotGiven = NOT_GIVEN,
+        ranking_options: vector_store_search_params.RankingOptions | NotGiven = NOT_GIVEN,
+        rewrite_query: bool | NotGiven = NOT_GIVEN,
+        cache: SearchCache | None = None,
+        max_concurrency: int = 8,
+    ) -> List[SyncPage[VectorStoreSearchResponse]]:
+        """Runs the given search queries concurrently, results are returned in the same order as the queries.
+
+        Duplicate queries are only sent once. If a `cache` is given then results are
+        read from it where possible and new results are stored in it, cached results
+        for a vector store are invalidated when its files or file batches are changed
+        through this client.
+        """
+        if not vector_store_id:
+            raise ValueError(f"Expected a non-empty value for `vector_store_id` but received {vector_store_id!r}")
+
+        generation: Optional[int] = None
+        if cache is not None:
+            cache.register(self._client)
+            generation = cache.generation
+
+        keys = [
+            search_cache_key(
+                vector_store_id,
+                query=query,
+                filters=filters,
+                max_num_results=max_num_results,
+                ranking_options=ranking_options,
+                rewrite_query=rewrite_query,
+            )
+            for query in queries
+        ]
+
+        pages: Dict[str, SyncPage[VectorStoreSearchResponse]] = {}
+        missing: Dict[str, Union[str, List[str]]] = {}
+        for key, query in zip(keys, queries):
+            if key in pages or key in missing:
+                continue
+
+            cached = cache.get(key) if cache is not None else None
+            if cached is not None:
+                pages[key] = cast("SyncPage[VectorStoreSearchResponse]", cached)
+            else:
+                missing[key] = query
+
+        results = run_concurrently(
+            [
+                functools.partial(
+                    self.search,
+                    vector_store_id,
+                    query=query,
+                    filters=filters,
+                    max_num_results=max_num_results,
+                    ranking_options=ranking_options,
+                    rewrite_query=rewrite_query,
+                )
+                for query in missing.values()
+            ],
+            max_concurrency=max_concurrency,
+        )
+        for key, page in zip(missing, results):
+            pages[key] = page
+            if cache is not None:
+                cache.set(key, vector_store_id, page, generation=generation)
+
+        return [pages[key] for key in keys]
+
+    def sync(
+        self,
+        vector_store_id: str,
+        *,
+        source: SyncSource,
+        manifest: VectorStoreManifest | str | os.PathLike[str],
+        attributes: Callable[[str], Optional[Dict[str, Union[str, float, bool]]]] | None = None,
+        chunking_strategy: FileChunkingStrategyParam | NotGiven = NOT_GIVEN,
+        delete: bool = True,
+        max_concurrency: int = 5,
+        dry_run: bool = False,
+    ) -> VectorStoreSyncResult:
+        """Makes the vector store contain exactly the files in the given source.
+
+        The `source` can be a directory, which is walked recursively and keyed by each
+        file's relative path, or a mapping of keys to file contents. Its contents are
+        hashed and diffed against the `manifest` of the previous sync so that only new
+        and changed files are uploaded, files whose `attributes` changed are updated in
+        place and files that are no longer in the source are removed from the vector
+        store and deleted, unless `delete` is `False`.
+
+        Up to `max_concurrency` operations are run at once. The manifest is updated as
+        each operation completes, so an interrupted sync can be resumed by running it
+        again with the same manifest. Failures are not raised, instead they are
+        reported per key in `result.failures`.
+
+        Note: the manifest only tracks files added through this method, files attached
+        to the vector store in other ways are left untouched.
+        """
+        if not vector_store_id:
+            raise ValueError(f"Expected a non-empty value for `vector_store_id` but received {vector_store_id!r}")
+
+        owns_manifest = not isinstance(manifest, VectorStoreManifest)
+        store = manifest if isinstance(manifest, VectorStoreManifest) else VectorStoreManifest(manifest)
+        try:
+            operations, unchanged = plan_sync(
+                source, store.entries(vector_store_id), attributes=attributes, delete=delete
+            )
+            if dry_run:
+                return VectorStoreSyncResult(operations=operations, unchanged=unchanged, failures=[], dry_run=True)
+
+            results = run_concurrently(
+                [
+                    functools.partial(
+                        apply_sync_operation,
+                        self._client,
+                        vector_store_id,
+                        operation,
+                        manifest=store,
+                        chunking_strategy=chunking_strategy,
+                    )
+                    for operation in operations
+                ],
+                max_concurrency=max_concurrency,
+            )
+        finally:
+            if owns_manifest:
+                store.close()
+
+        return VectorStoreSyncResult(
+            operations=operations,
+            unchanged=unchanged,
+            failures=[failure for failure in results if failure is not None],
+            dry_run=False,
+        )
+
 
 class AsyncVectorStores(AsyncAPIResource):
     @cached_property
@@ -665,13 +817,15 @@ class AsyncVectorStores(AsyncAPIResource):
         if not vector_store_id:
             raise ValueError(f"Expected a non-empty value for `vector_store_id` but received {vector_store_id!r}")
         extra_headers = {"OpenAI-Beta": "assistants=v2", **(extra_headers or {})}
-        return await self._delete(
+        deleted = await self._delete(
             f"/vector_stores/{vector_store_id}",
             options=make_request_options(
                 extra_headers=extra_headers, extra_query=extra_query, extra_body=extra_body, timeout=timeout
             ),
             cast_to=VectorStoreDeleted,
         )
+        invalidate_search_caches(self._client, vector_store_id)
+        return deleted
 
     def search(
         self,
@@ -736,6 +890,146 @@ class AsyncVectorStores(AsyncAPIResource):
             method="post",
         )
 
+    async def search_many(
+        self,
+        vector_store_id: str,
+        *,
+        queries: Sequence[Union[str, List[str]]],
+        filters: vector_store_search_params.Filters | NotGiven = NOT_GIVEN,
+        max_num_results: int | NotGiven = NOT_GIVEN,
+        ranking_options: vector_store_search_params.RankingOptions | NotGiven = NOT_GIVEN,
+        rewrite_query: bool | NotGiven = NOT_GIVEN,
+        cache: SearchCache | None = None,
+        max_concurrency: int = 8,
+    ) -> List[AsyncPage[VectorStoreSearchResponse]]:
+        """Runs the given search queries concurrently, results are returned in the same order as the queries.
+
+        Duplicate queries are only sent once. If a `cache` is given then results are
+        read from it where possible and new results are stored in it, cached results
+        for a vector store are invalidated when its files or file batches are changed
+        through this client.
+        """
+        if not vector_store_id:
+            raise ValueError(f"Expected a non-empty value for `vector_store_id` but received {vector_store_id!r}")
+
+        generation: Optional[int] = None
+        if cache is not None:
+            cache.register(self._client)
+            generation = cache.generation
+
+        keys = [
+            search_cache_key(
+                vector_store_id,
+                query=query,
+                filters=filters,
+                max_num_results=max_num_results,
+                ranking_options=ranking_options,
+                rewrite_query=rewrite_query,
+            )
+            for query in queries
+        ]
+
+        pages: Dict[str, AsyncPage[VectorStoreSearchResponse]] = {}
+        missing: Dict[str, Union[str, List[str]]] = {}
+        for key, query in zip(keys, queries):
+            if key in pages or key in missing:
+                continue
+
+            cached = cache.get(key) if cache is not None else None
+            if cached is not None:
+                pages[key] = cast("AsyncPage[VectorStoreSearchResponse]", cached)
+            else:
+                missing[key] = query
+
+        results = await async_run_concurrently(
+            [
+                functools.partial(
+                    self.search,
+                    vector_store_id,
+                    query=query,
+                    filters=filters,
+                    max_num_results=max_num_results,
+                    ranking_options=ranking_options,
+                    rewrite_query=rewrite_query,
+                )
+                for query in missing.values()
+            ],
+            max_concurrency=max_concurrency,
+        )
+        for key, page in zip(missing, results):
+            pages[key] = page
+            if cache is not None:
+                cache.set(key, vector_store_id, page, generation=generation)
+
+        return [pages[key] for key in keys]
+
+    async def sync(
+        self,
+        vector_store_id: str,
+        *,
+        source: SyncSource,
+        manifest: VectorStoreManifest | str | os.PathLike[str],
+        attributes: Callable[[str], Optional[Dict[str, Union[str, float, bool]]]] | None = None,
+        chunking_strategy: FileChunkingStrategyParam | NotGiven = NOT_GIVEN,
+        delete: bool = True,
+        max_concurrency: int = 5,
+        dry_run: bool = False,
+    ) -> VectorStoreSyncResult:
+        """Makes the vector store contain exactly the files in the given source.
+
+        The `source` can be a directory, which is walked recursively and keyed by each
+        file's relative path, or a mapping of keys to file contents. Its contents are
+        hashed and diffed against the `manifest` of the previous sync so that only new
+        and changed files are uploaded, files whose `attributes` changed are updated in
+        place and files that are no longer in the source are removed from the vector
+        store and deleted, unless `delete` is `False`.
+
+        Up to `max_concurrency` operations are run at once. The manifest is updated as
+        each operation completes, so an interrupted sync can be resumed by running it
+        again with the same manifest. Failures are not raised, instead they are
+        reported per key in `result.failures`.
+
+        Note: the manifest only tracks files added through this method, files attached
+        to the vector store in other ways are left untouched.
+        """
+        if not vector_store_id:
+            raise ValueError(f"Expected a non-empty value for `vector_store_id` but received {vector_store_id!r}")
+
+        owns_manifest = not isinstance(manifest, VectorStoreManifest)
+        store = manifest if isinstance(manifest, VectorStoreManifest) else VectorStoreManifest(manifest)
+        try:
+            # hashing the source reads every file so it's done in a worker thread
+            operations, unchanged = await asyncify(plan_sync)(
+                source, store.entries(vector_store_id), attributes=attributes, delete=delete
+            )
+            if dry_run:
+                return VectorStoreSyncResult(operations=operations, unchanged=unchanged, failures=[], dry_run=True)
+
+            results = await async_run_concurrently(
+                [
+                    functools.partial(
+                        async_apply_sync_operation,
+                        self._client,
+                        vector_store_id,
+                        operation,
+                        manifest=store,
+                        chunking_strategy=chunking_strategy,
+                    )
+                    for operation in operations
+                ],
+                max_concurrency=max_concurrency,
+            )
+        finally:
+            if owns_manifest:
+                store.close()
+
+        return VectorStoreSyncResult(
+            operations=operations,
+            unchanged=unchanged,
+            failures=[failure for failure in results if failure is not None],
+            dry_run=False,
+        )
+
 
 class VectorStoresWithRawResponse:
     def __init__(self, vector_stores: VectorStores) -> None:
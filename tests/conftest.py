@@ -2,12 +2,14 @@ from __future__ import annotations
 
 import os
 import logging
-from typing import TYPE_CHECKING, Iterator, AsyncIterator
+from typing import TYPE_CHECKING, Any, Iterator, AsyncIterator, cast
 
 import pytest
 from pytest_asyncio import is_async_test
 
 from openai import OpenAI, AsyncOpenAI
+from openai._extras import has_tiktoken
+from openai.lib._tokens import _encoding_for_model
 
 if TYPE_CHECKING:
     from _pytest.fixtures import FixtureRequest  # pyright: ignore[reportPrivateImportUsage]
@@ -31,6 +33,29 @@ base_url = os.environ.get("TEST_API_BASE_URL", "http://127.0.0.1:4010")
 api_key = "My API Key"
 
 
+@pytest.fixture(autouse=True)
+def tiktoken_encodings(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    """Registers encodings with a token per byte in place of tiktoken's own, which are downloaded on first use."""
+    if not has_tiktoken():
+        yield
+        return
+
+    import tiktoken
+
+    for name in ("o200k_base", "cl100k_base"):
+        encoding = tiktoken.Encoding(
+            name,
+            pat_str=r"\S+|\s+",
+            mergeable_ranks={bytes([i]): i for i in range(256)},
+            special_tokens={"<|endoftext|>": 256},
+        )
+        monkeypatch.setitem(tiktoken.registry.ENCODINGS, name, encoding)
+
+    cast(Any, _encoding_for_model).cache_clear()
+    yield
+    cast(Any, _encoding_for_model).cache_clear()
+
+
 @pytest.fixture(scope="session")
 def client(request: FixtureRequest) -> Iterator[OpenAI]:
     strict = getattr(request, "param", True)
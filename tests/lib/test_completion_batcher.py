@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List
+
+import anyio
+import httpx
+import pytest
+from respx import MockRouter
+
+from openai import OpenAI, AsyncOpenAI, BadRequestError
+from openai.lib import CompletionBatcher, AsyncCompletionBatcher
+from openai.types.completion import Completion
+
+from ..conftest import base_url
+
+
+def _completion(choices: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "id": "cmpl-1",
+        "object": "text_completion",
+        "created": 0,
+        "model": "gpt-3.5-turbo-instruct",
+        "choices": [{"finish_reason": "stop", "logprobs": None, **choice} for choice in choices],
+        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+    }
+
+
+def _mock_completions(respx_mock: MockRouter) -> List[Dict[str, Any]]:
+    """Replies with `<prompt>-<j>` for the j-th of the `n` choices of every prompt."""
+    requests: List[Dict[str, Any]] = []
+
+    def create(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        requests.append(body)
+        n = body.get("n", 1)
+        choices = [
+            {"index": i * n + j, "text": f"{prompt}-{j}"} for i, prompt in enumerate(body["prompt"]) for j in range(n)
+        ]
+        if not body.get("stream"):
+            return httpx.Response(200, json=_completion(choices))
+
+        # stream every choice in two chunks, with the prompts interleaved
+        events = [
+            _completion([{**choice, "text": choice["text"][:part] if part else choice["text"][1:]}])
+            for part in (1, 0)
+            for choice in choices
+        ]
+        content = b"".join(b"data: " + json.dumps(event).encode() + b"\n\n" for event in events)
+        return httpx.Response(200, content=content + b"data: [DONE]\n\n", headers={"content-type": "text/event-stream"})
+
+    respx_mock.post("/completions").mock(side_effect=create)
+    return requests
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_batches_prompts(client: OpenAI, respx_mock: MockRouter) -> None:
+    requests = _mock_completions(respx_mock)
+
+    with CompletionBatcher(client, model="gpt-3.5-turbo-instruct", max_batch_size=3, n=2, max_tokens=1) as batcher:
+        futures = [batcher.submit(prompt) for prompt in ["a", "b", "c", "d"]]
+        completions = [future.result() for future in futures]
+
+    # the first three prompts filled a batch, the last one was sent on its own once the window ended
+    assert sorted(request["prompt"] for request in requests) == [["a", "b", "c"], ["d"]]
+    assert all(request["n"] == 2 and request["max_tokens"] == 1 for request in requests)
+    for prompt, completion in zip("abcd", completions):
+        assert [(choice.index, choice.text) for choice in completion.choices] == [
+            (0, f"{prompt}-0"),
+            (1, f"{prompt}-1"),
+        ]
+        assert completion.usage is None
+
+    with pytest.raises(RuntimeError):
+        batcher.submit("e")
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_streams_chunks_to_each_prompt(client: OpenAI, respx_mock: MockRouter) -> None:
+    requests = _mock_completions(respx_mock)
+
+    with CompletionBatcher(client, model="gpt-3.5-turbo-instruct") as batcher:
+        first = batcher.stream("a")
+        second = batcher.stream("b")
+
+        assert ["".join(choice.text for choice in chunk.choices) for chunk in second] == ["b", "-0"]
+        assert [chunk.choices[0].index for chunk in first] == [0, 0]
+
+    assert len(requests) == 1
+    assert requests[0]["stream"] is True
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_errors_are_routed_to_every_prompt(client: OpenAI, respx_mock: MockRouter) -> None:
+    respx_mock.post("/completions").mock(return_value=httpx.Response(400, json={"error": {"message": "bad"}}))
+
+    with CompletionBatcher(client, model="gpt-3.5-turbo-instruct", batch_window_seconds=0) as batcher:
+        futures = [batcher.submit("a"), batcher.submit("b")]
+        for future in futures:
+            assert isinstance(future.exception(), BadRequestError)
+
+        with pytest.raises(BadRequestError):
+            list(batcher.stream("c"))
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_cancelled_prompts_are_not_sent(client: OpenAI, respx_mock: MockRouter) -> None:
+    requests = _mock_completions(respx_mock)
+
+    with CompletionBatcher(client, model="gpt-3.5-turbo-instruct", batch_window_seconds=1) as batcher:
+        cancelled = batcher.submit("a")
+        future = batcher.submit("b")
+        assert cancelled.cancel()
+        batcher.flush()
+
+        assert future.result(timeout=5).choices[0].text == "b-0"
+
+    assert [request["prompt"] for request in requests] == [["b"]]
+
+
+def test_rejects_per_prompt_params(client: OpenAI) -> None:
+    with pytest.raises(TypeError):
+        CompletionBatcher(client, model="gpt-3.5-turbo-instruct", stream=True)
+
+
+@pytest.mark.respx(base_url=base_url)
+async def test_async_batcher(async_client: AsyncOpenAI, respx_mock: MockRouter) -> None:
+    requests = _mock_completions(respx_mock)
+    completions: Dict[str, Completion] = {}
+    chunks: List[str] = []
+
+    async with AsyncCompletionBatcher(async_client, model="gpt-3.5-turbo-instruct") as batcher:
+
+        async def create(prompt: str) -> None:
+            completions[prompt] = await batcher.create(prompt)
+
+        async with anyio.create_task_group() as tg:
+            for prompt in ["a", "b", "c"]:
+                tg.start_soon(create, prompt)
+
+        async for chunk in batcher.stream("d"):
+            chunks.append(chunk.choices[0].text)
+
+    assert [request["prompt"] for request in requests] == [["a", "b", "c"], ["d"]]
+    assert {prompt: completion.choices[0].text for prompt, completion in completions.items()} == {
+        "a": "a-0",
+        "b": "b-0",
+        "c": "c-0",
+    }
+    assert chunks == ["d", "-0"]
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+from respx import MockRouter
+
+from openai import OpenAI, AsyncOpenAI
+from openai.lib import Conversation, AsyncConversation
+from openai.types.chat import ChatCompletionMessageParam
+
+from ..conftest import base_url
+
+
+def _mock_responses(respx_mock: MockRouter) -> List[Dict[str, Any]]:
+    requests: List[Dict[str, Any]] = []
+
+    def create(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        message: Dict[str, Any] = {
+            "type": "message",
+            "id": "msg_1",
+            "role": "assistant",
+            "status": "completed",
+            "content": [{"type": "output_text", "text": f"reply {len(requests)}", "annotations": []}],
+        }
+        return httpx.Response(
+            200,
+            json={
+                "id": f"resp_{len(requests)}",
+                "object": "response",
+                "created_at": 0,
+                "model": "gpt-4o",
+                "output": [message],
+                "parallel_tool_calls": True,
+                "tool_choice": "auto",
+                "tools": [],
+            },
+        )
+
+    respx_mock.post("/responses").mock(side_effect=create)
+    return requests
+
+
+def _mock_chat(respx_mock: MockRouter) -> List[Dict[str, Any]]:
+    requests: List[Dict[str, Any]] = []
+
+    def create(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        return httpx.Response(
+            200,
+            json={
+                "id": "chatcmpl-1",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "gpt-4o",
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": f"reply {len(requests)}"},
+                    }
+                ],
+            },
+        )
+
+    respx_mock.post("/chat/completions").mock(side_effect=create)
+    return requests
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_chains_responses(client: OpenAI, respx_mock: MockRouter) -> None:
+    requests = _mock_responses(respx_mock)
+
+    conversation = Conversation(client, model="gpt-4o", instructions="Be brief.")
+    first = conversation.send("Hello")
+    second = conversation.send("How are you?")
+
+    assert first.output_text == "reply 1"
+    assert second.output_text == "reply 2"
+    assert "previous_response_id" not in requests[0]
+    assert requests[1]["previous_response_id"] == "resp_1"
+    assert requests[1]["input"] == [{"role": "user", "content": "How are you?"}]
+    assert requests[1]["instructions"] == "Be brief."
+
+    assert first.tokens_saved == 0
+    assert second.tokens_saved > 0
+    assert conversation.tokens_saved == second.tokens_saved
+    assert [message.get("content") for message in conversation.messages] == [
+        "Be brief.",
+        "Hello",
+        "reply 1",
+        "How are you?",
+        "reply 2",
+    ]
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_resends_unstored_responses(client: OpenAI, respx_mock: MockRouter) -> None:
+    requests = _mock_responses(respx_mock)
+
+    conversation = Conversation(client, model="gpt-4o", store=False)
+    conversation.send("Hello")
+    turn = conversation.send("How are you?")
+
+    assert requests[1]["store"] is False
+    assert "previous_response_id" not in requests[1]
+    assert [item["content"] for item in requests[1]["input"]] == ["Hello", "reply 1", "How are you?"]
+    assert turn.tokens_saved == 0
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_compacts_chat_history(client: OpenAI, respx_mock: MockRouter) -> None:
+    requests = _mock_chat(respx_mock)
+    summarized: List[List[ChatCompletionMessageParam]] = []
+
+    def summarize(messages: List[ChatCompletionMessageParam]) -> str:
+        summarized.append(messages)
+        return "they said hello"
+
+    conversation = Conversation(
+        client,
+        model="gpt-4o",
+        api="chat",
+        instructions="Be brief.",
+        max_history_tokens=100,
+        summarize=summarize,
+        count_tokens=len,
+    )
+    for content in ["a" * 30, "b" * 30, "c" * 30]:
+        conversation.send(content)
+
+    # the first two turns fit in the budget and are sent in full
+    assert [message["content"] for message in requests[1]["messages"]] == ["Be brief.", "a" * 30, "reply 1", "b" * 30]
+
+    # the third turn went over the budget so the history was compacted to half of it
+    assert [[message.get("content") for message in messages] for messages in summarized] == [
+        ["a" * 30, "reply 1", "b" * 30, "reply 2"]
+    ]
+    assert [message["content"] for message in requests[2]["messages"]] == [
+        "Be brief.",
+        "Summary of the earlier conversation:\nthey said hello",
+        "c" * 30,
+    ]
+    assert conversation.turns[2].tokens_saved > 0
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_failed_turn_is_not_recorded(client: OpenAI, respx_mock: MockRouter) -> None:
+    respx_mock.post("/responses").mock(return_value=httpx.Response(400, json={"error": {"message": "bad"}}))
+
+    conversation = Conversation(client.with_options(max_retries=0), model="gpt-4o")
+    with pytest.raises(Exception):  # noqa: B017
+        conversation.send("Hello")
+
+    assert conversation.messages == []
+    assert conversation.turns == []
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_failed_turn_keeps_compacted_history(client: OpenAI, respx_mock: MockRouter) -> None:
+    _mock_chat(respx_mock)
+
+    conversation = Conversation(
+        client.with_options(max_retries=0),
+        model="gpt-4o",
+        api="chat",
+        max_history_tokens=100,
+        summarize=lambda _messages: "they said hello",
+        count_tokens=len,
+    )
+    conversation.send("a" * 30)
+    conversation.send("b" * 30)
+    messages = conversation.messages
+
+    # the third turn compacts the history before it's sent
+    respx_mock.post("/chat/completions").mock(return_value=httpx.Response(400, json={"error": {"message": "bad"}}))
+    with pytest.raises(Exception):  # noqa: B017
+        conversation.send("c" * 30)
+
+    assert conversation.messages == messages
+    assert conversation.summary is None
+
+
+@pytest.mark.respx(base_url=base_url)
+async def test_async_conversation(async_client: AsyncOpenAI, respx_mock: MockRouter) -> None:
+    requests = _mock_chat(respx_mock)
+
+    async def summarize(messages: List[ChatCompletionMessageParam]) -> str:
+        return f"{len(messages)} messages"
+
+    conversation = AsyncConversation(
+        async_client, model="gpt-4o", api="chat", max_history_tokens=12, summarize=summarize, count_tokens=len
+    )
+    await conversation.send("a" * 10)
+    turn = await conversation.send("b" * 10)
+
+    assert turn.output_text == "reply 2"
+    assert conversation.summary == "2 messages"
+    assert [message["content"] for message in requests[1]["messages"]] == [
+        "Summary of the earlier conversation:\n2 messages",
+        "b" * 10,
+    ]
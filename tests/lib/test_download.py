@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import re
+from typing import List
+from pathlib import Path
+
+import httpx
+import pytest
+from respx import MockRouter
+
+from openai import OpenAI, AsyncOpenAI
+
+from ..conftest import base_url
+
+CONTENT = bytes(range(256)) * 40
+
+
+def _mock_ranged_content(respx_mock: MockRouter, url: str, content: bytes = CONTENT) -> List[str]:
+    ranges: List[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        range_header = request.headers.get("range")
+        if range_header is None:
+            return httpx.Response(200, content=content)
+
+        ranges.append(range_header)
+        match = re.match(r"bytes=(\d+)-(\d+)", range_header)
+        assert match is not None
+        start, end = int(match.group(1)), min(int(match.group(2)), len(content) - 1)
+        if start >= len(content):
+            return httpx.Response(416)
+
+        return httpx.Response(
+            206,
+            content=content[start : end + 1],
+            headers={"Content-Range": f"bytes {start}-{end}/{len(content)}"},
+        )
+
+    respx_mock.get(url).mock(side_effect=handler)
+    return ranges
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_download_to_file(client: OpenAI, respx_mock: MockRouter, tmp_path: Path) -> None:
+    ranges = _mock_ranged_content(respx_mock, "/files/file-abc/content")
+    path = tmp_path / "out.bin"
+
+    written = client.files.download_to_file("file-abc", path, segment_size=1000, max_concurrency=3)
+
+    assert written == len(CONTENT)
+    assert path.read_bytes() == CONTENT
+    assert sorted(ranges, key=lambda r: int(r[6:].split("-")[0])) == [
+        f"bytes={start}-{min(start + 999, len(CONTENT) - 1)}" for start in range(0, len(CONTENT), 1000)
+    ]
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_download_to_file_without_range_support(client: OpenAI, respx_mock: MockRouter, tmp_path: Path) -> None:
+    route = respx_mock.get("/files/file-abc/content").mock(return_value=httpx.Response(200, content=CONTENT))
+    path = tmp_path / "out.bin"
+
+    written = client.files.download_to_file("file-abc", path, segment_size=1000)
+
+    assert written == len(CONTENT)
+    assert path.read_bytes() == CONTENT
+    assert route.call_count == 1
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_download_to_file_empty(client: OpenAI, respx_mock: MockRouter, tmp_path: Path) -> None:
+    _mock_ranged_content(respx_mock, "/files/file-abc/content", content=b"")
+    path = tmp_path / "out.bin"
+
+    assert client.files.download_to_file("file-abc", path) == 0
+    assert path.read_bytes() == b""
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_download_to_file_short_segment(client: OpenAI, respx_mock: MockRouter, tmp_path: Path) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        match = re.match(r"bytes=(\d+)-(\d+)", request.headers["range"])
+        assert match is not None
+        start = int(match.group(1))
+        return httpx.Response(
+            206,
+            content=CONTENT[start : start + 10],
+            headers={"Content-Range": f"bytes {start}-{int(match.group(2))}/{len(CONTENT)}"},
+        )
+
+    respx_mock.get("/files/file-abc/content").mock(side_effect=handler)
+
+    with pytest.raises(Exception, match="Expected 1000 bytes"):
+        client.files.download_to_file("file-abc", tmp_path / "out.bin", segment_size=1000, max_concurrency=1)
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_container_file_download_to_file(client: OpenAI, respx_mock: MockRouter, tmp_path: Path) -> None:
+    _mock_ranged_content(respx_mock, "/containers/cntr-abc/files/cfile-abc/content")
+    path = tmp_path / "out.bin"
+
+    written = client.containers.files.content.download_to_file(
+        "cfile-abc", path, container_id="cntr-abc", segment_size=4096
+    )
+
+    assert written == len(CONTENT)
+    assert path.read_bytes() == CONTENT
+
+
+@pytest.mark.respx(base_url=base_url)
+async def test_async_download_to_file(async_client: AsyncOpenAI, respx_mock: MockRouter, tmp_path: Path) -> None:
+    ranges = _mock_ranged_content(respx_mock, "/files/file-abc/content")
+    path = tmp_path / "out.bin"
+
+    written = await async_client.files.download_to_file("file-abc", path, segment_size=1000, max_concurrency=3)
+
+    assert written == len(CONTENT)
+    assert path.read_bytes() == CONTENT
+    assert len(ranges) == 11
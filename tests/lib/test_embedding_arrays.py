@@ -0,0 +1,152 @@
+# pyright: reportUnknownMemberType=false, reportUnknownArgumentType=false
+
+from __future__ import annotations
+
+import json
+import array
+import base64
+import struct
+from typing import List
+
+import httpx
+import numpy as np
+import pytest
+import numpy.typing as npt
+from respx import MockRouter
+
+from openai import OpenAI, AsyncOpenAI, OpenAIError
+from openai.lib import EmbeddingArray, truncate_embeddings
+from openai.types import Embedding, CreateEmbeddingResponse
+from openai.lib._embedding_arrays import parse_embedding_array
+from openai.types.create_embedding_response import Usage
+
+from ..conftest import base_url
+
+
+def _encode(values: List[float]) -> str:
+    return base64.b64encode(struct.pack(f"<{len(values)}f", *values)).decode()
+
+
+def _body(rows: List[List[float]]) -> object:
+    # returned out of order to check that rows are placed by their index
+    return {
+        "object": "list",
+        "model": "text-embedding-3-small",
+        "data": [
+            {"object": "embedding", "index": index, "embedding": _encode(row)}
+            for index, row in reversed(list(enumerate(rows)))
+        ],
+        "usage": {"prompt_tokens": len(rows), "total_tokens": len(rows)},
+    }
+
+
+ROWS = [[0.5, 1.0, 1.5], [2.0, 2.5, 3.0]]
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_create_array(client: OpenAI, respx_mock: MockRouter) -> None:
+    requests: List[httpx.Request] = []
+
+    def create(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json=_body(ROWS))
+
+    respx_mock.post("/embeddings").mock(side_effect=create)
+
+    result = client.embeddings.create_array(input=["a", "b"], model="text-embedding-3-small", dimensions=3)
+
+    assert json.loads(requests[0].content)["encoding_format"] == "base64"
+    assert isinstance(result.embeddings, np.ndarray)
+    assert result.embeddings.dtype == np.float32
+    assert result.embeddings.flags["C_CONTIGUOUS"]
+    assert result.embeddings.tolist() == ROWS
+    assert result.shape == (2, 3)
+    assert len(result) == 2
+    assert result.usage.total_tokens == 2
+
+
+def test_parse_embedding_array_without_numpy(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("openai.lib._embedding_arrays.has_numpy", lambda: False)
+
+    result = parse_embedding_array(_body(ROWS), model="text-embedding-3-small")  # type: ignore[arg-type]
+
+    assert result.embeddings.typecode == "f"  # type: ignore[union-attr]
+    assert list(result.embeddings) == [value for row in ROWS for value in row]
+    assert result.shape == (2, 3)
+
+
+def test_embedding_array_len() -> None:
+    usage = Usage(prompt_tokens=2, total_tokens=2)
+
+    # the length of a flat buffer doesn't depend on whether NumPy is installed
+    flat = EmbeddingArray(
+        embeddings=array.array("f", [value for row in ROWS for value in row]),
+        dimensions=3,
+        model="text-embedding-3-small",
+        usage=usage,
+    )
+    assert len(flat) == 2
+    assert flat.shape == (2, 3)
+
+    matrix = EmbeddingArray(
+        embeddings=np.array(ROWS, dtype=np.float32), dimensions=3, model="text-embedding-3-small", usage=usage
+    )
+    assert len(matrix) == 2
+
+
+def test_parse_embedding_array_errors() -> None:
+    empty = parse_embedding_array({"data": [], "usage": {}}, model="text-embedding-3-small")
+    assert empty.shape == (0, 0)
+
+    body = _body(ROWS)
+    body["data"][0]["index"] = 0  # type: ignore[index]
+    with pytest.raises(OpenAIError, match="unexpected embedding index"):
+        parse_embedding_array(body, model="text-embedding-3-small")  # type: ignore[arg-type]
+
+    body = _body(ROWS)
+    body["data"][1]["embedding"] = _encode([1.0])  # type: ignore[index]
+    with pytest.raises(OpenAIError, match="3 dimensions"):
+        parse_embedding_array(body, model="text-embedding-3-small")  # type: ignore[arg-type]
+
+
+def test_truncate_embeddings(monkeypatch: pytest.MonkeyPatch) -> None:
+    matrix: npt.NDArray[np.float32] = np.array([[3.0, 4.0, 12.0], [0.0, 0.0, 1.0]], dtype=np.float32)
+    expected = [[0.6, 0.8], [0.0, 0.0]]
+
+    truncated = truncate_embeddings(matrix, 2)
+    assert truncated.dtype == np.float32
+    assert np.allclose(truncated, expected)
+
+    assert np.allclose(truncate_embeddings(matrix.tolist(), 2), expected)
+
+    response = truncate_embeddings(
+        CreateEmbeddingResponse.construct(
+            data=[Embedding.construct(embedding=[3.0, 4.0, 12.0], index=0, object="embedding")],
+            model="text-embedding-3-large",
+        ),
+        2,
+    )
+    assert response.data[0].embedding == pytest.approx([0.6, 0.8])
+    assert response.model == "text-embedding-3-large"
+
+    body = _body([[3.0, 4.0, 12.0], [6.0, 8.0, 1.0]])
+    result = parse_embedding_array(body, model="text-embedding-3-small").truncate(2)  # type: ignore[arg-type]
+    assert result.shape == (2, 2)
+    assert np.allclose(result.embeddings, [[0.6, 0.8], [0.6, 0.8]])
+
+    monkeypatch.setattr("openai.lib._embedding_arrays.has_numpy", lambda: False)
+    result = parse_embedding_array(body, model="text-embedding-3-small").truncate(1)  # type: ignore[arg-type]
+    assert list(result.embeddings) == [1.0, 1.0]
+    assert result.shape == (2, 1)
+
+    with pytest.raises(ValueError, match="between 1 and 3"):
+        truncate_embeddings(matrix, 4)
+
+
+@pytest.mark.respx(base_url=base_url)
+async def test_async_create_array(async_client: AsyncOpenAI, respx_mock: MockRouter) -> None:
+    respx_mock.post("/embeddings").mock(return_value=httpx.Response(200, json=_body(ROWS)))
+
+    result = await async_client.embeddings.create_array(input=["a", "b"], model="text-embedding-3-small")
+
+    assert result.embeddings.tolist() == ROWS
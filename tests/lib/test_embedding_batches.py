@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+from typing import List
+
+import httpx
+import pytest
+from respx import MockRouter
+
+from openai import OpenAI, AsyncOpenAI, InternalServerError
+from openai.lib._embedding_batches import pack_inputs
+
+from ..conftest import base_url
+
+
+def _mock_embeddings(respx_mock: MockRouter, *, failures: int = 0) -> List[List[str]]:
+    requests: List[List[str]] = []
+    remaining_failures = [failures]
+
+    def create(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        if remaining_failures[0] > 0:
+            remaining_failures[0] -= 1
+            return httpx.Response(500, json={"error": {"message": "server error"}})
+
+        requests.append(body["input"])
+        return httpx.Response(
+            200,
+            json={
+                "object": "list",
+                "model": body["model"],
+                "data": [
+                    {"object": "embedding", "index": index, "embedding": [float(text), float(text)]}
+                    for index, text in enumerate(body["input"])
+                ],
+                "usage": {"prompt_tokens": len(body["input"]), "total_tokens": len(body["input"])},
+            },
+        )
+
+    respx_mock.post("/embeddings").mock(side_effect=create)
+    return requests
+
+
+def test_pack_inputs() -> None:
+    assert pack_inputs(["a"] * 5, max_inputs=2) == [[0, 1], [2, 3], [4]]
+    assert pack_inputs(["aa", "a", "aa", "aa"], max_tokens=3, count_tokens=len) == [[0, 1], [2], [3]]
+    assert pack_inputs(["a" * 30, "a", "a"], max_tokens=5) == [[0], [1, 2]]
+    assert pack_inputs(["a", [1, 2], "b", [3]], count_tokens=len) == [[0, 2], [1, 3]]
+    assert pack_inputs([]) == []
+
+    with pytest.raises(ValueError, match="max_inputs_per_request"):
+        pack_inputs(["a"], max_inputs=0)
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_create_many(client: OpenAI, respx_mock: MockRouter) -> None:
+    requests = _mock_embeddings(respx_mock)
+    texts = [str(i) for i in range(5)]
+
+    response = client.embeddings.create_many(
+        input=texts, model="text-embedding-3-small", max_inputs_per_request=2, max_concurrency=3
+    )
+
+    assert sorted(requests) == [["0", "1"], ["2", "3"], ["4"]]
+    assert [embedding.index for embedding in response.data] == [0, 1, 2, 3, 4]
+    assert [embedding.embedding for embedding in response.data] == [[float(i), float(i)] for i in range(5)]
+    assert response.model == "text-embedding-3-small"
+    assert response.usage.total_tokens == 5
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_create_many_retries_failed_shards(client: OpenAI, respx_mock: MockRouter) -> None:
+    requests = _mock_embeddings(respx_mock, failures=1)
+    client = client.with_options(max_retries=0)
+    client.embeddings._sleep = lambda _seconds: None  # type: ignore[method-assign]
+
+    response = client.embeddings.create_many(
+        input=["0", "1", "2"], model="text-embedding-3-small", max_inputs_per_request=2, max_concurrency=1
+    )
+
+    assert requests == [["0", "1"], ["2"]]
+    assert len(response.data) == 3
+
+    _mock_embeddings(respx_mock, failures=2)
+    with pytest.raises(InternalServerError):
+        client.embeddings.create_many(input=["0"], model="text-embedding-3-small", max_shard_retries=1)
+
+
+@pytest.mark.respx(base_url=base_url)
+async def test_async_create_many(async_client: AsyncOpenAI, respx_mock: MockRouter) -> None:
+    requests = _mock_embeddings(respx_mock)
+    texts = [str(i) for i in range(5)]
+
+    response = await async_client.embeddings.create_many(
+        input=texts, model="text-embedding-3-small", max_inputs_per_request=3
+    )
+
+    assert sorted(requests) == [["0", "1", "2"], ["3", "4"]]
+    assert [embedding.embedding for embedding in response.data] == [[float(i), float(i)] for i in range(5)]
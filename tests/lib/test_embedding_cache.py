@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import json
+from typing import List
+from pathlib import Path
+
+import httpx
+import pytest
+from respx import MockRouter
+
+from openai import OpenAI, AsyncOpenAI
+from openai.lib import (
+    EmbeddingCache,
+    MmapEmbeddingStore,
+    MemoryEmbeddingStore,
+    SqliteEmbeddingStore,
+)
+
+from ..conftest import base_url
+
+
+def _mock_embeddings(respx_mock: MockRouter) -> List[List[str]]:
+    requests: List[List[str]] = []
+
+    def create(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        requests.append(body["input"])
+        return httpx.Response(
+            200,
+            json={
+                "object": "list",
+                "model": body["model"],
+                "data": [
+                    {"object": "embedding", "index": index, "embedding": [float(text), -float(text)]}
+                    for index, text in enumerate(body["input"])
+                ],
+                "usage": {"prompt_tokens": len(body["input"]), "total_tokens": len(body["input"])},
+            },
+        )
+
+    respx_mock.post("/embeddings").mock(side_effect=create)
+    return requests
+
+
+def test_memory_store_eviction() -> None:
+    store = MemoryEmbeddingStore(max_entries=2)
+    store.set_many([("a", b"1"), ("b", b"2")])
+    assert store.get_many(["a"]) == [b"1"]
+
+    store.set_many([("c", b"3")])
+    assert store.get_many(["a", "b", "c"]) == [b"1", None, b"3"]
+
+
+def test_sqlite_store(tmp_path: Path) -> None:
+    with SqliteEmbeddingStore(tmp_path / "cache.sqlite") as store:
+        store.set_many([("a", b"\x00\x01"), ("b", b"\x02")])
+
+    with SqliteEmbeddingStore(tmp_path / "cache.sqlite") as store:
+        assert store.get_many(["b", "missing", "a", "b"]) == [b"\x02", None, b"\x00\x01", b"\x02"]
+
+
+def test_mmap_store(tmp_path: Path) -> None:
+    path = tmp_path / "cache.f32"
+
+    with MmapEmbeddingStore(path) as store:
+        store.set_many([("a", b"aaaa"), ("b", b"bbbbbbbb")])
+        assert store.get_many(["a", "b"]) == [b"aaaa", b"bbbbbbbb"]
+
+        store.set_many([("c", b"cccc"), ("a", b"AAAA")])
+        assert store.get_many(["c", "a", "missing"]) == [b"cccc", b"AAAA", None]
+
+    # simulate a write that was interrupted after the index record was partially written
+    with open(str(path) + ".idx", "ab") as f:
+        f.write(b"\x00" * 10)
+
+    with MmapEmbeddingStore(path) as store:
+        assert len(store) == 3
+        assert store.get_many(["a", "b", "c"]) == [b"AAAA", b"bbbbbbbb", b"cccc"]
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_create_many_with_cache(client: OpenAI, respx_mock: MockRouter, tmp_path: Path) -> None:
+    requests = _mock_embeddings(respx_mock)
+    with MmapEmbeddingStore(tmp_path / "cache.f32") as store:
+        cache = EmbeddingCache(store)
+
+        response = client.embeddings.create_many(input=["1", "2", "1"], model="text-embedding-3-small", cache=cache)
+        assert requests == [["1", "2"]]
+        assert [item.embedding for item in response.data] == [[1.0, -1.0], [2.0, -2.0], [1.0, -1.0]]
+        assert [item.index for item in response.data] == [0, 1, 2]
+
+        response = client.embeddings.create_many(input=["3", "2", "1"], model="text-embedding-3-small", cache=cache)
+        assert requests == [["1", "2"], ["3"]]
+        assert [item.embedding for item in response.data] == [[3.0, -3.0], [2.0, -2.0], [1.0, -1.0]]
+        assert response.usage.total_tokens == 1
+        assert (cache.hits, cache.misses) == (2, 4)
+
+        # the model and dimensions are part of the cache key
+        client.embeddings.create_many(input=["1"], model="text-embedding-3-small", dimensions=2, cache=cache)
+        assert requests[-1] == ["1"]
+
+        response = client.embeddings.create_many(
+            input=["1"], model="text-embedding-3-small", encoding_format="base64", cache=cache
+        )
+        assert len(requests) == 3
+        assert isinstance(response.data[0].embedding, str)
+
+
+@pytest.mark.respx(base_url=base_url)
+async def test_async_create_many_with_cache(async_client: AsyncOpenAI, respx_mock: MockRouter) -> None:
+    requests = _mock_embeddings(respx_mock)
+    cache = EmbeddingCache()
+
+    await async_client.embeddings.create_many(input=["1", "2"], model="text-embedding-3-small", cache=cache)
+    response = await async_client.embeddings.create_many(input=["2", "1"], model="text-embedding-3-small", cache=cache)
+
+    assert requests == [["1", "2"]]
+    assert [item.embedding for item in response.data] == [[2.0, -2.0], [1.0, -1.0]]
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import json
+from typing import List, Iterator
+from pathlib import Path
+
+import httpx
+import numpy as np
+import pytest
+from respx import MockRouter
+
+from openai import OpenAI, AsyncOpenAI
+from openai.lib import EmbeddingDatasetWriter, open_embedding_dataset
+from openai.types import Embedding, CreateEmbeddingResponse
+from openai.lib._embedding_arrays import parse_embedding_array
+
+from ..conftest import base_url
+
+
+def _mock_embeddings(respx_mock: MockRouter) -> List[List[str]]:
+    requests: List[List[str]] = []
+
+    def create(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        requests.append(body["input"])
+        return httpx.Response(
+            200,
+            json={
+                "object": "list",
+                "model": body["model"],
+                "data": [
+                    {"object": "embedding", "index": index, "embedding": [float(text), 0.5]}
+                    for index, text in enumerate(body["input"])
+                ],
+                "usage": {"prompt_tokens": len(body["input"]), "total_tokens": len(body["input"])},
+            },
+        )
+
+    respx_mock.post("/embeddings").mock(side_effect=create)
+    return requests
+
+
+def test_writer(tmp_path: Path) -> None:
+    path = tmp_path / "corpus.npy"
+
+    with EmbeddingDatasetWriter(path) as writer:
+        # the file is readable before anything is written
+        assert np.load(path).shape == (0, 0)
+
+        writer.write([[1.0, 2.0], [3.0, 4.0]], ids=["a", "b"])
+        # and after every write
+        assert np.load(path).tolist() == [[1.0, 2.0], [3.0, 4.0]]
+
+        writer.write(np.array([[5.0, 6.0]], dtype=np.float64), ids=["c\nd"])
+        writer.write_response(
+            CreateEmbeddingResponse.construct(
+                data=[
+                    Embedding.construct(embedding=[9.0, 10.0], index=1, object="embedding"),
+                    Embedding.construct(embedding=[7.0, 8.0], index=0, object="embedding"),
+                ],
+            ),
+            ids=["e", "f"],
+        )
+        writer.write_array(
+            parse_embedding_array(
+                {"data": [{"index": 0, "embedding": "AAAwQQAAQEE="}], "usage": {}}, model="text-embedding-3-small"
+            ),
+            ids=["g"],
+        )
+
+        with pytest.raises(ValueError, match="2 dimensions"):
+            writer.write([[1.0]], ids=["x"])
+        with pytest.raises(ValueError, match="Expected 1 IDs"):
+            writer.write([[1.0, 2.0]], ids=[])
+
+    dataset = open_embedding_dataset(path)
+    assert dataset.ids == ["a", "b", "c\nd", "e", "f", "g"]
+    assert dataset.embeddings.dtype == np.float32
+    assert dataset.embeddings.tolist() == [[1.0, 2.0], [3.0, 4.0], [5.0, 6.0], [7.0, 8.0], [9.0, 10.0], [11.0, 12.0]]
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_create_to_dataset(client: OpenAI, respx_mock: MockRouter, tmp_path: Path) -> None:
+    requests = _mock_embeddings(respx_mock)
+    consumed: List[int] = []
+
+    def texts() -> Iterator[str]:
+        for i in range(5):
+            consumed.append(i)
+            yield str(i)
+
+    count = client.embeddings.create_to_dataset(
+        tmp_path / "corpus.npy",
+        input=texts(),
+        model="text-embedding-3-small",
+        window_size=2,
+    )
+
+    assert count == 5
+    assert requests == [["0", "1"], ["2", "3"], ["4"]]
+
+    dataset = open_embedding_dataset(tmp_path / "corpus.npy")
+    assert dataset.ids == ["0", "1", "2", "3", "4"]
+    assert dataset.embeddings[:, 0].tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+    with pytest.raises(ValueError, match="more IDs than inputs"):
+        client.embeddings.create_to_dataset(
+            tmp_path / "other.npy", input=["1"], ids=["a", "b"], model="text-embedding-3-small"
+        )
+
+
+@pytest.mark.respx(base_url=base_url)
+async def test_async_create_to_dataset(async_client: AsyncOpenAI, respx_mock: MockRouter, tmp_path: Path) -> None:
+    _mock_embeddings(respx_mock)
+
+    count = await async_client.embeddings.create_to_dataset(
+        tmp_path / "corpus.npy", input=["7", "8"], ids=["x", "y"], model="text-embedding-3-small"
+    )
+
+    assert count == 2
+    dataset = open_embedding_dataset(tmp_path / "corpus.npy")
+    assert dataset.ids == ["x", "y"]
+    assert dataset.embeddings.tolist() == [[7.0, 0.5], [8.0, 0.5]]
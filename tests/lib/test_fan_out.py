@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import json
+import threading
+from typing import Dict, List, Iterator, AsyncIterator
+
+import httpx
+import pytest
+from respx import MockRouter
+
+from openai import OpenAI, AsyncOpenAI, BadRequestError
+from openai.lib import FanOutProgress
+from openai.types.chat.completion_create_params import CompletionCreateParamsNonStreaming
+from openai.types.responses.response_create_params import ResponseCreateParamsNonStreaming
+
+from ..conftest import base_url
+
+
+def _mock_chat(respx_mock: MockRouter, *, rate_limited: int = 0) -> List[str]:
+    """Replies with the content of the user message, or a 400 error if it's "bad"."""
+    lock = threading.Lock()
+    contents: List[str] = []
+    remaining_rate_limits = [rate_limited]
+
+    def create(request: httpx.Request) -> httpx.Response:
+        content: str = json.loads(request.content)["messages"][0]["content"]
+        with lock:
+            contents.append(content)
+            if remaining_rate_limits[0] > 0:
+                remaining_rate_limits[0] -= 1
+                return httpx.Response(429, json={"error": {"message": "slow down"}})
+
+        if content == "bad":
+            return httpx.Response(400, json={"error": {"message": "bad request"}})
+        return httpx.Response(
+            200,
+            json={
+                "id": "chatcmpl-1",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "gpt-4o",
+                "choices": [
+                    {"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}
+                ],
+            },
+        )
+
+    respx_mock.post("/chat/completions").mock(side_effect=create)
+    return contents
+
+
+def _request(content: str) -> CompletionCreateParamsNonStreaming:
+    return {"model": "gpt-4o", "messages": [{"role": "user", "content": content}]}
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_create_many(client: OpenAI, respx_mock: MockRouter) -> None:
+    _mock_chat(respx_mock)
+    updates: List[Dict[str, int]] = []
+
+    def on_progress(progress: FanOutProgress) -> None:
+        updates.append({"succeeded": progress.succeeded, "failed": progress.failed})
+
+    contents = [str(i) for i in range(10)] + ["bad"]
+    results = list(
+        client.chat.completions.create_many(
+            (_request(content) for content in contents), concurrency=3, ordered=True, on_progress=on_progress
+        )
+    )
+
+    assert [result.index for result in results] == list(range(11))
+    assert [result.result.choices[0].message.content for result in results[:10] if result.result] == contents[:10]
+    assert isinstance(results[10].error, BadRequestError)
+    assert results[10].request == _request("bad")
+    assert len(updates) == 11
+    assert updates[-1] == {"succeeded": 10, "failed": 1}
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_create_many_reads_requests_lazily(client: OpenAI, respx_mock: MockRouter) -> None:
+    _mock_chat(respx_mock)
+    read = 0
+
+    def requests() -> Iterator[CompletionCreateParamsNonStreaming]:
+        nonlocal read
+        for i in range(100):
+            read += 1
+            yield _request(str(i))
+
+    results = client.chat.completions.create_many(requests(), concurrency=2)
+    for count, _result in enumerate(results, start=1):
+        # at most twice the concurrency of requests are sent but not yet returned
+        assert read - count < 4
+
+    assert read == 100
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_create_many_retries_rate_limited_requests(client: OpenAI, respx_mock: MockRouter) -> None:
+    contents = _mock_chat(respx_mock, rate_limited=2)
+    client = client.with_options(max_retries=0)
+    client.chat.completions._sleep = lambda _seconds: None  # type: ignore[method-assign]
+
+    results = list(client.chat.completions.create_many([_request("a"), _request("b")], concurrency=1))
+
+    assert all(result.ok for result in results)
+    assert contents == ["a", "a", "a", "b"]
+
+    _mock_chat(respx_mock, rate_limited=1)
+    [result] = client.chat.completions.create_many([_request("a")], max_request_retries=0)
+    assert result.error is not None
+
+
+@pytest.mark.respx(base_url=base_url)
+async def test_async_create_many(async_client: AsyncOpenAI, respx_mock: MockRouter) -> None:
+    _mock_chat(respx_mock)
+
+    async with async_client.chat.completions.create_many(
+        [_request(str(i)) for i in range(10)] + [_request("bad")], concurrency=4
+    ) as results:
+        collected = [result async for result in results]
+
+    assert sorted(result.index for result in collected) == list(range(11))
+    assert sum(result.ok for result in collected) == 10
+    assert results.progress.started == 11
+    assert results.progress.failed == 1
+    assert results.progress.in_flight == 0
+
+
+@pytest.mark.respx(base_url=base_url)
+async def test_async_create_many_ordered(async_client: AsyncOpenAI, respx_mock: MockRouter) -> None:
+    respx_mock.post("/responses").mock(
+        return_value=httpx.Response(
+            200,
+            json={
+                "id": "resp_1",
+                "object": "response",
+                "created_at": 0,
+                "model": "gpt-4o",
+                "output": [],
+                "parallel_tool_calls": True,
+                "tool_choice": "auto",
+                "tools": [],
+            },
+        )
+    )
+
+    async def requests() -> AsyncIterator[ResponseCreateParamsNonStreaming]:
+        for i in range(5):
+            yield {"model": "gpt-4o", "input": str(i)}
+
+    async with async_client.responses.create_many(requests(), concurrency=2, ordered=True) as results:
+        indices = [result.index async for result in results if result.ok]
+
+    assert indices == [0, 1, 2, 3, 4]
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Optional
+
+import anyio
+import httpx
+import pytest
+from respx import MockRouter
+
+from openai import OpenAI, AsyncOpenAI
+from openai.lib import FileAttachFailure
+from openai.types import FileObject
+from openai.lib._file_batches import FileIdBatcher
+
+from ..conftest import base_url
+
+FILES = [b"one", b"two", b"bad", b"three", b"four"]
+
+
+def _mock_vector_store(respx_mock: MockRouter) -> List[List[str]]:
+    created: List[List[str]] = []
+    retrieved: Dict[str, int] = {}
+
+    def create_file(request: httpx.Request) -> httpx.Response:
+        body = request.read()
+        content = next(file for file in FILES if b"\r\n\r\n" + file + b"\r\n" in body)
+        if content == b"bad":
+            return httpx.Response(400, json={"error": {"message": "invalid file"}})
+
+        return httpx.Response(
+            200,
+            json={
+                "id": f"file-{content.decode()}",
+                "bytes": len(content),
+                "created_at": 0,
+                "filename": "upload",
+                "object": "file",
+                "purpose": "assistants",
+                "status": "processed",
+            },
+        )
+
+    def batch(batch_id: str, total: int, *, in_progress: int, failed: int = 0) -> Dict[str, Any]:
+        return {
+            "id": batch_id,
+            "created_at": 0,
+            "object": "vector_store.files_batch",
+            "status": "in_progress" if in_progress else "completed",
+            "vector_store_id": "vs_abc",
+            "file_counts": {
+                "cancelled": 0,
+                "completed": total - in_progress - failed,
+                "failed": failed,
+                "in_progress": in_progress,
+                "total": total,
+            },
+        }
+
+    def create_batch(request: httpx.Request) -> httpx.Response:
+        file_ids = json.loads(request.content)["file_ids"]
+        created.append(file_ids)
+        return httpx.Response(200, json=batch(f"vsfb_{len(created)}", len(file_ids), in_progress=len(file_ids)))
+
+    def retrieve_batch(_request: httpx.Request, batch_id: str) -> httpx.Response:
+        retrieved[batch_id] = retrieved.get(batch_id, 0) + 1
+        total = len(created[int(batch_id.split("_")[1]) - 1])
+        if retrieved[batch_id] == 1:
+            return httpx.Response(
+                200, json=batch(batch_id, total, in_progress=total), headers={"openai-poll-after-ms": "1"}
+            )
+
+        return httpx.Response(200, json=batch(batch_id, total, in_progress=0, failed=1 if batch_id == "vsfb_1" else 0))
+
+    def list_failed(request: httpx.Request, **_kwargs: str) -> httpx.Response:
+        assert request.url.params["filter"] == "failed"
+        return httpx.Response(
+            200,
+            json={
+                "object": "list",
+                "has_more": False,
+                "data": [
+                    {
+                        "id": created[0][0],
+                        "created_at": 0,
+                        "object": "vector_store.file",
+                        "status": "failed",
+                        "usage_bytes": 0,
+                        "vector_store_id": "vs_abc",
+                        "last_error": {"code": "unsupported_file", "message": "unsupported"},
+                    }
+                ],
+            },
+        )
+
+    respx_mock.post("/files").mock(side_effect=create_file)
+    respx_mock.post("/vector_stores/vs_abc/file_batches").mock(side_effect=create_batch)
+    respx_mock.get(path__regex=r"/vector_stores/vs_abc/file_batches/(?P<batch_id>vsfb_\d+)$").mock(
+        side_effect=retrieve_batch
+    )
+    respx_mock.get(path__regex=r"/vector_stores/vs_abc/file_batches/(?P<batch_id>vsfb_\d+)/files$").mock(
+        side_effect=list_failed
+    )
+    return created
+
+
+def test_file_id_batcher() -> None:
+    batcher = FileIdBatcher(batch_size=2, window_seconds=60)
+    assert batcher.timeout() is None
+
+    for file_id in ["a", "b", "c"]:
+        batcher.add(file_id)
+
+    assert batcher.take_ready() == [["a", "b"]]
+    assert batcher.take_ready() == []
+    assert batcher.timeout() is not None
+    assert batcher.take_ready(flush=True) == [["c"]]
+    assert batcher.timeout() is None
+
+    batcher = FileIdBatcher(batch_size=10, window_seconds=0)
+    batcher.add("a")
+    assert batcher.take_ready() == [["a"]]
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_upload_and_attach(client: OpenAI, respx_mock: MockRouter) -> None:
+    created = _mock_vector_store(respx_mock)
+
+    result = client.vector_stores.file_batches.upload_and_attach(
+        "vs_abc",
+        files=FILES,
+        file_ids=["file-existing"],
+        batch_size=2,
+        max_concurrency=2,
+    )
+
+    assert all(len(file_ids) <= 2 for file_ids in created)
+    assert sorted(file_id for file_ids in created for file_id in file_ids) == sorted(
+        ["file-existing", "file-one", "file-two", "file-three", "file-four"]
+    )
+    assert len(result.batches) == len(created)
+    assert all(batch.status == "completed" for batch in result.batches)
+
+    assert len(result.failures) == 1
+    assert isinstance(result.failures[0], FileAttachFailure)
+    assert result.failures[0].file == b"bad"
+    assert result.failures[0].file_id is None
+
+    assert [file.id for file in result.failed_files] == [created[0][0]]
+    assert result.completed_count == 4
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_upload_and_attach_batch_failure(client: OpenAI, respx_mock: MockRouter) -> None:
+    respx_mock.post("/files").mock(
+        return_value=httpx.Response(
+            200,
+            json={
+                "id": "file-one",
+                "bytes": 3,
+                "created_at": 0,
+                "filename": "upload",
+                "object": "file",
+                "purpose": "assistants",
+                "status": "processed",
+            },
+        )
+    )
+    respx_mock.post("/vector_stores/vs_abc/file_batches").mock(
+        return_value=httpx.Response(404, json={"error": {"message": "vector store not found"}})
+    )
+
+    result = client.vector_stores.file_batches.upload_and_attach("vs_abc", files=[b"one"])
+
+    assert result.batches == []
+    assert [(failure.file, failure.file_id) for failure in result.failures] == [(b"one", "file-one")]
+
+
+@pytest.mark.respx(base_url=base_url)
+async def test_async_upload_and_attach(async_client: AsyncOpenAI, respx_mock: MockRouter) -> None:
+    created = _mock_vector_store(respx_mock)
+
+    result = await async_client.vector_stores.file_batches.upload_and_attach(
+        "vs_abc",
+        files=FILES,
+        batch_size=3,
+        batch_window_seconds=0.01,
+    )
+
+    assert all(len(file_ids) <= 3 for file_ids in created)
+    assert sorted(file_id for file_ids in created for file_id in file_ids) == sorted(
+        ["file-one", "file-two", "file-three", "file-four"]
+    )
+    assert len(result.batches) == len(created)
+    assert [failure.file for failure in result.failures] == [b"bad"]
+    assert [file.id for file in result.failed_files] == [created[0][0]]
+
+
+@pytest.mark.respx(base_url=base_url)
+async def test_async_upload_and_attach_waits_for_uploads(
+    async_client: AsyncOpenAI, respx_mock: MockRouter, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    created = _mock_vector_store(respx_mock)
+    create_file = async_client.files.create
+    timeout_calls = 0
+    batcher_timeout = FileIdBatcher.timeout
+
+    async def slow_create_file(**kwargs: Any) -> FileObject:
+        await anyio.sleep(0.05)
+        return await create_file(**kwargs)
+
+    def count_timeout(self: FileIdBatcher) -> Optional[float]:
+        nonlocal timeout_calls
+        timeout_calls += 1
+        return batcher_timeout(self)
+
+    monkeypatch.setattr(async_client.files, "create", slow_create_file)
+    monkeypatch.setattr(FileIdBatcher, "timeout", count_timeout)
+
+    await async_client.vector_stores.file_batches.upload_and_attach(
+        "vs_abc", files=FILES, batch_size=3, batch_window_seconds=0
+    )
+
+    # with nothing pending the batcher waits for an upload instead of a zero second window
+    assert timeout_calls < 20
+    assert sorted(file_id for file_ids in created for file_id in file_ids) == sorted(
+        ["file-one", "file-two", "file-three", "file-four"]
+    )
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+from pathlib import Path
+
+import httpx
+import pytest
+from respx import MockRouter
+
+from openai import OpenAI, AsyncOpenAI
+from openai.lib import FileIndex
+from openai.lib._file_index import hash_file_content
+
+from ..conftest import base_url
+
+
+def _file(id: str, **kwargs: Any) -> Dict[str, Any]:
+    return {
+        "id": id,
+        "bytes": 11,
+        "created_at": 0,
+        "filename": "data.txt",
+        "object": "file",
+        "purpose": "assistants",
+        "status": "processed",
+        **kwargs,
+    }
+
+
+def test_hash_file_content(tmp_path: Path) -> None:
+    path = tmp_path / "data.txt"
+    path.write_bytes(b"hello world")
+
+    expected = hash_file_content(b"hello world")
+    assert hash_file_content(path) == expected
+    assert hash_file_content(("data.txt", path)) == expected
+
+    with path.open("rb") as fd:
+        fd.read(3)
+        assert hash_file_content(fd) == hash_file_content(b"lo world")
+        # the file position is restored so that it can still be uploaded
+        assert fd.read() == b"lo world"
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_files_create_reuses_indexed_file(client: OpenAI, respx_mock: MockRouter) -> None:
+    create = respx_mock.post("/files").mock(return_value=httpx.Response(200, json=_file("file-abc")))
+    retrieve = respx_mock.get("/files/file-abc").mock(return_value=httpx.Response(200, json=_file("file-abc")))
+
+    with FileIndex() as index:
+        first = client.files.create(file=b"hello world", purpose="assistants", file_index=index)
+        second = client.files.create(file=b"hello world", purpose="assistants", file_index=index)
+
+        assert first.id == second.id == "file-abc"
+        assert create.call_count == 1
+        assert retrieve.call_count == 1
+
+        # the index is keyed by purpose as well as content
+        client.files.create(file=b"hello world", purpose="batch", file_index=index)
+        assert create.call_count == 2
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_files_create_ignores_deleted_file(client: OpenAI, respx_mock: MockRouter) -> None:
+    create = respx_mock.post("/files").mock(
+        side_effect=[httpx.Response(200, json=_file("file-abc")), httpx.Response(200, json=_file("file-def"))]
+    )
+    respx_mock.get("/files/file-abc").mock(return_value=httpx.Response(404, json={"error": {"message": "not found"}}))
+
+    with FileIndex() as index:
+        client.files.create(file=b"hello world", purpose="assistants", file_index=index)
+        file = client.files.create(file=b"hello world", purpose="assistants", file_index=index)
+
+        assert file.id == "file-def"
+        assert create.call_count == 2
+        entry = index.get(hash_file_content(b"hello world") or "", "assistants")
+        assert entry is not None
+        assert entry.file_id == "file-def"
+
+
+@pytest.mark.respx(base_url=base_url)
+async def test_async_files_create_reuses_indexed_file(async_client: AsyncOpenAI, respx_mock: MockRouter) -> None:
+    create = respx_mock.post("/files").mock(return_value=httpx.Response(200, json=_file("file-abc")))
+    respx_mock.get("/files/file-abc").mock(return_value=httpx.Response(200, json=_file("file-abc")))
+
+    with FileIndex() as index:
+        await async_client.files.create(file=b"hello world", purpose="assistants", file_index=index)
+        file = await async_client.files.create(file=b"hello world", purpose="assistants", file_index=index)
+
+        assert file.id == "file-abc"
+        assert create.call_count == 1
+
+
+def test_raw_response_not_supported(client: OpenAI) -> None:
+    with FileIndex() as index:
+        with pytest.raises(TypeError, match="not supported with `.with_raw_response`"):
+            client.files.with_raw_response.create(file=b"hello world", purpose="assistants", file_index=index)
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+from respx import MockRouter
+
+from openai import OpenAI, AsyncOpenAI
+from openai.lib import Poller, AsyncPoller
+
+from ..conftest import base_url
+
+
+def _batch(batch_id: str, status: str) -> Dict[str, Any]:
+    return {
+        "id": batch_id,
+        "completion_window": "24h",
+        "created_at": 0,
+        "endpoint": "/v1/chat/completions",
+        "input_file_id": "file-abc",
+        "object": "batch",
+        "status": status,
+    }
+
+
+def _file_batch(batch_id: str, *, in_progress: int) -> Dict[str, Any]:
+    return {
+        "id": batch_id,
+        "created_at": 0,
+        "object": "vector_store.files_batch",
+        "status": "in_progress" if in_progress else "completed",
+        "vector_store_id": "vs_abc",
+        "file_counts": {
+            "cancelled": 0,
+            "completed": 2 - in_progress,
+            "failed": 0,
+            "in_progress": in_progress,
+            "total": 2,
+        },
+    }
+
+
+def _mock_batches(respx_mock: MockRouter, statuses: Dict[str, List[str]]) -> List[httpx.Request]:
+    """Mocks the batch endpoints, each time a batch is returned it advances to its next status."""
+    requests: List[httpx.Request] = []
+
+    def next_status(batch_id: str) -> str:
+        states = statuses[batch_id]
+        return states.pop(0) if len(states) > 1 else states[0]
+
+    def list_batches(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        data = [_batch(batch_id, next_status(batch_id)) for batch_id in statuses]
+        return httpx.Response(
+            200, json={"object": "list", "data": data, "has_more": False}, headers={"openai-poll-after-ms": "1"}
+        )
+
+    def retrieve_batch(request: httpx.Request, batch_id: str) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json=_batch(batch_id, next_status(batch_id)))
+
+    respx_mock.get("/batches").mock(side_effect=list_batches)
+    respx_mock.get(path__regex=r"/batches/(?P<batch_id>.+)").mock(side_effect=retrieve_batch)
+    return requests
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_poller_lists_batches(client: OpenAI, respx_mock: MockRouter) -> None:
+    requests = _mock_batches(
+        respx_mock,
+        {
+            "batch_1": ["in_progress", "completed"],
+            "batch_2": ["validating", "in_progress", "in_progress", "failed"],
+            "batch_3": ["in_progress"] * 10 + ["completed"],
+        },
+    )
+    with Poller(client, min_interval=0.001, max_interval=0.01) as poller:
+        futures = [poller.track_batch(batch_id) for batch_id in ["batch_1", "batch_2", "batch_3"]]
+        batches = [future.result(timeout=10) for future in futures]
+
+    assert [batch.status for batch in batches] == ["completed", "failed", "completed"]
+    assert all(request.headers["X-Stainless-Poll-Helper"] == "true" for request in requests)
+    # while more than one job is due they're refreshed by listing them instead of one request per job
+    assert [request.url.path for request in requests[:2]] == ["/batches", "/batches"]
+    assert len(requests) < 20
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_poller_deduplicates_jobs(client: OpenAI, respx_mock: MockRouter) -> None:
+    route = respx_mock.get("/batches/batch_1").mock(
+        side_effect=[
+            httpx.Response(200, json=_batch("batch_1", "in_progress")),
+            httpx.Response(200, json=_batch("batch_1", "completed")),
+        ]
+    )
+
+    with Poller(client, min_interval=0.001) as poller:
+        first = poller.track_batch("batch_1")
+        second = poller.track_batch("batch_1")
+
+        assert first is second
+        assert first.result(timeout=10).status == "completed"
+
+    assert route.call_count == 2
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_poller_resolves_errors(client: OpenAI, respx_mock: MockRouter) -> None:
+    respx_mock.get("/vector_stores/vs_abc/file_batches/vsfb_missing").mock(
+        return_value=httpx.Response(404, json={"error": {"message": "not found"}})
+    )
+    respx_mock.get("/vector_stores/vs_abc/file_batches/vsfb_abc").mock(
+        side_effect=[
+            httpx.Response(200, json=_file_batch("vsfb_abc", in_progress=2)),
+            httpx.Response(200, json=_file_batch("vsfb_abc", in_progress=1)),
+            httpx.Response(200, json=_file_batch("vsfb_abc", in_progress=0)),
+        ]
+    )
+
+    with Poller(client, min_interval=0.001) as poller:
+        missing = poller.track_vector_store_file_batch("vsfb_missing", vector_store_id="vs_abc")
+        found = poller.track_vector_store_file_batch("vsfb_abc", vector_store_id="vs_abc")
+
+        assert found.result(timeout=10).file_counts.completed == 2
+        with pytest.raises(Exception, match="not found"):
+            missing.result(timeout=10)
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_poller_recovers_from_loop_errors(
+    client: OpenAI, respx_mock: MockRouter, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    respx_mock.get("/batches/batch_1").mock(return_value=httpx.Response(200, json=_batch("batch_1", "in_progress")))
+    respx_mock.get("/batches/batch_2").mock(
+        side_effect=[
+            httpx.Response(200, json=_batch("batch_2", "in_progress")),
+            httpx.Response(200, json=_batch("batch_2", "completed")),
+        ]
+    )
+    reschedule = Poller._reschedule
+    calls = 0
+
+    def failing_reschedule(self: Poller, *args: Any, **kwargs: Any) -> None:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("unexpected")
+        reschedule(self, *args, **kwargs)
+
+    monkeypatch.setattr(Poller, "_reschedule", failing_reschedule)
+
+    with Poller(client, min_interval=0.001, max_interval=0.01) as poller:
+        failed = poller.track_batch("batch_1")
+        with pytest.raises(RuntimeError, match="unexpected"):
+            failed.result(timeout=10)
+
+        # a new polling thread is started for jobs that are tracked afterwards
+        assert poller.track_batch("batch_2").result(timeout=10).status == "completed"
+
+
+def test_poller_close_cancels_pending(client: OpenAI) -> None:
+    poller = Poller(client)
+    poller.close()
+
+    with pytest.raises(RuntimeError, match="closed"):
+        poller.track_batch("batch_1")
+
+
+@pytest.mark.respx(base_url=base_url)
+async def test_async_poller(async_client: AsyncOpenAI, respx_mock: MockRouter) -> None:
+    requests = _mock_batches(
+        respx_mock,
+        {
+            "batch_1": ["in_progress", "completed"],
+            "batch_2": ["in_progress", "in_progress", "in_progress", "cancelled"],
+        },
+    )
+
+    poller = AsyncPoller(async_client, min_interval=0.001, max_interval=0.01)
+    first = poller.track_batch("batch_1")
+    second = poller.track_batch("batch_2")
+
+    assert (await second).status == "cancelled"
+    assert first.done()
+    assert (await first).status == "completed"
+    assert [request.url.path for request in requests] == [
+        "/batches",
+        "/batches",
+        "/batches/batch_2",
+        "/batches/batch_2",
+    ]
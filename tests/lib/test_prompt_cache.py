@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+from respx import MockRouter
+
+from openai import OpenAI, AsyncOpenAI
+from openai.lib import PromptCacheTracker, prompt_prefix_hash, canonicalize_request
+from openai.types.completion_usage import CompletionUsage, PromptTokensDetails
+
+from ..conftest import base_url
+
+
+def _tool(name: str, properties: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "type": "function",
+        "function": {
+            "name": name,
+            "parameters": {"type": "object", "properties": properties, "additionalProperties": False},
+        },
+    }
+
+
+def test_canonicalize_request() -> None:
+    weather = _tool("get_weather", {"city": {"type": "string"}, "country": {"type": "string"}})
+    time = _tool("get_time", {"zone": {"type": "string"}})
+
+    request = canonicalize_request({"model": "gpt-4o", "tools": [weather, time], "messages": []})
+
+    assert [tool["function"]["name"] for tool in request["tools"]] == ["get_time", "get_weather"]
+    parameters = request["tools"][1]["function"]["parameters"]
+    assert list(parameters) == ["additionalProperties", "properties", "type"]
+    # the order of the properties determines the order of the output so it's kept
+    assert list(parameters["properties"]) == ["city", "country"]
+
+
+def test_prefix_hash_ignores_ordering_and_later_messages() -> None:
+    system = {"role": "system", "content": "Be brief."}
+    first = _tool("a", {"x": {"type": "string", "description": "x"}})
+    second = _tool("b", {})
+    # the same tool with its keys in a different order
+    reordered = {
+        "function": {
+            "parameters": {
+                "properties": {"x": {"description": "x", "type": "string"}},
+                "additionalProperties": False,
+                "type": "object",
+            },
+            "name": "a",
+        },
+        "type": "function",
+    }
+
+    prefix = prompt_prefix_hash(
+        {"model": "gpt-4o", "tools": [first, second], "messages": [system, {"role": "user", "content": "hi"}]}
+    )
+    assert prefix == prompt_prefix_hash(
+        {"tools": [second, reordered], "model": "gpt-4o", "messages": [system, {"role": "user", "content": "bye"}]}
+    )
+    assert prefix != prompt_prefix_hash({"model": "gpt-4o", "tools": [first, second], "messages": []})
+    assert prefix != prompt_prefix_hash({"model": "gpt-4o-mini", "tools": [first, second], "messages": [system]})
+
+
+def test_record() -> None:
+    tracker = PromptCacheTracker()
+    params = {"model": "gpt-4o", "input": "hi", "instructions": "Be brief."}
+
+    def usage(prompt_tokens: int, cached_tokens: int) -> CompletionUsage:
+        return CompletionUsage(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=1,
+            total_tokens=prompt_tokens + 1,
+            prompt_tokens_details=PromptTokensDetails(cached_tokens=cached_tokens),
+        )
+
+    tracker.record(params, usage(2000, 0), latency=1.0)
+    stats = tracker.record(params, usage(2000, 1536), latency=0.5)
+    tracker.record({**params, "instructions": "Be verbose."}, usage(1000, 0))
+
+    assert len(tracker.stats) == 2
+    assert stats is tracker.stats[prompt_prefix_hash(params)]
+    assert stats.requests == 2
+    assert stats.cached_requests == 1
+    assert stats.hit_rate == 1536 / 4000
+    assert stats.mean_cached_latency == 0.5
+    assert stats.mean_uncached_latency == 1.0
+    assert tracker.hit_rate == 1536 / 5000
+
+
+def _mock_chat(respx_mock: MockRouter, cached_tokens: List[int]) -> List[Dict[str, Any]]:
+    requests: List[Dict[str, Any]] = []
+
+    def create(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        return httpx.Response(
+            200,
+            json={
+                "id": "chatcmpl-1",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "gpt-4o",
+                "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "hi"}}],
+                "usage": {
+                    "prompt_tokens": 2048,
+                    "completion_tokens": 1,
+                    "total_tokens": 2049,
+                    "prompt_tokens_details": {"cached_tokens": cached_tokens[len(requests) - 1]},
+                },
+            },
+        )
+
+    respx_mock.post("/chat/completions").mock(side_effect=create)
+    return requests
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_track(client: OpenAI, respx_mock: MockRouter) -> None:
+    requests = _mock_chat(respx_mock, [0, 1024])
+    tracker = PromptCacheTracker()
+    tools: Any = [_tool("b", {}), _tool("a", {})]
+
+    for question in ["one", "two"]:
+        completion = tracker.track(
+            client.chat.completions.create,
+            model="gpt-4o",
+            messages=[{"role": "system", "content": "Be brief."}, {"role": "user", "content": question}],
+            tools=tools,
+        )
+        assert completion.choices[0].message.content == "hi"
+
+    assert [tool["function"]["name"] for tool in requests[0]["tools"]] == ["a", "b"]
+    [stats] = tracker.stats.values()
+    assert stats.requests == 2
+    assert stats.hit_rate == 0.25
+    assert stats.mean_cached_latency is not None
+    assert stats.mean_uncached_latency is not None
+
+
+@pytest.mark.respx(base_url=base_url)
+async def test_async_track(async_client: AsyncOpenAI, respx_mock: MockRouter) -> None:
+    _mock_chat(respx_mock, [512])
+    tracker = PromptCacheTracker()
+
+    await tracker.async_track(
+        async_client.chat.completions.create, model="gpt-4o", messages=[{"role": "user", "content": "hi"}]
+    )
+
+    assert tracker.hit_rate == 0.25
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 from enum import Enum
+from typing import List
 
+import pytest
 from pydantic import Field, BaseModel
 from inline_snapshot import snapshot
 
 import openai
-from openai._compat import PYDANTIC_V2
-from openai.lib._pydantic import to_strict_json_schema
+from openai._compat import PYDANTIC_V2, model_json_schema
+from openai.lib._pydantic import get_type_adapter, to_strict_json_schema
+from openai.lib._parsing._completions import type_to_response_format_param
 
 from .schema_types.query import Query
 
@@ -409,3 +412,42 @@ def test_nested_inline_ref_expansion() -> None:
                 "additionalProperties": False,
             }
         )
+
+
+class Nested(BaseModel):
+    name: str
+    children: List["Nested"] = []
+
+
+@pytest.mark.skipif(not PYDANTIC_V2, reason="TypeAdapter is only available in Pydantic v2")
+def test_strict_json_schema_is_cached(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[type] = []
+
+    def json_schema(model: type[BaseModel]) -> dict[str, object]:
+        calls.append(model)
+        return model_json_schema(model)
+
+    monkeypatch.setattr("openai.lib._pydantic.model_json_schema", json_schema)
+
+    first = to_strict_json_schema(Nested)
+    first["properties"]["name"]["title"] = "mutated"
+    second = to_strict_json_schema(Nested)
+
+    # generated once, but every caller gets its own copy
+    assert calls == [Nested]
+    assert second["properties"]["name"]["title"] == "Name"
+    assert second == to_strict_json_schema(Nested)
+
+
+@pytest.mark.skipif(not PYDANTIC_V2, reason="TypeAdapter is only available in Pydantic v2")
+def test_type_adapter_is_cached() -> None:
+    import pydantic.dataclasses
+
+    @pydantic.dataclasses.dataclass
+    class Point:
+        x: int
+        y: int
+
+    adapter = get_type_adapter(Point)
+    assert get_type_adapter(Point) is adapter
+    assert type_to_response_format_param(Point) == type_to_response_format_param(Point)
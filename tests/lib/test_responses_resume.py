@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Iterator, AsyncIterator
+
+import httpx
+import pytest
+from respx import MockRouter
+
+from openai import OpenAI, AsyncOpenAI
+from openai.lib.streaming.responses._responses import _StreamProgress
+
+from ..conftest import base_url
+
+
+def _response(status: str, output: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "id": "resp_1",
+        "object": "response",
+        "created_at": 0,
+        "model": "gpt-4o",
+        "status": status,
+        "output": output,
+        "parallel_tool_calls": True,
+        "tool_choice": "auto",
+        "tools": [],
+    }
+
+
+def _events() -> List[Dict[str, Any]]:
+    message: Dict[str, Any] = {"type": "message", "id": "msg_1", "role": "assistant", "status": "in_progress"}
+    part: Dict[str, Any] = {"type": "output_text", "text": "", "annotations": []}
+    text_event: Dict[str, Any] = {"output_index": 0, "content_index": 0, "item_id": "msg_1"}
+    events: List[Dict[str, Any]] = [
+        {"type": "response.created", "response": _response("queued", [])},
+        {"type": "response.output_item.added", "output_index": 0, "item": {**message, "content": []}},
+        {"type": "response.content_part.added", **text_event, "part": part},
+        {"type": "response.output_text.delta", **text_event, "delta": "Hel"},
+        {"type": "response.output_text.delta", **text_event, "delta": "lo"},
+        {"type": "response.output_text.done", **text_event, "text": "Hello"},
+        {
+            "type": "response.completed",
+            "response": _response(
+                "completed", [{**message, "status": "completed", "content": [{**part, "text": "Hello"}]}]
+            ),
+        },
+    ]
+    return [{**event, "sequence_number": i} for i, event in enumerate(events)]
+
+
+def _sse(events: List[Dict[str, Any]]) -> bytes:
+    return b"".join(b"data: " + json.dumps(event).encode() + b"\n\n" for event in events)
+
+
+HEADERS = {"content-type": "text/event-stream"}
+
+
+@pytest.fixture(autouse=True)
+def no_reconnect_delay(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_StreamProgress, "next_delay", lambda _self: 0)  # pyright: ignore[reportUnknownLambdaType, reportUnknownArgumentType]
+
+
+def _mock_retrieve(respx_mock: MockRouter) -> List[httpx.Request]:
+    requests: List[httpx.Request] = []
+
+    def retrieve(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        # resend the last event that was received before the connection dropped
+        return httpx.Response(200, content=_sse(_events()[3:]), headers=HEADERS)
+
+    respx_mock.get("/responses/resp_1").mock(side_effect=retrieve)
+    return requests
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_resumes_dropped_background_stream(client: OpenAI, respx_mock: MockRouter) -> None:
+    def dropped() -> Iterator[bytes]:
+        yield _sse(_events()[:4])
+        raise httpx.ReadError("connection reset")
+
+    respx_mock.post("/responses").mock(return_value=httpx.Response(200, content=dropped(), headers=HEADERS))
+    requests = _mock_retrieve(respx_mock)
+
+    with client.responses.stream(input="hi", model="gpt-4o", background=True) as stream:
+        deltas = [event.delta for event in stream if event.type == "response.output_text.delta"]
+        response = stream.get_final_response()
+
+    assert deltas == ["Hel", "lo"]
+    assert response.output_text == "Hello"
+    assert len(requests) == 1
+    assert requests[0].url.params["stream"] == "true"
+    assert requests[0].url.params["starting_after"] == "3"
+
+
+@pytest.mark.respx(base_url=base_url)
+async def test_async_resumes_dropped_background_stream(async_client: AsyncOpenAI, respx_mock: MockRouter) -> None:
+    async def dropped() -> AsyncIterator[bytes]:
+        yield _sse(_events()[:4])
+        raise httpx.ReadError("connection reset")
+
+    respx_mock.post("/responses").mock(return_value=httpx.Response(200, content=dropped(), headers=HEADERS))
+    requests = _mock_retrieve(respx_mock)
+
+    async with async_client.responses.stream(input="hi", model="gpt-4o", background=True) as stream:
+        deltas = [event.delta async for event in stream if event.type == "response.output_text.delta"]
+        response = await stream.get_final_response()
+
+    assert deltas == ["Hel", "lo"]
+    assert response.output_text == "Hello"
+    assert len(requests) == 1
+    assert requests[0].url.params["starting_after"] == "3"
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_does_not_resume_foreground_stream(client: OpenAI, respx_mock: MockRouter) -> None:
+    def dropped() -> Iterator[bytes]:
+        yield _sse(_events()[:4])
+        raise httpx.ReadError("connection reset")
+
+    respx_mock.post("/responses").mock(return_value=httpx.Response(200, content=dropped(), headers=HEADERS))
+
+    # nothing else is mocked so trying to reconnect would fail with a different error
+    with client.responses.stream(input="hi", model="gpt-4o") as stream:
+        with pytest.raises(httpx.ReadError):
+            stream.until_done()
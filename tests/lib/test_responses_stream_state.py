@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, cast
+
+from pydantic import BaseModel
+
+from openai._types import NOT_GIVEN
+from openai._models import construct_type
+from openai.types.responses import ResponseStreamEvent
+from openai.lib.streaming.responses import ResponseStreamState
+
+
+class Location(BaseModel):
+    city: str
+
+
+def _response(output: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "id": "resp_1",
+        "object": "response",
+        "created_at": 0,
+        "model": "gpt-4o",
+        "output": output,
+        "parallel_tool_calls": True,
+        "tool_choice": "auto",
+        "tools": [],
+    }
+
+
+def _events(deltas: List[str]) -> List[ResponseStreamEvent]:
+    text = "".join(deltas)
+    message: Dict[str, Any] = {
+        "type": "message",
+        "id": "msg_1",
+        "role": "assistant",
+        "status": "in_progress",
+        "content": [],
+    }
+    part: Dict[str, Any] = {"type": "output_text", "text": "", "annotations": []}
+    values: List[Dict[str, Any]] = [
+        {"type": "response.created", "response": _response([])},
+        {"type": "response.output_item.added", "output_index": 0, "item": message},
+        {
+            "type": "response.content_part.added",
+            "output_index": 0,
+            "content_index": 0,
+            "item_id": "msg_1",
+            "part": part,
+        },
+        *(
+            {
+                "type": "response.output_text.delta",
+                "output_index": 0,
+                "content_index": 0,
+                "item_id": "msg_1",
+                "delta": d,
+            }
+            for d in deltas
+        ),
+        {"type": "response.output_text.done", "output_index": 0, "content_index": 0, "item_id": "msg_1", "text": text},
+        {
+            "type": "response.completed",
+            "response": _response(
+                [{**message, "status": "completed", "content": [{**part, "text": text}]}],
+            ),
+        },
+    ]
+    return [
+        cast(ResponseStreamEvent, construct_type(type_=ResponseStreamEvent, value={**value, "sequence_number": i}))
+        for i, value in enumerate(values)
+    ]
+
+
+def test_accumulates_text_deltas() -> None:
+    state = ResponseStreamState(input_tools=NOT_GIVEN, text_format=Location)
+    deltas = ['{"ci', 'ty": "San', ' Francisco"}']
+
+    snapshots: List[str] = []
+    for raw_event in _events(deltas):
+        for event in state.handle_event(raw_event):
+            if event.type == "response.output_text.delta":
+                snapshots.append(event.snapshot)
+                assert event.sequence_number == raw_event.sequence_number
+            elif event.type == "response.output_text.done":
+                assert event.parsed == Location(city="San Francisco")
+
+    assert snapshots == ['{"ci', '{"city": "San', '{"city": "San Francisco"}']
+
+    completed = state.handle_event(_events(deltas)[-1])[-1]
+    assert completed.type == "response.completed"
+    response = completed.response
+    assert response.output_parsed == Location(city="San Francisco")
+    assert response.output[0].type == "message"
+    assert response.output[0].status == "completed"
+    output: Any = response.to_dict()["output"]
+    assert output[0]["content"][0]["text"] == '{"city": "San Francisco"}'
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+from typing import List
+
+import httpx
+import pytest
+from respx import MockRouter
+
+from openai import OpenAI, AsyncOpenAI
+from openai.lib import SearchCache
+
+from ..conftest import base_url
+
+
+def _mock_search(respx_mock: MockRouter) -> List[object]:
+    queries: List[object] = []
+
+    def search(request: httpx.Request) -> httpx.Response:
+        query = json.loads(request.content)["query"]
+        queries.append(query)
+        return httpx.Response(
+            200,
+            json={
+                "object": "vector_store.search_results.page",
+                "search_query": [query] if isinstance(query, str) else query,
+                "has_more": False,
+                "next_page": None,
+                "data": [
+                    {
+                        "file_id": "file-abc",
+                        "filename": "doc.txt",
+                        "score": 0.5,
+                        "attributes": None,
+                        "content": [{"type": "text", "text": f"result for {query}"}],
+                    }
+                ],
+            },
+        )
+
+    respx_mock.post("/vector_stores/vs_abc/search").mock(side_effect=search)
+    return queries
+
+
+def test_search_cache_ttl_and_eviction(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [0.0]
+    monkeypatch.setattr("openai.lib._search_cache.time.monotonic", lambda: now[0])
+
+    cache = SearchCache(ttl=10, max_size=2)
+    cache.set("a", "vs_abc", 1)
+    cache.set("b", "vs_abc", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", "vs_def", 3)
+    # `b` was the least recently used entry
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+    cache.invalidate("vs_abc")
+    assert cache.get("a") is None
+    assert cache.get("c") == 3
+
+    now[0] = 11
+    assert cache.get("c") is None
+
+    generation = cache.generation
+    cache.invalidate()
+    cache.set("d", "vs_abc", 4, generation=generation)
+    assert cache.get("d") is None
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_search_many(client: OpenAI, respx_mock: MockRouter) -> None:
+    queries = _mock_search(respx_mock)
+
+    pages = client.vector_stores.search_many("vs_abc", queries=["a", "b", "a", ["c", "d"]], max_concurrency=2)
+
+    assert [page.data[0].content[0].text for page in pages] == [
+        "result for a",
+        "result for b",
+        "result for a",
+        "result for ['c', 'd']",
+    ]
+    # duplicate queries are only sent once
+    assert sorted(map(str, queries)) == sorted(["a", "b", "['c', 'd']"])
+
+
+@pytest.mark.respx(base_url=base_url, assert_all_called=False)
+def test_search_many_cache_invalidation(client: OpenAI, respx_mock: MockRouter) -> None:
+    queries = _mock_search(respx_mock)
+    respx_mock.post("/vector_stores/vs_abc/files").mock(
+        return_value=httpx.Response(
+            200,
+            json={
+                "id": "file-def",
+                "created_at": 0,
+                "object": "vector_store.file",
+                "status": "in_progress",
+                "usage_bytes": 0,
+                "vector_store_id": "vs_abc",
+            },
+        )
+    )
+    cache = SearchCache()
+
+    client.vector_stores.search_many("vs_abc", queries=["a"], cache=cache)
+    client.vector_stores.search_many("vs_abc", queries=["a"], cache=cache)
+    assert queries == ["a"]
+    assert cache.hits == 1
+
+    # a different parameter is a different cache entry
+    client.vector_stores.search_many("vs_abc", queries=["a"], max_num_results=3, cache=cache)
+    assert queries == ["a", "a"]
+
+    client.vector_stores.files.create("vs_abc", file_id="file-def")
+    client.vector_stores.search_many("vs_abc", queries=["a"], cache=cache)
+    assert queries == ["a", "a", "a"]
+
+
+@pytest.mark.respx(base_url=base_url)
+async def test_async_search_many(async_client: AsyncOpenAI, respx_mock: MockRouter) -> None:
+    queries = _mock_search(respx_mock)
+    cache = SearchCache()
+
+    pages = await async_client.vector_stores.search_many("vs_abc", queries=["a", "b"], cache=cache)
+    assert [page.data[0].content[0].text for page in pages] == ["result for a", "result for b"]
+
+    pages = await async_client.vector_stores.search_many("vs_abc", queries=["b", "a"], cache=cache)
+    assert [page.data[0].content[0].text for page in pages] == ["result for b", "result for a"]
+    assert sorted(map(str, queries)) == ["a", "b"]
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+import pytest
+
+from openai import TokenLimitExceededError
+from openai.lib import (
+    estimate_tokens,
+    get_token_counter,
+    preflight_response,
+    count_response_tokens,
+    preflight_chat_completion,
+    count_chat_completion_tokens,
+)
+from openai.lib._tokens import _encoding_for_model
+
+
+def test_get_token_counter_with_tiktoken() -> None:
+    # the encodings are replaced with ones that have a token per byte in `tests/conftest.py`
+    pytest.importorskip("tiktoken")
+
+    count = get_token_counter("gpt-4o")
+    assert count is not estimate_tokens
+    assert count("hello world") == 11
+    # special tokens are counted as text instead of raising
+    assert count("<|endoftext|>") == 13
+
+    assert _encoding_for_model("gpt-4o").name == "o200k_base"
+    assert _encoding_for_model("gpt-3.5-turbo").name == "cl100k_base"
+    # models that tiktoken doesn't know and no model at all fall back to the newest encoding
+    assert _encoding_for_model("my-fine-tune").name == "o200k_base"
+    assert _encoding_for_model(None).name == "o200k_base"
+
+
+def test_get_token_counter_without_tiktoken(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("openai.lib._tokens.has_tiktoken", lambda: False)
+
+    count = get_token_counter("gpt-4o")
+    assert count is estimate_tokens
+    assert count("hello world") == 4
+
+
+def test_count_chat_completion_tokens() -> None:
+    messages: List[Dict[str, Any]] = [
+        {"role": "system", "content": "abcd"},
+        {"role": "user", "name": "bob", "content": [{"type": "text", "text": "efgh"}]},
+    ]
+
+    # every message adds 3 tokens and the reply adds another 3
+    assert count_chat_completion_tokens(messages=messages, count_tokens=len) == (3 + 6 + 4) + (3 + 4 + 1 + 3 + 4) + 3
+
+    with_images = [
+        *messages,
+        {
+            "role": "user",
+            "content": [
+                {"type": "image_url", "image_url": {"url": "https://example.com/a.png", "detail": "low"}},
+                {"type": "image_url", "image_url": {"url": "https://example.com/b.png"}},
+            ],
+        },
+    ]
+    assert count_chat_completion_tokens(messages=with_images, count_tokens=len) == count_chat_completion_tokens(
+        messages=messages, count_tokens=len
+    ) + (3 + 4 + 85 + 765)
+
+    tools: List[Dict[str, Any]] = [{"type": "function", "function": {"name": "f"}}]
+    with_tools = count_chat_completion_tokens(
+        messages=messages, tools=tools, model="gpt-4o", temperature=0, count_tokens=len
+    )
+    assert with_tools == count_chat_completion_tokens(messages=messages, count_tokens=len) + len(
+        '{"type":"function","function":{"name":"f"}}'
+    )
+
+
+def test_count_response_tokens() -> None:
+    assert count_response_tokens(input="abcd", count_tokens=len) == (3 + 4 + 4) + 3
+    assert count_response_tokens(input="abcd", instructions="efgh", count_tokens=len) == (3 + 4 + 4) + 3 + (3 + 6 + 4)
+
+    items: List[Dict[str, Any]] = [
+        {
+            "role": "user",
+            "content": [{"type": "input_image", "image_url": "https://example.com/a.png", "detail": "low"}],
+        },
+        {"type": "function_call_output", "call_id": "call_1", "output": "ok"},
+    ]
+    function_output = '{"type":"function_call_output","call_id":"call_1","output":"ok"}'
+    assert count_response_tokens(input=items, count_tokens=len) == (3 + 4 + 85) + (3 + len(function_output)) + 3
+
+
+def test_preflight_chat_completion() -> None:
+    messages: List[Dict[str, Any]] = [
+        {"role": "system", "content": "s" * 10},
+        {"role": "user", "content": "a" * 10},
+        {"role": "assistant", "content": "b" * 10},
+        {"role": "user", "content": "c" * 10},
+    ]
+    params: Dict[str, Any] = {"model": "gpt-4o", "messages": messages}
+
+    assert preflight_chat_completion(context_window=1000, count_tokens=len, **params) == params
+
+    with pytest.raises(TokenLimitExceededError) as exc_info:
+        preflight_chat_completion(context_window=1000, max_completion_tokens=950, count_tokens=len, **params)
+    assert exc_info.value.tokens == 4 * 3 + 6 + 4 + 9 + 4 + 10 * 4 + 3
+    assert exc_info.value.max_tokens == 50
+
+    # the oldest turn is dropped but the system message is kept
+    request = preflight_chat_completion(context_window=40, truncate=True, count_tokens=len, **params)
+    assert [message["content"] for message in request["messages"]] == ["s" * 10, "c" * 10]
+    assert request["model"] == "gpt-4o"
+
+    with pytest.raises(TokenLimitExceededError):
+        preflight_chat_completion(context_window=10, truncate=True, count_tokens=len, **params)
+
+
+def test_preflight_counts_each_message_once() -> None:
+    counted: List[str] = []
+
+    def count(text: str) -> int:
+        counted.append(text)
+        return len(text)
+
+    messages = [{"role": "user", "content": f"message {i}"} for i in range(100)]
+    request = preflight_chat_completion(context_window=100, truncate=True, count_tokens=count, messages=messages)
+
+    assert request["messages"] == messages[-5:]
+    # the role and content of every message
+    assert len(counted) == 2 * len(messages)
+
+
+def test_preflight_response() -> None:
+    with pytest.raises(TokenLimitExceededError):
+        preflight_response(context_window=10, truncate=True, count_tokens=len, model="gpt-4o", input="a" * 10)
+
+    # function calls are dropped along with the turn they belong to
+    input: List[Dict[str, Any]] = [
+        {"role": "user", "content": "a" * 10},
+        {"type": "function_call", "call_id": "call_1", "name": "f", "arguments": "{}"},
+        {"type": "function_call_output", "call_id": "call_1", "output": "ok"},
+        {"role": "user", "content": "b" * 10},
+    ]
+    request = preflight_response(context_window=50, truncate=True, count_tokens=len, model="gpt-4o", input=input)
+    assert request["input"] == input[3:]
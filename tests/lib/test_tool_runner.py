@@ -0,0 +1,480 @@
+from __future__ import annotations
+
+import json
+import time
+import threading
+from typing import Any, Dict, List, Iterator, Optional, AsyncIterator
+
+import anyio
+import httpx
+import pytest
+from respx import MockRouter
+from pydantic import BaseModel
+
+from openai import OpenAI, APIError, AsyncOpenAI
+from openai.lib import ToolRunner, AsyncToolRunner
+
+from ..conftest import base_url
+
+
+class GetWeather(BaseModel):
+    city: str
+
+
+def _response(id: str, output: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "id": id,
+        "object": "response",
+        "created_at": 0,
+        "model": "gpt-4o",
+        "output": output,
+        "parallel_tool_calls": True,
+        "tool_choice": "auto",
+        "tools": [],
+    }
+
+
+def _function_call(call_id: str, city: str) -> Dict[str, Any]:
+    return {
+        "type": "function_call",
+        "id": f"fc_{call_id}",
+        "call_id": call_id,
+        "name": "GetWeather",
+        "arguments": json.dumps({"city": city}),
+        "status": "completed",
+    }
+
+
+def _message(text: str) -> Dict[str, Any]:
+    return {
+        "type": "message",
+        "id": "msg_1",
+        "role": "assistant",
+        "status": "completed",
+        "content": [{"type": "output_text", "text": text, "annotations": []}],
+    }
+
+
+def _mock_responses(respx_mock: MockRouter, outputs: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    requests: List[Dict[str, Any]] = []
+
+    def create(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        return httpx.Response(200, json=_response(f"resp_{len(requests)}", outputs[len(requests) - 1]))
+
+    respx_mock.post("/responses").mock(side_effect=create)
+    return requests
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_run_responses(client: OpenAI, respx_mock: MockRouter) -> None:
+    requests = _mock_responses(
+        respx_mock,
+        [[_function_call("call_1", "Paris"), _function_call("call_2", "Tokyo")], [_message("Sunny everywhere")]],
+    )
+
+    # both calls have to be running at the same time to get past the barrier
+    barrier = threading.Barrier(2, timeout=5)
+
+    def get_weather(args: GetWeather) -> Dict[str, str]:
+        barrier.wait()
+        return {"city": args.city, "forecast": "sunny"}
+
+    runner = ToolRunner(client)
+    runner.register(GetWeather, get_weather)
+
+    result = runner.run_responses(model="gpt-4o", input="What's the weather in Paris and Tokyo?")
+
+    assert result.response.output_text == "Sunny everywhere"
+    assert len(result.responses) == 2
+    assert [call.output for call in result.tool_calls] == [
+        '{"city": "Paris", "forecast": "sunny"}',
+        '{"city": "Tokyo", "forecast": "sunny"}',
+    ]
+
+    assert requests[0]["tools"][0]["name"] == "GetWeather"
+    assert "previous_response_id" not in requests[0]
+    assert requests[1]["previous_response_id"] == "resp_1"
+    assert requests[1]["input"] == [
+        {"type": "function_call_output", "call_id": "call_1", "output": '{"city": "Paris", "forecast": "sunny"}'},
+        {"type": "function_call_output", "call_id": "call_2", "output": '{"city": "Tokyo", "forecast": "sunny"}'},
+    ]
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_run_responses_without_store(client: OpenAI, respx_mock: MockRouter) -> None:
+    requests = _mock_responses(respx_mock, [[_function_call("call_1", "Paris")], [_message("Sunny")]])
+
+    runner = ToolRunner(client)
+    runner.register(GetWeather, lambda args: f"sunny in {args.city}")
+
+    runner.run_responses(model="gpt-4o", input="What's the weather in Paris?", store=False)
+
+    assert "previous_response_id" not in requests[1]
+    assert requests[1]["input"] == [
+        {"role": "user", "content": "What's the weather in Paris?"},
+        _function_call("call_1", "Paris"),
+        {"type": "function_call_output", "call_id": "call_1", "output": "sunny in Paris"},
+    ]
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_run_chat(client: OpenAI, respx_mock: MockRouter) -> None:
+    requests: List[Dict[str, Any]] = []
+    tool_call = {
+        "id": "call_1",
+        "type": "function",
+        "function": {"name": "GetWeather", "arguments": '{"city": "Paris"}'},
+    }
+
+    def create(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        message: Dict[str, Any] = (
+            {"role": "assistant", "content": None, "tool_calls": [tool_call]}
+            if len(requests) == 1
+            else {"role": "assistant", "content": "Sunny"}
+        )
+        return httpx.Response(
+            200,
+            json={
+                "id": f"chatcmpl_{len(requests)}",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "gpt-4o",
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "tool_calls" if len(requests) == 1 else "stop",
+                        "message": message,
+                    }
+                ],
+            },
+        )
+
+    respx_mock.post("/chat/completions").mock(side_effect=create)
+
+    runner = ToolRunner(client)
+    runner.register(GetWeather, lambda args: f"sunny in {args.city}")
+
+    result = runner.run_chat(model="gpt-4o", messages=[{"role": "user", "content": "Weather in Paris?"}])
+
+    assert result.completion.choices[0].message.content == "Sunny"
+    assert requests[1]["messages"] == [
+        {"role": "user", "content": "Weather in Paris?"},
+        {"role": "assistant", "content": None, "tool_calls": [tool_call]},
+        {"role": "tool", "tool_call_id": "call_1", "content": "sunny in Paris"},
+    ]
+    assert result.messages == requests[1]["messages"]
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_tool_timeout(client: OpenAI, respx_mock: MockRouter) -> None:
+    requests = _mock_responses(
+        respx_mock, [[_function_call("call_1", "Paris")], [_function_call("call_2", "Paris")], [_message("Sorry")]]
+    )
+    release = threading.Event()
+
+    def get_weather(_args: GetWeather) -> str:
+        release.wait(5)
+        return "sunny"
+
+    try:
+        runner = ToolRunner(client, timeout=0.05)
+        runner.register(GetWeather, get_weather)
+
+        with pytest.raises(TimeoutError, match="`GetWeather` tool did not return within 0.05 seconds"):
+            runner.run_responses(model="gpt-4o", input="What's the weather in Paris?")
+
+        runner = ToolRunner(client, return_errors=True)
+        runner.register(GetWeather, get_weather, timeout=0.05)
+
+        start = time.monotonic()
+        runner.run_responses(model="gpt-4o", input="What's the weather in Paris?")
+        assert time.monotonic() - start < 2
+    finally:
+        release.set()
+
+    assert requests[-1]["input"][0]["output"] == json.dumps(
+        {"error": "TimeoutError: The `GetWeather` tool did not return within 0.05 seconds"}
+    )
+
+
+def test_tool_timeout_starts_when_the_call_runs(client: OpenAI) -> None:
+    release = threading.Event()
+
+    def get_weather(args: GetWeather) -> str:
+        if args.city == "Hung":
+            release.wait(5)
+        else:
+            time.sleep(0.2)
+        return f"sunny in {args.city}"
+
+    runner = ToolRunner(client, timeout=0.3, max_concurrency=1, return_errors=True)
+    runner.register(GetWeather, get_weather)
+
+    # the calls wait for each other, but each one runs within its own timeout
+    calls = runner.call_tools((f"call_{city}", "GetWeather", json.dumps({"city": city}), None) for city in "ABC")
+    assert [call.output for call in calls] == ["sunny in A", "sunny in B", "sunny in C"]
+
+    try:
+        # a call that times out gives up its slot to the calls that are waiting
+        calls = runner.call_tools(
+            (f"call_{city}", "GetWeather", json.dumps({"city": city}), None) for city in ["Hung", "A"]
+        )
+    finally:
+        release.set()
+
+    assert "TimeoutError" in calls[0].output
+    assert calls[1].output == "sunny in A"
+
+
+def test_register_validation(client: OpenAI) -> None:
+    runner = ToolRunner(client)
+
+    with pytest.raises(ValueError, match="No tools have been registered"):
+        runner.run_responses(model="gpt-4o", input="hi")
+
+    runner.register(GetWeather, lambda args: args.city)
+    with pytest.raises(ValueError, match="already registered"):
+        runner.register(GetWeather, lambda args: args.city)
+
+    with pytest.raises(TypeError, match="register them"):
+        runner.run_responses(model="gpt-4o", input="hi", tools=[])
+
+
+@pytest.mark.respx(base_url=base_url)
+async def test_async_run_responses(async_client: AsyncOpenAI, respx_mock: MockRouter) -> None:
+    requests = _mock_responses(
+        respx_mock,
+        [[_function_call("call_1", "Paris"), _function_call("call_2", "Tokyo")], [_message("Sunny everywhere")]],
+    )
+    started: List[str] = []
+    both_started = anyio.Event()
+
+    async def get_weather(args: GetWeather) -> str:
+        started.append(args.city)
+        if len(started) == 2:
+            both_started.set()
+        with anyio.fail_after(5):
+            await both_started.wait()
+        return f"sunny in {args.city}"
+
+    runner = AsyncToolRunner(async_client)
+    runner.register(GetWeather, get_weather)
+
+    result = await runner.run_responses(model="gpt-4o", input="What's the weather in Paris and Tokyo?")
+
+    assert result.response.output_text == "Sunny everywhere"
+    assert requests[1]["previous_response_id"] == "resp_1"
+    assert [item["output"] for item in requests[1]["input"]] == ["sunny in Paris", "sunny in Tokyo"]
+
+
+@pytest.mark.respx(base_url=base_url)
+async def test_async_tool_timeout(async_client: AsyncOpenAI, respx_mock: MockRouter) -> None:
+    requests = _mock_responses(respx_mock, [[_function_call("call_1", "Paris")], [_message("Sorry")]])
+
+    async def get_weather(_args: GetWeather) -> str:
+        await anyio.sleep(10)
+        return "sunny"
+
+    runner = AsyncToolRunner(async_client, timeout=0.05, return_errors=True)
+    runner.register(GetWeather, get_weather)
+
+    await runner.run_responses(model="gpt-4o", input="What's the weather in Paris?")
+
+    assert "TimeoutError" in requests[1]["input"][0]["output"]
+
+
+async def test_tool_timeout_errors_are_not_replaced(client: OpenAI, async_client: AsyncOpenAI) -> None:
+    def get_weather(_args: GetWeather) -> str:
+        raise TimeoutError("the weather service timed out")
+
+    expected = json.dumps({"error": "TimeoutError: the weather service timed out"})
+    request = [("call_1", "GetWeather", json.dumps({"city": "Paris"}), None)]
+
+    # a `TimeoutError` raised by the tool itself is reported as is, with or without a timeout
+    for timeout in (None, 5):
+        runner = ToolRunner(client, timeout=timeout, return_errors=True)
+        runner.register(GetWeather, get_weather)
+        assert [call.output for call in runner.call_tools(request)] == [expected]
+
+        async_runner = AsyncToolRunner(async_client, timeout=timeout, return_errors=True)
+        async_runner.register(GetWeather, get_weather)
+        assert [call.output for call in await async_runner.call_tools(request)] == [expected]
+
+
+def _sse(events: List[Dict[str, Any]]) -> bytes:
+    return b"".join(b"data: " + json.dumps(event).encode() + b"\n\n" for event in events)
+
+
+def _function_call_events(response_id: str, calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    events: List[Dict[str, Any]] = [
+        {"type": "response.created", "sequence_number": 0, "response": _response(response_id, [])}
+    ]
+    for index, call in enumerate(calls):
+        events.append(
+            {
+                "type": "response.output_item.added",
+                "sequence_number": len(events),
+                "output_index": index,
+                "item": {**call, "arguments": "", "status": "in_progress"},
+            }
+        )
+        events.append(
+            {
+                "type": "response.function_call_arguments.delta",
+                "sequence_number": len(events),
+                "item_id": call["id"],
+                "output_index": index,
+                "delta": call["arguments"],
+            }
+        )
+        events.append(
+            {
+                "type": "response.function_call_arguments.done",
+                "sequence_number": len(events),
+                "item_id": call["id"],
+                "output_index": index,
+                "arguments": call["arguments"],
+            }
+        )
+    return events
+
+
+def _completed_event(response_id: str, output: List[Dict[str, Any]], sequence_number: int) -> Dict[str, Any]:
+    return {
+        "type": "response.completed",
+        "sequence_number": sequence_number,
+        "response": _response(response_id, output),
+    }
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_run_responses_stream_dispatches_early(client: OpenAI, respx_mock: MockRouter) -> None:
+    calls = [_function_call("call_1", "Paris"), _function_call("call_2", "Tokyo")]
+    started: List[str] = []
+    both_started = threading.Event()
+    requests: List[Dict[str, Any]] = []
+
+    def first_stream() -> Iterator[bytes]:
+        events = _function_call_events("resp_1", calls)
+        yield _sse(events)
+        # the response isn't completed until both tools have started running
+        assert both_started.wait(5)
+        yield _sse([_completed_event("resp_1", calls, len(events))])
+
+    def create(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        headers = {"content-type": "text/event-stream"}
+        if len(requests) == 1:
+            return httpx.Response(200, content=first_stream(), headers=headers)
+
+        events = [{"type": "response.created", "sequence_number": 0, "response": _response("resp_2", [])}]
+        events.append(_completed_event("resp_2", [_message("Sunny everywhere")], 1))
+        return httpx.Response(200, content=_sse(events), headers=headers)
+
+    respx_mock.post("/responses").mock(side_effect=create)
+
+    def get_weather(args: GetWeather) -> str:
+        started.append(args.city)
+        if len(started) == 2:
+            both_started.set()
+        return f"sunny in {args.city}"
+
+    runner = ToolRunner(client)
+    runner.register(GetWeather, get_weather)
+
+    result = runner.run_responses(model="gpt-4o", input="What's the weather in Paris and Tokyo?", stream=True)
+
+    assert result.response.output_text == "Sunny everywhere"
+    assert sorted(started) == ["Paris", "Tokyo"]
+    assert requests[0]["stream"] is True
+    assert requests[1]["previous_response_id"] == "resp_1"
+    assert [item["output"] for item in requests[1]["input"]] == ["sunny in Paris", "sunny in Tokyo"]
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_run_chat_stream(client: OpenAI, respx_mock: MockRouter) -> None:
+    requests: List[Dict[str, Any]] = []
+
+    def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None) -> Dict[str, Any]:
+        return {
+            "id": "chatcmpl_1",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "gpt-4o",
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+
+    def tool_call_delta(index: int, id: str, city: str) -> Dict[str, Any]:
+        return {
+            "tool_calls": [
+                {
+                    "index": index,
+                    "id": id,
+                    "type": "function",
+                    "function": {"name": "GetWeather", "arguments": json.dumps({"city": city})},
+                }
+            ]
+        }
+
+    def create(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        if len(requests) == 1:
+            chunks = [
+                chunk({"role": "assistant", **tool_call_delta(0, "call_1", "Paris")}),
+                chunk(tool_call_delta(1, "call_2", "Tokyo")),
+                chunk({}, finish_reason="tool_calls"),
+            ]
+        else:
+            chunks = [chunk({"role": "assistant", "content": "Sunny"}), chunk({}, finish_reason="stop")]
+
+        return httpx.Response(
+            200, content=_sse(chunks) + b"data: [DONE]\n\n", headers={"content-type": "text/event-stream"}
+        )
+
+    respx_mock.post("/chat/completions").mock(side_effect=create)
+
+    dispatched: List[str] = []
+    runner = ToolRunner(client)
+    runner.register(GetWeather, lambda args: dispatched.append(args.city) or f"sunny in {args.city}")
+
+    result = runner.run_chat(model="gpt-4o", messages=[{"role": "user", "content": "Weather?"}], stream=True)
+
+    assert result.completion.choices[0].message.content == "Sunny"
+    assert sorted(dispatched) == ["Paris", "Tokyo"]
+    assert [message.get("content") for message in requests[1]["messages"][2:]] == ["sunny in Paris", "sunny in Tokyo"]
+
+
+@pytest.mark.respx(base_url=base_url)
+async def test_async_run_responses_stream_cancels_tools_on_error(
+    async_client: AsyncOpenAI, respx_mock: MockRouter
+) -> None:
+    started = anyio.Event()
+    cancelled = anyio.Event()
+
+    async def body() -> AsyncIterator[bytes]:
+        yield _sse(_function_call_events("resp_1", [_function_call("call_1", "Paris")]))
+        await started.wait()
+        yield b'data: {"error": {"message": "the stream failed"}}\n\n'
+
+    respx_mock.post("/responses").mock(
+        return_value=httpx.Response(200, content=body(), headers={"content-type": "text/event-stream"})
+    )
+
+    async def get_weather(_args: GetWeather) -> str:
+        started.set()
+        try:
+            await anyio.sleep(10)
+        finally:
+            cancelled.set()
+        return "sunny"
+
+    runner = AsyncToolRunner(async_client)
+    runner.register(GetWeather, get_weather)
+
+    with anyio.fail_after(5):
+        with pytest.raises(APIError, match="the stream failed"):
+            await runner.run_responses(model="gpt-4o", input="What's the weather in Paris?", stream=True)
+
+    assert cancelled.is_set()
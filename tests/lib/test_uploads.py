@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import json
+import hashlib
+from typing import Any, List
+from pathlib import Path
+
+import httpx
+import pytest
+from respx import MockRouter
+
+from openai import OpenAI, AsyncOpenAI
+from openai.lib import FileIndex
+
+from ..conftest import base_url
+
+UPLOAD = {
+    "id": "upload_abc",
+    "bytes": 0,
+    "created_at": 0,
+    "expires_at": 0,
+    "filename": "data.jsonl",
+    "object": "upload",
+    "purpose": "batch",
+    "status": "pending",
+}
+
+
+def _mock_upload(respx_mock: MockRouter) -> tuple[List[bytes], List[Any]]:
+    parts: List[bytes] = []
+    completions: List[Any] = []
+
+    def create_part(request: httpx.Request) -> httpx.Response:
+        parts.append(request.read())
+        return httpx.Response(
+            200,
+            json={"id": f"part_{len(parts)}", "created_at": 0, "object": "upload.part", "upload_id": "upload_abc"},
+        )
+
+    def complete(request: httpx.Request) -> httpx.Response:
+        completions.append(json.loads(request.content))
+        return httpx.Response(200, json={**UPLOAD, "status": "completed"})
+
+    respx_mock.post("/uploads").mock(return_value=httpx.Response(200, json=UPLOAD))
+    respx_mock.post("/uploads/upload_abc/parts").mock(side_effect=create_part)
+    respx_mock.post("/uploads/upload_abc/complete").mock(side_effect=complete)
+    return parts, completions
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_upload_file_chunked(client: OpenAI, respx_mock: MockRouter, tmp_path: Path) -> None:
+    content = b"".join(b'{"line": %d}\n' % i for i in range(1000))
+    path = tmp_path / "data.jsonl"
+    path.write_bytes(content)
+
+    parts, completions = _mock_upload(respx_mock)
+
+    client.uploads.upload_file_chunked(file=path, mime_type="text/jsonl", purpose="batch", part_size=5000)
+
+    assert len(parts) == 3
+    assert all(b'filename="data.jsonl"' in part for part in parts)
+    assert content[:5000] in parts[0]
+    assert content[10000:] in parts[2]
+    assert completions == [
+        {"part_ids": ["part_1", "part_2", "part_3"], "md5": hashlib.md5(content).hexdigest()},
+    ]
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_upload_file_chunked_explicit_md5(client: OpenAI, respx_mock: MockRouter) -> None:
+    _, completions = _mock_upload(respx_mock)
+
+    client.uploads.upload_file_chunked(
+        file=b"hello world",
+        filename="data.jsonl",
+        bytes=11,
+        mime_type="text/jsonl",
+        purpose="batch",
+        part_size=4,
+        md5="foo",
+    )
+
+    assert completions == [{"part_ids": ["part_1", "part_2", "part_3"], "md5": "foo"}]
+
+
+@pytest.mark.respx(base_url=base_url)
+async def test_async_upload_file_chunked(async_client: AsyncOpenAI, respx_mock: MockRouter, tmp_path: Path) -> None:
+    content = b"".join(b'{"line": %d}\n' % i for i in range(1000))
+    path = tmp_path / "data.jsonl"
+    path.write_bytes(content)
+
+    parts, completions = _mock_upload(respx_mock)
+
+    await async_client.uploads.upload_file_chunked(file=path, mime_type="text/jsonl", purpose="batch", part_size=5000)
+
+    assert len(parts) == 3
+    assert completions == [
+        {"part_ids": ["part_1", "part_2", "part_3"], "md5": hashlib.md5(content).hexdigest()},
+    ]
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_upload_file_chunked_file_index(client: OpenAI, respx_mock: MockRouter) -> None:
+    parts, _ = _mock_upload(respx_mock)
+    respx_mock.post("/uploads/upload_abc/complete").mock(
+        return_value=httpx.Response(
+            200,
+            json={
+                **UPLOAD,
+                "status": "completed",
+                "file": {
+                    "id": "file-abc",
+                    "bytes": 11,
+                    "created_at": 0,
+                    "filename": "data.jsonl",
+                    "object": "file",
+                    "purpose": "batch",
+                    "status": "processed",
+                },
+            },
+        )
+    )
+    respx_mock.get("/files/file-abc").mock(
+        return_value=httpx.Response(
+            200,
+            json={
+                "id": "file-abc",
+                "bytes": 11,
+                "created_at": 0,
+                "filename": "data.jsonl",
+                "object": "file",
+                "purpose": "batch",
+                "status": "processed",
+            },
+        )
+    )
+
+    with FileIndex() as index:
+        for _ in range(2):
+            upload = client.uploads.upload_file_chunked(
+                file=b"hello world",
+                filename="data.jsonl",
+                bytes=11,
+                mime_type="text/jsonl",
+                purpose="batch",
+                file_index=index,
+            )
+            assert upload.id == "upload_abc"
+            assert upload.file is not None
+            assert upload.file.id == "file-abc"
+
+    assert len(parts) == 1
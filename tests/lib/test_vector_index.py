@@ -0,0 +1,117 @@
+# pyright: reportUnknownMemberType=false, reportUnknownVariableType=false, reportUnknownArgumentType=false
+
+from __future__ import annotations
+
+from typing import Any, List
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from openai.lib import VectorIndex
+from openai.types import Embedding, CreateEmbeddingResponse
+
+
+def _brute_force(vectors: Any, query: Any, k: int) -> List[int]:
+    vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    query = query / np.linalg.norm(query)
+    return np.argsort(-(vectors @ query), kind="stable")[:k].tolist()
+
+
+def test_exact_search(monkeypatch: pytest.MonkeyPatch) -> None:
+    # score the index over several blocks
+    monkeypatch.setattr("openai.lib._vector_index._SEARCH_BLOCK_ROWS", 7)
+
+    rng = np.random.default_rng(1)
+    vectors = rng.normal(size=(50, 8)).astype(np.float32)
+    queries = rng.normal(size=(3, 8)).astype(np.float32)
+
+    index = VectorIndex()
+    index.add(vectors[:20])
+    index.add(vectors[20:])
+    assert len(index) == 50
+    assert index.dimensions == 8
+    assert np.allclose(np.linalg.norm(index.vectors, axis=1), 1)
+
+    results = index.search_many(queries, k=5)
+    for query, matches in zip(queries, results):
+        assert [match.index for match in matches] == _brute_force(vectors, query, 5)
+        assert [match.id for match in matches] == [str(match.index) for match in matches]
+        assert matches[0].score >= matches[-1].score
+
+    assert len(index.search(queries[0], k=100)) == 50
+
+    with pytest.raises(ValueError, match="8 dimensions"):
+        index.search([1.0, 2.0])
+    with pytest.raises(ValueError, match="use `search_many\\(\\)`"):
+        index.search(queries)
+
+
+def test_add_embedding_results() -> None:
+    index = VectorIndex()
+    index.add(
+        CreateEmbeddingResponse.construct(
+            data=[
+                Embedding.construct(embedding=[0.0, 1.0], index=1, object="embedding"),
+                Embedding.construct(embedding=[1.0, 0.0], index=0, object="embedding"),
+            ]
+        ),
+        ids=["x", "y"],
+    )
+
+    assert [match.id for match in index.search([0.9, 0.1], k=2)] == ["x", "y"]
+    assert index.search([0.0, 3.0], k=1)[0].score == pytest.approx(1.0)
+
+    with pytest.raises(ValueError, match="Expected 1 IDs"):
+        index.add([[1.0, 1.0]], ids=[])
+
+
+def test_ivf_search() -> None:
+    rng = np.random.default_rng(2)
+    centers = rng.normal(size=(4, 16))
+    vectors = np.concatenate([center + rng.normal(scale=0.05, size=(100, 16)) for center in centers]).astype(np.float32)
+
+    index = VectorIndex()
+    index.add(vectors)
+    index.train(4)
+
+    query = centers[2] + rng.normal(scale=0.05, size=16)
+    expected = _brute_force(vectors, query, 10)
+
+    # probing every list is exact
+    assert [match.index for match in index.search(query, k=10, n_probe=4)] == expected
+    # the closest cluster holds every true neighbour
+    assert [match.index for match in index.search(query, k=10, n_probe=1)] == expected
+
+    # embeddings added after training are assigned to a list
+    index.add(centers[2:3].astype(np.float32), ids=["center"])
+    assert index.search(centers[2], k=1, n_probe=1)[0].id == "center"
+
+    with pytest.raises(ValueError, match="n_lists"):
+        index.train(0)
+
+
+def test_save_and_load(tmp_path: Path) -> None:
+    rng = np.random.default_rng(3)
+    vectors = rng.normal(size=(30, 4)).astype(np.float32)
+
+    index = VectorIndex()
+    index.add(vectors, ids=[f"doc-{i}" for i in range(30)])
+    index.save(tmp_path / "index")
+
+    loaded = VectorIndex.load(tmp_path / "index")
+    assert isinstance(loaded.vectors.base, np.memmap) or isinstance(loaded.vectors, np.memmap)
+    assert loaded.ids == index.ids
+    assert [m.id for m in loaded.search(vectors[3], k=3)] == [m.id for m in index.search(vectors[3], k=3)]
+
+    # adding to a memory-mapped index copies it into memory
+    loaded.add(vectors[:1], ids=["copy"])
+    assert len(loaded) == 31
+    assert {m.id for m in loaded.search(vectors[0], k=2)} == {"doc-0", "copy"}
+
+    index.train(3)
+    index.save(tmp_path / "index")
+    loaded = VectorIndex.load(tmp_path / "index", mmap=False)
+    assert [m.id for m in loaded.search(vectors[5], k=1, n_probe=3)] == ["doc-5"]
+
+    assert len(VectorIndex().search_many(vectors[:2])) == 2
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Union
+from pathlib import Path
+
+import httpx
+import pytest
+from respx import MockRouter
+
+from openai import OpenAI, AsyncOpenAI
+from openai.lib import VectorStoreManifest
+
+from ..conftest import base_url
+
+
+class _FakeVectorStore:
+    def __init__(self, respx_mock: MockRouter) -> None:
+        self.uploads: List[str] = []
+        self.attached: Dict[str, Any] = {}
+        self.deleted_files: List[str] = []
+        self.fail_attach = False
+
+        respx_mock.post("/files").mock(side_effect=self.create_file)
+        respx_mock.delete(path__regex=r"^/files/(?P<file_id>[^/]+)$").mock(side_effect=self.delete_file)
+        respx_mock.post("/vector_stores/vs_abc/files").mock(side_effect=self.attach)
+        respx_mock.post(path__regex=r"/vector_stores/vs_abc/files/(?P<file_id>[^/]+)$").mock(side_effect=self.update)
+        respx_mock.delete(path__regex=r"/vector_stores/vs_abc/files/(?P<file_id>[^/]+)$").mock(side_effect=self.detach)
+
+    def create_file(self, _request: httpx.Request) -> httpx.Response:
+        file_id = f"file-{len(self.uploads) + 1}"
+        self.uploads.append(file_id)
+        return httpx.Response(
+            200,
+            json={
+                "id": file_id,
+                "bytes": 1,
+                "created_at": 0,
+                "filename": "upload",
+                "object": "file",
+                "purpose": "assistants",
+                "status": "processed",
+            },
+        )
+
+    def delete_file(self, _request: httpx.Request, file_id: str) -> httpx.Response:
+        self.deleted_files.append(file_id)
+        return httpx.Response(200, json={"id": file_id, "object": "file", "deleted": True})
+
+    def _vector_store_file(self, file_id: str) -> Dict[str, Any]:
+        return {
+            "id": file_id,
+            "created_at": 0,
+            "object": "vector_store.file",
+            "status": "in_progress",
+            "usage_bytes": 0,
+            "vector_store_id": "vs_abc",
+            "attributes": self.attached[file_id],
+        }
+
+    def attach(self, request: httpx.Request) -> httpx.Response:
+        if self.fail_attach:
+            return httpx.Response(400, json={"error": {"message": "invalid"}})
+
+        body = json.loads(request.content)
+        self.attached[body["file_id"]] = body.get("attributes")
+        return httpx.Response(200, json=self._vector_store_file(body["file_id"]))
+
+    def update(self, request: httpx.Request, file_id: str) -> httpx.Response:
+        self.attached[file_id] = json.loads(request.content)["attributes"]
+        return httpx.Response(200, json=self._vector_store_file(file_id))
+
+    def detach(self, _request: httpx.Request, file_id: str) -> httpx.Response:
+        if self.attached.pop(file_id, None) is None:
+            return httpx.Response(404, json={"error": {"message": "not found"}})
+        return httpx.Response(200, json={"id": file_id, "object": "vector_store.file.deleted", "deleted": True})
+
+
+@pytest.mark.respx(base_url=base_url, assert_all_called=False)
+def test_sync_directory(client: OpenAI, respx_mock: MockRouter, tmp_path: Path) -> None:
+    store = _FakeVectorStore(respx_mock)
+    source = tmp_path / "docs"
+    (source / "sub").mkdir(parents=True)
+    (source / "a.txt").write_text("a")
+    (source / "b.txt").write_text("b")
+    (source / "sub" / "c.txt").write_text("c")
+    manifest = tmp_path / "manifest.sqlite"
+
+    result = client.vector_stores.sync("vs_abc", source=source, manifest=manifest, max_concurrency=1)
+    assert sorted(result.added) == ["a.txt", "b.txt", "sub/c.txt"]
+    assert result.failures == []
+    assert len(store.attached) == 3
+
+    (source / "b.txt").write_text("b2")
+    (source / "sub" / "c.txt").unlink()
+    tags: Dict[str, Dict[str, Union[str, float, bool]]] = {"a.txt": {"tag": "new"}}
+
+    result = client.vector_stores.sync("vs_abc", source=source, manifest=manifest, attributes=tags.get)
+    assert result.updated == ["b.txt"]
+    assert result.attributes_updated == ["a.txt"]
+    assert result.deleted == ["sub/c.txt"]
+    assert result.added == []
+    assert len(store.uploads) == 4
+    # the previous versions of `b.txt` and `sub/c.txt` are removed
+    assert sorted(store.deleted_files) == ["file-2", "file-3"]
+    assert store.attached == {"file-1": {"tag": "new"}, "file-4": None}
+
+    result = client.vector_stores.sync("vs_abc", source=source, manifest=manifest, attributes=tags.get)
+    assert result.unchanged == 2
+    assert (result.added, result.updated, result.attributes_updated, result.deleted) == ([], [], [], [])
+    assert len(store.uploads) == 4
+
+
+@pytest.mark.respx(base_url=base_url, assert_all_called=False)
+def test_sync_resumes_interrupted_uploads(client: OpenAI, respx_mock: MockRouter) -> None:
+    store = _FakeVectorStore(respx_mock)
+
+    with VectorStoreManifest() as manifest:
+        store.fail_attach = True
+        result = client.vector_stores.sync(
+            "vs_abc", source={"a.txt": b"a", "b.txt": b"b"}, manifest=manifest, max_concurrency=1
+        )
+        assert result.added == []
+        assert sorted((failure.key, failure.operation) for failure in result.failures) == [
+            ("a.txt", "add"),
+            ("b.txt", "add"),
+        ]
+        assert len(store.uploads) == 2
+
+        store.fail_attach = False
+        result = client.vector_stores.sync("vs_abc", source={"a.txt": b"a", "b.txt": b"b2"}, manifest=manifest)
+
+    assert sorted(result.added) == ["a.txt", "b.txt"]
+    # `a.txt` reuses its upload while the stale upload of `b.txt` is replaced
+    assert len(store.uploads) == 3
+    assert sorted(store.attached) == ["file-1", "file-3"]
+    assert store.deleted_files == ["file-2"]
+
+
+@pytest.mark.respx(base_url=base_url, assert_all_called=False)
+def test_sync_dry_run(client: OpenAI, respx_mock: MockRouter) -> None:
+    store = _FakeVectorStore(respx_mock)
+
+    result = client.vector_stores.sync("vs_abc", source={"a.txt": b"a"}, manifest=":memory:", dry_run=True)
+
+    assert result.dry_run
+    assert result.added == ["a.txt"]
+    assert store.uploads == []
+
+
+@pytest.mark.respx(base_url=base_url, assert_all_called=False)
+async def test_async_sync(async_client: AsyncOpenAI, respx_mock: MockRouter) -> None:
+    store = _FakeVectorStore(respx_mock)
+
+    with VectorStoreManifest() as manifest:
+        result = await async_client.vector_stores.sync(
+            "vs_abc", source={"a.txt": b"a", "b.txt": b"b"}, manifest=manifest, max_concurrency=2
+        )
+        assert sorted(result.added) == ["a.txt", "b.txt"]
+
+        result = await async_client.vector_stores.sync("vs_abc", source={"a.txt": b"a2"}, manifest=manifest)
+
+    assert result.updated == ["a.txt"]
+    assert result.deleted == ["b.txt"]
+    assert len(store.attached) == 1
+    assert len(store.uploads) == 3
@@ -1,10 +1,12 @@
+import hashlib
 from pathlib import Path
 
 import anyio
+import httpx
 import pytest
-from dirty_equals import IsDict, IsList, IsBytes, IsTuple
+from dirty_equals import IsDict, IsList, IsBytes, IsTuple, IsInstance
 
-from openai._files import to_httpx_files, async_to_httpx_files
+from openai._files import FileStream, MappedFile, to_httpx_files, async_to_httpx_files
 
 readme_path = Path(__file__).parent.parent.joinpath("README.md")
 
@@ -12,13 +14,13 @@ readme_path = Path(__file__).parent.parent.joinpath("README.md")
 def test_pathlib_includes_file_name() -> None:
     result = to_httpx_files({"file": readme_path})
     print(result)
-    assert result == IsDict({"file": IsTuple("README.md", IsBytes())})
+    assert result == IsDict({"file": IsTuple("README.md", IsInstance(FileStream))})
 
 
 def test_tuple_input() -> None:
     result = to_httpx_files([("file", readme_path)])
     print(result)
-    assert result == IsList(IsTuple("file", IsTuple("README.md", IsBytes())))
+    assert result == IsList(IsTuple("file", IsTuple("README.md", IsInstance(FileStream))))
 
 
 @pytest.mark.asyncio
@@ -49,3 +51,89 @@ def test_string_not_allowed() -> None:
                 "file": "foo",  # type: ignore
             }
         )
+
+
+def test_file_stream_reads_lazily() -> None:
+    content = readme_path.read_bytes()
+    stream = FileStream(readme_path)
+
+    # the file isn't opened until the body is read
+    assert stream.seek(0, 2) == len(content)
+    assert stream.seek(0) == 0
+
+    chunks: list[bytes] = []
+    chunk = stream.read(100)
+    while chunk:
+        chunks.append(chunk)
+        chunk = stream.read(100)
+
+    assert b"".join(chunks) == content
+
+    # requests can be retried, in which case the body is rendered again
+    stream.seek(0)
+    assert stream.read() == content
+    stream.close()
+
+
+def test_file_stream_multipart_request() -> None:
+    files = to_httpx_files({"file": readme_path})
+    request = httpx.Request("POST", "https://example.com", files=files)
+
+    body = request.read()
+    assert request.headers["Content-Length"] == str(len(body))
+    assert b'filename="README.md"' in body
+    assert readme_path.read_bytes() in body
+
+
+def test_mapped_file_slices() -> None:
+    with MappedFile.open(readme_path) as file:
+        content = readme_path.read_bytes()
+        assert len(file) == len(content)
+        assert file.name == "README.md"
+
+        with file.slice(10, 20) as part:
+            assert len(part) == 20
+            assert part.read(5) == content[10:15]
+            assert part.read() == content[15:30]
+            assert part.read() == b""
+
+            part.seek(0)
+            assert part.read() == content[10:30]
+
+        with file.slice(len(content) - 5, 100) as part:
+            assert part.read() == content[-5:]
+
+
+def test_mapped_file_multipart_content_length() -> None:
+    with MappedFile.from_bytes(b"abcdefghij", name="data.bin") as file:
+        with file.slice(2, 4) as part:
+            request = httpx.Request("POST", "https://example.com", files={"data": part})
+            assert request.headers["Content-Length"] == str(len(request.read()))
+            assert b'filename="data.bin"' in request.content
+            assert b"\r\n\r\ncdef\r\n" in request.content
+
+
+def test_mapped_file_empty(tmp_path: Path) -> None:
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+
+    with MappedFile.open(path) as file:
+        assert len(file) == 0
+        assert file.read() == b""
+
+
+def test_mapped_file_slice_digest() -> None:
+    content = readme_path.read_bytes()
+    digest = hashlib.md5()
+
+    with MappedFile.open(readme_path) as file:
+        with file.slice(0, 100, digest=digest) as part:
+            part.read(10)
+            # reading the slice again, e.g. on retry, doesn't hash the same bytes twice
+            part.seek(0)
+            part.read()
+
+        with file.slice(100, len(content), digest=digest) as part:
+            part.update_digest()
+
+    assert digest.hexdigest() == hashlib.md5(content).hexdigest()
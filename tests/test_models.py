@@ -9,7 +9,7 @@ from pydantic import Field
 
 from openai._utils import PropertyInfo
 from openai._compat import PYDANTIC_V2, parse_obj, model_dump, model_json
-from openai._models import BaseModel, construct_type
+from openai._models import BaseModel, build_from, construct_type
 
 
 class BasicModel(BaseModel):
@@ -889,3 +889,25 @@ def test_discriminated_union_case() -> None:
     )
 
     assert isinstance(m, ModelB)
+
+
+def test_build_from() -> None:
+    class Nested(BaseModel):
+        foo: str
+
+    class Model(BaseModel):
+        nested: Nested
+        bar: Optional[int] = None
+
+    class ParsedModel(Model):
+        parsed: Optional[str] = None
+
+    source = Model.construct(nested={"foo": "a"}, extra_field=True)
+    m = build_from(ParsedModel, source, parsed="b")
+
+    assert isinstance(m, ParsedModel)
+    assert m.parsed == "b"
+    assert m.bar is None
+    # nested values are reused as they are
+    assert m.nested is source.nested
+    assert m.to_dict() == {"nested": {"foo": "a"}, "extra_field": True, "parsed": "b"}